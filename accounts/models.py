@@ -1,10 +1,7 @@
-import os
 import re
 import uuid
 from datetime import timedelta
-from io import BytesIO
 
-from PIL import Image
 from django.conf import settings
 from django.contrib.auth.models import (
     AbstractBaseUser, PermissionsMixin, BaseUserManager
@@ -12,16 +9,10 @@ from django.contrib.auth.models import (
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from imagekitio import ImageKit
-from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
 from rest_framework import serializers
 
-# Initialize ImageKit client with enhanced configuration
-imagekit = ImageKit(
-    private_key=settings.IMAGEKIT_PRIVATE_KEY,
-    public_key=settings.IMAGEKIT_PUBLIC_KEY,
-    url_endpoint=settings.IMAGEKIT_URL_ENDPOINT
-)
+from core.image_ingest import ImageVariant, ingest_image, read_upload
+from core.uploads import upload_file
 
 
 def validate_indian_phone_number(value):
@@ -41,43 +32,8 @@ def validate_indian_phone_number(value):
 
 
 def upload_to_imagekit(file, file_name, folder=None, is_private=False):
-    """Enhanced helper function to upload files to ImageKit with better error handling"""
-    try:
-        options = UploadFileRequestOptions(
-            use_unique_file_name=False,
-            folder=folder,
-            is_private_file=is_private,
-            overwrite_file=True,
-            overwrite_ai_tags=True,
-            overwrite_tags=True,
-            overwrite_custom_metadata=True
-        )
-
-        # Handle both file objects and bytes
-        if isinstance(file, bytes):
-            file = (file_name, BytesIO(file))
-
-        response = imagekit.upload_file(
-            file=file,
-            file_name=file_name,
-            options=options
-        )
-
-        # Robust: check for valid response and URL
-        if hasattr(response, 'response_metadata') and getattr(response.response_metadata, 'http_status_code', None) == 200:
-            if hasattr(response, 'url') and response.url and str(response.url).startswith('http'):
-                return response.url
-            elif hasattr(response.response_metadata, 'raw') and response.response_metadata.raw.get('url'):
-                return response.response_metadata.raw['url']
-            else:
-                raise Exception(f"ImageKit upload succeeded but no URL returned: {getattr(response.response_metadata, 'raw', {})}")
-        else:
-            raise Exception(f"ImageKit upload failed: {getattr(response.response_metadata, 'raw', 'No metadata')}")
-
-    except Exception as e:
-        import logging
-        logging.error(f"ImageKit upload error: {e}")
-        raise Exception(f"ImageKit upload error: {e}")
+    """Upload through the shared uploader service (core.uploads) and return the URL"""
+    return upload_file(file, file_name, folder=folder, is_private=is_private)
 
 
 class ImageKitField(models.CharField):
@@ -294,6 +250,13 @@ class UserProfile(models.Model):
     profile_picture_url = ImageKitField(_('profile picture URL'))
     profile_thumbnail_url = ImageKitField(_('profile thumbnail URL'))
 
+    image_ingest_variants = {
+        'profile_picture': (
+            ImageVariant('profile_picture_url', None, 'user_profiles'),
+            ImageVariant('profile_thumbnail_url', (150, 150), 'user_profiles/thumbnails', prefix='thumb_', quality=80),
+        ),
+    }
+
     # Timestamps
     created_at = models.DateTimeField(_('created at'), auto_now_add=True)
     updated_at = models.DateTimeField(_('updated at'), auto_now=True)
@@ -308,71 +271,12 @@ class UserProfile(models.Model):
 
     def save_profile_picture(self, image_file):
         """
-        Enhanced profile picture upload with better file handling
-        and error management
+        Validate the upload and queue it for the image ingestion pipeline.
+        The picture and thumbnail URLs are filled in when the job finishes.
         """
-        try:
-            # Read file content once
-            if hasattr(image_file, 'read'):
-                file_bytes = image_file.read()
-            else:
-                with open(image_file, 'rb') as f:
-                    file_bytes = f.read()
-
-            # Validate image
-            try:
-                Image.open(BytesIO(file_bytes)).verify()
-            except Exception as e:
-                raise serializers.ValidationError(f"Invalid image file: {str(e)}")
-
-            # Generate unique filename
-            original_filename = getattr(image_file, 'name', 'profile.jpg')
-            ext = os.path.splitext(original_filename)[1].lower()
-            if ext not in ['.jpg', '.jpeg', '.png', '.gif']:
-                raise serializers.ValidationError("Unsupported image format. Please upload JPG, JPEG, PNG, or GIF.")
-
-            filename = f"profile_{self.user.id}_{uuid.uuid4()}{ext}"
-
-            # Upload original image
-            self.profile_picture_url = upload_to_imagekit(
-                file_bytes,
-                filename,
-                folder="user_profiles"
-            )
-
-            # Create and upload thumbnail
-            thumbnail_bytes = self._create_thumbnail(file_bytes)
-            thumbnail_filename = f"thumb_{filename}"
-            self.profile_thumbnail_url = upload_to_imagekit(
-                thumbnail_bytes,
-                thumbnail_filename,
-                folder="user_profiles/thumbnails"
-            )
-
-            self.save()
-            return True
-
-        except Exception as e:
-            # Log the error in production
-            print(f"Error saving profile picture: {str(e)}")
-            raise
-
-    def _create_thumbnail(self, image_bytes, size=(150, 150), quality=80):
-        """Create optimized thumbnail from image bytes"""
-        try:
-            with Image.open(BytesIO(image_bytes)) as img:
-                img = img.convert('RGB')
-
-                # Maintain aspect ratio while fitting within dimensions
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-
-                thumb_io = BytesIO()
-                img.save(thumb_io, format='JPEG', quality=quality, optimize=True)
-                thumb_io.seek(0)
-                return thumb_io.getvalue()
-        except Exception as e:
-            print(f"Error creating thumbnail: {str(e)}")
-            raise
+        file_bytes, ext = read_upload(image_file)
+        filename = f"profile_{self.user.id}_{uuid.uuid4()}{ext}"
+        return ingest_image(self, 'profile_picture', file_bytes, filename)
 
 
 class Address(models.Model):
@@ -496,6 +400,13 @@ class PanCard(models.Model):
     pan_card_image_url = ImageKitField(_('PAN card image URL'))
     pan_card_thumbnail_url = ImageKitField(_('PAN card thumbnail URL'))
 
+    image_ingest_variants = {
+        'pan_card_image': (
+            ImageVariant('pan_card_image_url', None, 'pancards'),
+            ImageVariant('pan_card_thumbnail_url', (200, 150), 'pancards/thumbnails', prefix='thumb_'),
+        ),
+    }
+
     # Verification status
     is_verified = models.BooleanField(_('verified'), default=False)
 
@@ -512,66 +423,10 @@ class PanCard(models.Model):
         return self.pan_number
 
     def save_pan_card_image(self, image_file):
-        """Enhanced PAN card image upload with validation"""
-        try:
-            # Read file content once
-            if hasattr(image_file, 'read'):
-                file_bytes = image_file.read()
-            else:
-                with open(image_file, 'rb') as f:
-                    file_bytes = f.read()
-
-            # Validate image
-            try:
-                Image.open(BytesIO(file_bytes)).verify()
-            except Exception as e:
-                raise serializers.ValidationError(f"Invalid image file: {str(e)}")
-
-            # Generate unique filename
-            original_filename = getattr(image_file, 'name', 'pancard.jpg')
-            ext = os.path.splitext(original_filename)[1].lower()
-            if ext not in ['.jpg', '.jpeg', '.png']:
-                raise serializers.ValidationError("Only JPG/PNG images are supported for PAN cards.")
-
-            filename = f"pancard_{self.user.id}_{uuid.uuid4()}{ext}"
-
-            # Upload original image
-            self.pan_card_image_url = upload_to_imagekit(
-                file_bytes,
-                filename,
-                folder="pancards"
-            )
-
-            # Create and upload thumbnail
-            thumbnail_bytes = self._create_thumbnail(file_bytes)
-            thumbnail_filename = f"thumb_{filename}"
-            self.pan_card_thumbnail_url = upload_to_imagekit(
-                thumbnail_bytes,
-                thumbnail_filename,
-                folder="pancards/thumbnails"
-            )
-
-            self.save()
-            return True
-
-        except Exception as e:
-            # Log the error in production
-            print(f"Error saving PAN card image: {str(e)}")
-            raise
-
-    def _create_thumbnail(self, image_bytes, size=(200, 150), quality=85):
-        """Create optimized thumbnail for PAN card"""
-        try:
-            with Image.open(BytesIO(image_bytes)) as img:
-                img = img.convert('RGB')
-
-                # PAN cards often have different aspect ratio
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-
-                thumb_io = BytesIO()
-                img.save(thumb_io, format='JPEG', quality=quality, optimize=True)
-                thumb_io.seek(0)
-                return thumb_io.getvalue()
-        except Exception as e:
-            print(f"Error creating PAN card thumbnail: {str(e)}")
-            raise
+        """Validate the PAN card image and queue it for the image ingestion pipeline"""
+        file_bytes, ext = read_upload(
+            image_file, allowed_extensions=('.jpg', '.jpeg', '.png'),
+            error_message="Only JPG/PNG images are supported for PAN cards."
+        )
+        filename = f"pancard_{self.user.id}_{uuid.uuid4()}{ext}"
+        return ingest_image(self, 'pan_card_image', file_bytes, filename)
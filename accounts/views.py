@@ -304,8 +304,13 @@ class UserProfilePictureUpdateView(APIView):
         image_file = request.FILES.get('profile_picture')
         if not image_file:
             return Response({'detail': 'No file provided.'}, status=status.HTTP_400_BAD_REQUEST)
-        profile.save_profile_picture(image_file)
-        return Response({'profile_picture_url': profile.profile_picture_url, 'profile_thumbnail_url': profile.profile_thumbnail_url})
+        job = profile.save_profile_picture(image_file)
+        return Response({
+            'profile_picture_url': profile.profile_picture_url,
+            'profile_thumbnail_url': profile.profile_thumbnail_url,
+            'image_job': job.pk,
+            'image_status': job.status,
+        }, status=status.HTTP_202_ACCEPTED)
 
 
 class LogoutSerializer(serializers.Serializer):
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.safestring import mark_safe
-from .models import AstrologyService, AstrologyBooking
+from .models import AstrologyService, AstrologyBooking, AstrologySlotHold
 
 @admin.register(AstrologyService)
 class AstrologyServiceAdmin(admin.ModelAdmin):
@@ -182,4 +182,11 @@ class AstrologyBookingAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(AstrologySlotHold)
+class AstrologySlotHoldAdmin(admin.ModelAdmin):
+    list_display = ('service', 'date', 'start_time', 'end_time', 'status', 'expires_at', 'merchant_order_id', 'booking')
+    list_filter = ('status', 'date')
+    search_fields = ('merchant_order_id', 'user__email')
+    raw_id_fields = ('user', 'booking')
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('astrology', '0008_merge_20250807_1725'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='astrologyservice',
+            name='image_manifest',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 06:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('astrology', '0010_slot_engine'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='astrologybooking',
+            name='status',
+            field=models.CharField(choices=[('CONFIRMED', 'Confirmed'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled'), ('NEEDS_RESCHEDULE', 'Needs Reschedule')], default='CONFIRMED', max_length=20),
+        ),
+    ]
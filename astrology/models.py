@@ -3,23 +3,17 @@ from django.conf import settings
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
-from imagekitio import ImageKit
-from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
 import os
 import uuid
 import logging
+from core.events import BookingEventMixin
+from core.image_ingest import ImageVariant, ingest_image, read_upload
+from core.image_variants import ResponsiveImage
 
 logger = logging.getLogger(__name__)
 
 User = settings.AUTH_USER_MODEL
 
-# Initialize ImageKit client with enhanced configuration
-imagekit = ImageKit(
-    private_key=settings.IMAGEKIT_PRIVATE_KEY,
-    public_key=settings.IMAGEKIT_PUBLIC_KEY,
-    url_endpoint=settings.IMAGEKIT_URL_ENDPOINT
-)
-
 class ImageKitField(models.CharField):
     """Enhanced custom field to store ImageKit URLs with validation"""
 
@@ -55,6 +49,16 @@ class AstrologyService(models.Model):
     image_url = ImageKitField('Service Image URL')
     image_thumbnail_url = ImageKitField('Service Thumbnail URL')
     image_card_url = ImageKitField('Service Card URL')
+    image_manifest = models.JSONField(default=dict, blank=True, editable=False)
+
+    image_ingest_variants = {
+        'service_image': (
+            ResponsiveImage('image_manifest', 'astrology/services'),
+            ImageVariant('image_url', None, 'astrology/services'),
+            ImageVariant('image_thumbnail_url', (150, 150), 'astrology/services/thumbnails', prefix='thumb_', quality=80),
+            ImageVariant('image_card_url', (300, 200), 'astrology/services/cards', prefix='card_'),
+        ),
+    }
     
     price = models.DecimalField(max_digits=10, decimal_places=2)
     duration_minutes = models.PositiveIntegerField(default=30)
@@ -76,126 +80,22 @@ class AstrologyService(models.Model):
 
     def save_service_image(self, image_file):
         """
-        Enhanced service image upload with better file handling
-        and error management
+        Validate the upload and queue it for the image ingestion pipeline.
+        Image, thumbnail and card URLs are filled in when the job finishes.
         """
-        try:
-            import os
-            import uuid
-            from PIL import Image
-            from io import BytesIO
-            from rest_framework import serializers
-
-            # Read file content once
-            if hasattr(image_file, 'read'):
-                file_bytes = image_file.read()
-                # Reset file pointer if it's a file object
-                if hasattr(image_file, 'seek'):
-                    image_file.seek(0)
-            else:
-                with open(image_file, 'rb') as f:
-                    file_bytes = f.read()
-
-            # Validate image
-            try:
-                img_test = Image.open(BytesIO(file_bytes))
-                img_test.verify()
-                # Reset BytesIO after verification
-                del img_test
-            except Exception as e:
-                raise serializers.ValidationError(f"Invalid image file: {str(e)}")
-
-            # Generate unique filename
-            original_filename = getattr(image_file, 'name', 'service.jpg')
-            ext = os.path.splitext(original_filename)[1].lower()
-            if ext not in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-                raise serializers.ValidationError("Unsupported image format. Please upload JPG, JPEG, PNG, GIF, or WEBP.")
-
-            filename = f"service_{self.id}_{uuid.uuid4()}{ext}"
-
-            # Upload original image
-            self.image_url = upload_to_imagekit(
-                file_bytes,
-                filename,
-                folder="astrology/services"
-            )
-
-            # Create and upload thumbnail
-            thumbnail_bytes = self._create_thumbnail(file_bytes)
-            thumbnail_filename = f"thumb_{filename}"
-            self.image_thumbnail_url = upload_to_imagekit(
-                thumbnail_bytes,
-                thumbnail_filename,
-                folder="astrology/services/thumbnails"
-            )
-
-            # Create and upload card image (medium size)
-            card_bytes = self._create_card_image(file_bytes)
-            card_filename = f"card_{filename}"
-            self.image_card_url = upload_to_imagekit(
-                card_bytes,
-                card_filename,
-                folder="astrology/services/cards"
-            )
-
-            self.save()
-            return True
-
-        except Exception as e:
-            # Log the error in production
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error saving service image: {str(e)}")
-            raise
-
-    def _create_thumbnail(self, image_bytes, size=(150, 150), quality=80):
-        """Create optimized thumbnail from image bytes"""
-        try:
-            from PIL import Image
-            from io import BytesIO
-            
-            with Image.open(BytesIO(image_bytes)) as img:
-                img = img.convert('RGB')
-
-                # Maintain aspect ratio while fitting within dimensions
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-
-                thumb_io = BytesIO()
-                img.save(thumb_io, format='JPEG', quality=quality, optimize=True)
-                thumb_io.seek(0)
-                return thumb_io.getvalue()
-        except Exception as e:
-            logger.error(f"Error creating thumbnail: {str(e)}")
-            raise
-
-    def _create_card_image(self, image_bytes, size=(300, 200), quality=85):
-        """Create optimized card image from image bytes"""
-        try:
-            from PIL import Image
-            from io import BytesIO
-            
-            with Image.open(BytesIO(image_bytes)) as img:
-                img = img.convert('RGB')
-
-                # Maintain aspect ratio while fitting within dimensions
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-
-                card_io = BytesIO()
-                img.save(card_io, format='JPEG', quality=quality, optimize=True)
-                card_io.seek(0)
-                return card_io.getvalue()
-        except Exception as e:
-            logger.error(f"Error creating card image: {str(e)}")
-            raise
-        except Exception as e:
-            print(f"Error creating card image: {str(e)}")
-            raise
+        file_bytes, ext = read_upload(
+            image_file, allowed_extensions=('.jpg', '.jpeg', '.png', '.gif', '.webp')
+        )
+        filename = f"service_{self.id}_{uuid.uuid4()}{ext}"
+        return ingest_image(self, 'service_image', file_bytes, filename)
 
-class AstrologyBooking(models.Model):
+class AstrologyBooking(BookingEventMixin, models.Model):
     STATUS_CHOICES = [
         ('CONFIRMED', 'Confirmed'),  # Only confirmed bookings exist (after successful payment)
         ('COMPLETED', 'Completed'),
         ('CANCELLED', 'Cancelled'),
+        # Paid, but the slot was taken after the payment hold expired: reschedule or refund
+        ('NEEDS_RESCHEDULE', 'Needs Reschedule'),
     ]
 
     GENDER_CHOICES = [
@@ -255,6 +155,14 @@ class AstrologyBooking(models.Model):
             models.Index(fields=['service', 'status']),
         ]
 
+    booking_event_type = 'ASTROLOGY'
+    booking_ref_field = 'astro_book_id'
+    schedule_fields = ('preferred_date', 'preferred_time')
+    meet_link_field = 'google_meet_link'
+    calendar_fields = (
+        'user_id', 'astro_book_id', 'status', 'preferred_date', 'preferred_time', 'google_meet_link', 'service_id'
+    )
+
     def __str__(self):
         return f"{self.astro_book_id} - {self.contact_email} - {self.service.title}"
 
@@ -273,14 +181,10 @@ class AstrologyBooking(models.Model):
         # Check if Google Meet link was just added
         google_meet_link_added = False
         if not is_new and self.google_meet_link:
-            # Get the old instance to compare
-            try:
-                old_instance = AstrologyBooking.objects.get(pk=self.pk)
-                if not old_instance.google_meet_link and self.google_meet_link:
-                    google_meet_link_added = True
-                    self.is_session_scheduled = True
-            except AstrologyBooking.DoesNotExist:
-                pass
+            # Compare against the values loaded from the database (no extra query)
+            if self.has_changed('google_meet_link') and not self.previous('google_meet_link'):
+                google_meet_link_added = True
+                self.is_session_scheduled = True
         
         super().save(*args, **kwargs)
         
@@ -385,6 +289,10 @@ class AstrologyBooking(models.Model):
         
         self.preferred_date = new_date
         self.preferred_time = new_time
+        if self.status == 'NEEDS_RESCHEDULE':
+            # The new time is the session's slot
+            self.status = 'CONFIRMED'
+        self.event_actor = rescheduled_by
         self.save()
         
         # Send reschedule notification
@@ -441,6 +349,29 @@ Customer has been notified of the change.
             logger = logging.getLogger(__name__)
             logger.error(f"Failed to send reschedule notification: {e}")
 
+    def send_slot_conflict_notification(self):
+        """Tell admin that a paid booking lost its slot and must be rescheduled or refunded"""
+        admin_emails = [getattr(settings, 'ADMIN_PERSONAL_EMAIL', 'okpuja108@gmail.com')]
+        subject = f"Astrology Booking Needs Reschedule - {self.astro_book_id}"
+        message = f"""
+Astrology booking {self.astro_book_id} was paid after its slot hold expired,
+and the slot has since been booked by another customer.
+
+Customer: {self.contact_email} ({self.contact_phone})
+Service: {self.service.title}
+Requested Date/Time: {self.preferred_date} at {self.preferred_time}
+Payment: {self.metadata.get('merchant_order_id', self.payment_id)}
+
+Please reschedule the session or refund the payment.
+        """
+
+        try:
+            send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, admin_emails, fail_silently=False)
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Failed to send slot conflict notification: {e}")
+
     def send_session_link_notification(self):
         """Send Google Meet session link to user"""
         if not self.google_meet_link:
@@ -503,43 +434,49 @@ The customer has been notified and should receive the session details.
             logger = logging.getLogger(__name__)
             logger.error(f"Failed to send admin session link notification: {e}")
 
-def upload_to_imagekit(file, file_name, folder=None, is_private=False):
-    """Enhanced helper function to upload files to ImageKit with better error handling"""
-    try:
-        from io import BytesIO
-        
-        options = UploadFileRequestOptions(
-            use_unique_file_name=False,
-            folder=folder,
-            is_private_file=is_private,
-            overwrite_file=True,
-            overwrite_ai_tags=True,
-            overwrite_tags=True,
-            overwrite_custom_metadata=True
-        )
 
-        # Handle both file objects and bytes
-        if isinstance(file, bytes):
-            file = (file_name, BytesIO(file))
+class AstrologyScheduleDay(models.Model):
+    """
+    One row per calendar day that has seen a slot hold. Writers bump
+    ``version`` before reading the day's intervals, which serialises
+    concurrent checkouts for the same day (row lock on Postgres/MySQL,
+    database write lock on SQLite).
+    """
+    date = models.DateField(unique=True)
+    version = models.PositiveIntegerField(default=0)
 
-        response = imagekit.upload_file(
-            file=file,
-            file_name=file_name,
-            options=options
-        )
+    def __str__(self):
+        return f"{self.date} (v{self.version})"
+
+
+class AstrologySlotHold(models.Model):
+    """A slot reserved while the customer pays; see astrology.slots"""
+
+    class Status(models.TextChoices):
+        HELD = 'HELD', 'Held'
+        CONFIRMED = 'CONFIRMED', 'Confirmed'
+        RELEASED = 'RELEASED', 'Released'
+
+    service = models.ForeignKey(AstrologyService, on_delete=models.CASCADE, related_name='slot_holds')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='astrology_slot_holds')
+    date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.HELD)
+    expires_at = models.DateTimeField()
+    merchant_order_id = models.CharField(max_length=100, blank=True, db_index=True)
+    booking = models.OneToOneField(
+        AstrologyBooking, on_delete=models.SET_NULL, null=True, blank=True, related_name='slot_hold'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['date', 'start_time']
+        indexes = [
+            models.Index(fields=['date', 'status', 'expires_at']),
+            models.Index(fields=['status', 'expires_at']),
+        ]
 
-        # Robust: check for valid response and URL
-        if hasattr(response, 'response_metadata') and getattr(response.response_metadata, 'http_status_code', None) == 200:
-            if hasattr(response, 'url') and response.url and str(response.url).startswith('http'):
-                return response.url
-            elif hasattr(response.response_metadata, 'raw') and response.response_metadata.raw.get('url'):
-                return response.response_metadata.raw['url']
-            else:
-                raise Exception(f"ImageKit upload succeeded but no URL returned: {getattr(response.response_metadata, 'raw', {})}")
-        else:
-            raise Exception(f"ImageKit upload failed: {getattr(response.response_metadata, 'raw', 'No metadata')}")
-
-    except Exception as e:
-        import logging
-        logging.error(f"ImageKit upload error: {e}")
-        raise Exception(f"ImageKit upload error: {e}")
\ No newline at end of file
+    def __str__(self):
+        return f"{self.service.title} {self.date} {self.start_time}-{self.end_time} ({self.status})"
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import AstrologyService, AstrologyBooking
 from accounts.serializers import UserSerializer
+from core.serializers import ResponsiveImageField
 
 # Import admin serializers for use in views
 try:
@@ -21,12 +22,13 @@ class AstrologyServiceSerializer(serializers.ModelSerializer):
     image_url = serializers.URLField(read_only=True)
     image_thumbnail_url = serializers.URLField(read_only=True)
     image_card_url = serializers.URLField(read_only=True)
+    responsive_image = ResponsiveImageField()
 
     class Meta:
         model = AstrologyService
         fields = [
             'id', 'title', 'service_type', 'description', 'image', 'image_url',
-            'image_thumbnail_url', 'image_card_url', 'price', 'duration_minutes',
+            'image_thumbnail_url', 'image_card_url', 'responsive_image', 'price', 'duration_minutes',
             'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at', 'image_url', 'image_thumbnail_url', 'image_card_url']
@@ -0,0 +1,250 @@
+"""
+Astrology slot engine.
+
+Sessions are laid out on one shared astrologer calendar: every service's
+session lasts ``AstrologyService.duration_minutes`` and at most
+``ASTROLOGY_CONCURRENT_SESSIONS`` sessions may overlap. Bookable start
+times fall on an ``ASTROLOGY_SLOT_INTERVAL_MINUTES`` grid inside
+``ASTROLOGY_WORKING_HOURS``.
+
+A day's busy intervals (confirmed bookings plus unexpired payment holds)
+are loaded with two indexed queries into an IntervalIndex, which answers
+"is [start, end) free?" with a bisect instead of scanning the day.
+
+hold_slot() takes the per-day AstrologyScheduleDay lock before checking
+and inserting, so two concurrent checkouts can never both win the same
+slot. Holds expire on their own (``expires_at``); the payment expiry
+sweeper marks them released.
+
+A payment can succeed after its hold expired (a late webhook), so
+claim_paid_hold() checks the slot again under the same lock before the
+paid booking takes it; a slot re-taken in between leaves the booking
+NEEDS_RESCHEDULE instead of double-booking the astrologer.
+"""
+import bisect
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+DEFAULT_WORKING_HOURS = ('10:00', '19:00')
+DEFAULT_SLOT_INTERVAL_MINUTES = 30
+DEFAULT_CONCURRENT_SESSIONS = 1
+DEFAULT_HOLD_MINUTES = 10
+BUSY_BOOKING_STATUSES = ('CONFIRMED', 'COMPLETED')
+# Orders that may still be paid; their holds are kept when the user starts another checkout
+OPEN_ORDER_STATUSES = ('PENDING', 'INITIATED')
+
+
+class SlotUnavailable(Exception):
+    def __init__(self, message, free_slots=()):
+        super().__init__(message)
+        self.free_slots = list(free_slots)
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _as_time(minutes):
+    return time(minutes // 60, minutes % 60)
+
+
+def working_hours():
+    opening, closing = getattr(settings, 'ASTROLOGY_WORKING_HOURS', DEFAULT_WORKING_HOURS)
+    return (
+        _minutes(datetime.strptime(opening, '%H:%M')),
+        _minutes(datetime.strptime(closing, '%H:%M')),
+    )
+
+
+class IntervalIndex:
+    """Half-open [start, end) minute intervals sorted by start"""
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals)
+        self.starts = [start for start, _ in self.intervals]
+        self.longest = max((end - start for start, end in self.intervals), default=0)
+
+    def overlapping(self, start, end):
+        # Anything starting before ``start - longest`` has ended by ``start``
+        lo = bisect.bisect_left(self.starts, start - self.longest)
+        hi = bisect.bisect_left(self.starts, end)
+        return [(s, e) for s, e in self.intervals[lo:hi] if e > start]
+
+    def peak(self, start, end):
+        """Most intervals active at the same moment inside [start, end)"""
+        edges = []
+        for s, e in self.overlapping(start, end):
+            edges.append((max(s, start), 1))
+            edges.append((min(e, end), -1))
+        active = peak = 0
+        for _, delta in sorted(edges):
+            active += delta
+            peak = max(peak, active)
+        return peak
+
+    def is_free(self, start, end, capacity=1):
+        return self.peak(start, end) < capacity
+
+
+def busy_index(day, now=None):
+    """IntervalIndex of confirmed bookings and active holds on ``day``"""
+    from .models import AstrologyBooking, AstrologySlotHold
+
+    now = now or timezone.now()
+    intervals = [
+        (_minutes(start), _minutes(start) + duration)
+        for start, duration in AstrologyBooking.objects.filter(
+            preferred_date=day, status__in=BUSY_BOOKING_STATUSES
+        ).values_list('preferred_time', 'service__duration_minutes')
+    ]
+    holds = AstrologySlotHold.objects.filter(
+        date=day, status=AstrologySlotHold.Status.HELD, expires_at__gt=now
+    )
+    intervals += [(_minutes(start), _minutes(end)) for start, end in holds.values_list('start_time', 'end_time')]
+    return IntervalIndex(intervals)
+
+
+def candidate_starts(service, day, now=None):
+    """Grid start times (minutes) on ``day`` at which ``service`` fits in working hours"""
+    opening, closing = working_hours()
+    step = getattr(settings, 'ASTROLOGY_SLOT_INTERVAL_MINUTES', DEFAULT_SLOT_INTERVAL_MINUTES)
+    starts = range(opening, closing - service.duration_minutes + 1, step)
+    local_now = timezone.localtime(now or timezone.now())
+    if day < local_now.date():
+        return []
+    if day == local_now.date():
+        return [start for start in starts if start > _minutes(local_now.time())]
+    return list(starts)
+
+
+def free_slots(service, day, now=None, index=None):
+    """Free (start, end) times for ``service`` on ``day``"""
+    index = index or busy_index(day, now)
+    capacity = getattr(settings, 'ASTROLOGY_CONCURRENT_SESSIONS', DEFAULT_CONCURRENT_SESSIONS)
+    return [
+        (_as_time(start), _as_time(start + service.duration_minutes))
+        for start in candidate_starts(service, day, now)
+        if index.is_free(start, start + service.duration_minutes, capacity)
+    ]
+
+
+def is_bookable(service, day, start_time, now=None, index=None):
+    start = _minutes(start_time)
+    if start_time.second or start_time.microsecond or start not in candidate_starts(service, day, now):
+        return False
+    index = index or busy_index(day, now)
+    capacity = getattr(settings, 'ASTROLOGY_CONCURRENT_SESSIONS', DEFAULT_CONCURRENT_SESSIONS)
+    return index.is_free(start, start + service.duration_minutes, capacity)
+
+
+def _lock_day(day):
+    from .models import AstrologyScheduleDay
+
+    AstrologyScheduleDay.objects.get_or_create(date=day)
+    # Writing first takes the lock before the intervals are read
+    AstrologyScheduleDay.objects.filter(date=day).update(version=F('version') + 1)
+
+
+def hold_slot(service, day, start_time, user=None, now=None):
+    """
+    Reserve a slot for the duration of a payment. Earlier active holds of
+    the same user are released first (one checkout at a time), except those
+    whose payment order is still open and may yet succeed.
+    Raises SlotUnavailable with the remaining free slots.
+    """
+    from payments.models import PaymentOrder
+    from .models import AstrologySlotHold
+
+    now = now or timezone.now()
+    hold_minutes = getattr(settings, 'ASTROLOGY_SLOT_HOLD_MINUTES', DEFAULT_HOLD_MINUTES)
+    with transaction.atomic():
+        _lock_day(day)
+        if user is not None:
+            open_orders = PaymentOrder.objects.filter(status__in=OPEN_ORDER_STATUSES).values('merchant_order_id')
+            AstrologySlotHold.objects.filter(user=user, status=AstrologySlotHold.Status.HELD).exclude(
+                merchant_order_id__in=open_orders
+            ).update(status=AstrologySlotHold.Status.RELEASED, updated_at=now)
+        index = busy_index(day, now)
+        if not is_bookable(service, day, start_time, now, index):
+            raise SlotUnavailable(
+                'The selected time slot is not available',
+                free_slots(service, day, now, index)
+            )
+        start = _minutes(start_time)
+        return AstrologySlotHold.objects.create(
+            service=service,
+            user=user,
+            date=day,
+            start_time=_as_time(start),
+            end_time=_as_time(start + service.duration_minutes),
+            expires_at=now + timedelta(minutes=hold_minutes),
+        )
+
+
+def claim_paid_hold(hold_id, now=None):
+    """
+    Take the slot of a paid hold for its booking, under the day lock.
+    True when the hold is still active, or it expired or was released but
+    its interval is free again; the hold is then CONFIRMED. False when
+    someone else has the slot (the hold stays released). Call inside the
+    transaction that creates the booking, so the lock covers both.
+    """
+    from .models import AstrologySlotHold
+
+    now = now or timezone.now()
+    hold = AstrologySlotHold.objects.select_related('service').filter(pk=hold_id).first()
+    if hold is None:
+        return False
+    _lock_day(hold.date)
+    hold.refresh_from_db(fields=['status', 'expires_at'])
+    if hold.status == AstrologySlotHold.Status.CONFIRMED:
+        return True
+    active = hold.status == AstrologySlotHold.Status.HELD and hold.expires_at > now
+    if not active and not is_bookable(hold.service, hold.date, hold.start_time, now):
+        if hold.status == AstrologySlotHold.Status.HELD:
+            hold.status = AstrologySlotHold.Status.RELEASED
+            hold.save(update_fields=['status', 'updated_at'])
+        return False
+    hold.status = AstrologySlotHold.Status.CONFIRMED
+    hold.save(update_fields=['status', 'updated_at'])
+    return True
+
+
+def confirm_hold(hold_id, booking):
+    """Attach the paid booking to its claimed hold; the booking now occupies the slot"""
+    from .models import AstrologySlotHold
+
+    return AstrologySlotHold.objects.filter(
+        pk=hold_id, status=AstrologySlotHold.Status.CONFIRMED, booking__isnull=True
+    ).update(booking=booking, updated_at=timezone.now())
+
+
+def release_hold(hold_id):
+    from .models import AstrologySlotHold
+
+    return AstrologySlotHold.objects.filter(pk=hold_id, status=AstrologySlotHold.Status.HELD).update(
+        status=AstrologySlotHold.Status.RELEASED, updated_at=timezone.now()
+    )
+
+
+def release_expired_holds(now=None):
+    """Sweeper: release holds past their expiry or whose payment failed/expired"""
+    from payments.models import PaymentOrder
+    from .models import AstrologySlotHold
+
+    now = now or timezone.now()
+    held = AstrologySlotHold.objects.filter(status=AstrologySlotHold.Status.HELD)
+    dead_orders = PaymentOrder.objects.filter(status__in=['FAILED', 'CANCELLED', 'EXPIRED']).values('merchant_order_id')
+    released = held.filter(expires_at__lte=now).update(status=AstrologySlotHold.Status.RELEASED, updated_at=now)
+    released += held.filter(merchant_order_id__in=dead_orders).update(
+        status=AstrologySlotHold.Status.RELEASED, updated_at=now
+    )
+    return released
+
+
+def slot_payload(slots):
+    return [{'start': start.strftime('%H:%M:%S'), 'end': end.strftime('%H:%M:%S')} for start, end in slots]
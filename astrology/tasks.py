@@ -7,7 +7,6 @@ from django.conf import settings
 from django.core.mail import send_mail, EmailMessage
 from django.template.loader import render_to_string
 from django.utils import timezone
-from datetime import datetime, timedelta
 import logging
 
 from .models import AstrologyBooking, AstrologyService
@@ -389,47 +388,33 @@ def send_astrology_admin_notification(self, booking_id, notification_type):
 
 @shared_task
 def send_daily_astrology_reminders():
-    """Daily task to send session reminders"""
+    """
+    Safety net for the reminder scheduler: plans reminders for upcoming
+    bookings that have none yet and sends any that are due. Exact-time
+    delivery is handled by core.tasks.dispatch_due_reminders.
+    """
     try:
-        # Get bookings for tomorrow (24h reminder)
-        tomorrow = timezone.now().date() + timedelta(days=1)
-        tomorrow_bookings = AstrologyBooking.objects.filter(
-            preferred_date=tomorrow,
-            status='CONFIRMED'
-        ).select_related('service')
-        
-        for booking in tomorrow_bookings:
-            send_astrology_session_reminder.delay(booking.id, '24h')
-        
-        # Get bookings for today in 2 hours (2h reminder)
-        now = timezone.now()
-        two_hours_later = now + timedelta(hours=2)
-        
-        today_bookings = AstrologyBooking.objects.filter(
-            preferred_date=now.date(),
-            status='CONFIRMED'
-        ).select_related('service')
-        
-        for booking in today_bookings:
-            booking_datetime = timezone.make_aware(
-                datetime.combine(booking.preferred_date, booking.preferred_time)
-            )
-            
-            # Send 2h reminder if session is within 2-3 hours
-            if two_hours_later <= booking_datetime <= two_hours_later + timedelta(hours=1):
-                send_astrology_session_reminder.delay(booking.id, '2h')
-            
-            # Send 30m reminder if session is within 30-45 minutes
-            thirty_minutes_later = now + timedelta(minutes=30)
-            if thirty_minutes_later <= booking_datetime <= thirty_minutes_later + timedelta(minutes=15):
-                send_astrology_session_reminder.delay(booking.id, '30m')
-        
-        logger.info(f"Daily reminders processed: {tomorrow_bookings.count()} tomorrow reminders, {today_bookings.count()} today reminders")
+        from core.reminders import backfill_reminders, dispatch_due_reminders
+
+        planned = backfill_reminders()
+        counts = dispatch_due_reminders()
+        logger.info(f"Daily reminders processed: {planned} bookings planned, {counts['sent']} reminders sent")
         
     except Exception as e:
         logger.error(f"Failed to process daily reminders: {str(e)}")
 
 
+@shared_task
+def release_expired_slot_holds():
+    """Release astrology slots held by payments that expired or failed"""
+    from .slots import release_expired_holds
+
+    released = release_expired_holds()
+    if released:
+        logger.info(f"Released {released} expired astrology slot holds")
+    return released
+
+
 @shared_task
 def cleanup_astrology_notifications():
     """Weekly cleanup task for notification logs"""
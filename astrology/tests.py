@@ -1,3 +1,103 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from payments.models import PaymentOrder
+
+from .models import AstrologyBooking, AstrologyService, AstrologySlotHold
+from .slots import SlotUnavailable, free_slots, hold_slot, release_expired_holds
+
+User = get_user_model()
+
+SESSION_DAY = date(2030, 3, 15)
+
+
+class AstrologySlotEngineTests(TestCase):
+    def setUp(self):
+        self.short = AstrologyService.objects.create(
+            title='Quick Question', service_type='HOROSCOPE', description='One question',
+            price=Decimal('301.00'), duration_minutes=30
+        )
+        self.long = AstrologyService.objects.create(
+            title='Kundali Reading', service_type='HOROSCOPE', description='Birth chart',
+            price=Decimal('1001.00'), duration_minutes=60
+        )
+        self.user = User.objects.create_user(email='seeker@example.com', password='testpass123', username='seeker')
+        self.other = User.objects.create_user(email='other@example.com', password='testpass123', username='other')
+
+    def _starts(self, service, day=SESSION_DAY, now=None):
+        return [start for start, _ in free_slots(service, day, now)]
+
+    def test_slots_skip_overlapping_bookings(self):
+        AstrologyBooking.objects.create(
+            service=self.long, language='Hindi', preferred_date=SESSION_DAY, preferred_time=time(11, 0),
+            birth_place='Varanasi', birth_date=date(1990, 5, 1), birth_time=time(6, 30), gender='MALE',
+            contact_email='seeker@example.com', contact_phone='9999999999'
+        )
+        starts = self._starts(self.short)
+        self.assertIn(time(10, 30), starts)
+        self.assertNotIn(time(11, 0), starts)
+        self.assertNotIn(time(11, 30), starts)
+        self.assertIn(time(12, 0), starts)
+        # A 60 minute session cannot start at 10:30 either
+        self.assertNotIn(time(10, 30), self._starts(self.long))
+        self.assertEqual(self._starts(self.short)[-1], time(18, 30))
+
+    def test_hold_blocks_slot_until_it_expires(self):
+        hold = hold_slot(self.long, SESSION_DAY, time(15, 0), user=self.user)
+        with self.assertRaises(SlotUnavailable) as raised:
+            hold_slot(self.short, SESSION_DAY, time(15, 30), user=self.other)
+        self.assertNotIn(time(15, 30), [start for start, _ in raised.exception.free_slots])
+
+        later = hold.expires_at + timedelta(seconds=1)
+        self.assertIn(time(15, 30), self._starts(self.short, now=later))
+        self.assertEqual(release_expired_holds(now=later), 1)
+        hold.refresh_from_db()
+        self.assertEqual(hold.status, AstrologySlotHold.Status.RELEASED)
+
+    def test_new_checkout_releases_previous_hold_of_user(self):
+        first = hold_slot(self.short, SESSION_DAY, time(10, 0), user=self.user)
+        hold_slot(self.short, SESSION_DAY, time(12, 0), user=self.user)
+        first.refresh_from_db()
+        self.assertEqual(first.status, AstrologySlotHold.Status.RELEASED)
+        self.assertIn(time(10, 0), self._starts(self.short))
+
+        # A hold whose payment may still succeed is kept
+        held = AstrologySlotHold.objects.get(user=self.user, status=AstrologySlotHold.Status.HELD)
+        PaymentOrder.objects.create(
+            merchant_order_id='OKPUJA_OPEN0001', user=self.user, amount=30100,
+            redirect_url='https://api.okpuja.com/api/payments/redirect/', status='INITIATED'
+        )
+        held.merchant_order_id = 'OKPUJA_OPEN0001'
+        held.save(update_fields=['merchant_order_id', 'updated_at'])
+        hold_slot(self.short, SESSION_DAY, time(14, 0), user=self.user)
+        held.refresh_from_db()
+        self.assertEqual(held.status, AstrologySlotHold.Status.HELD)
+
+    def test_payment_view_rejects_taken_slot(self):
+        hold_slot(self.short, SESSION_DAY, time(16, 0), user=self.other)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(reverse('astrology-booking-with-payment'), {
+            'service': self.short.id,
+            'language': 'Hindi',
+            'preferred_date': SESSION_DAY.isoformat(),
+            'preferred_time': '16:00:00',
+            'birth_place': 'Varanasi',
+            'birth_date': '1990-05-01',
+            'birth_time': '06:30:00',
+            'gender': 'MALE',
+            'contact_email': 'seeker@example.com',
+            'contact_phone': '9999999999',
+            'redirect_url': 'https://www.okpuja.com',
+        }, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertNotIn({'start': '16:00:00', 'end': '16:30:00'}, response.data['available_slots'])
 
-# Create your tests here.
+        slots = client.get(reverse('astrology-service-slots', args=[self.short.id]), {'date': SESSION_DAY.isoformat()})
+        self.assertEqual(slots.status_code, 200)
+        self.assertNotIn({'start': '16:00:00', 'end': '16:30:00'}, slots.data['slots'])
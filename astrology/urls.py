@@ -6,12 +6,14 @@ from .views import (
     AstrologyServiceUpdateView,
     AstrologyServiceDeleteView,
     AstrologyServiceImageUploadView,
+    AstrologyServiceSlotsView,
     AstrologyBookingListView,
     AstrologyBookingCreateView,
     AstrologyBookingDetailView,
     AstrologyBookingUpdateView,
     AstrologyBookingDeleteView,
     AstrologyBookingRescheduleView,
+    AstrologyBookingTimelineView,
     AstrologyBookingWithPaymentView,
     AstrologyBookingConfirmationView
 )
@@ -20,6 +22,7 @@ urlpatterns = [
     # Public endpoints
     path('services/', AstrologyServiceListView.as_view(), name='astrology-service-list'),
     path('services/<int:pk>/', AstrologyServiceDetailView.as_view(), name='astrology-service-detail'),
+    path('services/<int:pk>/slots/', AstrologyServiceSlotsView.as_view(), name='astrology-service-slots'),
     path('bookings/book-with-payment/', AstrologyBookingWithPaymentView.as_view(), name='astrology-booking-with-payment'),
     path('bookings/confirmation/', AstrologyBookingConfirmationView.as_view(), name='astrology-booking-confirmation'),
     
@@ -29,6 +32,7 @@ urlpatterns = [
     path('bookings/<int:pk>/', AstrologyBookingDetailView.as_view(), name='astrology-booking-detail'),
     path('bookings/<int:pk>/update/', AstrologyBookingUpdateView.as_view(), name='astrology-booking-update'),
     path('bookings/<int:pk>/reschedule/', AstrologyBookingRescheduleView.as_view(), name='astrology-booking-reschedule'),
+    path('bookings/<int:pk>/timeline/', AstrologyBookingTimelineView.as_view(), name='astrology-booking-timeline'),
     path('bookings/<int:pk>/delete/', AstrologyBookingDeleteView.as_view(), name='astrology-booking-delete'),
     
     # Admin endpoints (require admin permissions)
@@ -4,13 +4,14 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import transaction
-from django.utils import timezone
+from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import uuid
 import logging
 
 from .models import AstrologyService, AstrologyBooking
+from .slots import SlotUnavailable, free_slots, hold_slot, release_hold, slot_payload
 from .serializers import (
     AstrologyServiceSerializer,
     AstrologyBookingSerializer,
@@ -18,7 +19,10 @@ from .serializers import (
     AstrologyBookingWithPaymentSerializer,
     AstrologyBookingRescheduleSerializer
 )
+from core.models import BookingEvent
 from core.permissions import IsActiveUser
+from core.serializers import BookingEventSerializer
+from payments.models import PendingCheckout
 from payments.services import PaymentService
 
 logger = logging.getLogger(__name__)
@@ -115,6 +119,21 @@ class AstrologyBookingDeleteView(generics.DestroyAPIView):
             return AstrologyBooking.objects.all()
         return AstrologyBooking.objects.filter(user=self.request.user)
 
+class AstrologyBookingTimelineView(generics.ListAPIView):
+    """Status, reschedule and session-link history of an astrology booking"""
+    serializer_class = BookingEventSerializer
+    permission_classes = [IsActiveUser]
+    pagination_class = None
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return BookingEvent.objects.none()
+        bookings = AstrologyBooking.objects.all()
+        if not self.request.user.is_staff:
+            bookings = bookings.filter(user=self.request.user)
+        booking = get_object_or_404(bookings, pk=self.kwargs['pk'])
+        return booking.booking_timeline().select_related('actor')
+
 class AstrologyBookingRescheduleView(APIView):
     """Reschedule an astrology booking"""
     
@@ -229,14 +248,16 @@ class AstrologyServiceImageUploadView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            service.save_service_image(image_file)
+            job = service.save_service_image(image_file)
             
             return Response({
-                'message': 'Image uploaded successfully',
+                'message': 'Image accepted for processing',
                 'image_url': service.image_url,
                 'image_thumbnail_url': service.image_thumbnail_url,
-                'image_card_url': service.image_card_url
-            })
+                'image_card_url': service.image_card_url,
+                'image_job': job.pk,
+                'image_status': job.status
+            }, status=status.HTTP_202_ACCEPTED)
             
         except AstrologyService.DoesNotExist:
             return Response(
@@ -249,6 +270,51 @@ class AstrologyServiceImageUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+class AstrologyServiceSlotsView(APIView):
+    """Free session slots of a service on one day"""
+    
+    permission_classes = [permissions.AllowAny]
+    
+    @swagger_auto_schema(
+        operation_description="List free session start times of an astrology service on a date",
+        operation_summary="Astrology Service Free Slots",
+        tags=['Astrology'],
+        manual_parameters=[
+            openapi.Parameter('date', openapi.IN_QUERY, description="Date (YYYY-MM-DD)", type=openapi.TYPE_STRING, required=True)
+        ],
+        responses={
+            200: openapi.Response(
+                description="Free slots",
+                examples={
+                    "application/json": {
+                        "service_id": 1,
+                        "date": "2025-08-10",
+                        "duration_minutes": 30,
+                        "slots": [{"start": "10:00:00", "end": "10:30:00"}]
+                    }
+                }
+            ),
+            400: openapi.Response(description="Missing or invalid date"),
+            404: openapi.Response(description="Service not found"),
+        }
+    )
+    def get(self, request, pk):
+        from datetime import datetime
+
+        service = get_object_or_404(AstrologyService, pk=pk, is_active=True)
+        try:
+            day = datetime.strptime(request.query_params.get('date', ''), '%Y-%m-%d').date()
+        except ValueError:
+            return Response({'error': 'date must be given as YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'service_id': service.id,
+            'date': day.isoformat(),
+            'duration_minutes': service.duration_minutes,
+            'slots': slot_payload(free_slots(service, day))
+        })
+
+
 class AstrologyBookingWithPaymentView(APIView):
     """Create astrology booking with payment integration"""
     
@@ -302,11 +368,15 @@ class AstrologyBookingWithPaymentView(APIView):
             ),
             401: openapi.Response(
                 description="Authentication required"
+            ),
+            409: openapi.Response(
+                description="Selected slot is no longer available; response lists the free slots of that day"
             )
         }
     )
     def post(self, request):
         """Create astrology booking with payment - Only create booking after successful payment"""
+        hold = None
         try:
             # Validate request data
             serializer = AstrologyBookingWithPaymentSerializer(data=request.data)
@@ -320,48 +390,35 @@ class AstrologyBookingWithPaymentView(APIView):
             validated_data = serializer.validated_data
             service = validated_data['service']
             
-            # Store all booking data in payment metadata (NOT creating booking yet)
-            booking_data = {
-                'booking_type': 'astrology',
-                'service_id': service.id,
-                'service_title': service.title,
-                'service_price': float(service.price),
-                'user_id': request.user.id,
-                'language': validated_data['language'],
-                'preferred_date': validated_data['preferred_date'].isoformat(),
-                'preferred_time': validated_data['preferred_time'].strftime('%H:%M:%S'),
-                'birth_place': validated_data['birth_place'],
-                'birth_date': validated_data['birth_date'].isoformat(),
-                'birth_time': validated_data['birth_time'].strftime('%H:%M:%S'),
-                'gender': validated_data['gender'],
-                'questions': validated_data.get('questions', ''),
-                'contact_email': validated_data['contact_email'],
-                'contact_phone': validated_data['contact_phone'],
-                # Store original frontend URL for proper redirects
-                'frontend_redirect_url': validated_data['redirect_url']
-            }
+            # Reserve the slot for the payment window so no one else can pay for it
+            try:
+                hold = hold_slot(
+                    service, validated_data['preferred_date'], validated_data['preferred_time'], user=request.user
+                )
+            except SlotUnavailable as e:
+                return Response({
+                    'success': False,
+                    'error': str(e),
+                    'available_slots': slot_payload(e.free_slots)
+                }, status=status.HTTP_409_CONFLICT)
             
             # Create payment order using PaymentService with professional timeout
+            # (the booking form is kept in a PendingCheckout row, not in the order metadata)
             payment_service = PaymentService()
             
             # Use the payment redirect handler URL instead of direct frontend URL
             # The redirect handler will then redirect to the correct frontend page
             payment_redirect_url = f"{request.scheme}://{request.get_host()}/api/payments/redirect/"
             
-            # Enhanced booking data with professional timeout settings
-            booking_data['payment_timeout_minutes'] = 5  # Professional 5-minute timeout
-            booking_data['max_retry_attempts'] = 3
-            booking_data['created_timestamp'] = timezone.now().isoformat()
-            
             payment_result = payment_service.create_payment_order(
                 user=request.user,
                 amount=int(service.price * 100),  # Convert to paisa
                 redirect_url=payment_redirect_url,  # Use redirect handler
-                description=f"Payment for {service.title} - Astrology Consultation",
-                metadata=booking_data
+                description=f"Payment for {service.title} - Astrology Consultation"
             )
             
             if not payment_result['success']:
+                release_hold(hold.id)
                 return Response({
                     'success': False,
                     'error': 'Failed to create payment order',
@@ -371,6 +428,28 @@ class AstrologyBookingWithPaymentView(APIView):
             # Get the merchant order ID from the payment order
             payment_order = payment_result['payment_order']
             merchant_order_id = payment_order.merchant_order_id
+            hold.merchant_order_id = merchant_order_id
+            hold.save(update_fields=['merchant_order_id', 'updated_at'])
+            
+            # Booking is created from this row after successful payment
+            PendingCheckout.objects.create(
+                payment_order=payment_order,
+                checkout_type=PendingCheckout.CheckoutType.ASTROLOGY,
+                user=request.user,
+                frontend_redirect_url=validated_data['redirect_url'],
+                astrology_service=service,
+                slot_hold=hold,
+                language=validated_data['language'],
+                preferred_date=validated_data['preferred_date'],
+                preferred_time=validated_data['preferred_time'],
+                birth_place=validated_data['birth_place'],
+                birth_date=validated_data['birth_date'],
+                birth_time=validated_data['birth_time'],
+                gender=validated_data['gender'],
+                questions=validated_data.get('questions', ''),
+                contact_email=validated_data['contact_email'],
+                contact_phone=validated_data['contact_phone']
+            )
             
             # Prepare response data with professional timeout info
             response_data = {
@@ -386,6 +465,12 @@ class AstrologyBookingWithPaymentView(APIView):
                         'expires_at': payment_result.get('expires_at')
                     },
                     'service': AstrologyServiceSerializer(service).data,
+                    'slot': {
+                        'date': hold.date.isoformat(),
+                        'start': hold.start_time.strftime('%H:%M:%S'),
+                        'end': hold.end_time.strftime('%H:%M:%S'),
+                        'held_until': hold.expires_at.isoformat()
+                    },
                     'timeout_info': {
                         'expires_in_minutes': payment_result.get('expires_in_minutes', 5),
                         'max_retry_attempts': 3,
@@ -404,6 +489,8 @@ class AstrologyBookingWithPaymentView(APIView):
                 
         except Exception as e:
             logger.error(f"Error creating astrology payment: {str(e)}")
+            if hold is not None:
+                release_hold(hold.id)
             return Response({
                 'success': False,
                 'error': 'Internal server error',
@@ -6,7 +6,11 @@ from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 
-from .models import BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike, BlogView
+from .models import (
+    BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike, BlogView, BlogSearchQuery, BlogAnalytics,
+    BlogPostDailyStats
+)
+from . import comments, derived
 
 @admin.register(BlogCategory)
 class BlogCategoryAdmin(admin.ModelAdmin):
@@ -128,12 +132,12 @@ class BlogPostAdmin(admin.ModelAdmin):
     readonly_fields = ['view_count', 'created_at', 'updated_at']
     
     def like_count(self, obj):
-        count = obj.likes.count()
+        count = obj.like_count
         return format_html('<span style="color: #e74c3c;">❤️ {}</span>', count)
     like_count.short_description = 'Likes'
     
     def comment_count(self, obj):
-        count = obj.comments.filter(is_approved=True).count()
+        count = obj.approved_comment_count
         url = reverse('admin:blog_blogcomment_changelist') + f'?post__id__exact={obj.id}'
         return format_html('<a href="{}" style="color: #3498db;">💬 {}</a>', url, count)
     comment_count.short_description = 'Comments'
@@ -255,12 +259,20 @@ class BlogCommentAdmin(admin.ModelAdmin):
     content_preview.short_description = 'Comment'
     
     def approve_comments(self, request, queryset):
+        post_ids = set(queryset.values_list('post_id', flat=True))
         updated = queryset.update(is_approved=True)
+        derived.recount_comments(post_ids)
+        for post_id in post_ids:
+            comments.bump_version(post_id)
         self.message_user(request, f'{updated} comments approved.')
     approve_comments.short_description = "Approve selected comments"
     
     def disapprove_comments(self, request, queryset):
+        post_ids = set(queryset.values_list('post_id', flat=True))
         updated = queryset.update(is_approved=False)
+        derived.recount_comments(post_ids)
+        for post_id in post_ids:
+            comments.bump_version(post_id)
         self.message_user(request, f'{updated} comments disapproved.')
     disapprove_comments.short_description = "Disapprove selected comments"
     
@@ -307,4 +319,37 @@ class BlogViewAdmin(admin.ModelAdmin):
     
     def has_add_permission(self, request):
         # Prevent manual addition of views
-        return False
\ No newline at end of file
+        return False
+
+@admin.register(BlogSearchQuery)
+class BlogSearchQueryAdmin(admin.ModelAdmin):
+    list_display = ['query', 'results_count', 'user', 'ip_address', 'created_at']
+    list_filter = ['created_at']
+    search_fields = ['query', 'user__email']
+    raw_id_fields = ['user', 'clicked_result']
+    date_hierarchy = 'created_at'
+    
+    def has_add_permission(self, request):
+        # Logged in batches by blog.search
+        return False
+
+
+@admin.register(BlogAnalytics)
+class BlogAnalyticsAdmin(admin.ModelAdmin):
+    list_display = ['date', 'total_views', 'unique_visitors', 'total_likes', 'total_comments', 'updated_at']
+    date_hierarchy = 'date'
+
+    def has_add_permission(self, request):
+        # Filled by blog.rollups
+        return False
+
+
+@admin.register(BlogPostDailyStats)
+class BlogPostDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ['post', 'date', 'views', 'likes', 'comments']
+    raw_id_fields = ['post']
+    date_hierarchy = 'date'
+
+    def has_add_permission(self, request):
+        # Filled by blog.rollups
+        return False
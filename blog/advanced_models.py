@@ -10,153 +10,9 @@ from django.utils import timezone
 from datetime import timedelta
 import json
 
-from .models import BlogPost, BlogCategory, User
-
-class BlogAnalytics(models.Model):
-    """Store daily analytics data for blog performance"""
-    date = models.DateField(verbose_name='Analytics Date')
-    total_views = models.PositiveIntegerField(default=0, verbose_name='Total Views')
-    unique_visitors = models.PositiveIntegerField(default=0, verbose_name='Unique Visitors')
-    total_likes = models.PositiveIntegerField(default=0, verbose_name='Total Likes')
-    total_comments = models.PositiveIntegerField(default=0, verbose_name='Total Comments')
-    bounce_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Bounce Rate %')
-    avg_time_on_page = models.DurationField(null=True, blank=True, verbose_name='Average Time on Page')
-    
-    # Traffic sources
-    direct_traffic = models.PositiveIntegerField(default=0, verbose_name='Direct Traffic')
-    search_traffic = models.PositiveIntegerField(default=0, verbose_name='Search Traffic')
-    social_traffic = models.PositiveIntegerField(default=0, verbose_name='Social Traffic')
-    referral_traffic = models.PositiveIntegerField(default=0, verbose_name='Referral Traffic')
-    
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    
-    class Meta:
-        verbose_name = 'Blog Analytics'
-        verbose_name_plural = 'Blog Analytics'
-        unique_together = ('date',)
-        ordering = ['-date']
-        indexes = [
-            models.Index(fields=['date']),
-            models.Index(fields=['total_views']),
-        ]
-    
-    def __str__(self):
-        return f"Analytics for {self.date}"
-
-class BlogPostPerformance(models.Model):
-    """Track individual post performance metrics"""
-    post = models.OneToOneField(
-        BlogPost,
-        on_delete=models.CASCADE,
-        related_name='performance',
-        verbose_name='Blog Post'
-    )
-    
-    # Engagement metrics
-    avg_reading_time = models.DurationField(null=True, blank=True, verbose_name='Average Reading Time')
-    completion_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Completion Rate %')
-    scroll_depth_avg = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Average Scroll Depth %')
-    
-    # SEO metrics
-    search_impressions = models.PositiveIntegerField(default=0, verbose_name='Search Impressions')
-    search_clicks = models.PositiveIntegerField(default=0, verbose_name='Search Clicks')
-    click_through_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='CTR %')
-    avg_position = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Average Search Position')
-    
-    # Social metrics
-    social_shares = models.PositiveIntegerField(default=0, verbose_name='Social Shares')
-    social_mentions = models.PositiveIntegerField(default=0, verbose_name='Social Mentions')
-    
-    # Quality score (calculated)
-    quality_score = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Quality Score')
-    
-    last_updated = models.DateTimeField(auto_now=True)
-    
-    class Meta:
-        verbose_name = 'Post Performance'
-        verbose_name_plural = 'Post Performance'
-        ordering = ['-quality_score']
-    
-    def __str__(self):
-        return f"Performance for {self.post.title}"
-    
-    def calculate_quality_score(self):
-        """Calculate quality score based on various metrics"""
-        score = 0
-        
-        # Engagement factor (40% of score)
-        if self.post.view_count > 0:
-            like_ratio = (self.post.likes.count() / self.post.view_count) * 100
-            comment_ratio = (self.post.comments.filter(is_approved=True).count() / self.post.view_count) * 100
-            engagement_score = min(40, (like_ratio + comment_ratio) * 2)
-            score += engagement_score
-        
-        # SEO factor (30% of score)
-        if self.search_impressions > 0:
-            ctr_score = min(30, self.click_through_rate * 3)
-            score += ctr_score
-        
-        # Content quality factor (20% of score)
-        content_score = 0
-        if self.post.meta_title:
-            content_score += 5
-        if self.post.meta_description:
-            content_score += 5
-        if self.post.featured_image:
-            content_score += 5
-        if len(self.post.content) > 300:
-            content_score += 5
-        score += content_score
-        
-        # Social factor (10% of score)
-        social_score = min(10, self.social_shares * 0.5)
-        score += social_score
-        
-        self.quality_score = round(score, 2)
-        return self.quality_score
-
-class BlogSearchQuery(models.Model):
-    """Track internal blog search queries"""
-    query = models.CharField(max_length=255, verbose_name='Search Query')
-    results_count = models.PositiveIntegerField(default=0, verbose_name='Results Count')
-    user = models.ForeignKey(
-        User,
-        on_delete=models.SET_NULL,
-        null=True,
-        blank=True,
-        related_name='blog_searches',
-        verbose_name='User'
-    )
-    ip_address = models.GenericIPAddressField(
-        verbose_name='IP Address',
-        null=True,
-        blank=True,
-        protocol='both',
-        unpack_ipv4=False
-    )
-    clicked_result = models.ForeignKey(
-        BlogPost,
-        on_delete=models.SET_NULL,
-        null=True,
-        blank=True,
-        related_name='search_clicks',
-        verbose_name='Clicked Result'
-    )
-    created_at = models.DateTimeField(auto_now_add=True)
-    
-    class Meta:
-        verbose_name = 'Search Query'
-        verbose_name_plural = 'Search Queries'
-        ordering = ['-created_at']
-        indexes = [
-            models.Index(fields=['query']),
-            models.Index(fields=['created_at']),
-            models.Index(fields=['results_count']),
-        ]
-    
-    def __str__(self):
-        return f"Search: {self.query} ({self.results_count} results)"
+# BlogSearchQuery lives in models.py (it is fed by blog.search); BlogAnalytics
+# and BlogPostPerformance too (they are filled by blog.rollups)
+from .models import BlogPost, BlogCategory, BlogSearchQuery, BlogAnalytics, BlogPostPerformance, User
 
 class BlogNotification(models.Model):
     """Notification system for blog events"""
@@ -0,0 +1,71 @@
+"""
+Comment threads loaded in one query.
+
+``comment_thread(post, serializer_class)`` reads every approved comment of
+a post (with its user) in a single query, links replies to their parents
+in memory and serializes the tree. Replies come from the
+``comment_replies`` serializer context instead of a query per comment.
+
+The serialized thread is cached per post under a version (a
+core.cache_versions counter, shared by every process) that blog.signals
+bumps whenever the set of approved comments changes (a comment approved,
+unapproved, edited while approved or deleted), so readers never wait on
+the tree between new comments.
+"""
+from collections import defaultdict
+
+from django.core.cache import cache
+from rest_framework.pagination import PageNumberPagination
+
+from core import cache_versions
+
+CACHE_TIMEOUT = 60 * 60
+
+
+class CommentThreadPagination(PageNumberPagination):
+    """Pages of top-level comments; replies stay with their thread"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+def _version_name(post_id):
+    return f"blog_comments:{post_id}"
+
+
+def get_version(post_id):
+    return cache_versions.get_version(_version_name(post_id))
+
+
+def bump_version(post_id):
+    return cache_versions.bump_version(_version_name(post_id))
+
+
+def approved_tree(post):
+    """(top-level comments newest first, {parent id: replies oldest first}) from one query"""
+    from .models import BlogComment
+
+    comments = BlogComment.objects.filter(post=post, is_approved=True).select_related('user').order_by('created_at')
+    top_level = []
+    replies = defaultdict(list)
+    for comment in comments:
+        # The post is already loaded; get_is_author reads comment.post.user_id
+        comment.post = post
+        if comment.parent_id is None:
+            top_level.append(comment)
+        else:
+            replies[comment.parent_id].append(comment)
+    top_level.reverse()
+    return top_level, replies
+
+
+def comment_thread(post, serializer_class, context=None):
+    """Serialized approved comment tree of ``post``, cached until its comments change"""
+    key = f"blog_comments:{post.pk}:{get_version(post.pk)}:{serializer_class.__name__}"
+    thread = cache.get(key)
+    if thread is None:
+        top_level, replies = approved_tree(post)
+        context = dict(context or {}, comment_replies=replies)
+        thread = serializer_class(top_level, many=True, context=context).data
+        cache.set(key, thread, CACHE_TIMEOUT)
+    return thread
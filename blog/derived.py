@@ -0,0 +1,270 @@
+"""
+Derived blog post fields, computed when a post is written instead of on
+every read.
+
+BlogPost stores its word count, reading time, table of contents, published
+tag names, like and approved comment counts and the request-independent
+parts of its JSON-LD and Open Graph data. The listing and detail
+serializers read these columns and only fill in the live bits (absolute
+URLs, image, author and timestamps) with
+``render_structured_data``/``render_open_graph_data``.
+
+* ``BlogPost.save()`` calls ``apply(post)`` when a source field changed.
+* Tag changes and category/tag renames call ``refresh_posts(post_ids)``
+  (blog.signals).
+* Likes, unlikes, comment approval and deletion move ``like_count`` and
+  ``approved_comment_count`` with atomic F() updates (``adjust_counter``);
+  bulk changes call ``recount`` and ``manage.py reconcile_blog_counters``
+  repairs any drift.
+"""
+import re
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.template.defaultfilters import truncatewords
+
+WORDS_PER_MINUTE = 200
+DEFAULT_BASE_URL = 'https://www.okpuja.com/'
+# Tracked on BlogPost; a save changing one of them recomputes the derived fields
+SOURCE_FIELDS = (
+    'title', 'slug', 'excerpt', 'content', 'meta_title', 'meta_description', 'meta_keywords', 'category_id',
+)
+DERIVED_FIELDS = ('word_count', 'reading_time', 'table_of_contents', 'structured_data', 'open_graph_data')
+# Stored paths in these keys are made absolute when rendered
+URL_KEYS = frozenset(('url', '@id', 'og:url'))
+
+_HEADING_RE = re.compile(r'^\s*(#{1,6})\s+(.+?)\s*$', re.MULTILINE)
+_SLUG_STRIP_RE = re.compile(r'[^a-zA-Z0-9\s]')
+
+
+def reading_stats(content):
+    """(word count, reading time in minutes)"""
+    word_count = len((content or '').split())
+    return word_count, max(1, round(word_count / WORDS_PER_MINUTE))
+
+
+def table_of_contents(content):
+    """Markdown headings of the content as [{level, title, slug, url}]"""
+    headings = []
+    for match in _HEADING_RE.finditer(content or ''):
+        title = match.group(2)
+        slug = _SLUG_STRIP_RE.sub('', title).replace(' ', '-').lower()
+        headings.append({"level": len(match.group(1)), "title": title, "slug": slug, "url": f"#{slug}"})
+    return headings
+
+
+def _section(post):
+    return post.category.name if post.category_id else "Spirituality"
+
+
+def structured_data(post, tag_names):
+    """JSON-LD BlogPosting; image, author and dates are filled in when rendered"""
+    path = f'/blog/{post.slug}/'
+    return {
+        "@context": "https://schema.org",
+        "@type": "BlogPosting",
+        "headline": post.title,
+        "description": post.excerpt or truncatewords(post.content, 30),
+        "image": None,
+        "author": None,
+        "publisher": {
+            "@type": "Organization",
+            "name": "OkPuja",
+            "logo": {
+                "@type": "ImageObject",
+                "url": "/static/images/okpuja-logo.png"
+            }
+        },
+        "datePublished": None,
+        "dateModified": None,
+        "url": path,
+        "mainEntityOfPage": {
+            "@type": "WebPage",
+            "@id": path
+        },
+        "keywords": post.meta_keywords or ', '.join(tag_names),
+        "wordCount": post.word_count,
+        "timeRequired": f"PT{post.reading_time}M",
+        "articleSection": _section(post),
+        "inLanguage": "en-US"
+    }
+
+
+def open_graph_data(post, tag_names):
+    """Open Graph tags; image, author and times are filled in when rendered"""
+    return {
+        "og:type": "article",
+        "og:title": post.meta_title or post.title,
+        "og:description": post.meta_description or post.excerpt or truncatewords(post.content, 30),
+        "og:image": None,
+        "og:url": f'/blog/{post.slug}/',
+        "og:site_name": "OkPuja - Hindu Spiritual Services",
+        "article:author": None,
+        "article:published_time": None,
+        "article:modified_time": None,
+        "article:section": _section(post),
+        "article:tag": ', '.join(tag_names)
+    }
+
+
+def apply(post, tag_names=None):
+    """Recompute the derived fields of ``post`` in memory (no query for an unchanged tag list)"""
+    if tag_names is not None:
+        post.tag_names = tag_names
+    tag_names = post.tag_names or []
+    post.word_count, post.reading_time = reading_stats(post.content)
+    post.table_of_contents = table_of_contents(post.content)
+    post.structured_data = structured_data(post, tag_names)
+    post.open_graph_data = open_graph_data(post, tag_names)
+
+
+def published_tag_names(post_ids, apps=None):
+    """{post_id: [published tag names]}"""
+    BlogPost = _post_model(apps)
+    names = {post_id: [] for post_id in post_ids}
+    for post_id, name in BlogPost.tags.through.objects.filter(
+        blogpost_id__in=list(post_ids), blogtag__status='PUBLISHED'
+    ).order_by('blogtag__name').values_list('blogpost_id', 'blogtag__name'):
+        names[post_id].append(name)
+    return names
+
+
+def refresh_posts(post_ids, apps=None, batch_size=200):
+    """Recompute and store the derived fields (and tag names) of the given posts"""
+    BlogPost = _post_model(apps)
+    post_ids = list(post_ids)
+    if not post_ids:
+        return 0
+    tag_names = published_tag_names(post_ids, apps)
+    posts = list(BlogPost.objects.filter(pk__in=post_ids).select_related('category'))
+    for post in posts:
+        apply(post, tag_names[post.pk])
+    BlogPost.objects.bulk_update(posts, DERIVED_FIELDS + ('tag_names',), batch_size=batch_size)
+    return len(posts)
+
+
+def _post_model(apps=None):
+    return _registry(apps).get_model('blog', 'BlogPost')
+
+
+def _registry(apps=None):
+    # ``apps`` lets data migrations pass their historical app registry
+    if apps is None:
+        from django.apps import apps
+    return apps
+
+
+# Counters ------------------------------------------------------------------
+
+# BlogPost counter column: (model counted, filter)
+COUNTERS = {
+    'like_count': ('BlogLike', {}),
+    'approved_comment_count': ('BlogComment', {'is_approved': True}),
+}
+# Moved only by F() (and trending logaddexp) updates; a full save() of a loaded post
+# leaves them alone, except the trending score on the save that publishes it
+COUNTER_FIELDS = ('view_count',) + tuple(COUNTERS) + ('trending_score',)
+
+
+def adjust_counter(post_id, field, delta):
+    """Atomic ``field = field + delta`` in the database, never going below zero"""
+    posts = _post_model().objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(**{f'{field}__gte': -delta})
+    posts.update(**{field: F(field) + delta})
+
+
+def adjust_like_count(post_id, delta):
+    adjust_counter(post_id, 'like_count', delta)
+
+
+def adjust_comment_count(post_id, delta):
+    adjust_counter(post_id, 'approved_comment_count', delta)
+
+
+def _actual_count(field, apps=None):
+    model_name, filters = COUNTERS[field]
+    rows = _registry(apps).get_model('blog', model_name).objects.filter(
+        post=OuterRef('pk'), **filters
+    ).order_by().values('post')
+    return Coalesce(Subquery(rows.annotate(n=Count('pk')).values('n'), output_field=IntegerField()), Value(0))
+
+
+def recount(fields=tuple(COUNTERS), post_ids=None, apps=None):
+    """Set counters from the rows they count; all posts when ``post_ids`` is None"""
+    BlogPost = _post_model(apps)
+    posts = BlogPost.objects.all() if post_ids is None else BlogPost.objects.filter(pk__in=list(post_ids))
+    return posts.update(**{field: _actual_count(field, apps) for field in fields})
+
+
+def recount_comments(post_ids=None, apps=None):
+    return recount(('approved_comment_count',), post_ids, apps)
+
+
+def counter_drift(post_ids=None):
+    """[(post_id, field, stored, actual)] for every counter that disagrees with its rows"""
+    BlogPost = _post_model()
+    posts = BlogPost.objects.all() if post_ids is None else BlogPost.objects.filter(pk__in=list(post_ids))
+    posts = posts.annotate(**{f'actual_{field}': _actual_count(field) for field in COUNTERS})
+    differs = Q()
+    for field in COUNTERS:
+        differs |= ~Q(**{field: F(f'actual_{field}')})
+    drift = []
+    for row in posts.filter(differs).values('pk', *COUNTERS, *[f'actual_{field}' for field in COUNTERS]):
+        for field in COUNTERS:
+            if row[field] != row[f'actual_{field}']:
+                drift.append((row['pk'], field, row[field], row[f'actual_{field}']))
+    return drift
+
+
+# Rendering ------------------------------------------------------------------
+
+def base_url(request=None):
+    return request.build_absolute_uri('/') if request is not None else DEFAULT_BASE_URL
+
+
+def absolute_urls(data, base):
+    """Copy of stored JSON with the site-relative paths under URL_KEYS made absolute"""
+    if isinstance(data, dict):
+        return {
+            key: base.rstrip('/') + value if key in URL_KEYS and isinstance(value, str) and value.startswith('/')
+            else absolute_urls(value, base)
+            for key, value in data.items()
+        }
+    return data
+
+
+def author_name(user):
+    # accounts.User has no get_full_name(), and its full_name reads the profile (a query per post)
+    return user.username or user.email
+
+
+def _published(post):
+    return (post.published_at or post.created_at).isoformat()
+
+
+def render_structured_data(post, request=None, image_url=None):
+    base = base_url(request)
+    data = absolute_urls(post.structured_data or structured_data(post, post.tag_names or []), base)
+    data.update({
+        "image": image_url,
+        "author": {
+            "@type": "Person",
+            "name": author_name(post.user),
+            "url": f"{base}author/{post.user_id}/"
+        },
+        "datePublished": _published(post),
+        "dateModified": post.updated_at.isoformat(),
+    })
+    return data
+
+
+def render_open_graph_data(post, request=None, image_url=None):
+    data = absolute_urls(post.open_graph_data or open_graph_data(post, post.tag_names or []), base_url(request))
+    data.update({
+        "og:image": image_url,
+        "article:author": author_name(post.user),
+        "article:published_time": _published(post),
+        "article:modified_time": post.updated_at.isoformat(),
+    })
+    return data
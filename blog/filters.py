@@ -0,0 +1,23 @@
+from core.filters import RankedSearchFilter as BaseRankedSearchFilter
+
+from . import search
+
+
+def client_ip(request):
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    return forwarded.split(',')[0].strip() if forwarded else request.META.get('REMOTE_ADDR')
+
+
+class RankedSearchFilter(BaseRankedSearchFilter):
+    """
+    ``?search=`` backed by the blog full-text index (blog.search).
+    The queryset decides which statuses are visible. The search is logged
+    to BlogSearchQuery in the background.
+    """
+
+    def ranked_ids(self, request, query, queryset):
+        ids = search.ranked_post_ids(query, published_only=False)
+        search.log_search(
+            query, len(ids), request.user.pk if request.user.is_authenticated else None, client_ip(request)
+        )
+        return ids
@@ -9,7 +9,8 @@ from django.db.models import Count, Q
 from datetime import timedelta
 import logging
 
-from blog.models import BlogPost, BlogView, BlogCategory, BlogTag
+from blog.models import BlogPost, BlogCategory, BlogTag
+from blog import rollups
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +62,8 @@ class Command(BaseCommand):
     def generate_seo_report(self, days):
         """Generate comprehensive SEO analysis report"""
         start_date = timezone.now() - timedelta(days=days)
+        # View figures come from the daily rollups (blog.rollups)
+        since = timezone.localdate() - timedelta(days=days)
         
         # Overall statistics
         total_posts = BlogPost.objects.filter(status='PUBLISHED').count()
@@ -69,7 +72,7 @@ class Command(BaseCommand):
             published_at__gte=start_date
         ).count()
         
-        total_views = BlogView.objects.filter(created_at__gte=start_date).count()
+        total_views = rollups.totals(since)['views']
         
         # SEO issues analysis
         posts_without_meta_title = BlogPost.objects.filter(
@@ -94,25 +97,17 @@ class Command(BaseCommand):
         ).count()
         
         # Performance analysis
-        top_posts = BlogPost.objects.filter(
-            status='PUBLISHED'
-        ).annotate(
-            recent_views=Count('views', filter=Q(views__created_at__gte=start_date))
+        top_posts = rollups.with_recent_views(
+            BlogPost.objects.filter(status='PUBLISHED'), since
         ).order_by('-recent_views')[:10]
         
-        low_performing_posts = BlogPost.objects.filter(
-            status='PUBLISHED',
-            published_at__lte=start_date
-        ).annotate(
-            recent_views=Count('views', filter=Q(views__created_at__gte=start_date))
+        low_performing_posts = rollups.with_recent_views(
+            BlogPost.objects.filter(status='PUBLISHED', published_at__lte=start_date), since
         ).filter(recent_views__lt=5).order_by('recent_views')[:10]
         
         # Category analysis
-        category_performance = BlogCategory.objects.filter(
-            status='PUBLISHED'
-        ).annotate(
-            post_count=Count('posts', filter=Q(posts__status='PUBLISHED')),
-            total_views=Count('posts__views', filter=Q(posts__views__created_at__gte=start_date))
+        category_performance = rollups.categories_with_views(
+            BlogCategory.objects.filter(status='PUBLISHED'), since
         ).order_by('-total_views')
         
         # Tag analysis
@@ -0,0 +1,33 @@
+"""
+Blog view flush
+Writes buffered post views to BlogView and BlogPost.view_count (see blog.view_buffer)
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog.view_buffer import buffered_view_count, flush_views
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered blog post views to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Also flush the bucket that is still being written (e.g. before a deploy)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count buffered views',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            pending = buffered_view_count(include_current=options['all'])
+            self.stdout.write(f'🔍 DRY RUN MODE - {pending} buffered view(s)')
+            return
+
+        written = flush_views(include_current=options['all'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Flushed {written} blog view(s)'))
@@ -0,0 +1,20 @@
+"""
+Rebuild the blog full-text search index
+Re-creates every search document from the current posts
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog.search import rebuild_index, fts_available
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search documents for blog posts'
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔎 Rebuilding blog search index...')
+        if not fts_available():
+            self.stdout.write(self.style.WARNING('⚠️ No full-text index on this database, search will use substring matching'))
+
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'✅ Indexed {count} post(s)'))
@@ -0,0 +1,36 @@
+"""
+Rebuild related posts
+Recomputes the TF-IDF neighbours of every published post (see blog.related)
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog.related import DEFAULT_NEIGHBOURS, published_vectors, rebuild_related_posts
+
+
+class Command(BaseCommand):
+    help = 'Recompute the related posts of every published blog post'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--neighbours',
+            type=int,
+            default=DEFAULT_NEIGHBOURS,
+            help=f'Related posts stored per post (default: {DEFAULT_NEIGHBOURS})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only build the vectors and report their size',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            vectors = published_vectors()
+            terms = sum(len(vector) for vector in vectors.values())
+            self.stdout.write(f'🔍 DRY RUN MODE - {len(vectors)} post vector(s), {terms} term weight(s)')
+            return
+
+        self.stdout.write('🔗 Rebuilding related posts...')
+        stored = rebuild_related_posts(k=options['neighbours'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Stored {stored} related post link(s)'))
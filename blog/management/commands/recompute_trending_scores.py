@@ -0,0 +1,18 @@
+"""
+Recompute blog trending scores
+Rebuilds every post's trending score from its stored views, likes and comments
+(e.g. after changing BLOG_TRENDING_HALF_LIFE_HOURS)
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog.trending import recompute_scores
+
+
+class Command(BaseCommand):
+    help = 'Recompute the time-decayed trending score of every blog post'
+
+    def handle(self, *args, **options):
+        self.stdout.write('📈 Recomputing trending scores...')
+        scored = recompute_scores()
+        self.stdout.write(self.style.SUCCESS(f'✅ Scored {scored} published post(s)'))
@@ -0,0 +1,36 @@
+"""
+Reconcile blog post counters
+Compares every post's like_count and approved_comment_count with the likes
+and comments they count, reports any drift and repairs it
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog.derived import counter_drift, recount
+
+
+class Command(BaseCommand):
+    help = 'Check blog post like/comment counters against their rows and fix any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted counters without fixing them',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔢 Checking blog post counters...')
+        drift = counter_drift()
+        for post_id, field, stored, actual in drift:
+            self.stdout.write(f'  Post {post_id}: {field} is {stored}, counted {actual}')
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('✅ All counters match'))
+            return
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'🔍 Dry run: {len(drift)} counter(s) would be fixed'))
+            return
+
+        recount(post_ids={post_id for post_id, *_ in drift})
+        self.stdout.write(self.style.SUCCESS(f'✅ Fixed {len(drift)} counter(s)'))
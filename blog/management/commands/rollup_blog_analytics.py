@@ -0,0 +1,46 @@
+"""
+Roll up blog analytics
+Aggregates views, likes and approved comments into the daily BlogAnalytics
+and BlogPostDailyStats rollups and refreshes post quality scores
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.rollups import pending_days, retained_days, rollup_day, update_performance
+
+
+class Command(BaseCommand):
+    help = 'Roll up daily blog analytics (pending days, or the last --days days)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Roll up the last N days again instead of only the pending ones'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the days that would be rolled up without writing anything',
+        )
+
+    def handle(self, *args, **options):
+        if options['days']:
+            today = timezone.localdate()
+            days = retained_days(today - timedelta(days=options['days'] - 1), today)
+        else:
+            days = pending_days()
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'🔍 Dry run: {len(days)} day(s) would be rolled up'))
+            for day in days:
+                self.stdout.write(f'  {day}')
+            return
+
+        for day in days:
+            rollup_day(day)
+        self.stdout.write(self.style.SUCCESS(f'✅ Rolled up {len(days)} day(s)'))
+        scored = update_performance()
+        self.stdout.write(self.style.SUCCESS(f'📈 Refreshed quality scores of {scored} posts'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='featured_image_manifest',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 5.2 on 2026-10-19 05:00
+
+import html
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+# Frozen copy of blog.search as of this migration, so later changes to the
+# application code cannot change what it does
+FTS_TABLE = 'blog_search_fts'
+_SPACE_RE = re.compile(r'\s+')
+
+COLUMNS = 'title, excerpt, body, tags, category'
+NEW_VALUES = 'new.title, new.excerpt, new.body, new.tags, new.category'
+OLD_VALUES = 'old.title, old.excerpt, old.body, old.tags, old.category'
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        {COLUMNS},
+        content='blog_blogsearchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON blog_blogsearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES});
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON blog_blogsearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES});
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON blog_blogsearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES});
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES});
+    END""",
+]
+SQLITE_REVERSE = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_FORWARD = [
+    """ALTER TABLE blog_blogsearchdocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(tags, '') || ' ' || coalesce(category, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(excerpt, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'D')
+    ) STORED""",
+    "CREATE INDEX blog_search_vector_gin ON blog_blogsearchdocument USING GIN (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS blog_search_vector_gin",
+    "ALTER TABLE blog_blogsearchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_fts_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_fts_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_REVERSE)
+
+
+def plain_text(value):
+    return _SPACE_RE.sub(' ', html.unescape(strip_tags(value or ''))).strip()
+
+
+def index_existing_posts(apps, schema_editor):
+    BlogSearchDocument = apps.get_model('blog', 'BlogSearchDocument')
+    documents = []
+    for post in apps.get_model('blog', 'BlogPost').objects.select_related('category'):
+        tags = ' '.join(post.tags.values_list('name', flat=True))
+        documents.append(BlogSearchDocument(
+            post=post,
+            title=plain_text(post.title),
+            excerpt=plain_text(post.excerpt),
+            body=plain_text(post.content),
+            tags=' '.join(part for part in (tags, post.meta_keywords or '') if part),
+            category=post.category.name if post.category_id else '',
+        ))
+    BlogSearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_image_manifest'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.TextField(blank=True)),
+                ('excerpt', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+                ('tags', models.TextField(blank=True)),
+                ('category', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='blog.blogpost')),
+            ],
+            options={
+                'verbose_name': 'Blog Search Document',
+                'verbose_name_plural': 'Blog Search Documents',
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogSearchQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255, verbose_name='Search Query')),
+                ('results_count', models.PositiveIntegerField(default=0, verbose_name='Results Count')),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True, verbose_name='IP Address')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('clicked_result', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='search_clicks', to='blog.blogpost', verbose_name='Clicked Result')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='blog_searches', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Search Query',
+                'verbose_name_plural': 'Search Queries',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['query'], name='blog_blogse_query_912c53_idx'), models.Index(fields=['created_at'], name='blog_blogse_created_4267df_idx'), models.Index(fields=['results_count'], name='blog_blogse_results_a548f0_idx')],
+            },
+        ),
+        migrations.RunPython(create_fts_index, drop_fts_index),
+        migrations.RunPython(index_existing_posts, migrations.RunPython.noop),
+    ]
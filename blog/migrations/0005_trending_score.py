@@ -0,0 +1,72 @@
+# Generated by Django 5.2 on 2026-10-19 05:10
+
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, FloatField, Value, When
+
+# Frozen copy of blog.trending.recompute_scores as of this migration, so
+# later changes to the application code cannot change what it does
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+WEIGHTS = {'view': 1.0, 'like': 5.0, 'comment': 8.0, 'publish': 10.0}
+
+
+def score_existing_posts(apps, schema_editor):
+    tau = getattr(settings, 'BLOG_TRENDING_HALF_LIFE_HOURS', 48) * 3600 / math.log(2)
+
+    def exponent(kind, at):
+        return math.log(WEIGHTS[kind]) + (at - EPOCH).total_seconds() / tau
+
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    exponents = {
+        post_id: [exponent('publish', published_at)]
+        for post_id, published_at in BlogPost.objects.filter(
+            status='PUBLISHED', published_at__isnull=False
+        ).values_list('pk', 'published_at')
+    }
+    events = {
+        'view': apps.get_model('blog', 'BlogView').objects.all(),
+        'like': apps.get_model('blog', 'BlogLike').objects.all(),
+        'comment': apps.get_model('blog', 'BlogComment').objects.filter(is_approved=True),
+    }
+    for kind, queryset in events.items():
+        for post_id, created_at in queryset.filter(post_id__in=list(exponents)).values_list('post_id', 'created_at'):
+            exponents[post_id].append(exponent(kind, created_at))
+
+    scores = []
+    for post_id, values in exponents.items():
+        top = max(values)
+        scores.append((post_id, top + math.log(sum(math.exp(value - top) for value in values))))
+    for start in range(0, len(scores), 500):
+        chunk = dict(scores[start:start + 500])
+        BlogPost.objects.filter(pk__in=list(chunk)).update(trending_score=Case(
+            *[When(pk=post_id, then=Value(score)) for post_id, score in chunk.items()],
+            output_field=FloatField()
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_related_posts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='trending_score',
+            field=models.FloatField(default=0.0, editable=False, help_text='Log-scale time-decayed engagement (see blog.trending)', verbose_name='Trending Score'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['status', '-trending_score'], name='blog_post_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['category', 'status', '-trending_score'], name='blog_post_cat_trending_idx'),
+        ),
+        migrations.RunPython(score_existing_posts, migrations.RunPython.noop),
+    ]
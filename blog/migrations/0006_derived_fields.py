@@ -0,0 +1,146 @@
+# Generated by Django 5.2 on 2026-10-19 05:18
+
+import re
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.template.defaultfilters import truncatewords
+
+# Frozen copy of blog.derived as of this migration, so later changes to the
+# application code cannot change what it does
+WORDS_PER_MINUTE = 200
+_HEADING_RE = re.compile(r'^\s*(#{1,6})\s+(.+?)\s*$', re.MULTILINE)
+_SLUG_STRIP_RE = re.compile(r'[^a-zA-Z0-9\s]')
+
+
+def table_of_contents(content):
+    headings = []
+    for match in _HEADING_RE.finditer(content or ''):
+        title = match.group(2)
+        slug = _SLUG_STRIP_RE.sub('', title).replace(' ', '-').lower()
+        headings.append({"level": len(match.group(1)), "title": title, "slug": slug, "url": f"#{slug}"})
+    return headings
+
+
+def structured_data(post, tag_names, section):
+    path = f'/blog/{post.slug}/'
+    return {
+        "@context": "https://schema.org",
+        "@type": "BlogPosting",
+        "headline": post.title,
+        "description": post.excerpt or truncatewords(post.content, 30),
+        "image": None,
+        "author": None,
+        "publisher": {
+            "@type": "Organization",
+            "name": "OkPuja",
+            "logo": {
+                "@type": "ImageObject",
+                "url": "/static/images/okpuja-logo.png"
+            }
+        },
+        "datePublished": None,
+        "dateModified": None,
+        "url": path,
+        "mainEntityOfPage": {
+            "@type": "WebPage",
+            "@id": path
+        },
+        "keywords": post.meta_keywords or ', '.join(tag_names),
+        "wordCount": post.word_count,
+        "timeRequired": f"PT{post.reading_time}M",
+        "articleSection": section,
+        "inLanguage": "en-US"
+    }
+
+
+def open_graph_data(post, tag_names, section):
+    return {
+        "og:type": "article",
+        "og:title": post.meta_title or post.title,
+        "og:description": post.meta_description or post.excerpt or truncatewords(post.content, 30),
+        "og:image": None,
+        "og:url": f'/blog/{post.slug}/',
+        "og:site_name": "OkPuja - Hindu Spiritual Services",
+        "article:author": None,
+        "article:published_time": None,
+        "article:modified_time": None,
+        "article:section": section,
+        "article:tag": ', '.join(tag_names)
+    }
+
+
+def derive_existing_posts(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    tag_names = {}
+    for post_id, name in BlogPost.tags.through.objects.filter(
+        blogtag__status='PUBLISHED'
+    ).order_by('blogtag__name').values_list('blogpost_id', 'blogtag__name'):
+        tag_names.setdefault(post_id, []).append(name)
+
+    posts = list(BlogPost.objects.select_related('category'))
+    for post in posts:
+        post.tag_names = tag_names.get(post.pk, [])
+        post.word_count = len((post.content or '').split())
+        post.reading_time = max(1, round(post.word_count / WORDS_PER_MINUTE))
+        post.table_of_contents = table_of_contents(post.content)
+        section = post.category.name if post.category_id else "Spirituality"
+        post.structured_data = structured_data(post, post.tag_names, section)
+        post.open_graph_data = open_graph_data(post, post.tag_names, section)
+    BlogPost.objects.bulk_update(posts, [
+        'word_count', 'reading_time', 'table_of_contents', 'structured_data', 'open_graph_data', 'tag_names'
+    ], batch_size=200)
+
+    approved = apps.get_model('blog', 'BlogComment').objects.filter(
+        post=OuterRef('pk'), is_approved=True
+    ).order_by().values('post').annotate(n=Count('pk')).values('n')
+    BlogPost.objects.update(approved_comment_count=Coalesce(
+        Subquery(approved, output_field=IntegerField()), Value(0)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='approved_comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Approved Comments'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='open_graph_data',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, help_text='Minutes', verbose_name='Reading Time'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='structured_data',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='table_of_contents',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='tag_names',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Names of the published tags'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Word Count'),
+        ),
+        migrations.RunPython(derive_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-19 05:23
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_existing_likes(apps, schema_editor):
+    likes = apps.get_model('blog', 'BlogLike').objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(n=Count('pk')).values('n')
+    apps.get_model('blog', 'BlogPost').objects.update(like_count=Coalesce(
+        Subquery(likes, output_field=IntegerField()), Value(0)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_derived_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Like Count'),
+        ),
+        migrations.RunPython(count_existing_likes, migrations.RunPython.noop),
+    ]
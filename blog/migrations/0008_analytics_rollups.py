@@ -0,0 +1,81 @@
+# Generated by Django 5.2 on 2026-10-19 05:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_like_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogAnalytics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Analytics Date')),
+                ('total_views', models.PositiveIntegerField(default=0, verbose_name='Total Views')),
+                ('unique_visitors', models.PositiveIntegerField(default=0, verbose_name='Unique Visitors')),
+                ('total_likes', models.PositiveIntegerField(default=0, verbose_name='Total Likes')),
+                ('total_comments', models.PositiveIntegerField(default=0, verbose_name='Total Comments')),
+                ('bounce_rate', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Bounce Rate %')),
+                ('avg_time_on_page', models.DurationField(blank=True, null=True, verbose_name='Average Time on Page')),
+                ('direct_traffic', models.PositiveIntegerField(default=0, verbose_name='Direct Traffic')),
+                ('search_traffic', models.PositiveIntegerField(default=0, verbose_name='Search Traffic')),
+                ('social_traffic', models.PositiveIntegerField(default=0, verbose_name='Social Traffic')),
+                ('referral_traffic', models.PositiveIntegerField(default=0, verbose_name='Referral Traffic')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Blog Analytics',
+                'verbose_name_plural': 'Blog Analytics',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='blog_blogan_date_1f10ca_idx'), models.Index(fields=['total_views'], name='blog_blogan_total_v_79a9e3_idx')],
+                'unique_together': {('date',)},
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogPostPerformance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('avg_reading_time', models.DurationField(blank=True, null=True, verbose_name='Average Reading Time')),
+                ('completion_rate', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Completion Rate %')),
+                ('scroll_depth_avg', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Average Scroll Depth %')),
+                ('search_impressions', models.PositiveIntegerField(default=0, verbose_name='Search Impressions')),
+                ('search_clicks', models.PositiveIntegerField(default=0, verbose_name='Search Clicks')),
+                ('click_through_rate', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='CTR %')),
+                ('avg_position', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Average Search Position')),
+                ('social_shares', models.PositiveIntegerField(default=0, verbose_name='Social Shares')),
+                ('social_mentions', models.PositiveIntegerField(default=0, verbose_name='Social Mentions')),
+                ('quality_score', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Quality Score')),
+                ('last_updated', models.DateTimeField(auto_now=True)),
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='performance', to='blog.blogpost', verbose_name='Blog Post')),
+            ],
+            options={
+                'verbose_name': 'Post Performance',
+                'verbose_name_plural': 'Post Performance',
+                'ordering': ['-quality_score'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogPostDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Views')),
+                ('likes', models.PositiveIntegerField(default=0, verbose_name='Likes')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Comments')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='blog.blogpost', verbose_name='Post')),
+            ],
+            options={
+                'verbose_name': 'Post Daily Stats',
+                'verbose_name_plural': 'Post Daily Stats',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='blog_blogpo_date_835f4e_idx')],
+                'constraints': [models.UniqueConstraint(fields=('post', 'date'), name='unique_post_daily_stats')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 05:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blogview',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Created At'),
+        ),
+    ]
@@ -1,13 +1,19 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.text import slugify
 from django.urls import reverse
-from django.utils import timezone
 from imagekit.models import ImageSpecField
 from imagekit.processors import ResizeToFill
 import uuid
 import os
 
+from core.image_ingest import ingest_stored_image
+from core.tracking import FieldTrackerMixin
+from core.image_variants import ResponsiveImage, manifest_is_current
+
+from . import derived
+
 User = settings.AUTH_USER_MODEL
 
 def blog_image_upload_path(instance, filename):
@@ -146,7 +152,7 @@ class BlogTag(models.Model):
     def get_absolute_url(self):
         return reverse('blog:tag_detail', kwargs={'slug': self.slug})
 
-class BlogPost(models.Model):
+class BlogPost(FieldTrackerMixin, models.Model):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -192,6 +198,11 @@ class BlogPost(models.Model):
         format='JPEG',
         options={'quality': 80}
     )
+    featured_image_manifest = models.JSONField(default=dict, blank=True, editable=False)
+
+    image_ingest_variants = {
+        'featured_image': (ResponsiveImage('featured_image_manifest', 'blog'),),
+    }
     youtube_url = models.URLField(
         blank=True,
         null=True,
@@ -211,6 +222,12 @@ class BlogPost(models.Model):
         default=0,
         verbose_name='View Count'
     )
+    trending_score = models.FloatField(
+        default=0.0,
+        editable=False,
+        verbose_name='Trending Score',
+        help_text='Log-scale time-decayed engagement (see blog.trending)'
+    )
     meta_title = models.CharField(
         max_length=255,
         blank=True,
@@ -228,6 +245,24 @@ class BlogPost(models.Model):
         null=True,
         verbose_name='Meta Description'
     )
+    # Derived on save (see blog.derived) so listings do not recompute them per row
+    word_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Word Count')
+    reading_time = models.PositiveSmallIntegerField(
+        default=1,
+        editable=False,
+        verbose_name='Reading Time',
+        help_text='Minutes'
+    )
+    table_of_contents = models.JSONField(default=list, blank=True, editable=False)
+    tag_names = models.JSONField(default=list, blank=True, editable=False, help_text='Names of the published tags')
+    structured_data = models.JSONField(default=dict, blank=True, editable=False)
+    open_graph_data = models.JSONField(default=dict, blank=True, editable=False)
+    like_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Like Count')
+    approved_comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Approved Comments'
+    )
     tags = models.ManyToManyField(
         BlogTag,
         related_name='posts',
@@ -258,29 +293,62 @@ class BlogPost(models.Model):
             models.Index(fields=['is_featured']),
             models.Index(fields=['published_at']),
             models.Index(fields=['view_count']),
+            models.Index(fields=['status', '-trending_score'], name='blog_post_trending_idx'),
+            models.Index(fields=['category', 'status', '-trending_score'], name='blog_post_cat_trending_idx'),
         ]
 
+    # published_at is stamped by blog.signals.update_published_at; the
+    # other fields feed the search document (blog.search.INDEXED_FIELDS)
+    # and the derived fields (blog.derived.SOURCE_FIELDS)
+    tracked_fields = (
+        'status', 'title', 'slug', 'excerpt', 'content', 'meta_title', 'meta_description', 'meta_keywords',
+        'category_id'
+    )
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
-        
-        # Set published_at when status changes to PUBLISHED
-        if self.status == PublicationStatus.PUBLISHED and not self.published_at:
-            self.published_at = timezone.now()
-        
+
+        update_fields = kwargs.get('update_fields')
+        sources = derived.SOURCE_FIELDS if update_fields is None else [
+            name for name in derived.SOURCE_FIELDS
+            if name in update_fields or name.removesuffix('_id') in update_fields
+        ]
+        if any(self.has_changed(name) for name in sources):
+            derived.apply(self)
+            if update_fields is not None:
+                update_fields = kwargs['update_fields'] = set(update_fields) | set(derived.DERIVED_FIELDS)
+        publishing = self.is_being_published()
+        if update_fields is None and not self._state.adding:
+            # Counters move with F() updates; writing back the loaded copies would undo concurrent ones
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and (
+                    field.name not in derived.COUNTER_FIELDS or (publishing and field.name == 'trending_score')
+                )
+            ]
+        elif publishing and update_fields is not None:
+            # The publication date and head start are set in pre_save (blog.signals)
+            kwargs['update_fields'] = set(update_fields) | {'published_at', 'trending_score'}
+
         super().save(*args, **kwargs)
 
+        update_fields = kwargs.get('update_fields')
+        if self.featured_image and (update_fields is None or 'featured_image' in update_fields):
+            if not manifest_is_current(self.featured_image_manifest, self.featured_image.name):
+                ingest_stored_image(self, 'featured_image', self.featured_image.name)
+
+    def is_being_published(self):
+        """Whether this save publishes the post"""
+        return self.status == 'PUBLISHED' and self.has_changed('status')
+
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'slug': self.slug})
 
-    def increment_view_count(self):
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
-
-class BlogComment(models.Model):
+class BlogComment(FieldTrackerMixin, models.Model):
     post = models.ForeignKey(
         BlogPost,
         on_delete=models.CASCADE,
@@ -327,6 +395,9 @@ class BlogComment(models.Model):
             models.Index(fields=['is_approved']),
         ]
 
+    # Approval counts towards the post's trending score (blog.signals)
+    tracked_fields = ('is_approved',)
+
     def __str__(self):
         return f"Comment by {self.user.email} on {self.post.title}"
 
@@ -388,8 +459,10 @@ class BlogView(models.Model):
         blank=True,
         verbose_name='User Agent'
     )
+    # Not auto_now_add: buffered views are stamped with the time they were recorded (blog.view_buffer)
     created_at = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         verbose_name='Created At'
     )
 
@@ -405,4 +478,228 @@ class BlogView(models.Model):
 
     def __str__(self):
         viewer = self.user.email if self.user else self.ip_address
-        return f"View by {viewer} on {self.post.title}"
\ No newline at end of file
+        return f"View by {viewer} on {self.post.title}"
+
+class BlogSearchDocument(models.Model):
+    """Plain-text search fields of one post, indexed by blog.search"""
+    post = models.OneToOneField(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='search_document'
+    )
+    title = models.TextField(blank=True)
+    excerpt = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    tags = models.TextField(blank=True)
+    category = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Blog Search Document'
+        verbose_name_plural = 'Blog Search Documents'
+
+    def __str__(self):
+        return self.title
+
+class BlogRelatedPost(models.Model):
+    """One precomputed neighbour of a post, best first by ``rank`` (see blog.related)"""
+    post = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='related_links'
+    )
+    related = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='related_from'
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Related Post'
+        verbose_name_plural = 'Related Posts'
+        ordering = ['post', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'related'], name='unique_related_post'),
+        ]
+        indexes = [
+            models.Index(fields=['post', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} -> {self.related_id} ({self.score:.3f})"
+
+class BlogSearchQuery(models.Model):
+    """Track internal blog search queries (logged in batches by blog.search)"""
+    query = models.CharField(max_length=255, verbose_name='Search Query')
+    results_count = models.PositiveIntegerField(default=0, verbose_name='Results Count')
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='blog_searches',
+        verbose_name='User'
+    )
+    ip_address = models.GenericIPAddressField(
+        verbose_name='IP Address',
+        null=True,
+        blank=True,
+        protocol='both',
+        unpack_ipv4=False
+    )
+    clicked_result = models.ForeignKey(
+        BlogPost,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='search_clicks',
+        verbose_name='Clicked Result'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Search Query'
+        verbose_name_plural = 'Search Queries'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['query']),
+            models.Index(fields=['created_at']),
+            models.Index(fields=['results_count']),
+        ]
+    
+    def __str__(self):
+        return f"Search: {self.query} ({self.results_count} results)"
+
+class BlogAnalytics(models.Model):
+    """Daily blog totals, rolled up from the raw rows by blog.rollups"""
+    date = models.DateField(verbose_name='Analytics Date')
+    total_views = models.PositiveIntegerField(default=0, verbose_name='Total Views')
+    unique_visitors = models.PositiveIntegerField(default=0, verbose_name='Unique Visitors')
+    total_likes = models.PositiveIntegerField(default=0, verbose_name='Total Likes')
+    total_comments = models.PositiveIntegerField(default=0, verbose_name='Total Comments')
+    bounce_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Bounce Rate %')
+    avg_time_on_page = models.DurationField(null=True, blank=True, verbose_name='Average Time on Page')
+    
+    # Traffic sources
+    direct_traffic = models.PositiveIntegerField(default=0, verbose_name='Direct Traffic')
+    search_traffic = models.PositiveIntegerField(default=0, verbose_name='Search Traffic')
+    social_traffic = models.PositiveIntegerField(default=0, verbose_name='Social Traffic')
+    referral_traffic = models.PositiveIntegerField(default=0, verbose_name='Referral Traffic')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Blog Analytics'
+        verbose_name_plural = 'Blog Analytics'
+        unique_together = ('date',)
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['total_views']),
+        ]
+    
+    def __str__(self):
+        return f"Analytics for {self.date}"
+
+class BlogPostDailyStats(models.Model):
+    """Views, likes and approved comments of one post on one day (blog.rollups)"""
+    post = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='daily_stats',
+        verbose_name='Post'
+    )
+    date = models.DateField(verbose_name='Date')
+    views = models.PositiveIntegerField(default=0, verbose_name='Views')
+    likes = models.PositiveIntegerField(default=0, verbose_name='Likes')
+    comments = models.PositiveIntegerField(default=0, verbose_name='Comments')
+
+    class Meta:
+        verbose_name = 'Post Daily Stats'
+        verbose_name_plural = 'Post Daily Stats'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'date'], name='unique_post_daily_stats'),
+        ]
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} on {self.date}: {self.views} views"
+
+class BlogPostPerformance(models.Model):
+    """Track individual post performance metrics (quality score refreshed nightly by blog.rollups)"""
+    post = models.OneToOneField(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='performance',
+        verbose_name='Blog Post'
+    )
+    
+    # Engagement metrics
+    avg_reading_time = models.DurationField(null=True, blank=True, verbose_name='Average Reading Time')
+    completion_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Completion Rate %')
+    scroll_depth_avg = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Average Scroll Depth %')
+    
+    # SEO metrics
+    search_impressions = models.PositiveIntegerField(default=0, verbose_name='Search Impressions')
+    search_clicks = models.PositiveIntegerField(default=0, verbose_name='Search Clicks')
+    click_through_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='CTR %')
+    avg_position = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Average Search Position')
+    
+    # Social metrics
+    social_shares = models.PositiveIntegerField(default=0, verbose_name='Social Shares')
+    social_mentions = models.PositiveIntegerField(default=0, verbose_name='Social Mentions')
+    
+    # Quality score (calculated)
+    quality_score = models.DecimalField(max_digits=5, decimal_places=2, default=0, verbose_name='Quality Score')
+    
+    last_updated = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Post Performance'
+        verbose_name_plural = 'Post Performance'
+        ordering = ['-quality_score']
+    
+    def __str__(self):
+        return f"Performance for {self.post.title}"
+    
+    def calculate_quality_score(self):
+        """Calculate quality score based on various metrics"""
+        score = 0
+        
+        # Engagement factor (40% of score)
+        if self.post.view_count > 0:
+            like_ratio = (self.post.like_count / self.post.view_count) * 100
+            comment_ratio = (self.post.approved_comment_count / self.post.view_count) * 100
+            engagement_score = min(40, (like_ratio + comment_ratio) * 2)
+            score += engagement_score
+        
+        # SEO factor (30% of score)
+        if self.search_impressions > 0:
+            ctr_score = min(30, self.click_through_rate * 3)
+            score += ctr_score
+        
+        # Content quality factor (20% of score)
+        content_score = 0
+        if self.post.meta_title:
+            content_score += 5
+        if self.post.meta_description:
+            content_score += 5
+        if self.post.featured_image:
+            content_score += 5
+        if len(self.post.content) > 300:
+            content_score += 5
+        score += content_score
+        
+        # Social factor (10% of score)
+        social_score = min(10, self.social_shares * 0.5)
+        score += social_score
+        
+        self.quality_score = round(score, 2)
+        return self.quality_score
@@ -0,0 +1,156 @@
+"""
+Related posts from TF-IDF similarity.
+
+Every published post is turned into a sparse TF-IDF vector over its tags,
+category, title and body terms (read from the BlogSearchDocument rows of
+blog.search). The ``DEFAULT_NEIGHBOURS`` most cosine-similar posts are
+stored in BlogRelatedPost, so the related-posts endpoints are a single
+indexed read.
+
+``rebuild_related_posts()`` recomputes every list (nightly task and
+``manage.py rebuild_related_posts``). ``update_related_posts(post_id)``
+runs when a post is published, edited or retagged: it recomputes the
+lists of that post and of every post it is (or was) similar to.
+
+Vectors are plain dicts; a blog-sized corpus does not need NumPy.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+DEFAULT_NEIGHBOURS = 8
+# Terms kept per post vector: bounds the cost of the similarity pass
+MAX_TERMS = 80
+MIN_SCORE = 0.02
+FIELD_WEIGHTS = {'tag': 3.0, 'category': 2.0, 'title': 2.0, 'body': 1.0}
+
+_WORD_RE = re.compile(r'[^\W\d_]{3,}', re.UNICODE)
+STOP_WORDS = frozenset("""
+    about after also and are been before being but can did does for from had has have her his how into its just
+    more most not now off only our out over own same she should some such than that the their them then there
+    these they this those through too under until very was were what when where which while who why will with
+    would you your yours
+""".split())
+
+
+def _words(text):
+    return [word for word in (w.lower() for w in _WORD_RE.findall(text or '')) if word not in STOP_WORDS]
+
+
+def document_terms(title, body, tags, category):
+    """Weighted term frequencies of one post; tags and category are whole-phrase terms"""
+    terms = Counter()
+    for word in _words(title):
+        terms[f'w:{word}'] += FIELD_WEIGHTS['title']
+    for word in _words(body):
+        terms[f'w:{word}'] += FIELD_WEIGHTS['body']
+    for tag in tags or ():
+        terms[f'tag:{tag.lower()}'] += FIELD_WEIGHTS['tag']
+    if category:
+        terms[f'cat:{category.lower()}'] += FIELD_WEIGHTS['category']
+    return terms
+
+
+def tfidf_vectors(documents):
+    """{post_id: {term: weight}} L2-normalised, from {post_id: weighted term counts}"""
+    total = len(documents)
+    document_frequency = Counter(term for terms in documents.values() for term in terms)
+    vectors = {}
+    for post_id, terms in documents.items():
+        weights = {
+            term: (1 + math.log(count)) * (math.log((1 + total) / (1 + document_frequency[term])) + 1)
+            for term, count in terms.items() if count > 0
+        }
+        top = sorted(weights.items(), key=lambda item: item[1], reverse=True)[:MAX_TERMS]
+        norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1.0
+        vectors[post_id] = {term: weight / norm for term, weight in top}
+    return vectors
+
+
+def inverted_index(vectors):
+    postings = defaultdict(list)
+    for post_id, vector in vectors.items():
+        for term, weight in vector.items():
+            postings[term].append((post_id, weight))
+    return postings
+
+
+def similarities(post_id, vectors, postings):
+    """{other post id: cosine similarity} for posts sharing at least one term"""
+    scores = defaultdict(float)
+    for term, weight in vectors.get(post_id, {}).items():
+        for other, other_weight in postings[term]:
+            if other != post_id:
+                scores[other] += weight * other_weight
+    return scores
+
+
+def nearest(post_id, vectors, postings, k=DEFAULT_NEIGHBOURS):
+    scores = similarities(post_id, vectors, postings)
+    ranked = sorted(
+        ((other, score) for other, score in scores.items() if score >= MIN_SCORE),
+        key=lambda item: (-item[1], item[0])
+    )
+    return ranked[:k]
+
+
+def published_vectors():
+    """TF-IDF vectors of every published post, from the search documents"""
+    from .models import BlogPost, BlogSearchDocument
+
+    documents = BlogSearchDocument.objects.filter(post__status='PUBLISHED').values_list(
+        'post_id', 'title', 'body', 'category'
+    )
+    tags = defaultdict(list)
+    for post_id, name in BlogPost.tags.through.objects.filter(blogpost__status='PUBLISHED').values_list(
+        'blogpost_id', 'blogtag__name'
+    ):
+        tags[post_id].append(name)
+    return tfidf_vectors({
+        post_id: document_terms(title, body, tags[post_id], category)
+        for post_id, title, body, category in documents
+    })
+
+
+def _store(post_ids, vectors, postings, k):
+    from .models import BlogRelatedPost
+
+    rows = [
+        BlogRelatedPost(post_id=post_id, related_id=other, score=score, rank=rank)
+        for post_id in post_ids if post_id in vectors
+        for rank, (other, score) in enumerate(nearest(post_id, vectors, postings, k), start=1)
+    ]
+    with transaction.atomic():
+        BlogRelatedPost.objects.filter(post_id__in=list(post_ids)).delete()
+        BlogRelatedPost.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def rebuild_related_posts(k=DEFAULT_NEIGHBOURS):
+    """Recompute the related posts of every published post; returns the rows stored"""
+    from .models import BlogRelatedPost
+
+    vectors = published_vectors()
+    postings = inverted_index(vectors)
+    with transaction.atomic():
+        # Unpublished posts keep no list
+        BlogRelatedPost.objects.exclude(post_id__in=list(vectors)).delete()
+        return _store(list(vectors), vectors, postings, k)
+
+
+def update_related_posts(post_id, k=DEFAULT_NEIGHBOURS):
+    """
+    Refresh the lists touched by one post: its own and those of every post
+    similar to it now or listing it before (e.g. when it is unpublished).
+    """
+    from .models import BlogRelatedPost
+
+    vectors = published_vectors()
+    postings = inverted_index(vectors)
+    affected = set(similarities(post_id, vectors, postings))
+    affected |= set(BlogRelatedPost.objects.filter(related_id=post_id).values_list('post_id', flat=True))
+    affected.add(post_id)
+    # Posts that are no longer published lose their list in _store()
+    return _store(affected, vectors, postings, k)
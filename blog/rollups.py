@@ -0,0 +1,177 @@
+"""
+Daily blog analytics rollups.
+
+BlogView, BlogLike and approved BlogComment rows are aggregated per post
+and day into BlogPostDailyStats, and per day into BlogAnalytics together
+with that day's unique visitors (core.visitors sketches). The analytics
+endpoint and ``manage.py blog_seo_report`` read only these tables, so
+their cost follows the number of posts and days, not the traffic, and the
+raw view rows can be aged out after ``VIEW_ROW_RETENTION_DAYS``
+(core.visitors.prune_view_rows).
+
+``rollup_pending()`` (``blog.tasks.rollup_blog_analytics``, hourly) rolls
+up every day from the one before the last rolled up through today: today
+fills in incrementally, and the previous day is rolled up again so views
+of its last buffered bucket, flushed after midnight, still count.
+Rolling up a day replaces its rows, so runs can repeat or overlap. Days
+are local dates (TIME_ZONE); days whose view rows may already be pruned
+are never rolled up again. The nightly run (``manage.py
+rollup_blog_analytics``, ``blog.tasks.rollup_blog_analytics_nightly`` at
+00:30) also refreshes BlogPostPerformance.quality_score.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, IntegerField, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.visitors import DEFAULT_RETENTION_DAYS, total_unique_visitors
+
+# BlogPostDailyStats field: (model counted, filter)
+METRICS = {
+    'views': ('BlogView', {}),
+    'likes': ('BlogLike', {}),
+    'comments': ('BlogComment', {'is_approved': True}),
+}
+# BlogAnalytics column holding the daily total of each metric
+TOTALS = {'views': 'total_views', 'likes': 'total_likes', 'comments': 'total_comments'}
+
+
+def _model(name):
+    from django.apps import apps
+
+    return apps.get_model('blog', name)
+
+
+def day_bounds(day):
+    """[start, end) of a local date as aware datetimes"""
+    return (
+        timezone.make_aware(datetime.combine(day, time.min)),
+        timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min)),
+    )
+
+
+def first_retained_day(now=None):
+    """First day whose raw view rows are all still stored"""
+    days = getattr(settings, 'VIEW_ROW_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    return timezone.localdate(now) - timedelta(days=days - 1)
+
+
+def _per_post(metric, start, end):
+    model_name, filters = METRICS[metric]
+    return dict(
+        _model(model_name).objects.filter(created_at__gte=start, created_at__lt=end, **filters)
+        .order_by().values('post').annotate(n=Count('pk')).values_list('post', 'n')
+    )
+
+
+def rollup_day(day):
+    """Replace the rollups of ``day``; returns the number of posts with activity"""
+    BlogPost = _model('BlogPost')
+    BlogPostDailyStats = _model('BlogPostDailyStats')
+    start, end = day_bounds(day)
+    counts = {metric: _per_post(metric, start, end) for metric in METRICS}
+    active = set().union(*counts.values())
+    # A post deleted since its rows were counted takes them with it
+    active = set(BlogPost.objects.filter(pk__in=active).values_list('pk', flat=True)) if active else active
+    rows = [
+        BlogPostDailyStats(post_id=post_id, date=day, **{metric: counts[metric].get(post_id, 0) for metric in METRICS})
+        for post_id in active
+    ]
+    with transaction.atomic():
+        BlogPostDailyStats.objects.filter(date=day).delete()
+        BlogPostDailyStats.objects.bulk_create(rows, batch_size=500)
+        _model('BlogAnalytics').objects.update_or_create(date=day, defaults={
+            **{TOTALS[metric]: sum(getattr(row, metric) for row in rows) for metric in METRICS},
+            'unique_visitors': total_unique_visitors(BlogPost, start=day, end=day),
+        })
+    return len(rows)
+
+
+def pending_days(now=None):
+    """Days ``rollup_pending`` would roll up, oldest first"""
+    today = timezone.localdate(now)
+    start = _model('BlogAnalytics').objects.aggregate(last=Max('date'))['last']
+    if start is not None:
+        # The day before the last rolled up one may have had views flushed since
+        start -= timedelta(days=1)
+    else:
+        # Nothing rolled up yet: start from the oldest stored activity
+        oldest = [
+            _model(model_name).objects.aggregate(oldest=Min('created_at'))['oldest']
+            for model_name, _ in METRICS.values()
+        ]
+        oldest = [timezone.localdate(value) for value in oldest if value is not None]
+        start = min(oldest, default=today)
+    start = max(start, first_retained_day(now))
+    return [start + timedelta(days=n) for n in range((today - start).days + 1)]
+
+
+def rollup_pending(now=None):
+    """Roll up every day from the one before the last rolled up through today; returns the days rolled up"""
+    days = pending_days(now)
+    for day in days:
+        rollup_day(day)
+    return days
+
+
+def retained_days(start, end, now=None):
+    """Days in [start, end] (up to today) that still have their view rows"""
+    start = max(start, first_retained_day(now))
+    end = min(end, timezone.localdate(now))
+    return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+def update_performance(batch_size=500):
+    """Create missing BlogPostPerformance rows and refresh every quality score; returns the rows scored"""
+    BlogPostPerformance = _model('BlogPostPerformance')
+    missing = _model('BlogPost').objects.filter(status='PUBLISHED', performance__isnull=True).values_list('pk', flat=True)
+    BlogPostPerformance.objects.bulk_create(
+        [BlogPostPerformance(post_id=post_id) for post_id in missing], batch_size=batch_size, ignore_conflicts=True
+    )
+    now = timezone.now()
+    rows = list(BlogPostPerformance.objects.select_related('post'))
+    for row in rows:
+        row.calculate_quality_score()
+        row.last_updated = now
+    BlogPostPerformance.objects.bulk_update(rows, ['quality_score', 'last_updated'], batch_size=batch_size)
+    return len(rows)
+
+
+# Readers ---------------------------------------------------------------------
+
+def totals(since):
+    """{'views', 'likes', 'comments'} summed over the days from ``since``"""
+    return _model('BlogAnalytics').objects.filter(date__gte=since).aggregate(
+        **{metric: Coalesce(Sum(column), Value(0), output_field=IntegerField()) for metric, column in TOTALS.items()}
+    )
+
+
+def views_by_post(post_ids, since):
+    """{post_id: views} over the days from ``since``"""
+    return dict(
+        _model('BlogPostDailyStats').objects.filter(post_id__in=list(post_ids), date__gte=since)
+        .order_by().values('post').annotate(n=Sum('views')).values_list('post', 'n')
+    )
+
+
+def with_recent_views(posts, since):
+    """Annotate a BlogPost queryset with ``recent_views`` from the rollups"""
+    return posts.annotate(
+        recent_views=Coalesce(
+            Sum('daily_stats__views', filter=Q(daily_stats__date__gte=since)), Value(0), output_field=IntegerField()
+        )
+    )
+
+
+def categories_with_views(categories, since):
+    """Annotate a BlogCategory queryset with ``post_count`` and ``total_views`` from the rollups"""
+    return categories.annotate(
+        post_count=Count('posts', filter=Q(posts__status='PUBLISHED'), distinct=True),
+        total_views=Coalesce(
+            Sum('posts__daily_stats__views', filter=Q(posts__daily_stats__date__gte=since)), Value(0),
+            output_field=IntegerField()
+        )
+    )
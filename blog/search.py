@@ -0,0 +1,238 @@
+"""
+Full-text search over blog posts.
+
+Each post has a BlogSearchDocument row with its title, excerpt, body
+(HTML stripped), tags plus meta keywords, and category as plain text. The
+index is backend specific, like puja.search:
+
+* SQLite: an FTS5 external-content table (``blog_search_fts``) kept in sync
+  with the documents by triggers, ranked with bm25() and highlighted with
+  snippet().
+* PostgreSQL: a generated, weighted tsvector column with a GIN index,
+  ranked with ts_rank_cd() and highlighted with ts_headline().
+
+Any other database falls back to ``icontains`` matching. Every query term
+is prefix matched, so results update while the user is still typing.
+
+Searches are logged to BlogSearchQuery through a cache buffer
+(core.write_buffer) and written in batches by
+``blog.tasks.flush_search_log``, never on the request path.
+"""
+import html
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.html import strip_tags
+
+from core.write_buffer import CacheBuffer, buffering_enabled
+
+FTS_TABLE = 'blog_search_fts'
+# bm25() column weights: title, excerpt, body, tags, category
+COLUMN_WEIGHTS = (10.0, 4.0, 1.0, 6.0, 3.0)
+MAX_RESULTS = 200
+SNIPPET_WORDS = 24
+DEFAULT_LOG_BUCKET_SECONDS = 60
+# BlogPost fields the search document is built from (tracked on the model)
+INDEXED_FIELDS = ('title', 'excerpt', 'content', 'meta_keywords', 'category_id')
+
+# Highlight markers; the snippet is HTML-escaped before they become <mark>
+MARK_START, MARK_END = '\x02', '\x03'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_SPACE_RE = re.compile(r'\s+')
+
+search_log = CacheBuffer(
+    'blog_search_log', lambda: getattr(settings, 'BLOG_SEARCH_LOG_BUCKET_SECONDS', DEFAULT_LOG_BUCKET_SECONDS)
+)
+
+
+def plain_text(value):
+    return _SPACE_RE.sub(' ', html.unescape(strip_tags(value or ''))).strip()
+
+
+def tokenize(query):
+    return list(dict.fromkeys(token.lower() for token in _TOKEN_RE.findall(query or '')))
+
+
+def _fts5_match(tokens):
+    return ' AND '.join(f'"{token}"*' for token in tokens)
+
+
+def _tsquery(tokens):
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def render_snippet(text):
+    """Escape a marked snippet and turn the markers into <mark> tags"""
+    escaped = html.escape(text or '')
+    return escaped.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def fts_available():
+    return connection.vendor in ('sqlite', 'postgresql') and _index_exists()
+
+
+def _index_exists():
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            return cursor.fetchone() is not None
+        cursor.execute(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = 'blog_blogsearchdocument' "
+            "AND column_name = 'search_vector'"
+        )
+        return cursor.fetchone() is not None
+
+
+def search_posts(query, limit=MAX_RESULTS, published_only=True):
+    """
+    Return [(post_id, snippet_html)] best match first. Snippets are
+    HTML-escaped with the matched terms wrapped in <mark>.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    status_filter = "AND p.status = 'PUBLISHED' " if published_only else ''
+
+    if fts_available():
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    f"SELECT d.post_id, snippet({FTS_TABLE}, -1, %s, %s, '…', %s) "
+                    f"FROM {FTS_TABLE} "
+                    f"JOIN blog_blogsearchdocument d ON d.id = {FTS_TABLE}.rowid "
+                    f"JOIN blog_blogpost p ON p.id = d.post_id "
+                    f"WHERE {FTS_TABLE} MATCH %s {status_filter}"
+                    f"ORDER BY bm25({FTS_TABLE}, %s, %s, %s, %s, %s) LIMIT %s",
+                    [MARK_START, MARK_END, SNIPPET_WORDS, _fts5_match(tokens), *COLUMN_WEIGHTS, limit]
+                )
+            else:
+                cursor.execute(
+                    "SELECT d.post_id, ts_headline('simple', d.excerpt || ' ' || d.body, q, %s) "
+                    "FROM blog_blogsearchdocument d JOIN blog_blogpost p ON p.id = d.post_id, "
+                    "to_tsquery('simple', %s) q "
+                    f"WHERE d.search_vector @@ q {status_filter}"
+                    "ORDER BY ts_rank_cd(d.search_vector, q) DESC LIMIT %s",
+                    [
+                        f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={SNIPPET_WORDS}, MinWords=8',
+                        _tsquery(tokens), limit
+                    ]
+                )
+            return [(post_id, render_snippet(snippet)) for post_id, snippet in cursor.fetchall()]
+
+    # Fallback: substring match on the documents, title matches first
+    from django.db.models import Q
+    from .models import BlogSearchDocument
+
+    condition = Q()
+    for token in tokens:
+        condition &= (
+            Q(title__icontains=token) | Q(excerpt__icontains=token) | Q(body__icontains=token) |
+            Q(tags__icontains=token) | Q(category__icontains=token)
+        )
+    documents = BlogSearchDocument.objects.filter(condition)
+    if published_only:
+        documents = documents.filter(post__status='PUBLISHED')
+    rows = documents.values_list('post_id', 'title', 'body')[:limit]
+    ranked = sorted(rows, key=lambda row: 0 if any(token in row[1].lower() for token in tokens) else 1)
+    return [(post_id, render_snippet(_fallback_snippet(body, tokens))) for post_id, _title, body in ranked]
+
+
+def _fallback_snippet(text, tokens, width=160):
+    lowered = text.lower()
+    positions = [lowered.find(token) for token in tokens if token in lowered]
+    start = max(min(positions) - width // 4, 0) if positions else 0
+    snippet = text[start:start + width]
+    pattern = re.compile('|'.join(re.escape(token) for token in tokens), re.IGNORECASE)
+    snippet = pattern.sub(lambda match: f'{MARK_START}{match.group(0)}{MARK_END}', snippet)
+    return ('…' if start else '') + snippet + ('…' if start + width < len(text) else '')
+
+
+def ranked_post_ids(query, published_only=True):
+    return [post_id for post_id, _snippet in search_posts(query, published_only=published_only)]
+
+
+# Query log ------------------------------------------------------------------
+
+def log_search(query, results_count, user_id=None, ip_address=None, now=None):
+    """Buffer one search for BlogSearchQuery; costs a cache write, not a DB write"""
+    query = (query or '').strip()
+    if not query:
+        return
+    entry = (query[:255], results_count, user_id, ip_address)
+    if buffering_enabled():
+        search_log.append(entry, now)
+    else:
+        # No shared cache: the flusher would never see this process's buffer
+        _write_search_log([entry])
+
+
+def _write_search_log(entries, batch_size=500):
+    from .models import BlogSearchQuery
+
+    with transaction.atomic():
+        BlogSearchQuery.objects.bulk_create(
+            [
+                BlogSearchQuery(query=query, results_count=results_count, user_id=user_id, ip_address=ip_address)
+                for query, results_count, user_id, ip_address in entries
+            ],
+            batch_size=batch_size
+        )
+
+
+def flush_search_log(now=None, include_current=False, batch_size=500):
+    """Bulk-insert the buffered searches of closed buckets; returns the number written"""
+    with search_log.lock() as acquired:
+        if not acquired:
+            return 0
+        buckets = search_log.buckets(now, include_current)
+        entries = [entry for bucket in buckets for entry in search_log.read(bucket)]
+        _write_search_log(entries, batch_size)
+        # Only once the rows are stored: a failed insert leaves the buckets for the next run
+        search_log.discard(buckets)
+    return len(entries)
+
+
+# Index maintenance ---------------------------------------------------------
+
+def _post_document(post):
+    tags = ' '.join(post.tags.values_list('name', flat=True))
+    return {
+        'title': plain_text(post.title),
+        'excerpt': plain_text(post.excerpt),
+        'body': plain_text(post.content),
+        'tags': ' '.join(part for part in (tags, post.meta_keywords or '') if part),
+        'category': post.category.name if post.category_id else '',
+    }
+
+
+def _document_model(apps=None):
+    if apps is None:
+        from django.apps import apps
+    return apps.get_model('blog', 'BlogSearchDocument'), apps.get_model('blog', 'BlogPost')
+
+
+def index_post(post, apps=None):
+    BlogSearchDocument, _ = _document_model(apps)
+    BlogSearchDocument.objects.update_or_create(post_id=post.pk, defaults=_post_document(post))
+
+
+def index_posts(post_ids):
+    _, BlogPost = _document_model()
+    for post in BlogPost.objects.filter(pk__in=list(post_ids)).select_related('category'):
+        index_post(post)
+
+
+def rebuild_index(apps=None):
+    """Re-create every search document; returns the number indexed.
+
+    ``apps`` lets data migrations pass their historical app registry.
+    """
+    BlogSearchDocument, BlogPost = _document_model(apps)
+    BlogSearchDocument.objects.all().delete()
+    count = 0
+    for post in BlogPost.objects.select_related('category'):
+        index_post(post, apps=apps)
+        count += 1
+    return count
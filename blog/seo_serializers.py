@@ -1,7 +1,7 @@
 from rest_framework import serializers
-from django.template.defaultfilters import truncatewords
 from .models import BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike, BlogView
 from accounts.serializers import UserSerializer
+from . import derived
 
 class SEOBlogCategorySerializer(serializers.ModelSerializer):
     """Enhanced category serializer with SEO fields"""
@@ -40,12 +40,12 @@ class EnterpriseMinimalBlogPostSerializer(serializers.ModelSerializer):
     author_avatar = serializers.SerializerMethodField()
     category_name = serializers.CharField(source='category.name', read_only=True)
     category_slug = serializers.CharField(source='category.slug', read_only=True)
-    tag_names = serializers.SerializerMethodField()
+    tag_names = serializers.ListField(child=serializers.CharField(), read_only=True)
     featured_image_url = serializers.SerializerMethodField()
     featured_image_alt = serializers.SerializerMethodField()
-    reading_time = serializers.SerializerMethodField()
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
+    reading_time = serializers.IntegerField(read_only=True)
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(source='approved_comment_count', read_only=True)
     canonical_url = serializers.SerializerMethodField()
     
     class Meta:
@@ -63,9 +63,6 @@ class EnterpriseMinimalBlogPostSerializer(serializers.ModelSerializer):
         # Placeholder for future user avatar implementation
         return None
     
-    def get_tag_names(self, obj):
-        return [tag.name for tag in obj.tags.filter(status='PUBLISHED')]
-    
     def get_featured_image_url(self, obj):
         request = self.context.get('request')
         if obj.featured_image_thumbnail and hasattr(obj.featured_image_thumbnail, 'url'):
@@ -79,25 +76,23 @@ class EnterpriseMinimalBlogPostSerializer(serializers.ModelSerializer):
         # Generate SEO-friendly alt text
         return f"{obj.title} - {obj.category.name if obj.category else 'Blog'} | OkPuja"
     
-    def get_reading_time(self, obj):
-        """Calculate reading time based on content length"""
-        word_count = len(obj.content.split())
-        # Average reading speed: 200 words per minute
-        reading_time = max(1, round(word_count / 200))
-        return reading_time
-    
-    def get_like_count(self, obj):
-        return getattr(obj, 'like_count', obj.likes.count())
-    
-    def get_comment_count(self, obj):
-        return obj.comments.filter(is_approved=True).count()
-    
     def get_canonical_url(self, obj):
         request = self.context.get('request')
         if request:
             return request.build_absolute_uri(f'/blog/{obj.slug}/')
         return f'/blog/{obj.slug}/'
 
+class BlogSearchResultSerializer(EnterpriseMinimalBlogPostSerializer):
+    """Listing fields plus the highlighted match from blog.search"""
+    snippet = serializers.SerializerMethodField()
+    
+    class Meta(EnterpriseMinimalBlogPostSerializer.Meta):
+        fields = EnterpriseMinimalBlogPostSerializer.Meta.fields + ['snippet']
+        read_only_fields = fields
+    
+    def get_snippet(self, obj):
+        return self.context.get('search_snippets', {}).get(obj.pk, '')
+
 class EnterpriseBlogPostDetailSerializer(EnterpriseMinimalBlogPostSerializer):
     """Detailed blog post serializer with full SEO optimization"""
     content = serializers.CharField(read_only=True)
@@ -109,7 +104,7 @@ class EnterpriseBlogPostDetailSerializer(EnterpriseMinimalBlogPostSerializer):
     open_graph_data = serializers.SerializerMethodField()
     twitter_card_data = serializers.SerializerMethodField()
     breadcrumbs = serializers.SerializerMethodField()
-    table_of_contents = serializers.SerializerMethodField()
+    table_of_contents = serializers.JSONField(read_only=True)
     
     class Meta(EnterpriseMinimalBlogPostSerializer.Meta):
         fields = EnterpriseMinimalBlogPostSerializer.Meta.fields + [
@@ -119,67 +114,22 @@ class EnterpriseBlogPostDetailSerializer(EnterpriseMinimalBlogPostSerializer):
         ]
     
     def get_structured_data(self, obj):
-        """Generate JSON-LD structured data for the blog post"""
-        request = self.context.get('request')
-        base_url = request.build_absolute_uri('/') if request else 'https://www.okpuja.com/'
-        
-        return {
-            "@context": "https://schema.org",
-            "@type": "BlogPosting",
-            "headline": obj.title,
-            "description": obj.excerpt or truncatewords(obj.content, 30),
-            "image": self.get_featured_image_url(obj),
-            "author": {
-                "@type": "Person",
-                "name": obj.user.get_full_name() or obj.user.email,
-                "url": f"{base_url}author/{obj.user.id}/"
-            },
-            "publisher": {
-                "@type": "Organization",
-                "name": "OkPuja",
-                "logo": {
-                    "@type": "ImageObject",
-                    "url": f"{base_url}static/images/okpuja-logo.png"
-                }
-            },
-            "datePublished": obj.published_at.isoformat() if obj.published_at else obj.created_at.isoformat(),
-            "dateModified": obj.updated_at.isoformat(),
-            "url": self.get_canonical_url(obj),
-            "mainEntityOfPage": {
-                "@type": "WebPage",
-                "@id": self.get_canonical_url(obj)
-            },
-            "keywords": obj.meta_keywords or ', '.join(self.get_tag_names(obj)),
-            "wordCount": len(obj.content.split()),
-            "timeRequired": f"PT{self.get_reading_time(obj)}M",
-            "articleSection": obj.category.name if obj.category else "Spirituality",
-            "inLanguage": "en-US"
-        }
+        """JSON-LD structured data, stored on save (blog.derived) plus the live fields"""
+        return derived.render_structured_data(obj, self.context.get('request'), self.get_featured_image_url(obj))
     
     def get_open_graph_data(self, obj):
-        """Generate Open Graph meta tags data"""
-        return {
-            "og:type": "article",
-            "og:title": obj.meta_title or obj.title,
-            "og:description": obj.meta_description or obj.excerpt or truncatewords(obj.content, 30),
-            "og:image": self.get_featured_image_url(obj),
-            "og:url": self.get_canonical_url(obj),
-            "og:site_name": "OkPuja - Hindu Spiritual Services",
-            "article:author": obj.user.get_full_name() or obj.user.email,
-            "article:published_time": obj.published_at.isoformat() if obj.published_at else obj.created_at.isoformat(),
-            "article:modified_time": obj.updated_at.isoformat(),
-            "article:section": obj.category.name if obj.category else "Spirituality",
-            "article:tag": ', '.join(self.get_tag_names(obj))
-        }
+        """Open Graph meta tags data"""
+        return derived.render_open_graph_data(obj, self.context.get('request'), self.get_featured_image_url(obj))
     
     def get_twitter_card_data(self, obj):
         """Generate Twitter Card meta tags data"""
+        open_graph = obj.open_graph_data or {}
         return {
             "twitter:card": "summary_large_image",
             "twitter:site": "@OkPuja",
             "twitter:creator": f"@{obj.user.username}" if hasattr(obj.user, 'username') else "@OkPuja",
-            "twitter:title": obj.meta_title or obj.title,
-            "twitter:description": obj.meta_description or obj.excerpt or truncatewords(obj.content, 30),
+            "twitter:title": open_graph.get("og:title", obj.meta_title or obj.title),
+            "twitter:description": open_graph.get("og:description", obj.meta_description or obj.excerpt),
             "twitter:image": self.get_featured_image_url(obj),
             "twitter:url": self.get_canonical_url(obj)
         }
@@ -204,30 +154,6 @@ class EnterpriseBlogPostDetailSerializer(EnterpriseMinimalBlogPostSerializer):
         })
         
         return breadcrumbs
-    
-    def get_table_of_contents(self, obj):
-        """Extract table of contents from content headings"""
-        import re
-        
-        # Extract headings from markdown/HTML content
-        heading_pattern = r'^(#{1,6})\s+(.+)$'
-        headings = []
-        
-        for line in obj.content.split('\n'):
-            match = re.match(heading_pattern, line.strip())
-            if match:
-                level = len(match.group(1))
-                title = match.group(2).strip()
-                slug = re.sub(r'[^a-zA-Z0-9\s]', '', title).replace(' ', '-').lower()
-                
-                headings.append({
-                    "level": level,
-                    "title": title,
-                    "slug": slug,
-                    "url": f"#{slug}"
-                })
-        
-        return headings
 
 class SEOBlogCommentSerializer(serializers.ModelSerializer):
     """Enhanced comment serializer with moderation features"""
@@ -244,16 +170,23 @@ class SEOBlogCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'created_at', 'updated_at', 'replies', 'is_author']
     
     def get_replies(self, obj):
-        replies = obj.replies.filter(is_approved=True).order_by('created_at')
+        if 'comment_replies' in self.context:
+            # Thread assembled in memory by blog.comments
+            replies = self.context['comment_replies'].get(obj.pk, [])
+        elif hasattr(obj, 'approved_replies'):
+            replies = obj.approved_replies
+        else:
+            replies = obj.replies.filter(is_approved=True).select_related('user', 'post').order_by('created_at')
         return SEOBlogCommentSerializer(replies, many=True, context=self.context).data
     
     def get_is_author(self, obj):
         """Check if comment is from the blog post author"""
-        return obj.user == obj.post.user
+        return obj.user_id == obj.post.user_id
 
 class BlogAnalyticsSerializer(serializers.ModelSerializer):
     """Serializer for blog analytics and performance data"""
     daily_views = serializers.SerializerMethodField()
+    unique_visitors = serializers.SerializerMethodField()
     referrer_data = serializers.SerializerMethodField()
     engagement_rate = serializers.SerializerMethodField()
     
@@ -261,17 +194,31 @@ class BlogAnalyticsSerializer(serializers.ModelSerializer):
         model = BlogPost
         fields = [
             'id', 'title', 'slug', 'view_count', 'daily_views',
-            'referrer_data', 'engagement_rate', 'published_at'
+            'unique_visitors', 'referrer_data', 'engagement_rate', 'published_at'
         ]
         read_only_fields = fields
     
     def get_daily_views(self, obj):
-        """Get view count for the last 30 days"""
+        """View count for the last 30 days, from the daily rollups (see blog.rollups)"""
+        if 'daily_views' in self.context:
+            return self.context['daily_views'].get(obj.pk, 0)
         from django.utils import timezone
         from datetime import timedelta
-        
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        return obj.views.filter(created_at__gte=thirty_days_ago).count()
+        from .rollups import views_by_post
+
+        since = timezone.localdate() - timedelta(days=30)
+        return views_by_post([obj.pk], since).get(obj.pk, 0)
+    
+    def get_unique_visitors(self, obj):
+        """Estimated distinct visitors from the daily sketches (see core.visitors)"""
+        if 'unique_visitors' in self.context:
+            return self.context['unique_visitors'].get(obj.pk, 0)
+        from django.utils import timezone
+        from datetime import timedelta
+        from core.visitors import unique_visitors
+
+        since = timezone.localdate() - timedelta(days=30)
+        return unique_visitors(BlogPost, [obj.pk], start=since).get(obj.pk, 0)
     
     def get_referrer_data(self, obj):
         """Get top referrer sources (placeholder for future implementation)"""
@@ -287,7 +234,7 @@ class BlogAnalyticsSerializer(serializers.ModelSerializer):
         if obj.view_count == 0:
             return 0
         
-        engagements = obj.likes.count() + obj.comments.filter(is_approved=True).count()
+        engagements = obj.like_count + obj.approved_comment_count
         return round((engagements / obj.view_count) * 100, 2)
 
 # Backward compatibility with existing serializers
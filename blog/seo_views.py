@@ -6,19 +6,23 @@ from rest_framework.generics import ListAPIView, RetrieveAPIView
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Count, Prefetch
 from django.utils import timezone
-from django.http import HttpResponse
-from django.template.loader import render_to_string
-from django.contrib.syndication.views import Feed
-from django.urls import reverse
+from django.views import View
 from datetime import timedelta
-import xml.etree.ElementTree as ET
 
 from .models import BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike, BlogView
+from core import visitors
+from core.filters import order_by_relevance
+from core.views import blog_feed_view, sitemap_index_view
+from . import rollups, search, trending
+from .comments import CommentThreadPagination, comment_thread
+from .filters import client_ip
+from .view_buffer import record_view
 from .seo_serializers import (
     SEOBlogCategorySerializer,
     SEOBlogTagSerializer,
     EnterpriseMinimalBlogPostSerializer,
     EnterpriseBlogPostDetailSerializer,
+    BlogSearchResultSerializer,
     SEOBlogCommentSerializer,
     BlogLikeSerializer,
     BlogViewSerializer,
@@ -42,7 +46,7 @@ class BlogCategoryViewSet(viewsets.ModelViewSet):
         posts = BlogPost.objects.filter(
             category=category,
             status='PUBLISHED'
-        ).select_related('user', 'category').prefetch_related('tags')
+        ).select_related('user', 'category')
         
         serializer = EnterpriseMinimalBlogPostSerializer(
             posts, many=True, context={'request': request}
@@ -66,7 +70,7 @@ class BlogTagViewSet(viewsets.ModelViewSet):
         posts = BlogPost.objects.filter(
             tags=tag,
             status='PUBLISHED'
-        ).select_related('user', 'category').prefetch_related('tags')
+        ).select_related('user', 'category')
         
         serializer = EnterpriseMinimalBlogPostSerializer(
             posts, many=True, context={'request': request}
@@ -85,13 +89,6 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = BlogPost.objects.filter(status='PUBLISHED').select_related(
             'user', 'category'
-        ).prefetch_related(
-            'tags',
-            Prefetch('comments', queryset=BlogComment.objects.filter(is_approved=True)),
-            'likes'
-        ).annotate(
-            like_count=Count('likes'),
-            comment_count=Count('comments', filter=Q(comments__is_approved=True))
         )
         
         # Filter by category
@@ -109,15 +106,16 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         if user_id:
             queryset = queryset.filter(user_id=user_id)
         
-        # Search functionality
-        search = self.request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(content__icontains=search) |
-                Q(excerpt__icontains=search) |
-                Q(meta_keywords__icontains=search)
+        # Search functionality (full-text index, best match first)
+        query = self.request.query_params.get('search', '').strip()
+        if query and self.action == 'list':
+            ids = search.ranked_post_ids(query)
+            search.log_search(
+                query, len(ids),
+                self.request.user.pk if self.request.user.is_authenticated else None,
+                self.get_client_ip(self.request)
             )
+            return order_by_relevance(queryset, ids)
         
         return queryset.order_by('-published_at', '-created_at')
     
@@ -125,24 +123,14 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         """Enhanced retrieve with view tracking"""
         instance = self.get_object()
         
-        # Track view
-        user = request.user if request.user.is_authenticated else None
-        ip_address = self.get_client_ip(request)
-        
-        # Create view record (avoid duplicates within 24 hours for same IP)
-        if not BlogView.objects.filter(
-            post=instance,
-            ip_address=ip_address,
-            created_at__gte=timezone.now() - timedelta(hours=24)
-        ).exists():
-            BlogView.objects.create(
-                post=instance,
-                user=user,
-                ip_address=ip_address
-            )
-            # Update view count
-            instance.view_count += 1
-            instance.save(update_fields=['view_count'])
+        # Track view (buffered, one per IP within 24 hours; see blog.view_buffer)
+        record_view(
+            instance.pk,
+            user_id=request.user.pk if request.user.is_authenticated else None,
+            ip_address=self.get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT'),
+            dedupe=True
+        )
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -180,15 +168,11 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     def comments(self, request, slug=None):
         """Get comments for a blog post"""
         post = self.get_object()
-        comments = post.comments.filter(
-            is_approved=True, 
-            parent__isnull=True
-        ).select_related('user').order_by('-created_at')
-        
-        serializer = SEOBlogCommentSerializer(
-            comments, many=True, context={'request': request}
-        )
-        return Response(serializer.data)
+        # One query per post, cached until its comments change (blog.comments)
+        thread = comment_thread(post, SEOBlogCommentSerializer)
+        paginator = CommentThreadPagination()
+        page = paginator.paginate_queryset(thread, request, view=self)
+        return paginator.get_paginated_response(page)
     
     @action(detail=True, methods=['get'])
     def related(self, request, slug=None):
@@ -201,7 +185,7 @@ class BlogPostViewSet(viewsets.ModelViewSet):
             Q(category=post.category) | Q(tags__in=post.tags.all())
         ).exclude(id=post.id).distinct().select_related(
             'user', 'category'
-        ).prefetch_related('tags')[:5]
+        )[:5]
         
         serializer = EnterpriseMinimalBlogPostSerializer(
             related_posts, many=True, context={'request': request}
@@ -216,7 +200,7 @@ class BlogPostBySlugView(RetrieveAPIView):
     def get_queryset(self):
         return BlogPost.objects.filter(status='PUBLISHED').select_related(
             'user', 'category'
-        ).prefetch_related('tags', 'comments', 'likes')
+        )
 
 class BlogCommentViewSet(viewsets.ModelViewSet):
     """Enhanced comment viewset with moderation"""
@@ -226,6 +210,12 @@ class BlogCommentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return BlogComment.objects.filter(is_approved=True).select_related(
             'user', 'post'
+        ).prefetch_related(
+            Prefetch(
+                'replies',
+                queryset=BlogComment.objects.filter(is_approved=True).select_related('user', 'post').order_by('created_at'),
+                to_attr='approved_replies'
+            )
         ).order_by('-created_at')
     
     def perform_create(self, serializer):
@@ -247,42 +237,50 @@ class BlogViewViewSet(viewsets.ReadOnlyModelViewSet):
         return BlogView.objects.all().select_related('user', 'post')
 
 class BlogSearchView(ListAPIView):
-    """Advanced blog search with SEO optimization"""
-    serializer_class = EnterpriseMinimalBlogPostSerializer
+    """Ranked full-text blog search with highlighted snippets"""
+    serializer_class = BlogSearchResultSerializer
+    
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        self.search_hits = search.search_posts(query) if query else []
+        response = super().list(request, *args, **kwargs)
+        if query:
+            search.log_search(
+                query, len(self.search_hits),
+                request.user.pk if request.user.is_authenticated else None,
+                client_ip(request)
+            )
+        return response
     
     def get_queryset(self):
-        query = self.request.query_params.get('q', '')
-        
-        if not query:
+        if not self.search_hits:
             return BlogPost.objects.none()
         
-        return BlogPost.objects.filter(
-            Q(title__icontains=query) |
-            Q(content__icontains=query) |
-            Q(excerpt__icontains=query) |
-            Q(meta_keywords__icontains=query) |
-            Q(category__name__icontains=query) |
-            Q(tags__name__icontains=query)
-        ).filter(status='PUBLISHED').distinct().select_related(
-            'user', 'category'
-        ).prefetch_related('tags').order_by('-published_at')
+        queryset = BlogPost.objects.filter(status='PUBLISHED').select_related('user', 'category')
+        return order_by_relevance(queryset, [post_id for post_id, _snippet in self.search_hits])
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['search_snippets'] = dict(getattr(self, 'search_hits', []))
+        return context
 
 class TrendingBlogPostsView(ListAPIView):
-    """Get trending blog posts based on views and engagement"""
+    """Trending posts by time-decayed views, likes and comments (blog.trending)"""
     serializer_class = EnterpriseMinimalBlogPostSerializer
     
     def get_queryset(self):
-        # Posts with high engagement in the last 7 days
-        week_ago = timezone.now() - timedelta(days=7)
-        
-        return BlogPost.objects.filter(
-            status='PUBLISHED',
-            published_at__gte=week_ago
-        ).annotate(
-            recent_views=Count('views', filter=Q(views__created_at__gte=week_ago)),
-            like_count=Count('likes'),
-            comment_count=Count('comments', filter=Q(comments__is_approved=True))
-        ).order_by('-recent_views', '-like_count', '-comment_count')[:10]
+        category_id = None
+        category_slug = self.request.query_params.get('category')
+        if category_slug:
+            category_id = BlogCategory.objects.filter(slug=category_slug).values_list('pk', flat=True).first()
+            if category_id is None:
+                return BlogPost.objects.none()
+        
+        ids = trending.trending_post_ids(category_id)
+        return order_by_relevance(
+            BlogPost.objects.filter(status='PUBLISHED').select_related('user', 'category'),
+            ids
+        )
 
 class RelatedBlogPostsView(ListAPIView):
     """Get related posts for a specific blog post"""
@@ -296,107 +294,75 @@ class RelatedBlogPostsView(ListAPIView):
         except BlogPost.DoesNotExist:
             return BlogPost.objects.none()
         
+        # Precomputed TF-IDF neighbours (blog.related)
+        related = BlogPost.objects.filter(
+            related_from__post=post, status='PUBLISHED'
+        ).select_related(
+            'user', 'category'
+        ).order_by('related_from__rank')[:5]
+        if related:
+            return related
+        
+        # Not computed yet: same category or tags
         return BlogPost.objects.filter(
             status='PUBLISHED'
         ).filter(
             Q(category=post.category) | Q(tags__in=post.tags.all())
         ).exclude(id=post.id).distinct().select_related(
             'user', 'category'
-        ).prefetch_related('tags')[:5]
+        )[:5]
 
-class BlogSitemapView(APIView):
-    """Generate XML sitemap for blog posts"""
+class BlogSitemapView(View):
+    """XML sitemap index, pre-generated and gzipped by core.sitemaps"""
     
     def get(self, request):
-        posts = BlogPost.objects.filter(status='PUBLISHED').order_by('-updated_at')
-        
-        # Create XML sitemap
-        urlset = ET.Element('urlset')
-        urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        
-        # Add blog index
-        url = ET.SubElement(urlset, 'url')
-        ET.SubElement(url, 'loc').text = request.build_absolute_uri('/blog/')
-        ET.SubElement(url, 'changefreq').text = 'daily'
-        ET.SubElement(url, 'priority').text = '0.8'
-        
-        # Add individual posts
-        for post in posts:
-            url = ET.SubElement(urlset, 'url')
-            ET.SubElement(url, 'loc').text = request.build_absolute_uri(f'/blog/{post.slug}/')
-            ET.SubElement(url, 'lastmod').text = post.updated_at.strftime('%Y-%m-%d')
-            ET.SubElement(url, 'changefreq').text = 'weekly'
-            ET.SubElement(url, 'priority').text = '0.6'
-        
-        xml_content = ET.tostring(urlset, encoding='unicode')
-        xml_content = '<?xml version="1.0" encoding="UTF-8"?>\n' + xml_content
-        
-        return HttpResponse(xml_content, content_type='application/xml')
+        return sitemap_index_view(request)
 
-class BlogRSSFeedView(Feed):
-    """RSS feed for blog posts"""
-    title = "OkPuja Blog - Hindu Spiritual Services"
-    link = "/blog/"
-    description = "Latest spiritual insights, puja guides, and Hindu traditions from OkPuja"
-    
-    def items(self):
-        return BlogPost.objects.filter(status='PUBLISHED').order_by('-published_at')[:20]
-    
-    def item_title(self, item):
-        return item.title
-    
-    def item_description(self, item):
-        return item.excerpt or item.content[:200] + '...'
-    
-    def item_link(self, item):
-        return f'/blog/{item.slug}/'
+class BlogRSSFeedView(View):
+    """RSS feed for blog posts, pre-generated by core.sitemaps"""
     
-    def item_pubdate(self, item):
-        return item.published_at or item.created_at
+    def get(self, request):
+        return blog_feed_view(request)
 
 class BlogAnalyticsView(APIView):
-    """Blog analytics and performance data"""
+    """Blog analytics and performance data, read from the daily rollups (blog.rollups)"""
     permission_classes = [permissions.IsAdminUser]
     
     def get(self, request):
         # Get time range from query params
         days = int(request.query_params.get('days', 30))
-        start_date = timezone.now() - timedelta(days=days)
+        since = timezone.localdate() - timedelta(days=days)
         
         # Overall stats
         total_posts = BlogPost.objects.filter(status='PUBLISHED').count()
-        total_views = BlogView.objects.filter(created_at__gte=start_date).count()
-        total_likes = BlogLike.objects.filter(created_at__gte=start_date).count()
-        total_comments = BlogComment.objects.filter(
-            is_approved=True, 
-            created_at__gte=start_date
-        ).count()
+        totals = rollups.totals(since)
+        unique_visitors = visitors.total_unique_visitors(BlogPost, start=since)
         
         # Top performing posts
-        top_posts = BlogPost.objects.filter(
-            status='PUBLISHED'
-        ).annotate(
-            recent_views=Count('views', filter=Q(views__created_at__gte=start_date))
-        ).order_by('-recent_views')[:10]
-        
+        top_posts = list(rollups.with_recent_views(
+            BlogPost.objects.filter(status='PUBLISHED'), since
+        ).order_by('-recent_views')[:10])
+        post_ids = [post.pk for post in top_posts]
         top_posts_data = BlogAnalyticsSerializer(
-            top_posts, many=True, context={'request': request}
+            top_posts, many=True, context={
+                'request': request,
+                'unique_visitors': visitors.unique_visitors(BlogPost, post_ids, start=since),
+                'daily_views': rollups.views_by_post(post_ids, timezone.localdate() - timedelta(days=30)),
+            }
         ).data
         
         # Category performance
-        category_stats = BlogCategory.objects.filter(
-            status='PUBLISHED'
-        ).annotate(
-            post_count=Count('posts', filter=Q(posts__status='PUBLISHED')),
-            total_views=Count('posts__views', filter=Q(posts__views__created_at__gte=start_date))
+        category_stats = rollups.categories_with_views(
+            BlogCategory.objects.filter(status='PUBLISHED'), since
         ).values('name', 'post_count', 'total_views')
         
         return Response({
             'overview': {
                 'total_posts': total_posts,
-                'total_views': total_views,
-                'total_likes': total_likes,
-                'total_comments': total_comments,
+                'total_views': totals['views'],
+                'unique_visitors': unique_visitors,
+                'total_likes': totals['likes'],
+                'total_comments': totals['comments'],
                 'date_range': f'{days} days'
             },
             'top_posts': top_posts_data,
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike, BlogView
 from accounts.serializers import UserSerializer
+from core.serializers import ResponsiveImageField
 
 class BlogCategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -26,12 +27,13 @@ class BlogPostListSerializer(serializers.ModelSerializer):
     category = BlogCategorySerializer(read_only=True)
     tags = BlogTagSerializer(many=True, read_only=True)
     featured_image_thumbnail_url = serializers.SerializerMethodField()
+    responsive_image = ResponsiveImageField(source='featured_image_manifest')
 
     class Meta:
         model = BlogPost
         fields = [
             'id', 'title', 'slug', 'excerpt', 'author',
-            'category', 'tags', 'featured_image_thumbnail_url',
+            'category', 'tags', 'featured_image_thumbnail_url', 'responsive_image',
             'status', 'is_featured', 'view_count',
             'created_at', 'updated_at', 'published_at'
         ]
@@ -63,8 +65,12 @@ class BlogCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'created_at', 'updated_at', 'replies']
     
     def get_replies(self, obj):
-        replies = obj.replies.filter(is_approved=True)
-        return BlogCommentSerializer(replies, many=True).data
+        if 'comment_replies' in self.context:
+            # Thread assembled in memory by blog.comments
+            replies = self.context['comment_replies'].get(obj.pk, [])
+        else:
+            replies = obj.replies.filter(is_approved=True).select_related('user')
+        return BlogCommentSerializer(replies, many=True, context=self.context).data
 
 class BlogLikeSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
@@ -1,13 +1,106 @@
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
-from .models import BlogPost
+from .models import BlogCategory, BlogComment, BlogLike, BlogPost, BlogTag
+from . import comments, derived, search, trending
 
 @receiver(pre_save, sender=BlogPost)
 def update_published_at(sender, instance, **kwargs):
-    if instance.pk:
-        original = BlogPost.objects.get(pk=instance.pk)
-        if original.status != 'PUBLISHED' and instance.status == 'PUBLISHED':
-            instance.published_at = timezone.now()
-    elif instance.status == 'PUBLISHED':
-        instance.published_at = timezone.now()
\ No newline at end of file
+    # Status is tracked on the instance, so no re-read of the row is needed
+    if not instance.is_being_published():
+        return
+    if not (instance._state.adding and instance.published_at):
+        # Keep an explicitly given publication date on new posts
+        instance.published_at = timezone.now()
+    # Publication head start in the trending score, written by this same save
+    instance.trending_score = trending.log_sum([
+        instance.trending_score, trending.event_exponent(trending.WEIGHTS['publish'], instance.published_at)
+    ])
+
+
+@receiver(post_save, sender=BlogPost)
+def index_blog_post(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    # Saves that leave the search text alone (status, view_count...) skip the index
+    text_changed = created or any(instance.has_changed(name) for name in search.INDEXED_FIELDS)
+    if text_changed:
+        search.index_post(instance)
+    # Published, unpublished, or a published post edited
+    published_changed = instance.has_changed('status') and 'PUBLISHED' in (instance.status, instance.previous('status'))
+    if published_changed or (text_changed and instance.status == 'PUBLISHED'):
+        schedule_related_update(instance.pk)
+
+
+def schedule_related_update(post_id):
+    from .tasks import update_related_posts
+    transaction.on_commit(lambda: update_related_posts.delay(post_id))
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def reindex_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # tag.posts.clear(): remember the posts before the relation is gone
+        instance._search_cleared_posts = list(instance.posts.values_list('pk', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    post_ids = [instance.pk] if not reverse else list(pk_set or getattr(instance, '_search_cleared_posts', ()))
+    search.index_posts(post_ids)
+    derived.refresh_posts(post_ids)
+    for post_id in BlogPost.objects.filter(pk__in=post_ids, status='PUBLISHED').values_list('pk', flat=True):
+        schedule_related_update(post_id)
+
+
+@receiver(post_save, sender=BlogTag)
+@receiver(post_save, sender=BlogCategory)
+def reindex_renamed_terms(sender, instance, created, raw=False, **kwargs):
+    # Tag and category names are part of every document (and SEO data) of their posts
+    if created or raw:
+        return
+    post_ids = list(instance.posts.values_list('pk', flat=True))
+    search.index_posts(post_ids)
+    derived.refresh_posts(post_ids)
+
+
+@receiver(post_save, sender=BlogLike)
+def trend_on_like(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        derived.adjust_like_count(instance.post_id, 1)
+        trending.add_engagement(instance.post_id, 'like')
+
+
+@receiver(post_delete, sender=BlogLike)
+def uncount_like(sender, instance, **kwargs):
+    derived.adjust_like_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=BlogComment)
+def trend_on_comment(sender, instance, created, raw=False, **kwargs):
+    # Counted once, when the comment is (or becomes) approved
+    if not raw and instance.is_approved and (created or instance.has_changed('is_approved')):
+        trending.add_engagement(instance.post_id, 'comment')
+
+
+@receiver(post_save, sender=BlogComment)
+def count_approved_comment(sender, instance, created, raw=False, **kwargs):
+    if raw or not (created or instance.has_changed('is_approved')):
+        return
+    if instance.is_approved:
+        derived.adjust_comment_count(instance.post_id, 1)
+    elif not created:
+        derived.adjust_comment_count(instance.post_id, -1)
+
+
+@receiver(post_delete, sender=BlogComment)
+def uncount_deleted_comment(sender, instance, **kwargs):
+    if instance.is_approved:
+        derived.adjust_comment_count(instance.post_id, -1)
+        comments.bump_version(instance.post_id)
+
+
+@receiver(post_save, sender=BlogComment)
+def invalidate_comment_thread(sender, instance, created, raw=False, **kwargs):
+    # Approved comments are the cached thread; pending ones are not shown
+    if not raw and (instance.is_approved or instance.has_changed('is_approved')):
+        comments.bump_version(instance.post_id)
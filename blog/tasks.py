@@ -0,0 +1,57 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_blog_views():
+    """Write buffered blog post views to the database (see blog.view_buffer)"""
+    from .view_buffer import flush_views
+
+    return flush_views()
+
+
+@shared_task
+def flush_search_log():
+    """Write buffered blog searches to BlogSearchQuery (see blog.search)"""
+    from .search import flush_search_log as flush
+
+    return flush()
+
+
+@shared_task
+def update_related_posts(post_id):
+    """Refresh the related-post lists touched by one post (see blog.related)"""
+    from .related import update_related_posts as update
+
+    return update(post_id)
+
+
+@shared_task
+def rebuild_related_posts():
+    """Nightly full recompute of the related-post lists"""
+    from .related import rebuild_related_posts as rebuild
+
+    stored = rebuild()
+    logger.info(f"Rebuilt related posts: {stored} rows")
+    return stored
+
+
+@shared_task
+def rollup_blog_analytics():
+    """Hourly rollup of today's (and any missed days') blog analytics (see blog.rollups)"""
+    from .rollups import rollup_pending
+
+    return [day.isoformat() for day in rollup_pending()]
+
+
+@shared_task
+def rollup_blog_analytics_nightly():
+    """Finish the daily rollups and refresh every post's quality score"""
+    from .rollups import rollup_pending, update_performance
+
+    days = rollup_pending()
+    scored = update_performance()
+    logger.info(f"Rolled up blog analytics for {len(days)} day(s), scored {scored} posts")
+    return scored
@@ -0,0 +1,150 @@
+"""
+Time-decayed trending score for blog posts.
+
+Every engagement adds ``weight * 2 ** (-age / half_life)`` to a post's
+trend. Instead of decaying all posts over time, each event is stored
+scaled up by its time: ``trending_score`` is
+
+    ln( sum of weight * exp((event time - EPOCH) / tau) )
+
+with ``tau = half_life / ln 2``. Dividing every post by the same
+``exp(now / tau)`` does not change their order, so sorting on the stored
+column ranks posts by decayed engagement at any moment, and an event is a
+single ``score = logaddexp(score, x)`` UPDATE that never touches other
+posts. The view flusher applies it per batch; like and comment signals per
+write.
+
+Top-N lists (overall and per category) are cached under a version (a
+core.cache_versions counter, shared by every process) that each view
+flush bumps; like/comment updates show up within ``CACHE_TIMEOUT``.
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Exp, Ln
+from django.utils import timezone
+
+from core import cache_versions
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+DEFAULT_HALF_LIFE_HOURS = 48
+WEIGHTS = {
+    'view': 1.0,
+    'like': 5.0,
+    'comment': 8.0,
+    # Head start so a fresh post can appear before it has engagement
+    'publish': 10.0,
+}
+VERSION_NAME = 'blog_trending'
+CACHE_TIMEOUT = 60 * 10
+DEFAULT_LIMIT = 10
+
+
+def tau_seconds():
+    half_life = getattr(settings, 'BLOG_TRENDING_HALF_LIFE_HOURS', DEFAULT_HALF_LIFE_HOURS)
+    return half_life * 3600 / math.log(2)
+
+
+def event_exponent(weight, at=None):
+    """ln(weight * exp((at - EPOCH) / tau)): the log-space size of one event"""
+    at = at or timezone.now()
+    return math.log(weight) + (at - EPOCH).total_seconds() / tau_seconds()
+
+
+def log_sum(exponents):
+    exponents = list(exponents)
+    if not exponents:
+        return None
+    top = max(exponents)
+    return top + math.log(sum(math.exp(value - top) for value in exponents))
+
+
+def _added(exponent):
+    # logaddexp(score, x) = x + ln(1 + exp(score - x)); score - x stays small for live posts
+    return Value(exponent) + Ln(Value(1.0) + Exp(F('trending_score') - Value(exponent)))
+
+
+def score_expression(exponents):
+    """UPDATE expression adding {post_id: event exponent} to their scores"""
+    return Case(
+        *[When(pk=post_id, then=_added(exponent)) for post_id, exponent in exponents.items()],
+        default=F('trending_score'),
+        output_field=FloatField()
+    )
+
+
+def add_engagement(post_id, kind, at=None, count=1):
+    from .models import BlogPost
+
+    BlogPost.objects.filter(pk=post_id).update(
+        trending_score=_added(event_exponent(WEIGHTS[kind] * count, at))
+    )
+
+
+def current_score(score, now=None):
+    """Decayed engagement (in view units) behind a stored score, for display"""
+    return math.exp(score - event_exponent(1.0, now))
+
+
+def recompute_scores(apps=None):
+    """
+    Rebuild every score from the stored events (publication, BlogView rows,
+    likes, approved comments). ``apps`` lets data migrations pass their
+    historical app registry. Returns the number of posts scored.
+    """
+    if apps is None:
+        from django.apps import apps
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    events = {
+        'view': apps.get_model('blog', 'BlogView').objects.all(),
+        'like': apps.get_model('blog', 'BlogLike').objects.all(),
+        'comment': apps.get_model('blog', 'BlogComment').objects.filter(is_approved=True),
+    }
+    exponents = {}
+    for post_id, published_at in BlogPost.objects.filter(
+        status='PUBLISHED', published_at__isnull=False
+    ).values_list('pk', 'published_at'):
+        exponents[post_id] = [event_exponent(WEIGHTS['publish'], published_at)]
+    for kind, queryset in events.items():
+        for post_id, created_at in queryset.filter(post_id__in=list(exponents)).values_list('post_id', 'created_at'):
+            exponents[post_id].append(event_exponent(WEIGHTS[kind], created_at))
+
+    BlogPost.objects.exclude(pk__in=list(exponents)).update(trending_score=0.0)
+    scores = {post_id: log_sum(values) for post_id, values in exponents.items()}
+    batch = list(scores.items())
+    for start in range(0, len(batch), 500):
+        chunk = dict(batch[start:start + 500])
+        BlogPost.objects.filter(pk__in=list(chunk)).update(trending_score=Case(
+            *[When(pk=post_id, then=Value(score)) for post_id, score in chunk.items()],
+            output_field=FloatField()
+        ))
+    bump_version()
+    return len(scores)
+
+
+# Cached top-N lists ----------------------------------------------------------
+
+def get_version():
+    return cache_versions.get_version(VERSION_NAME)
+
+
+def bump_version():
+    return cache_versions.bump_version(VERSION_NAME)
+
+
+def trending_post_ids(category_id=None, limit=DEFAULT_LIMIT):
+    """Ids of the top ``limit`` published posts by trending score, cached per category"""
+    from .models import BlogPost
+
+    key = f"blog_trending:{get_version()}:{category_id or 'all'}:{limit}"
+    ids = cache.get(key)
+    if ids is None:
+        posts = BlogPost.objects.filter(status='PUBLISHED')
+        if category_id:
+            posts = posts.filter(category_id=category_id)
+        ids = list(posts.order_by('-trending_score').values_list('pk', flat=True)[:limit])
+        cache.set(key, ids, CACHE_TIMEOUT)
+    return ids
@@ -1,6 +1,7 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 from . import views
+from core.views import blog_feed_view
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -18,8 +19,8 @@ urlpatterns = [
     # Posts
     path('posts/', views.BlogPostListView.as_view(), name='post-list'),
     path('posts/create/', views.BlogPostCreateView.as_view(), name='post-create'),
-    path('posts/<slug:slug>/', views.BlogPostDetailView.as_view(), name='post-detail'),
     path('posts/popular/', views.BlogPopularPostsView.as_view(), name='popular-posts'),
+    path('posts/<slug:slug>/', views.BlogPostDetailView.as_view(), name='post-detail'),
     path('posts/<slug:post_slug>/related/', views.BlogRelatedPostsView.as_view(), name='related-posts'),
     
     # Comments
@@ -28,6 +29,9 @@ urlpatterns = [
     
     # Likes
     path('posts/<slug:post_slug>/like/', views.BlogLikeView.as_view(), name='post-like'),
+
+    # RSS feed (pre-generated by core.sitemaps)
+    path('feed/', blog_feed_view, name='rss-feed'),
 ]
 
 urlpatterns += router.urls
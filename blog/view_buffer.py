@@ -0,0 +1,142 @@
+"""
+Write-behind view counting for blog posts.
+
+A detail request only records the view in a cache buffer
+(core.write_buffer); nothing is written to the database on the read path.
+The flusher (``blog.tasks.flush_blog_views`` or ``manage.py
+flush_blog_views``) drains closed buckets of ``BLOG_VIEW_BUCKET_SECONDS``
+and ``write_views`` stores them in one transaction: BlogView rows stamped
+with their bucket's start time, every post's ``view_count`` and trending
+score (blog.trending) in a single UPDATE, and the visitors merged into the
+per-day unique-visitor sketches (core.visitors). Buckets are discarded
+only after that transaction, under the buffer's drain lock.
+
+Without a shared cache (``core.write_buffer.buffering_enabled()``) the
+flusher could not see other processes' buffers, so each view goes
+straight through ``write_views`` instead.
+
+The 24 hour per-IP dedupe of the SEO endpoint is a ``cache.add`` marker
+instead of an ``exists()`` query.
+"""
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from core.visitors import add_visitors, visitor_key
+from core.write_buffer import CacheBuffer, buffering_enabled
+
+from . import trending
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKET_SECONDS = 30
+DEDUPE_SECONDS = 60 * 60 * 24
+
+views = CacheBuffer(
+    'blog_views', lambda: getattr(settings, 'BLOG_VIEW_BUCKET_SECONDS', DEFAULT_BUCKET_SECONDS)
+)
+
+
+def _at(epoch_seconds):
+    return datetime.fromtimestamp(epoch_seconds, tz=dt_timezone.utc)
+
+
+def record_view(post_id, user_id=None, ip_address=None, user_agent=None, dedupe=False, now=None):
+    """
+    Buffer one view of a post. With ``dedupe`` a repeat view from the same
+    IP within 24 hours is ignored. Returns True if the view was recorded.
+    """
+    if dedupe and ip_address and not cache.add(f"blog_views:seen:{post_id}:{ip_address}", 1, DEDUPE_SECONDS):
+        return False
+
+    event = (post_id, user_id, ip_address, (user_agent or '')[:255] or None)
+    if buffering_enabled():
+        views.append(event, now)
+    else:
+        write_views([(_at(now if now is not None else time.time()), [event])])
+    return True
+
+
+def buffered_view_count(now=None, include_current=True):
+    """Views waiting in the buffer (not yet written to the database)"""
+    return views.pending(now, include_current)
+
+
+def write_views(batches, batch_size=500):
+    """
+    Store ``[(time, [(post_id, user_id, ip_address, user_agent)])]`` in one
+    transaction. Returns the number of views written.
+    """
+    from .models import BlogPost, BlogView
+
+    post_ids = {event[0] for _, events in batches for event in events}
+    if not post_ids:
+        return 0
+    live_posts = set(BlogPost.objects.filter(pk__in=post_ids).values_list('pk', flat=True))
+    rows = []
+    counts = {}
+    visitors = {}
+    trend = {}
+    for at, events in batches:
+        day = timezone.localdate(at)
+        per_post = {}
+        for post_id, user_id, ip_address, user_agent in events:
+            if post_id not in live_posts:
+                continue
+            rows.append(BlogView(
+                post_id=post_id, user_id=user_id, ip_address=ip_address, user_agent=user_agent, created_at=at
+            ))
+            visitors.setdefault((post_id, day), set()).add(visitor_key(user_id, ip_address))
+            per_post[post_id] = per_post.get(post_id, 0) + 1
+        for post_id, n in per_post.items():
+            trend.setdefault(post_id, []).append(trending.event_exponent(trending.WEIGHTS['view'] * n, at))
+            counts[post_id] = counts.get(post_id, 0) + n
+    if not rows:
+        return 0
+
+    with transaction.atomic():
+        BlogView.objects.bulk_create(rows, batch_size=batch_size)
+        # One UPDATE for every post: view_count = view_count + n, trending score decayed-added
+        BlogPost.objects.filter(pk__in=counts).update(
+            view_count=F('view_count') + Case(
+                *[When(pk=post_id, then=Value(n)) for post_id, n in counts.items()],
+                default=Value(0),
+                output_field=IntegerField()
+            ),
+            trending_score=trending.score_expression(
+                {post_id: trending.log_sum(trend[post_id]) for post_id in counts}
+            )
+        )
+        for (post_id, day), keys in visitors.items():
+            add_visitors(BlogPost, post_id, day, keys)
+        transaction.on_commit(trending.bump_version)
+    return len(rows)
+
+
+def flush_views(now=None, include_current=False, batch_size=500):
+    """
+    Write the buffered views of closed buckets to the database.
+    Returns the number of views written.
+    """
+    with views.lock() as acquired:
+        if not acquired:
+            logger.info("Blog view flush already running, skipped")
+            return 0
+        buckets = views.buckets(now, include_current)
+        if not buckets:
+            return 0
+        written = write_views(
+            [(_at(views.bucket_start(bucket)), views.read(bucket)) for bucket in buckets], batch_size
+        )
+        # Only once the rows are stored: a failed write leaves the buckets for the next run
+        views.discard(buckets)
+
+    if written:
+        logger.info(f"Flushed {written} buffered blog views")
+    return written
@@ -4,7 +4,13 @@ from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from django.db.models import Count, Q
+from core.filters import order_by_relevance
+
 from .models import BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike, BlogView
+from .comments import CommentThreadPagination, comment_thread
+from .filters import RankedSearchFilter
+from .trending import trending_post_ids
+from .view_buffer import record_view
 from .serializers import (
     BlogCategorySerializer, BlogTagSerializer,
     BlogPostListSerializer, BlogPostDetailSerializer,
@@ -44,9 +50,8 @@ class BlogTagDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 class BlogPostListView(generics.ListAPIView):
     serializer_class = BlogPostListSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, RankedSearchFilter]
     filterset_fields = ['category', 'tags', 'status', 'is_featured']
-    search_fields = ['title', 'excerpt', 'content']
     ordering_fields = ['published_at', 'created_at', 'view_count']
     ordering = ['-published_at']
 
@@ -76,14 +81,14 @@ class BlogPostDetailView(generics.RetrieveUpdateDestroyAPIView):
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         
-        # Increment view count
+        # Buffered; view_count is bumped by the periodic flush (blog.view_buffer)
         if instance.status == 'PUBLISHED':
-            BlogView.objects.create(
-                post=instance,
-                user=request.user if request.user.is_authenticated else None,
-                ip_address=self.get_client_ip(request)
+            record_view(
+                instance.pk,
+                user_id=request.user.pk if request.user.is_authenticated else None,
+                ip_address=self.get_client_ip(request),
+                user_agent=request.META.get('HTTP_USER_AGENT')
             )
-            instance.increment_view_count()
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -99,6 +104,14 @@ class BlogPostDetailView(generics.RetrieveUpdateDestroyAPIView):
 class BlogCommentListView(generics.ListCreateAPIView):
     serializer_class = BlogCommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CommentThreadPagination
+
+    def list(self, request, *args, **kwargs):
+        post = get_object_or_404(BlogPost, slug=self.kwargs['post_slug'])
+        # One query per post, cached until its comments change (blog.comments)
+        thread = comment_thread(post, BlogCommentSerializer)
+        page = self.paginate_queryset(thread)
+        return self.get_paginated_response(page)
 
     def get_queryset(self):
         post_slug = self.kwargs['post_slug']
@@ -153,9 +166,9 @@ class BlogPopularPostsView(generics.ListAPIView):
     serializer_class = BlogPostListSerializer
 
     def get_queryset(self):
-        return BlogPost.objects.filter(status='PUBLISHED') \
-            .annotate(like_count=Count('likes')) \
-            .order_by('-view_count', '-like_count')[:5]
+        # Cached top posts by time-decayed engagement (blog.trending)
+        ids = trending_post_ids(limit=5)
+        return order_by_relevance(BlogPost.objects.filter(status='PUBLISHED'), ids)
 
 class BlogRelatedPostsView(generics.ListAPIView):
     serializer_class = BlogPostListSerializer
@@ -164,7 +177,13 @@ class BlogRelatedPostsView(generics.ListAPIView):
         post_slug = self.kwargs['post_slug']
         post = get_object_or_404(BlogPost, slug=post_slug)
         
-        # Get posts with same tags or category
+        # Precomputed TF-IDF neighbours (blog.related)
+        related = BlogPost.objects.filter(
+            related_from__post=post, status='PUBLISHED'
+        ).select_related('user', 'category').prefetch_related('tags').order_by('related_from__rank')[:4]
+        if related:
+            return related
+        # Not computed yet (e.g. the nightly rebuild has not run): same tags or category
         return BlogPost.objects.filter(
             Q(tags__in=post.tags.all()) | Q(category=post.category),
             status='PUBLISHED'
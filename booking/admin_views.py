@@ -297,29 +297,27 @@ class AdminBookingDetailView(generics.RetrieveUpdateAPIView):
     
     def perform_update(self, serializer):
         """Handle booking updates with notifications and tracking"""
-        booking = self.get_object()
-        old_status = booking.status
-        old_date = booking.selected_date
-        old_time = booking.selected_time
-        old_assigned = booking.assigned_to
-        
-        # Save the booking
-        updated_booking = serializer.save(updated_by=self.request.user)
+        # Save the booking; the instance tracks what this save changed
+        updated_booking = serializer.save(updated_by=self.request.user, event_actor=self.request.user)
+        changes = updated_booking.saved_changes or {}
         
         # Send notifications based on changes
         try:
             # Status change notification
-            if old_status != updated_booking.status:
-                self._send_status_change_notification(updated_booking, old_status)
+            if 'status' in changes:
+                self._send_status_change_notification(updated_booking, changes['status'])
             
             # Schedule change notification
-            if (old_date != updated_booking.selected_date or 
-                old_time != updated_booking.selected_time):
-                self._send_reschedule_notification(updated_booking, old_date, old_time)
+            if 'selected_date' in changes or 'selected_time' in changes:
+                self._send_reschedule_notification(
+                    updated_booking,
+                    changes.get('selected_date', updated_booking.selected_date),
+                    changes.get('selected_time', updated_booking.selected_time)
+                )
             
             # Assignment change notification
-            if old_assigned != updated_booking.assigned_to:
-                self._send_assignment_notification(updated_booking, old_assigned)
+            if 'assigned_to_id' in changes:
+                self._send_assignment_notification(updated_booking, changes['assigned_to_id'])
                 
         except Exception as e:
             logger.error(f"Failed to send booking update notifications: {str(e)}")
@@ -380,7 +378,7 @@ class AdminBookingDetailView(generics.RetrieveUpdateAPIView):
         except Exception as e:
             logger.error(f"Failed to send booking reschedule notification: {str(e)}")
     
-    def _send_assignment_notification(self, booking, old_assigned):
+    def _send_assignment_notification(self, booking, old_assigned_id):
         """Send assignment notification"""
         try:
             # Notify new assignee
@@ -510,6 +508,7 @@ class AdminBookingBulkActionsView(APIView):
                     try:
                         old_status = booking.status
                         old_assigned = booking.assigned_to
+                        booking.event_actor = request.user
                         
                         if action == 'confirm_bookings':
                             booking.status = BookingStatus.CONFIRMED
@@ -760,11 +759,28 @@ class AdminBookingReportsView(APIView):
         ).count()
         completion_rate = round((completed / total_services * 100), 2) if total_services > 0 else 0
         
+        # Time between status transitions, computed in SQL from the booking event log
+        from core.models import BookingEvent
+        booking_ids = bookings.values('id')
+        transitions = BookingEvent.objects.filter(booking_id__in=booking_ids)
+        transition_times = {}
+        for from_status, to_status in [
+            (BookingStatus.PENDING, BookingStatus.CONFIRMED),
+            (BookingStatus.CONFIRMED, BookingStatus.COMPLETED),
+        ]:
+            average = transitions.average_transition_time(
+                BookingEvent.BookingType.BOOKING, from_status, to_status
+            )
+            transition_times[f"{from_status.lower()}_to_{to_status.lower()}_hours"] = (
+                round(average.total_seconds() / 3600, 2) if average else None
+            )
+        
         return {
             "total_bookings": bookings.count(),
             "status_breakdown": status_performance,
             "completion_rate": completion_rate,
-            "cancellation_rate": status_performance.get(BookingStatus.CANCELLED, {}).get('percentage', 0)
+            "cancellation_rate": status_performance.get(BookingStatus.CANCELLED, {}).get('percentage', 0),
+            "transition_times": transition_times
         }
     
     def _generate_assignment_report(self, start_date, end_date):
@@ -0,0 +1,259 @@
+"""
+iCalendar (ICS) feeds for customers and employees.
+
+Feeds are cached per owner under a version number kept in the database
+(core.cache_versions), so every worker sees a bump. Creating or deleting a
+booking, or a save changing one of its ``calendar_fields`` (the fields
+rendered into its VEVENT, plus its owners), bumps the version of every
+owner before and after the change (booking.models), so a feed is rebuilt
+only after something it shows changed. Individual VEVENT blocks are cached
+by booking and a fingerprint of those fields, which means a rebuild
+re-renders only the bookings that changed since the last one.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.cache_versions import bump_version, get_version
+
+FEED_CUSTOMER = 'customer'
+FEED_EMPLOYEE = 'employee'
+FEED_KINDS = (FEED_CUSTOMER, FEED_EMPLOYEE)
+
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+FEED_PAST_DAYS = 30
+TOKEN_SALT = 'booking.calendar-feed'
+
+DEFAULT_DURATION_MINUTES = 60
+PRODID = '-//OkPuja//Booking Calendar//EN'
+
+
+# (feed kind, owner field) of the feeds a booking appears in
+FEED_OWNER_FIELDS = ((FEED_CUSTOMER, 'user_id'), (FEED_EMPLOYEE, 'assigned_to_id'))
+
+
+def _version_name(kind, user_id):
+    return f"booking_calendar:{kind}:{user_id}"
+
+
+def get_feed_version(kind, user_id):
+    return get_version(_version_name(kind, user_id))
+
+
+def invalidate_feed(kind, user_id):
+    """Bump the feed version; the previous cached body simply expires"""
+    if not user_id:
+        return
+    bump_version(_version_name(kind, user_id))
+
+
+def invalidate_feeds_for_booking(booking):
+    """Bump the feeds of every owner of ``booking``, before and after its last change"""
+    for kind, field in FEED_OWNER_FIELDS:
+        if hasattr(booking, field):
+            for user_id in {getattr(booking, field), booking.previous(field)}:
+                invalidate_feed(kind, user_id)
+
+
+def make_feed_token(user, kind):
+    return signing.dumps({'u': user.pk, 'k': kind}, salt=TOKEN_SALT)
+
+
+def read_feed_token(token):
+    """Return (user_id, kind) or raise signing.BadSignature"""
+    data = signing.loads(token, salt=TOKEN_SALT)
+    if data.get('k') not in FEED_KINDS:
+        raise signing.BadSignature('Unknown feed kind')
+    return data['u'], data['k']
+
+
+def _escape(value):
+    return (
+        str(value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    # RFC 5545: lines longer than 75 octets are folded with CRLF + space
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while len(encoded) > 75:
+        cut = 75 if not parts else 74
+        while cut > 0 and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    parts.append(encoded.decode('utf-8'))
+    return '\r\n '.join(parts)
+
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _local_datetime(day, at):
+    return timezone.make_aware(datetime.combine(day, at), timezone.get_current_timezone())
+
+
+def _render_vevent(uid, start, end, summary, status, updated_at, location='', description='', url=''):
+    ics_status = {'CANCELLED': 'CANCELLED', 'REJECTED': 'CANCELLED', 'FAILED': 'CANCELLED',
+                  'PENDING': 'TENTATIVE'}.get(status, 'CONFIRMED')
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f'DTSTAMP:{_utc(updated_at)}',
+        f'LAST-MODIFIED:{_utc(updated_at)}',
+        f'DTSTART:{_utc(start)}',
+        f'DTEND:{_utc(end)}',
+        f'SUMMARY:{_escape(summary)}',
+        f'STATUS:{ics_status}',
+    ]
+    if location:
+        lines.append(f'LOCATION:{_escape(location)}')
+    if description:
+        lines.append(f'DESCRIPTION:{_escape(description)}')
+    if url:
+        lines.append(f'URL:{url}')
+    lines.append('END:VEVENT')
+    return '\r\n'.join(_fold(line) for line in lines)
+
+
+def _cached_vevent(key, booking, render):
+    # updated_at alone misses saves with update_fields that leave it out
+    fingerprint = hashlib.md5(repr(
+        [booking.updated_at] + [getattr(booking, name) for name in booking.calendar_fields]
+    ).encode('utf-8')).hexdigest()
+    cache_key = f"booking_calendar_vevent:{key}:{fingerprint}"
+    block = cache.get(cache_key)
+    if block is None:
+        block = render()
+        cache.set(cache_key, block, FEED_CACHE_TIMEOUT)
+    return block
+
+
+def _booking_vevents(bookings):
+    for booking in bookings:
+        def render(booking=booking):
+            service = booking.cart.puja_service if booking.cart_id and booking.cart else None
+            duration = getattr(service, 'duration_minutes', None) or DEFAULT_DURATION_MINUTES
+            start = _local_datetime(booking.selected_date, booking.selected_time)
+            address = booking.address
+            location = ', '.join(filter(None, [
+                getattr(address, 'address_line1', ''), getattr(address, 'city', ''),
+                getattr(address, 'state', ''), getattr(address, 'postal_code', '')
+            ])) if address else ''
+            return _render_vevent(
+                uid=f'booking-{booking.book_id}@okpuja.com',
+                start=start,
+                end=start + timedelta(minutes=duration),
+                summary=f"{service.title if service else 'Puja Booking'} ({booking.book_id})",
+                status=booking.status,
+                updated_at=booking.updated_at,
+                location=location,
+                description=f"Booking {booking.book_id} - {booking.get_status_display()}",
+            )
+        yield _cached_vevent(f'booking:{booking.pk}', booking, render)
+
+
+def _puja_booking_vevents(bookings):
+    for booking in bookings:
+        def render(booking=booking):
+            start = _local_datetime(booking.booking_date, booking.start_time)
+            end = _local_datetime(booking.booking_date, booking.end_time)
+            if end <= start:
+                end = start + timedelta(minutes=booking.puja_service.duration_minutes or DEFAULT_DURATION_MINUTES)
+            return _render_vevent(
+                uid=f'puja-booking-{booking.pk}@okpuja.com',
+                start=start,
+                end=end,
+                summary=booking.puja_service.title,
+                status=booking.status,
+                updated_at=booking.updated_at,
+                location=booking.address,
+                description=booking.special_instructions,
+            )
+        yield _cached_vevent(f'puja:{booking.pk}', booking, render)
+
+
+def _astrology_booking_vevents(bookings):
+    for booking in bookings:
+        def render(booking=booking):
+            start = _local_datetime(booking.preferred_date, booking.preferred_time)
+            duration = booking.service.duration_minutes or DEFAULT_DURATION_MINUTES
+            description = f"Astrology session {booking.astro_book_id}"
+            if booking.google_meet_link:
+                description += f"\nJoin: {booking.google_meet_link}"
+            return _render_vevent(
+                uid=f'astrology-{booking.astro_book_id}@okpuja.com',
+                start=start,
+                end=start + timedelta(minutes=duration),
+                summary=f"{booking.service.title} ({booking.astro_book_id})",
+                status=booking.status,
+                updated_at=booking.updated_at,
+                location=booking.google_meet_link or 'Online',
+                description=description,
+                url=booking.google_meet_link or '',
+            )
+        yield _cached_vevent(f'astrology:{booking.pk}', booking, render)
+
+
+def build_feed(kind, user_id):
+    """Render the full ICS document for an owner"""
+    from booking.models import Booking
+    from puja.models import PujaBooking
+    from astrology.models import AstrologyBooking
+
+    since = timezone.localdate() - timedelta(days=FEED_PAST_DAYS)
+    blocks = []
+
+    if kind == FEED_EMPLOYEE:
+        bookings = Booking.objects.filter(assigned_to_id=user_id, selected_date__gte=since)
+        calendar_name = 'OkPuja Assigned Bookings'
+    else:
+        bookings = Booking.objects.filter(user_id=user_id, selected_date__gte=since)
+        calendar_name = 'OkPuja Bookings'
+        blocks.extend(_puja_booking_vevents(
+            PujaBooking.objects.filter(user_id=user_id, booking_date__gte=since).select_related('puja_service')
+        ))
+        blocks.extend(_astrology_booking_vevents(
+            AstrologyBooking.objects.filter(user_id=user_id, preferred_date__gte=since).select_related('service')
+        ))
+
+    blocks[:0] = _booking_vevents(
+        bookings.select_related('cart__puja_service', 'address').order_by('selected_date', 'selected_time')
+    )
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{calendar_name}',
+        'X-PUBLISHED-TTL:PT15M',
+    ]
+    return '\r\n'.join(lines + blocks + ['END:VCALENDAR']) + '\r\n'
+
+
+def get_feed(kind, user_id):
+    """Return (etag, body) for the owner's feed, building it only when stale"""
+    version = get_feed_version(kind, user_id)
+    cache_key = f"booking_calendar_feed:{kind}:{user_id}:{version}"
+    cached = cache.get(cache_key)
+    if cached is None:
+        body = build_feed(kind, user_id)
+        etag = '"%s"' % hashlib.md5(body.encode('utf-8')).hexdigest()
+        cached = (etag, body)
+        cache.set(cache_key, cached, FEED_CACHE_TIMEOUT)
+    return cached
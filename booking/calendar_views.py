@@ -0,0 +1,81 @@
+"""
+ICS calendar feed endpoints.
+
+Calendar apps cannot send JWT headers, so subscriptions use a signed,
+per-owner token in the URL. Responses carry an ETag and a cached feed is
+returned as 304 Not Modified when the client already has it.
+"""
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.http import HttpResponse, HttpResponseNotFound
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.urls import reverse
+
+from .calendar_feeds import (
+    FEED_CUSTOMER, FEED_EMPLOYEE, get_feed, make_feed_token, read_feed_token
+)
+
+User = get_user_model()
+
+
+def _can_use_employee_feed(user):
+    return user.role in [User.Role.EMPLOYEE, User.Role.ADMIN]
+
+
+def _feed_response(request, kind, user_id):
+    etag, body = get_feed(kind, user_id)
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')]:
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = f'inline; filename="okpuja-{kind}.ics"'
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
+
+
+@require_GET
+def calendar_feed(request, token):
+    """Subscribable ICS feed identified by a signed token"""
+    try:
+        user_id, kind = read_feed_token(token)
+    except signing.BadSignature:
+        return HttpResponseNotFound('Unknown calendar feed')
+
+    user = User.objects.filter(pk=user_id, is_active=True).only('id', 'role').first()
+    if user is None or (kind == FEED_EMPLOYEE and not _can_use_employee_feed(user)):
+        return HttpResponseNotFound('Unknown calendar feed')
+
+    return _feed_response(request, kind, user_id)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_calendar_feed(request):
+    """ICS feed for the logged in user (?kind=customer|employee)"""
+    kind = request.GET.get('kind', FEED_CUSTOMER)
+    if kind == FEED_EMPLOYEE and not _can_use_employee_feed(request.user):
+        return Response({'error': 'Employee calendar is only available to employees'}, status=403)
+    if kind not in (FEED_CUSTOMER, FEED_EMPLOYEE):
+        return Response({'error': 'kind must be customer or employee'}, status=400)
+    return _feed_response(request, kind, request.user.pk)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def calendar_subscriptions(request):
+    """Subscription URLs that can be added to Google/Apple/Outlook calendars"""
+    kinds = [FEED_CUSTOMER]
+    if _can_use_employee_feed(request.user):
+        kinds.append(FEED_EMPLOYEE)
+
+    return Response({
+        kind: request.build_absolute_uri(
+            reverse('booking-calendar-feed', kwargs={'token': make_feed_token(request.user, kind)})
+        )
+        for kind in kinds
+    })
@@ -2,7 +2,7 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from model_utils import Choices
 from imagekit.models import ProcessedImageField
@@ -11,6 +11,7 @@ import uuid
 
 from cart.models import Cart
 from accounts.models import Address
+from core.events import BookingEventMixin
 
 User = settings.AUTH_USER_MODEL
 
@@ -22,7 +23,7 @@ class BookingStatus(models.TextChoices):
     FAILED = "FAILED", "Failed"
     COMPLETED = "COMPLETED", "Completed"
 
-class Booking(models.Model):
+class Booking(BookingEventMixin, models.Model):
     user = models.ForeignKey(
         User, 
         on_delete=models.CASCADE, 
@@ -92,6 +93,14 @@ class Booking(models.Model):
             models.Index(fields=['user', 'status']),
         ]
 
+    booking_event_type = 'BOOKING'
+    booking_ref_field = 'book_id'
+    schedule_fields = ('selected_date', 'selected_time')
+    assignment_field = 'assigned_to'
+    calendar_fields = (
+        'user_id', 'assigned_to_id', 'book_id', 'status', 'selected_date', 'selected_time', 'address_id', 'cart_id'
+    )
+
     def __str__(self):
         return f"Booking #{self.book_id} - {self.user.email}"
 
@@ -210,6 +219,7 @@ class Booking(models.Model):
         
         self.selected_date = new_date
         self.selected_time = new_time
+        self.event_actor = rescheduled_by
         self.save()
         
         # Send reschedule notification
@@ -225,6 +235,7 @@ class Booking(models.Model):
         
         old_assigned = self.assigned_to
         self.assigned_to = employee
+        self.event_actor = assigned_by
         self.save()
         
         # Send assignment notification
@@ -259,6 +270,26 @@ def booking_post_save(sender, instance, created, **kwargs):
     if created and instance.status == BookingStatus.CONFIRMED:
         # Send confirmation email for new confirmed bookings
         send_booking_confirmation.delay(instance.id)
-    elif not created:
-        # Send status update notifications for existing bookings
-        send_booking_notification.delay(instance.id)
\ No newline at end of file
+    elif not created and instance.has_changed('status'):
+        # Send status update notifications for existing bookings (the instance
+        # still holds the pre-save snapshot while post_save receivers run)
+        send_booking_notification.delay(instance.id)
+
+
+# Bookings shown in the ICS feeds (booking.calendar_feeds)
+CALENDAR_BOOKING_MODELS = ('booking.Booking', 'puja.PujaBooking', 'astrology.AstrologyBooking')
+
+
+def invalidate_booking_calendars(sender, instance, signal, created=False, raw=False, **kwargs):
+    """Drop cached ICS feeds of everyone who could see the booking, before or after the change"""
+    from .calendar_feeds import invalidate_feeds_for_booking
+
+    if raw:
+        return
+    if signal is post_delete or created or any(instance.has_changed(name) for name in instance.calendar_fields):
+        invalidate_feeds_for_booking(instance)
+
+
+for label in CALENDAR_BOOKING_MODELS:
+    post_save.connect(invalidate_booking_calendars, sender=label, dispatch_uid=f'calendar-save-{label}')
+    post_delete.connect(invalidate_booking_calendars, sender=label, dispatch_uid=f'calendar-delete-{label}')
@@ -1,3 +1,83 @@
+from datetime import date, time
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from accounts.models import Address
+
+from .models import Booking, BookingStatus
+from .calendar_feeds import FEED_CUSTOMER, FEED_EMPLOYEE, get_feed_version, make_feed_token
+
+User = get_user_model()
+
+
+class BookingCalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='customer@example.com',
+            password='testpass123',
+            username='customer'
+        )
+        self.employee = User.objects.create_user(
+            email='priest@example.com',
+            password='testpass123',
+            username='priest',
+            role=User.Role.EMPLOYEE
+        )
+        self.booking = Booking.objects.create(
+            user=self.user,
+            selected_date=date(2030, 1, 10),
+            selected_time=time(10, 0),
+            status=BookingStatus.CONFIRMED
+        )
+        self.client = APIClient()
+
+    def test_customer_feed_with_etag(self):
+        url = f'/api/booking/calendar/feed/{make_feed_token(self.user, FEED_CUSTOMER)}.ics'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertIn(f'UID:booking-{self.booking.book_id}@okpuja.com', response.content.decode())
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_events_invalidate_employee_feed(self):
+        url = f'/api/booking/calendar/feed/{make_feed_token(self.employee, FEED_EMPLOYEE)}.ics'
+        empty = self.client.get(url)
+        self.assertNotIn(self.booking.book_id, empty.content.decode())
+        version = get_feed_version(FEED_EMPLOYEE, self.employee.pk)
+
+        booking = Booking.objects.get(pk=self.booking.pk)
+        booking.assign_to(self.employee, self.employee)
+
+        self.assertGreater(get_feed_version(FEED_EMPLOYEE, self.employee.pk), version)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=empty['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.booking.book_id, response.content.decode())
+
+    def test_untracked_edits_and_deletes_invalidate_customer_feed(self):
+        url = f'/api/booking/calendar/feed/{make_feed_token(self.user, FEED_CUSTOMER)}.ics'
+        self.client.get(url)
+
+        # The address is not a booking event, and update_fields leaves updated_at alone
+        address = Address.objects.create(
+            user=self.user, address_line1='12 Temple Road', city='Varanasi', state='UP', postal_code='221001'
+        )
+        booking = Booking.objects.get(pk=self.booking.pk)
+        booking.address = address
+        booking.save(update_fields=['address'])
+        self.assertIn('LOCATION:12 Temple Road\\, Varanasi', self.client.get(url).content.decode())
+
+        version = get_feed_version(FEED_CUSTOMER, self.user.pk)
+        booking.delete()
+        self.assertGreater(get_feed_version(FEED_CUSTOMER, self.user.pk), version)
+        self.assertNotIn(self.booking.book_id, self.client.get(url).content.decode())
 
-# Create your tests here.
+    def test_invalid_token_and_role(self):
+        self.assertEqual(self.client.get('/api/booking/calendar/feed/bogus.ics').status_code, 404)
+        token = make_feed_token(self.user, FEED_EMPLOYEE)
+        self.assertEqual(self.client.get(f'/api/booking/calendar/feed/{token}.ics').status_code, 404)
@@ -5,6 +5,7 @@ from .invoice_views import (
     generate_invoice_pdf, public_invoice_pdf,
     generate_invoice_html_view, public_invoice_html_view
 )
+from .calendar_views import calendar_feed, my_calendar_feed, calendar_subscriptions
 
 router = DefaultRouter()
 router.register(r'bookings', BookingViewSet, basename='booking')
@@ -16,6 +17,11 @@ urlpatterns = [
     path('public/invoice/<str:book_id>/', public_invoice_pdf, name='booking-public-invoice'),
     path('invoice/html/<str:book_id>/', generate_invoice_html_view, name='booking-invoice-html'),
     path('public/invoice/html/<str:book_id>/', public_invoice_html_view, name='booking-public-invoice-html'),
+
+    # Calendar (ICS) feeds
+    path('calendar/subscriptions/', calendar_subscriptions, name='booking-calendar-subscriptions'),
+    path('calendar/my.ics', my_calendar_feed, name='booking-calendar-my-feed'),
+    path('calendar/feed/<str:token>.ics', calendar_feed, name='booking-calendar-feed'),
     
     # Enterprise Admin URLs
     path('', include('booking.admin_urls')),
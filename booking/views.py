@@ -22,6 +22,7 @@ from .serializers import (
 )
 from core.tasks import send_booking_confirmation
 from core.permissions import IsAdminUser, IsStaffUser
+from core.serializers import BookingEventSerializer
 from accounts.models import User
 
 logger = logging.getLogger(__name__)
@@ -89,7 +90,7 @@ class BookingViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         
         with transaction.atomic():
-            booking = serializer.save()
+            booking = serializer.save(event_actor=request.user)
         
         return Response(self.get_serializer(booking).data)
 
@@ -132,6 +133,17 @@ class BookingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @swagger_auto_schema(
+        method='get',
+        responses={200: BookingEventSerializer(many=True)}
+    )
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        """Status, reschedule and assignment history of a booking"""
+        booking = self.get_object()
+        events = booking.booking_timeline().select_related('actor')
+        return Response(BookingEventSerializer(events, many=True).data)
+
     @action(detail=True, methods=['post'])
     def upload_attachment(self, request, pk=None):
         booking = self.get_object()
@@ -356,7 +368,7 @@ class AdminBookingViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         
         with transaction.atomic():
-            booking = serializer.save()
+            booking = serializer.save(event_actor=request.user)
         
         return Response(BookingSerializer(booking).data)
 
@@ -433,6 +445,17 @@ class AdminBookingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @swagger_auto_schema(
+        method='get',
+        responses={200: BookingEventSerializer(many=True)}
+    )
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        """Admin view of a booking's event history"""
+        booking = self.get_object()
+        events = booking.booking_timeline().select_related('actor')
+        return Response(BookingEventSerializer(events, many=True).data)
+
     @action(detail=False, methods=['get'])
     def employees(self, request):
         """Get list of employees that can be assigned to bookings"""
@@ -463,6 +486,7 @@ class AdminBookingViewSet(viewsets.ModelViewSet):
         """Get dashboard statistics for admin"""
         from django.db.models import Count, Q
         from datetime import datetime, timedelta
+        from core.models import BookingEvent
         
         today = timezone.now().date()
         week_ago = today - timedelta(days=7)
@@ -477,5 +501,12 @@ class AdminBookingViewSet(viewsets.ModelViewSet):
             'today_bookings': Booking.objects.filter(selected_date=today).count(),
             'unassigned_bookings': Booking.objects.filter(assigned_to__isnull=True).count(),
         }
+
+        avg_completion = BookingEvent.objects.average_transition_time(
+            BookingEvent.BookingType.BOOKING, BookingStatus.CONFIRMED, BookingStatus.COMPLETED
+        )
+        stats['avg_confirm_to_complete_hours'] = (
+            round(avg_completion.total_seconds() / 3600, 2) if avg_completion else None
+        )
         
         return Response(stats)
\ No newline at end of file
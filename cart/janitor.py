@@ -0,0 +1,138 @@
+"""
+Background cart janitor.
+
+Runs outside the checkout path (Celery task ``cart.tasks.run_cart_janitor``
+or ``manage.py cart_janitor``) and uses only bulk UPDATE/DELETE statements.
+Each step walks its candidates in primary-key batches so one run never
+holds a long transaction:
+
+1. cancel pending payment orders older than the grace period
+2. mark stale active/inactive carts without live payments as ABANDONED
+3. prune converted carts beyond the newest ``keep_converted`` per user
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef, F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .models import Cart, PENDING_PAYMENT_STATUSES, PENDING_PAYMENT_GRACE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_ABANDON_AFTER = timedelta(days=7)
+DEFAULT_KEEP_CONVERTED = 3
+METRICS_CACHE_KEY = 'cart_janitor:last_run'
+
+
+def _batches(queryset, batch_size):
+    """Yield lists of primary keys in ascending order, re-querying past the last seen key"""
+    last_pk = None
+    while True:
+        batch = queryset.order_by('pk')
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        pks = list(batch.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+
+
+def cancel_stale_pending_payments(older_than=PENDING_PAYMENT_GRACE, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Cancel PENDING/INITIATED payment orders older than ``older_than``"""
+    from payments.models import PaymentOrder
+
+    stale = PaymentOrder.objects.filter(
+        status__in=PENDING_PAYMENT_STATUSES,
+        created_at__lt=timezone.now() - older_than
+    )
+    if dry_run:
+        return stale.count()
+
+    cancelled = 0
+    for pks in _batches(stale, batch_size):
+        cancelled += PaymentOrder.objects.filter(
+            pk__in=pks, status__in=PENDING_PAYMENT_STATUSES
+        ).update(status='CANCELLED', updated_at=timezone.now())
+    return cancelled
+
+
+def mark_abandoned_carts(older_than=DEFAULT_ABANDON_AFTER, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Mark carts untouched for ``older_than`` and without live payments as ABANDONED"""
+    from payments.models import PaymentOrder
+
+    live_payment = PaymentOrder.objects.filter(
+        cart_id=OuterRef('cart_id'),
+        status__in=PENDING_PAYMENT_STATUSES + ['SUCCESS']
+    )
+    stale = Cart.objects.filter(
+        status__in=[Cart.StatusChoices.ACTIVE, Cart.StatusChoices.INACTIVE],
+        updated_at__lt=timezone.now() - older_than
+    ).exclude(Exists(live_payment))
+    if dry_run:
+        return stale.count()
+
+    abandoned = 0
+    for pks in _batches(stale, batch_size):
+        abandoned += Cart.objects.filter(
+            pk__in=pks,
+            status__in=[Cart.StatusChoices.ACTIVE, Cart.StatusChoices.INACTIVE]
+        ).update(status=Cart.StatusChoices.ABANDONED, updated_at=timezone.now())
+    return abandoned
+
+
+def converted_carts_to_prune(keep_per_user=DEFAULT_KEEP_CONVERTED):
+    """Converted carts older than the newest ``keep_per_user`` of each user"""
+    ranked = Cart.objects.filter(status=Cart.StatusChoices.CONVERTED).annotate(
+        position=Window(RowNumber(), partition_by=[F('user_id')], order_by=F('created_at').desc())
+    ).filter(position__gt=keep_per_user).values('pk')
+    return Cart.objects.filter(pk__in=ranked)
+
+
+def prune_converted_carts(keep_per_user=DEFAULT_KEEP_CONVERTED, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Detach bookings/payments from old converted carts and delete them in bulk"""
+    from booking.models import Booking
+    from payments.models import PaymentOrder
+
+    prunable = converted_carts_to_prune(keep_per_user)
+    if dry_run:
+        return prunable.count()
+
+    deleted = 0
+    for pks in _batches(prunable, batch_size):
+        cart_ids = list(Cart.objects.filter(pk__in=pks).values_list('cart_id', flat=True))
+        with transaction.atomic():
+            Booking.objects.filter(cart_id__in=pks).update(cart=None)
+            PaymentOrder.objects.filter(cart_id__in=cart_ids).update(cart_id=None)
+            deleted += Cart.objects.filter(pk__in=pks).delete()[1].get(Cart._meta.label, 0)
+    return deleted
+
+
+def run_cart_janitor(batch_size=DEFAULT_BATCH_SIZE, abandon_after=DEFAULT_ABANDON_AFTER,
+                     keep_converted=DEFAULT_KEEP_CONVERTED, payment_grace=PENDING_PAYMENT_GRACE,
+                     dry_run=False):
+    """Run every janitor step and return (and cache) the run metrics"""
+    started = time.monotonic()
+    metrics = {
+        'payments_cancelled': cancel_stale_pending_payments(payment_grace, batch_size, dry_run),
+        'carts_abandoned': mark_abandoned_carts(abandon_after, batch_size, dry_run),
+        'converted_carts_pruned': prune_converted_carts(keep_converted, batch_size, dry_run),
+        'dry_run': dry_run,
+        'finished_at': timezone.now().isoformat(),
+    }
+    metrics['duration_ms'] = int((time.monotonic() - started) * 1000)
+
+    if not dry_run:
+        cache.set(METRICS_CACHE_KEY, metrics, None)
+    logger.info(f"Cart janitor finished: {metrics}")
+    return metrics
+
+
+def last_run_metrics():
+    return cache.get(METRICS_CACHE_KEY)
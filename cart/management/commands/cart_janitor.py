@@ -0,0 +1,65 @@
+"""
+Cart janitor management command
+Bulk cleanup of stale payments and carts, meant to run from cron/Celery
+"""
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+
+from cart.janitor import run_cart_janitor, DEFAULT_BATCH_SIZE, DEFAULT_KEEP_CONVERTED
+
+
+class Command(BaseCommand):
+    help = 'Cancel stale pending payments, mark idle carts abandoned and prune old converted carts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count what would change',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per bulk statement (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--payment-minutes',
+            type=int,
+            default=30,
+            help='Age threshold in minutes for pending payments (default: 30)',
+        )
+        parser.add_argument(
+            '--abandon-days',
+            type=int,
+            default=7,
+            help='Mark carts untouched for this many days as abandoned (default: 7)',
+        )
+        parser.add_argument(
+            '--keep-converted',
+            type=int,
+            default=DEFAULT_KEEP_CONVERTED,
+            help=f'Converted carts kept per user (default: {DEFAULT_KEEP_CONVERTED})',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        
+        self.stdout.write('🧹 Starting cart janitor...')
+        if dry_run:
+            self.stdout.write('🔍 DRY RUN MODE - No changes will be made')
+        
+        metrics = run_cart_janitor(
+            batch_size=options['batch_size'],
+            abandon_after=timedelta(days=options['abandon_days']),
+            keep_converted=options['keep_converted'],
+            payment_grace=timedelta(minutes=options['payment_minutes']),
+            dry_run=dry_run,
+        )
+        
+        verb = 'Would' if dry_run else 'Did'
+        self.stdout.write(f"💳 {verb} cancel {metrics['payments_cancelled']} stale pending payment(s)")
+        self.stdout.write(f"🛒 {verb} mark {metrics['carts_abandoned']} cart(s) abandoned")
+        self.stdout.write(f"🗑️ {verb} prune {metrics['converted_carts_pruned']} converted cart(s)")
+        self.stdout.write(self.style.SUCCESS(f"✅ Cart janitor finished in {metrics['duration_ms']} ms"))
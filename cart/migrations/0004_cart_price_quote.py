@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0003_remove_selected_address'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='price_quote',
+            field=models.JSONField(blank=True, editable=False, help_text='Price quote (paisa) for the current cart contents; rebuilt on save', null=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-19 04:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('astrology', '0008_merge_20250807_1725'),
+        ('cart', '0004_cart_price_quote'),
+        ('promo', '0001_initial'),
+        ('puja', '0002_alter_pujaservice_image'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cart',
+            index=models.Index(fields=['status', 'updated_at'], name='cart_cart_status_39ba2f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cart',
+            index=models.Index(fields=['user', 'status', 'created_at'], name='cart_cart_user_id_620288_idx'),
+        ),
+    ]
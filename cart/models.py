@@ -1,9 +1,16 @@
 # cart/models.py
 from django.db import models
 from django.conf import settings
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from django.db.models import Case, Count, F, Max, Q, Value, When
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
 from puja.models import PujaService, Package
 from astrology.models import AstrologyService
 from promo.models import PromoCode
+from core.tracking import FieldTrackerMixin
 
 User = settings.AUTH_USER_MODEL
 
@@ -11,7 +18,55 @@ class ServiceType(models.TextChoices):
     PUJA = 'PUJA', 'Puja Service'
     ASTROLOGY = 'ASTROLOGY', 'Astrology Service'
 
-class Cart(models.Model):
+PENDING_PAYMENT_STATUSES = ['PENDING', 'INITIATED']
+FAILED_PAYMENT_STATUSES = ['FAILED', 'CANCELLED', 'EXPIRED']
+PENDING_PAYMENT_GRACE = timedelta(minutes=30)
+PAYMENT_SUMMARY_FIELDS = (
+    'payment_count', 'failed_count', 'success_count',
+    'pending_count', 'recent_pending_count', 'latest_pending_at'
+)
+
+
+def payment_summary_aggregates(prefix=''):
+    """Conditional aggregates over PaymentOrder rows describing cart deletability"""
+    pending = Q(**{f'{prefix}status__in': PENDING_PAYMENT_STATUSES})
+    return {
+        'payment_count': Count(f'{prefix}id'),
+        'failed_count': Count(f'{prefix}id', filter=Q(**{f'{prefix}status__in': FAILED_PAYMENT_STATUSES})),
+        'success_count': Count(f'{prefix}id', filter=Q(**{f'{prefix}status': 'SUCCESS'})),
+        'pending_count': Count(f'{prefix}id', filter=pending),
+        'recent_pending_count': Count(
+            f'{prefix}id',
+            filter=pending & Q(**{f'{prefix}created_at__gte': timezone.now() - PENDING_PAYMENT_GRACE})
+        ),
+        'latest_pending_at': Max(f'{prefix}created_at', filter=pending),
+    }
+
+
+class CartQuerySet(models.QuerySet):
+    def with_deletion_info(self):
+        """
+        Annotate payment counts and a boolean ``deletable`` on every cart.
+        The counts are conditional aggregates over one join to the cart's
+        payment orders, so a whole cart list is evaluated in a single query.
+        """
+        return self.annotate(**payment_summary_aggregates(prefix='payment_orders__')).annotate(
+            deletable=Case(
+                When(payment_count=0, then=Value(True)),
+                When(failed_count=F('payment_count'), then=Value(True)),
+                When(status='CONVERTED', success_count__gt=0, then=Value(True)),
+                When(pending_count__gt=0, recent_pending_count=0, then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            )
+        )
+
+
+class Cart(FieldTrackerMixin, models.Model):
+    objects = CartQuerySet.as_manager()
+    # Inputs of the price quote; a save changing one rebuilds it
+    tracked_fields = ('service_type', 'puja_service_id', 'package_id', 'astrology_service_id', 'promo_code_id')
+
     class StatusChoices(models.TextChoices):
         ACTIVE = 'ACTIVE', 'Active'
         INACTIVE = 'INACTIVE', 'Inactive'
@@ -62,6 +117,12 @@ class Cart(models.Model):
         choices=StatusChoices.choices, 
         default=StatusChoices.ACTIVE
     )
+    price_quote = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Price quote (paisa) for the current cart contents; rebuilt on save"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -69,6 +130,10 @@ class Cart(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Cart'
         verbose_name_plural = 'Carts'
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+            models.Index(fields=['user', 'status', 'created_at']),
+        ]
 
     def __str__(self):
         return f"Cart {self.cart_id} - {self.user.email}"
@@ -91,6 +156,16 @@ class Cart(models.Model):
                 status=self.StatusChoices.ACTIVE
             ).exclude(pk=self.pk).update(status=self.StatusChoices.INACTIVE)
         
+        # Rebuilt only when a price input changed (or was invalidated); a
+        # converted cart keeps the quote it was paid at
+        if self.status != self.StatusChoices.CONVERTED and (
+            self.price_quote is None or any(self.has_changed(name) for name in self.tracked_fields)
+        ):
+            from .pricing import compute_price_quote
+            self.price_quote = compute_price_quote(self)
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'price_quote'}
+        
         super().save(*args, **kwargs)
 
     @property
@@ -98,22 +173,31 @@ class Cart(models.Model):
         """Get the associated service regardless of type"""
         return self.puja_service or self.astrology_service
 
+    def get_price_quote(self):
+        """Stored price quote, rebuilt lazily if a price input was invalidated"""
+        if self.price_quote is None:
+            from .pricing import compute_price_quote
+            self.price_quote = compute_price_quote(self)
+            if self.pk:
+                Cart.objects.filter(pk=self.pk).update(price_quote=self.price_quote)
+        return self.price_quote
+
     @property
     def total_price(self):
-        """Calculate total price after applying promo code"""
-        base_price = 0
-        if self.puja_service and self.package:
-            base_price = self.package.price
-        elif self.astrology_service:
-            base_price = self.astrology_service.service_price
-        
-        if not self.promo_code:
-            return base_price
-            
-        if self.promo_code.discount_type == 'PERCENTAGE':
-            return base_price * (1 - self.promo_code.discount / 100)
-        return base_price - self.promo_code.discount
+        """Final price in rupees, taken from the stored price quote"""
+        return Decimal(self.get_price_quote()['final_paisa']) / 100
     
+    def payment_summary(self):
+        """
+        Payment counts used for deletion checks. Uses the values annotated by
+        Cart.objects.with_deletion_info() when present, otherwise runs one
+        conditional-aggregation query over PaymentOrder(cart_id).
+        """
+        if hasattr(self, 'payment_count'):
+            return {name: getattr(self, name) for name in PAYMENT_SUMMARY_FIELDS}
+        from payments.models import PaymentOrder
+        return PaymentOrder.objects.filter(cart_id=self.cart_id).aggregate(**payment_summary_aggregates())
+
     def can_be_deleted(self):
         """Check if cart can be safely deleted"""
         # Cart can be deleted if:
@@ -121,123 +205,77 @@ class Cart(models.Model):
         # 2. All payments are FAILED/CANCELLED, OR
         # 3. Cart is CONVERTED and has successful booking, OR
         # 4. Pending payments are older than 30 minutes (auto-cleanup)
-        try:
-            from payments.models import PaymentOrder
-            from django.utils import timezone
-            from datetime import timedelta
-            
-            # Check for payments with this cart ID
-            payments = PaymentOrder.objects.filter(cart_id=self.cart_id)
-            
-            if not payments.exists():
-                return True
-                
-            # Check if all payments are failed/cancelled
-            failed_statuses = ['FAILED', 'CANCELLED', 'EXPIRED']
-            if all(p.status in failed_statuses for p in payments):
-                return True
-                
-            # Check if cart is converted with successful booking
-            if self.status == self.StatusChoices.CONVERTED:
-                successful_payments = payments.filter(status='SUCCESS')
-                if successful_payments.exists():
-                    return True
-            
-            # Check for pending payments older than 30 minutes
-            pending_payments = payments.filter(status__in=['PENDING', 'INITIATED'])
-            if pending_payments.exists():
-                cutoff_time = timezone.now() - timedelta(minutes=30)
-                old_pending_payments = pending_payments.filter(created_at__lt=cutoff_time)
-                
-                # If all pending payments are old, cart can be deleted
-                if old_pending_payments.count() == pending_payments.count():
-                    return True
-                    
-            return False
-            
-        except ImportError:
-            # If payments app is not available, allow deletion
-            return True
+        if hasattr(self, 'deletable'):
+            return self.deletable
+        summary = self.payment_summary()
+        return (
+            summary['payment_count'] == 0
+            or summary['failed_count'] == summary['payment_count']
+            or (self.status == self.StatusChoices.CONVERTED and summary['success_count'] > 0)
+            or (summary['pending_count'] > 0 and summary['recent_pending_count'] == 0)
+        )
     
     def get_deletion_info(self):
         """Get detailed information about why cart cannot be deleted and when it can be"""
-        try:
-            from payments.models import PaymentOrder
-            from django.utils import timezone
-            from datetime import timedelta
-            
-            # Check for payments with this cart ID
-            payments = PaymentOrder.objects.filter(cart_id=self.cart_id)
+        summary = self.payment_summary()
+        
+        if summary['payment_count'] == 0:
+            return {"can_delete": True, "reason": "No payments associated"}
             
-            if not payments.exists():
-                return {"can_delete": True, "reason": "No payments associated"}
-                
-            # Check for pending payments
-            pending_payments = payments.filter(status__in=['PENDING', 'INITIATED'])
-            if pending_payments.exists():
-                cutoff_time = timezone.now() - timedelta(minutes=30)
-                newest_payment = pending_payments.order_by('-created_at').first()
+        # Check for pending payments
+        if summary['pending_count'] > 0:
+            if summary['recent_pending_count'] == 0:
+                return {
+                    "can_delete": True, 
+                    "reason": "Pending payments are older than 30 minutes"
+                }
+            else:
+                # Calculate remaining wait time
+                newest_created_at = summary['latest_pending_at']
+                wait_until = newest_created_at + PENDING_PAYMENT_GRACE
+                remaining_minutes = int((wait_until - timezone.now()).total_seconds() / 60)
+                remaining_minutes = max(0, remaining_minutes)  # Don't show negative time
                 
-                if newest_payment.created_at < cutoff_time:
-                    return {
-                        "can_delete": True, 
-                        "reason": "Pending payments are older than 30 minutes"
-                    }
-                else:
-                    # Calculate remaining wait time
-                    wait_until = newest_payment.created_at + timedelta(minutes=30)
-                    remaining_minutes = int((wait_until - timezone.now()).total_seconds() / 60)
-                    remaining_minutes = max(0, remaining_minutes)  # Don't show negative time
-                    
-                    return {
-                        "can_delete": False,
-                        "reason": "pending_payment_wait",
-                        "message": f"Cart has pending payment(s). Please wait {remaining_minutes} more minute(s) before deletion or complete the payment.",
-                        "wait_time_minutes": remaining_minutes,
-                        "retry_after": wait_until.isoformat(),
-                        "payment_count": pending_payments.count(),
-                        "latest_payment_age_minutes": int((timezone.now() - newest_payment.created_at).total_seconds() / 60)
-                    }
-            
-            # Other reasons cart cannot be deleted
-            if self.status == self.StatusChoices.CONVERTED:
                 return {
                     "can_delete": False,
-                    "reason": "Cart is already converted to booking"
+                    "reason": "pending_payment_wait",
+                    "message": f"Cart has pending payment(s). Please wait {remaining_minutes} more minute(s) before deletion or complete the payment.",
+                    "wait_time_minutes": remaining_minutes,
+                    "retry_after": wait_until.isoformat(),
+                    "payment_count": summary['pending_count'],
+                    "latest_payment_age_minutes": int((timezone.now() - newest_created_at).total_seconds() / 60)
                 }
-                
+        
+        # Other reasons cart cannot be deleted
+        if self.status == self.StatusChoices.CONVERTED:
             return {
-                "can_delete": self.can_be_deleted(),
-                "reason": "Cart has active payments"
+                "can_delete": False,
+                "reason": "Cart is already converted to booking"
             }
             
-        except ImportError:
-            # If payments app is not available, allow deletion
-            return {"can_delete": True, "reason": "Payments app not available"}
+        return {
+            "can_delete": self.can_be_deleted(),
+            "reason": "Cart has active payments"
+        }
     
     def auto_cleanup_old_payments(self):
         """Auto-cleanup pending payments older than 30 minutes"""
         try:
             from payments.models import PaymentOrder
-            from django.utils import timezone
-            from datetime import timedelta
             
-            cutoff_time = timezone.now() - timedelta(minutes=30)
-            
-            # Check for old pending payments with this cart ID
-            old_pending_payments = PaymentOrder.objects.filter(
+            # Mark old pending payments as cancelled (single UPDATE)
+            updated_count = PaymentOrder.objects.filter(
                 cart_id=self.cart_id,
-                status__in=['PENDING', 'INITIATED'],
-                created_at__lt=cutoff_time
+                status__in=PENDING_PAYMENT_STATUSES,
+                created_at__lt=timezone.now() - PENDING_PAYMENT_GRACE
+            ).update(
+                status='CANCELLED',
+                updated_at=timezone.now()
             )
             
-            if old_pending_payments.exists():
-                # Mark old pending payments as cancelled
-                updated_count = old_pending_payments.update(
-                    status='CANCELLED',
-                    updated_at=timezone.now()
-                )
-                
+            if updated_count:
+                self.__dict__.pop('payment_count', None)
+                self.__dict__.pop('deletable', None)
                 return {
                     "cleaned_up": True,
                     "payments_cancelled": updated_count,
@@ -266,4 +304,35 @@ class Cart(models.Model):
                 # If payments app is not available, just delete cart
                 self.delete()
                 return True
-        return False
\ No newline at end of file
+        return False
+
+
+def invalidate_cart_quotes(**filters):
+    """Drop stored quotes of open carts whose price inputs changed; converted carts keep theirs"""
+    return Cart.objects.filter(**filters).exclude(
+        status=Cart.StatusChoices.CONVERTED
+    ).update(price_quote=None)
+
+
+@receiver(post_save, sender=Package)
+def package_price_changed(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_cart_quotes(package=instance)
+
+
+@receiver(post_save, sender=AstrologyService)
+def astrology_service_price_changed(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_cart_quotes(astrology_service=instance)
+
+
+@receiver(post_save, sender=PromoCode)
+def promo_code_changed(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_cart_quotes(promo_code=instance)
+
+
+@receiver(pre_delete, sender=PromoCode)
+def promo_code_deleted(sender, instance, **kwargs):
+    # promo_code is SET_NULL on carts, which bypasses Cart.save
+    invalidate_cart_quotes(promo_code=instance)
@@ -0,0 +1,60 @@
+"""
+Price quotes for carts.
+
+A quote is computed once per cart version (every save) and stored on the
+cart as JSON. Readers such as the cart serializer, payment creation and
+Booking.total_amount all use the stored numbers and do not re-derive them.
+Amounts are integers in paisa.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.utils import timezone
+
+QUOTE_VERSION = 1
+CURRENCY = 'INR'
+
+
+def to_paisa(amount):
+    """Convert a rupee amount (Decimal/float/int) to integer paisa"""
+    return int((Decimal(str(amount or 0)) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def base_price_for(cart):
+    """List price of whatever is in the cart, in rupees"""
+    if cart.puja_service_id and cart.package_id:
+        return cart.package.price
+    if cart.astrology_service_id:
+        return cart.astrology_service.price
+    return Decimal('0')
+
+
+def compute_price_quote(cart):
+    """Build an immutable price quote for the cart's current contents"""
+    base_price = Decimal(str(base_price_for(cart)))
+    base_paisa = to_paisa(base_price)
+
+    discount_paisa = 0
+    promo = cart.promo_code if cart.promo_code_id else None
+    if promo:
+        # PromoCode.apply_discount honours max_discount_amount for percentage codes
+        discounted = promo.apply_discount(base_price)
+        discount_paisa = min(base_paisa, max(0, base_paisa - to_paisa(discounted)))
+
+    taxable_paisa = base_paisa - discount_paisa
+    tax_percent = Decimal(str(getattr(settings, 'CART_TAX_PERCENT', 0)))
+    tax_paisa = to_paisa(Decimal(taxable_paisa) * tax_percent / 10000)
+
+    return {
+        'version': QUOTE_VERSION,
+        'currency': CURRENCY,
+        'base_paisa': base_paisa,
+        'discount_paisa': discount_paisa,
+        'tax_paisa': tax_paisa,
+        'final_paisa': taxable_paisa + tax_paisa,
+        'tax_percent': str(tax_percent),
+        'promo_code': promo.code if promo else None,
+        'package_id': cart.package_id,
+        'astrology_service_id': cart.astrology_service_id,
+        'computed_at': timezone.now().isoformat(),
+    }
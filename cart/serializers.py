@@ -18,6 +18,11 @@ class CartSerializer(serializers.ModelSerializer):
         decimal_places=2, 
         read_only=True
     )
+    price_quote = serializers.JSONField(
+        source='get_price_quote',
+        read_only=True,
+        help_text="Base, discount, tax and final amounts in paisa"
+    )
     can_delete = serializers.BooleanField(
         source='can_be_deleted',
         read_only=True,
@@ -30,7 +35,8 @@ class CartSerializer(serializers.ModelSerializer):
             'id', 'cart_id', 'user', 'service_type', 
             'puja_service', 'package', 'astrology_service',
             'selected_date', 'selected_time', 'promo_code',
-            'status', 'created_at', 'updated_at', 'total_price', 'can_delete'
+            'status', 'created_at', 'updated_at', 'total_price', 'price_quote',
+            'can_delete'
         ]
         read_only_fields = ['user', 'cart_id', 'status', 'created_at', 'updated_at']
 
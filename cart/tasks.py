@@ -0,0 +1,19 @@
+"""
+Celery tasks for cart maintenance
+"""
+from celery import shared_task
+import logging
+
+from .janitor import run_cart_janitor as _run_cart_janitor
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_cart_janitor(batch_size=500):
+    """Cancel stale pending payments, abandon idle carts and prune old converted carts"""
+    try:
+        return _run_cart_janitor(batch_size=batch_size)
+    except Exception as e:
+        logger.error(f"Cart janitor failed: {str(e)}")
+        raise
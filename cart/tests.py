@@ -1,3 +1,203 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from puja.models import PujaCategory, PujaService, Package
+from promo.models import PromoCode
+from payments.models import PaymentOrder
+from .models import Cart
+
+User = get_user_model()
+
+
+class CartPriceQuoteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='customer@example.com',
+            password='testpass123',
+            username='customer'
+        )
+        category = PujaCategory.objects.create(name='Graha Shanti')
+        service = PujaService.objects.create(
+            title='Navgraha Puja',
+            description='Test description',
+            category=category,
+            duration_minutes=90
+        )
+        self.package = Package.objects.create(
+            puja_service=service,
+            location='Delhi',
+            language=Package.Language.HINDI,
+            package_type=Package.PackageType.BASIC,
+            price=Decimal('2000.00'),
+            description='Basic package'
+        )
+        self.promo = PromoCode.objects.create(
+            code='SAVE50',
+            discount=50,
+            discount_type='PERCENT',
+            max_discount_amount=Decimal('300.00'),
+            expiry_date=timezone.now() + timezone.timedelta(days=30),
+        )
+        self.cart = Cart.objects.create(
+            user=self.user,
+            puja_service=service,
+            package=self.package,
+            selected_date=date(2030, 1, 10),
+            selected_time='10:00 AM',
+            cart_id='cart-quote-test',
+            promo_code=self.promo
+        )
+
+    def test_quote_respects_max_discount(self):
+        quote = self.cart.price_quote
+        self.assertEqual(quote['base_paisa'], 200000)
+        self.assertEqual(quote['discount_paisa'], 30000)
+        self.assertEqual(quote['final_paisa'], 170000)
+        self.assertEqual(self.cart.total_price, Decimal('1700'))
+
+    def test_package_change_invalidates_open_carts_only(self):
+        converted = Cart.objects.get(pk=self.cart.pk)
+        converted.status = Cart.StatusChoices.CONVERTED
+        converted.save()
+
+        self.package.price = Decimal('3000.00')
+        self.package.save()
+
+        cart = Cart.objects.get(pk=self.cart.pk)
+        self.assertEqual(cart.price_quote['base_paisa'], 200000)
+
+        Cart.objects.filter(pk=cart.pk).update(status=Cart.StatusChoices.ACTIVE)
+        self.package.save()
+        cart = Cart.objects.get(pk=self.cart.pk)
+        self.assertIsNone(cart.price_quote)
+        self.assertEqual(cart.get_price_quote()['final_paisa'], 270000)
+        self.assertIsNotNone(Cart.objects.get(pk=cart.pk).price_quote)
+
+
+    def test_unrelated_and_converted_saves_keep_the_quote(self):
+        # A price change that sent no signal is not picked up by unrelated saves
+        Package.objects.filter(pk=self.package.pk).update(price=Decimal('3000.00'))
+        cart = Cart.objects.get(pk=self.cart.pk)
+        cart.selected_time = '11:00 AM'
+        cart.save()
+        self.assertEqual(Cart.objects.get(pk=cart.pk).price_quote['base_paisa'], 200000)
+
+        cart.status = Cart.StatusChoices.CONVERTED
+        cart.promo_code = None
+        cart.save()
+        self.assertEqual(Cart.objects.get(pk=cart.pk).price_quote['final_paisa'], 170000)
+
+        cart.status = Cart.StatusChoices.ACTIVE
+        cart.save(update_fields=['status'])
+        cart.promo_code = self.promo
+        cart.save(update_fields=['promo_code'])
+        self.assertEqual(Cart.objects.get(pk=cart.pk).price_quote['base_paisa'], 300000)
+
+class CartFixturesMixin:
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='customer@example.com',
+            password='testpass123',
+            username='customer'
+        )
+        category = PujaCategory.objects.create(name='Graha Shanti')
+        self.service = PujaService.objects.create(
+            title='Navgraha Puja',
+            description='Test description',
+            category=category,
+            duration_minutes=90
+        )
+        self.package = Package.objects.create(
+            puja_service=self.service,
+            location='Delhi',
+            language=Package.Language.HINDI,
+            package_type=Package.PackageType.BASIC,
+            price=Decimal('1000.00'),
+            description='Basic package'
+        )
+
+    def make_cart(self, cart_id, status=Cart.StatusChoices.INACTIVE):
+        return Cart.objects.create(
+            user=self.user,
+            puja_service=self.service,
+            package=self.package,
+            selected_date=date(2030, 1, 10),
+            selected_time='10:00 AM',
+            cart_id=cart_id,
+            status=status
+        )
+
+    def make_payment(self, cart, status, minutes_ago=0):
+        payment = PaymentOrder.objects.create(
+            merchant_order_id=f'ORDER_{cart.cart_id}_{PaymentOrder.objects.count()}',
+            user=self.user,
+            cart_id=cart.cart_id,
+            amount=100000,
+            status=status,
+            redirect_url='https://example.com/redirect'
+        )
+        if minutes_ago:
+            PaymentOrder.objects.filter(pk=payment.pk).update(
+                created_at=timezone.now() - timezone.timedelta(minutes=minutes_ago)
+            )
+
+
+class CartDeletionInfoTests(CartFixturesMixin, TestCase):
+    def test_annotation_matches_instance_checks(self):
+        empty = self.make_cart('empty')
+        failed = self.make_cart('failed')
+        self.make_payment(failed, 'FAILED')
+        recent = self.make_cart('recent')
+        self.make_payment(recent, 'PENDING')
+        stale = self.make_cart('stale')
+        self.make_payment(stale, 'INITIATED', minutes_ago=45)
+        converted = self.make_cart('converted', status=Cart.StatusChoices.CONVERTED)
+        self.make_payment(converted, 'SUCCESS')
+
+        expected = {'empty': True, 'failed': True, 'recent': False, 'stale': True, 'converted': True}
+        with self.assertNumQueries(1):
+            annotated = {cart.cart_id: cart.can_be_deleted() for cart in Cart.objects.with_deletion_info()}
+        self.assertEqual(annotated, expected)
+
+        for cart in Cart.objects.all():
+            self.assertEqual(cart.can_be_deleted(), expected[cart.cart_id])
+
+        info = Cart.objects.get(cart_id='recent').get_deletion_info()
+        self.assertEqual(info['reason'], 'pending_payment_wait')
+        self.assertEqual(info['payment_count'], 1)
+
+
+class CartJanitorTests(CartFixturesMixin, TestCase):
+    def test_janitor_bulk_cleanup(self):
+        from booking.models import Booking
+        from .janitor import run_cart_janitor
+
+        converted = [self.make_cart(f'converted-{i}', status=Cart.StatusChoices.CONVERTED) for i in range(5)]
+        oldest = converted[0]
+        booking = Booking.objects.create(
+            user=self.user, cart=oldest, selected_date=date(2030, 1, 10), selected_time='10:00'
+        )
+        self.make_payment(oldest, 'SUCCESS')
+        stale_pending = self.make_cart('stale-pending')
+        self.make_payment(stale_pending, 'PENDING', minutes_ago=45)
+        idle = self.make_cart('idle')
+        Cart.objects.filter(pk=idle.pk).update(updated_at=timezone.now() - timezone.timedelta(days=10))
+
+        dry = run_cart_janitor(dry_run=True)
+        self.assertEqual(Cart.objects.filter(status=Cart.StatusChoices.CONVERTED).count(), 5)
+
+        metrics = run_cart_janitor(batch_size=1)
+        self.assertEqual(metrics['payments_cancelled'], 1)
+        self.assertEqual(metrics['converted_carts_pruned'], 2)
+        self.assertEqual(dry['converted_carts_pruned'], 2)
+        self.assertEqual(metrics['carts_abandoned'], 1)
 
-# Create your tests here.
+        self.assertFalse(Cart.objects.filter(pk=oldest.pk).exists())
+        booking.refresh_from_db()
+        self.assertIsNone(booking.cart_id)
+        self.assertFalse(PaymentOrder.objects.filter(cart_id=oldest.cart_id).exists())
+        self.assertEqual(Cart.objects.get(pk=idle.pk).status, Cart.StatusChoices.ABANDONED)
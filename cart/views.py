@@ -21,7 +21,13 @@ class CartViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return Cart.objects.none()
-        return self.queryset.filter(user=self.request.user)
+        queryset = self.queryset.filter(user=self.request.user).select_related(
+            'puja_service', 'package', 'astrology_service', 'promo_code'
+        )
+        if self.action in ['list', 'retrieve', 'active', 'destroy', 'deletion_status']:
+            # Deletability for every cart in the same query
+            queryset = queryset.with_deletion_info()
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -69,8 +75,8 @@ class CartViewSet(viewsets.ModelViewSet):
             
             # If cart is converted, clear payments reference first
             if cart.status == Cart.StatusChoices.CONVERTED:
-                from payment.models import Payment
-                Payment.objects.filter(cart=cart).update(cart=None)
+                from payments.models import PaymentOrder
+                PaymentOrder.objects.filter(cart_id=cart.cart_id).update(cart_id=None)
             
             cart.delete()
             return Response(response_data, status=status.HTTP_200_OK)
@@ -170,23 +176,22 @@ class CartViewSet(viewsets.ModelViewSet):
     def deletion_status(self, request, pk=None):
         """Check if cart can be deleted and get detailed timing information"""
         cart = self.get_object()
-        from payment.models import Payment, PaymentStatus
+        from payments.models import PaymentOrder
         
         # Get detailed deletion information
         deletion_info = cart.get_deletion_info()
         
         # Get payment summary
-        payments = Payment.objects.filter(cart=cart)
+        payments = list(PaymentOrder.objects.filter(cart_id=cart.cart_id).order_by('-created_at'))
         payment_summary = []
         
         for payment in payments:
             payment_summary.append({
-                'transaction_id': payment.transaction_id,
+                'merchant_order_id': payment.merchant_order_id,
                 'status': payment.status,
-                'amount': str(payment.amount),
+                'amount': str(payment.amount_in_rupees),
                 'created_at': payment.created_at,
-                'age_minutes': int((timezone.now() - payment.created_at).total_seconds() / 60),
-                'has_booking': bool(payment.booking)
+                'age_minutes': int((timezone.now() - payment.created_at).total_seconds() / 60)
             })
         
         # Check if auto-cleanup can be performed
@@ -200,7 +205,7 @@ class CartViewSet(viewsets.ModelViewSet):
         response_data = {
             'can_delete': deletion_info["can_delete"],
             'cart_status': cart.status,
-            'payments_count': payments.count(),
+            'payments_count': len(payments),
             'payments': payment_summary,
             'deletion_info': deletion_info
         }
@@ -0,0 +1,59 @@
+from django.contrib import admin
+from .hll import HyperLogLog
+from .models import BookingEvent, ImageIngestJob, ScheduledReminder, VisitorSketch
+
+
+@admin.register(BookingEvent)
+class BookingEventAdmin(admin.ModelAdmin):
+    list_display = ('booking_type', 'booking_ref', 'kind', 'from_value', 'to_value', 'actor', 'created_at')
+    list_filter = ('booking_type', 'kind')
+    search_fields = ('booking_ref', 'actor__email')
+    raw_id_fields = ('actor',)
+    date_hierarchy = 'created_at'
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ImageIngestJob)
+class ImageIngestJobAdmin(admin.ModelAdmin):
+    list_display = ('content_type', 'object_id', 'slot', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'content_type', 'slot')
+    readonly_fields = [field.name for field in ImageIngestJob._meta.fields]
+    actions = ['retry_jobs']
+
+    @admin.action(description='Retry selected failed jobs')
+    def retry_jobs(self, request, queryset):
+        from .tasks import process_image_ingest_job
+
+        failed = list(queryset.filter(status=ImageIngestJob.Status.FAILED).values_list('pk', flat=True))
+        for job_id in failed:
+            process_image_ingest_job.delay(job_id)
+        self.message_user(request, f"Queued {len(failed)} job(s) for retry")
+
+
+@admin.register(ScheduledReminder)
+class ScheduledReminderAdmin(admin.ModelAdmin):
+    list_display = ('booking_type', 'booking_id', 'reminder_type', 'due_at', 'status', 'attempts', 'sent_at')
+    list_filter = ('status', 'booking_type', 'reminder_type')
+    readonly_fields = ('claimed_at', 'sent_at', 'attempts', 'last_error', 'created_at', 'updated_at')
+    date_hierarchy = 'due_at'
+
+
+@admin.register(VisitorSketch)
+class VisitorSketchAdmin(admin.ModelAdmin):
+    list_display = ('content_type', 'object_id', 'day', 'estimated_visitors', 'updated_at')
+    list_filter = ('content_type',)
+    exclude = ('registers',)
+    readonly_fields = ('content_type', 'object_id', 'day', 'estimated_visitors', 'updated_at')
+    date_hierarchy = 'day'
+
+    @admin.display(description='Unique visitors (est.)')
+    def estimated_visitors(self, obj):
+        return HyperLogLog.from_bytes(obj.registers).count()
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,45 @@
+"""
+Version counters for version-keyed caches.
+
+A versioned cache stores its entries under ``<name>:<version>:...`` and
+orphans all of them at once by bumping the version. Counters kept with
+``cache.incr`` are only as shared as the cache backend: on a per-process
+cache (LocMem) a bump in one worker leaves every other worker serving its
+old entries. These counters live in CacheVersion rows instead, so a bump
+is an atomic UPDATE every process sees.
+
+Reads go through the cache for ``READ_CACHE_SECONDS``, so a hot endpoint
+pays for the version query at most once per process per window; the
+process that bumps sees its own change at once, others within the window.
+"""
+from django.core.cache import cache
+from django.db.models import F
+
+READ_CACHE_SECONDS = 5
+
+
+def _cache_key(name):
+    return f"cache_version:{name}"
+
+
+def get_version(name):
+    from .models import CacheVersion
+
+    version = cache.get(_cache_key(name))
+    if version is None:
+        version = CacheVersion.objects.filter(name=name).values_list('version', flat=True).first() or 1
+        cache.set(_cache_key(name), version, READ_CACHE_SECONDS)
+    return version
+
+
+def bump_version(name):
+    """Increment the version of ``name``; returns the new version"""
+    from .models import CacheVersion
+
+    if not CacheVersion.objects.filter(name=name).update(version=F('version') + 1):
+        _, created = CacheVersion.objects.get_or_create(name=name, defaults={'version': 2})
+        if not created:
+            # Created by a concurrent bump in between
+            CacheVersion.objects.filter(name=name).update(version=F('version') + 1)
+    cache.delete(_cache_key(name))
+    return get_version(name)
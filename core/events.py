@@ -0,0 +1,150 @@
+"""
+Booking event log helpers.
+
+``BookingEventMixin`` tracks the booking fields (see core.tracking) and,
+after each save, appends the differences to ``core.BookingEvent``.
+No extra read is needed to know the previous values.
+"""
+
+import logging
+
+from django.dispatch import Signal
+
+from .tracking import FieldTrackerMixin
+
+logger = logging.getLogger(__name__)
+
+# Sent after events are appended: sender=booking model class, instance, events
+booking_events_recorded = Signal()
+
+
+def _as_event_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'pk'):
+        return str(value.pk)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+class BookingEventMixin(FieldTrackerMixin):
+    """
+    Model mixin for booking models.
+
+    Subclasses declare:
+        booking_event_type   - one of BookingEvent.BookingType
+        booking_ref_field    - field holding the public reference (e.g. 'book_id')
+        schedule_fields      - (date_field, time_field) used for reschedule events
+        assignment_field     - FK field whose changes are recorded as assignments (optional)
+        meet_link_field      - URL field whose first value is recorded (optional)
+        calendar_fields      - fields rendered into the booking's calendar event
+                               (booking.calendar_feeds); tracked as well
+
+    Callers may set ``instance.event_actor = user`` before saving to attribute
+    the change; ``ModelSerializer.save(event_actor=user)`` does the same.
+    """
+    booking_event_type = None
+    booking_ref_field = None
+    schedule_fields = ()
+    assignment_field = None
+    meet_link_field = None
+    calendar_fields = ()
+
+    def _event_field_names(self):
+        names = ['status', *self.schedule_fields]
+        if self.assignment_field:
+            names.append(self.assignment_field + '_id')
+        if self.meet_link_field:
+            names.append(self.meet_link_field)
+        return names
+
+    def tracked_field_names(self):
+        return list(dict.fromkeys([*self.tracked_fields, *self.calendar_fields, *self._event_field_names()]))
+
+    def _schedule_value(self, values):
+        return ' '.join(_as_event_value(values.get(name)) for name in self.schedule_fields).strip()
+
+    def pending_booking_events(self, created):
+        """Build (unsaved) BookingEvent rows describing this save"""
+        from core.models import BookingEvent
+
+        current = {name: self.tracked_value(name) for name in self._event_field_names()}
+        base = {
+            'booking_type': self.booking_event_type,
+            'booking_id': self.pk,
+            'booking_ref': (getattr(self, self.booking_ref_field, '') or '') if self.booking_ref_field else '',
+            'actor': getattr(self, 'event_actor', None),
+        }
+
+        if created:
+            return [BookingEvent(kind=BookingEvent.Kind.CREATED, to_value=_as_event_value(self.status), **base)]
+
+        changes = self.saved_changes
+        if changes is None:
+            # Instance was not loaded from the database; nothing to diff against
+            return []
+        previous = {**current, **changes}
+
+        events = []
+        if previous.get('status') != current['status']:
+            events.append(BookingEvent(
+                kind=BookingEvent.Kind.STATUS_CHANGED,
+                from_value=_as_event_value(previous.get('status')),
+                to_value=_as_event_value(current['status']),
+                **base
+            ))
+
+        if self.schedule_fields and any(previous.get(name) != current[name] for name in self.schedule_fields):
+            events.append(BookingEvent(
+                kind=BookingEvent.Kind.RESCHEDULED,
+                from_value=self._schedule_value(previous),
+                to_value=self._schedule_value(current),
+                **base
+            ))
+
+        if self.assignment_field:
+            name = self.assignment_field + '_id'
+            if previous.get(name) != current[name]:
+                events.append(BookingEvent(
+                    kind=BookingEvent.Kind.ASSIGNED,
+                    from_value=_as_event_value(previous.get(name)),
+                    to_value=_as_event_value(current[name]),
+                    **base
+                ))
+
+        if self.meet_link_field and not previous.get(self.meet_link_field) and current[self.meet_link_field]:
+            events.append(BookingEvent(
+                kind=BookingEvent.Kind.MEET_LINK_ADDED,
+                to_value=_as_event_value(current[self.meet_link_field]),
+                **base
+            ))
+
+        return events
+
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        super().save(*args, **kwargs)
+        events = self.pending_booking_events(created)
+        if record_booking_events(events):
+            booking_events_recorded.send(sender=type(self), instance=self, events=events)
+
+    def booking_timeline(self):
+        """Events for this booking, oldest first"""
+        from core.models import BookingEvent
+        return BookingEvent.objects.for_booking(self.booking_event_type, self.pk)
+
+
+def record_booking_events(events):
+    """Append events to the log; logging must never break the booking save"""
+    if not events:
+        return False
+    from django.db import transaction
+    from core.models import BookingEvent
+    try:
+        with transaction.atomic():
+            BookingEvent.objects.bulk_create(events)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to record booking events: {str(e)}")
+        return False
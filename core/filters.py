@@ -0,0 +1,42 @@
+"""
+Relevance-ranked ``?search=`` shared by the apps' full-text indexes
+(blog.search, puja.search).
+"""
+from django.db.models import Case, When
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+
+def order_by_relevance(queryset, ids):
+    """Rows of ``queryset`` with a pk in ``ids``, in the order of ``ids``"""
+    if not ids:
+        return queryset.none()
+    relevance = Case(*[When(pk=pk, then=position) for position, pk in enumerate(ids)])
+    return queryset.filter(pk__in=ids).order_by(relevance)
+
+
+class RankedSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by a full-text index. Subclasses return the
+    matching ids best first from ``ranked_ids``; results are limited to
+    them and ordered by relevance, unless the view has an OrderingFilter
+    and an explicit ``?ordering=`` is given (put this filter after it).
+    The schema parameters are inherited from DRF's SearchFilter.
+    """
+
+    def ranked_ids(self, request, query, queryset):
+        raise NotImplementedError
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+
+        ids = self.ranked_ids(request, query, queryset)
+        if not ids:
+            return queryset.none()
+        if request.query_params.get(api_settings.ORDERING_PARAM) and any(
+            issubclass(backend, filters.OrderingFilter) for backend in getattr(view, 'filter_backends', ())
+        ):
+            return queryset.filter(pk__in=ids)
+        return order_by_relevance(queryset, ids)
@@ -0,0 +1,237 @@
+"""
+Shared image ingestion pipeline.
+
+The request only validates the upload and stores it locally
+(``default_storage``), then records an ImageIngestJob and returns. The job
+runs after commit on a Celery worker (``core.tasks.process_image_ingest_job``):
+it decodes the source once, renders every variant, uploads them
+concurrently on a thread pool and writes the resulting URLs back to the
+model in one save.
+
+Models declare their image slots as::
+
+    image_ingest_variants = {
+        'profile_picture': (
+            ImageVariant('profile_picture_url', None, 'user_profiles'),
+            ImageVariant('profile_thumbnail_url', (150, 150), 'user_profiles/thumbnails', prefix='thumb_'),
+        ),
+    }
+
+A variant with ``size=None`` uploads the original bytes unchanged, and a
+``ResponsiveImage`` entry uploads a width/format ladder and stores its
+manifest (see core.image_variants).
+"""
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+from rest_framework import serializers
+
+from .image_variants import ResponsiveImage, build_manifest, render_ladder, rendition_file_name
+from .uploads import upload_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPLOAD_WORKERS = 4
+SOURCE_FOLDER = 'image_ingest'
+DEFAULT_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')
+
+
+class ImageVariant(NamedTuple):
+    field: str
+    size: Optional[Tuple[int, int]]
+    folder: str
+    prefix: str = ''
+    quality: int = 85
+
+
+def read_upload(image_file, allowed_extensions=DEFAULT_EXTENSIONS, error_message=None):
+    """Read and validate an uploaded image; returns (bytes, extension)"""
+    if hasattr(image_file, 'read'):
+        if hasattr(image_file, 'seek'):
+            image_file.seek(0)
+        file_bytes = image_file.read()
+    else:
+        with open(image_file, 'rb') as f:
+            file_bytes = f.read()
+
+    try:
+        Image.open(BytesIO(file_bytes)).verify()
+    except Exception as e:
+        raise serializers.ValidationError(f"Invalid image file: {str(e)}")
+
+    ext = os.path.splitext(getattr(image_file, 'name', '') or '')[1].lower()
+    if ext not in allowed_extensions:
+        raise serializers.ValidationError(
+            error_message or f"Unsupported image format. Please upload {', '.join(e[1:].upper() for e in allowed_extensions)}."
+        )
+    return file_bytes, ext
+
+
+def _variants_for(model, slot):
+    try:
+        return model.image_ingest_variants[slot]
+    except (AttributeError, KeyError):
+        raise ValueError(f"{model.__name__} has no image slot '{slot}'")
+
+
+def _enqueue(instance, slot, source_path, file_name, keep_source):
+    from django.contrib.contenttypes.models import ContentType
+    from .models import ImageIngestJob
+
+    _variants_for(type(instance), slot)
+    content_type = ContentType.objects.get_for_model(instance)
+    active = ImageIngestJob.objects.filter(
+        content_type=content_type, object_id=instance.pk, slot=slot,
+        status__in=[ImageIngestJob.Status.PENDING, ImageIngestJob.Status.PROCESSING]
+    )
+    existing = active.filter(source_path=source_path).first()
+    if existing:
+        return existing
+
+    # A newer upload wins: older jobs for the same slot must not overwrite it
+    active.update(status=ImageIngestJob.Status.SUPERSEDED, updated_at=timezone.now())
+    job = ImageIngestJob.objects.create(
+        content_type=content_type,
+        object_id=instance.pk,
+        slot=slot,
+        source_path=source_path,
+        file_name=file_name,
+        keep_source=keep_source,
+    )
+
+    def dispatch():
+        from .tasks import process_image_ingest_job
+        process_image_ingest_job.delay(job.pk)
+
+    transaction.on_commit(dispatch)
+    return job
+
+
+def ingest_image(instance, slot, file_bytes, file_name):
+    """Store validated bytes locally and queue variant processing for ``instance``"""
+    source_path = default_storage.save(
+        os.path.join(SOURCE_FOLDER, f"{uuid.uuid4()}{os.path.splitext(file_name)[1]}"),
+        ContentFile(file_bytes)
+    )
+    return _enqueue(instance, slot, source_path, file_name, keep_source=False)
+
+
+def ingest_stored_image(instance, slot, storage_name, file_name=None):
+    """Queue processing for a file the model already keeps in default_storage"""
+    return _enqueue(instance, slot, storage_name, file_name or os.path.basename(storage_name), keep_source=True)
+
+
+def render_variant(image, source_bytes, variant):
+    """JPEG bytes for ``variant`` from an already decoded image"""
+    if variant.size is None:
+        return source_bytes
+    img = image.convert('RGB')
+    img.thumbnail(variant.size, Image.Resampling.LANCZOS)
+    output = BytesIO()
+    img.save(output, format='JPEG', quality=variant.quality, optimize=True)
+    return output.getvalue()
+
+
+def _variant_file_name(file_name, variant):
+    if variant.size is None:
+        return file_name
+    return f"{variant.prefix}{os.path.splitext(file_name)[0]}.jpg"
+
+
+def upload_variants(source_bytes, file_name, variants, uploader=None, max_workers=None, source=None):
+    """
+    Render every variant from one decode and upload them concurrently.
+    Returns {field: url} for fixed variants and {field: manifest} for
+    ResponsiveImage entries.
+    """
+    uploader = uploader or upload_file
+    uploads = []  # (field, rendition or None, payload, file name, folder)
+    with Image.open(BytesIO(source_bytes)) as image:
+        image.load()
+        for variant in variants:
+            if isinstance(variant, ResponsiveImage):
+                for rendition in render_ladder(image, variant.widths, variant.formats):
+                    uploads.append((
+                        variant.field, rendition, rendition.payload,
+                        rendition_file_name(file_name, rendition), os.path.join(variant.folder, 'responsive')
+                    ))
+            else:
+                uploads.append((
+                    variant.field, None, render_variant(image, source_bytes, variant),
+                    _variant_file_name(file_name, variant), variant.folder
+                ))
+
+    max_workers = max_workers or getattr(settings, 'IMAGE_INGEST_UPLOAD_WORKERS', DEFAULT_UPLOAD_WORKERS)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(uploads)))) as pool:
+        futures = [
+            (field, rendition, pool.submit(uploader, payload, name, folder=folder))
+            for field, rendition, payload, name, folder in uploads
+        ]
+        results, ladders = {}, {}
+        for field, rendition, future in futures:
+            if rendition is None:
+                results[field] = future.result()
+            else:
+                ladders.setdefault(field, []).append((rendition, future.result()))
+
+    for field, renditions in ladders.items():
+        results[field] = build_manifest(source or file_name, renditions)
+    return results
+
+
+def process_job(job_id):
+    """Run one ingestion job; safe to call again for a finished job"""
+    from .models import ImageIngestJob
+
+    claimed = ImageIngestJob.objects.filter(
+        pk=job_id, status__in=[ImageIngestJob.Status.PENDING, ImageIngestJob.Status.FAILED]
+    ).update(status=ImageIngestJob.Status.PROCESSING, updated_at=timezone.now())
+    if not claimed:
+        return None
+    job = ImageIngestJob.objects.select_related('content_type').get(pk=job_id)
+    job.attempts += 1
+
+    try:
+        model = job.content_type.model_class()
+        with default_storage.open(job.source_path, 'rb') as source:
+            source_bytes = source.read()
+        urls = upload_variants(
+            source_bytes, job.file_name, _variants_for(model, job.slot), source=job.source_path
+        )
+
+        with transaction.atomic():
+            current = ImageIngestJob.objects.select_for_update().get(pk=job.pk)
+            if current.status == ImageIngestJob.Status.SUPERSEDED:
+                job.status = ImageIngestJob.Status.SUPERSEDED
+            else:
+                instance = model._default_manager.get(pk=job.object_id)
+                for field, url in urls.items():
+                    setattr(instance, field, url)
+                update_fields = list(urls)
+                if any(f.name == 'updated_at' for f in model._meta.concrete_fields):
+                    update_fields.append('updated_at')
+                instance.save(update_fields=update_fields)
+                job.status = ImageIngestJob.Status.DONE
+            job.results = urls
+            job.error = ''
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'results', 'error', 'attempts', 'finished_at', 'updated_at'])
+
+        if not job.keep_source:
+            default_storage.delete(job.source_path)
+    except Exception as e:
+        logger.error(f"Image ingest job {job.pk} failed: {e}")
+        job.status = ImageIngestJob.Status.FAILED
+        job.error = str(e)
+        job.save(update_fields=['status', 'error', 'attempts', 'updated_at'])
+    return job
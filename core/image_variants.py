@@ -0,0 +1,132 @@
+"""
+Responsive image variants.
+
+From one decoded image we render a width ladder (IMAGE_VARIANT_WIDTHS) in
+every modern format (IMAGE_VARIANT_FORMATS, AVIF/WebP by default) plus a
+JPEG fallback. Each width is downscaled from the previous, larger step, so
+the source is decoded exactly once. The uploaded files are described by a
+manifest stored on the model (``image_manifest``)::
+
+    {
+        "version": 1,
+        "source": "gallery/originals/....jpg",
+        "width": 1600, "height": 900,
+        "fallback": "<largest JPEG url>",
+        "variants": [{"format": "avif", "width": 320, "height": 180, "url": "..."}, ...]
+    }
+
+responsive_image_data() turns a manifest into ``srcset`` strings ready for
+``<picture>``/``<img>`` markup.
+"""
+import os
+from io import BytesIO
+from typing import NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+MANIFEST_VERSION = 1
+DEFAULT_WIDTHS = (320, 640, 960, 1280, 1920)
+DEFAULT_FORMATS = ('avif', 'webp')
+FALLBACK_FORMAT = 'jpeg'
+
+ENCODERS = {
+    'avif': ('AVIF', 'avif', {'quality': 50}),
+    'webp': ('WEBP', 'webp', {'quality': 75, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 80, 'optimize': True, 'progressive': True}),
+}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+class ResponsiveImage(NamedTuple):
+    """Image slot entry that produces a manifest instead of a single URL"""
+    field: str
+    folder: str
+    widths: Optional[Tuple[int, ...]] = None
+    formats: Optional[Tuple[str, ...]] = None
+
+
+class Rendition(NamedTuple):
+    format: str
+    width: int
+    height: int
+    payload: bytes
+    extension: str
+
+
+def ladder_widths(source_width, widths=None):
+    """Ladder steps that do not upscale; a small image gets its own width as the only step"""
+    widths = sorted(widths or getattr(settings, 'IMAGE_VARIANT_WIDTHS', DEFAULT_WIDTHS))
+    steps = [width for width in widths if width < source_width]
+    if source_width <= widths[-1]:
+        steps.append(source_width)
+    return steps or [widths[-1]]
+
+
+def render_ladder(image, widths=None, formats=None):
+    """Encode every (width, format) rendition of an already decoded image"""
+    formats = list(formats or getattr(settings, 'IMAGE_VARIANT_FORMATS', DEFAULT_FORMATS))
+    if FALLBACK_FORMAT not in formats:
+        formats.append(FALLBACK_FORMAT)
+
+    current = ImageOps.exif_transpose(image).convert('RGB')
+    renditions = []
+    for width in sorted(ladder_widths(current.width, widths), reverse=True):
+        if width < current.width:
+            height = max(1, round(current.height * width / current.width))
+            current = current.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            pil_format, extension, options = ENCODERS[fmt]
+            output = BytesIO()
+            current.save(output, format=pil_format, **options)
+            renditions.append(Rendition(fmt, current.width, current.height, output.getvalue(), extension))
+    return renditions
+
+
+def rendition_file_name(file_name, rendition):
+    return f"{os.path.splitext(file_name)[0]}-{rendition.width}w.{rendition.extension}"
+
+
+def build_manifest(source, renditions_with_urls):
+    """Manifest from [(Rendition, url)]"""
+    variants = sorted(
+        ({'format': r.format, 'width': r.width, 'height': r.height, 'url': url} for r, url in renditions_with_urls),
+        key=lambda v: (v['format'], v['width'])
+    )
+    fallbacks = [v for v in variants if v['format'] == FALLBACK_FORMAT]
+    largest = fallbacks[-1] if fallbacks else variants[-1]
+    return {
+        'version': MANIFEST_VERSION,
+        'source': source,
+        'width': largest['width'],
+        'height': largest['height'],
+        'fallback': largest['url'],
+        'variants': variants,
+    }
+
+
+def _srcset(variants):
+    return ', '.join(f"{v['url']} {v['width']}w" for v in variants)
+
+
+def responsive_image_data(manifest):
+    """``srcset``-ready representation of a manifest, or None without one"""
+    if not manifest or not manifest.get('variants'):
+        return None
+    by_format = {}
+    for variant in manifest['variants']:
+        by_format.setdefault(variant['format'], []).append(variant)
+    return {
+        'src': manifest['fallback'],
+        'width': manifest['width'],
+        'height': manifest['height'],
+        'srcset': _srcset(by_format.get(FALLBACK_FORMAT, [])),
+        'sources': [
+            {'type': MIME_TYPES[fmt], 'srcset': _srcset(variants)}
+            for fmt, variants in by_format.items() if fmt != FALLBACK_FORMAT
+        ],
+    }
+
+
+def manifest_is_current(manifest, source):
+    return bool(manifest) and manifest.get('version') == MANIFEST_VERSION and manifest.get('source') == source
@@ -0,0 +1,49 @@
+"""
+Queue responsive image ladders for stored images that do not have one yet
+Covers gallery items, blog featured images and events
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.image_ingest import ingest_stored_image
+from core.image_variants import manifest_is_current
+
+
+class Command(BaseCommand):
+    help = 'Queue AVIF/WebP/JPEG responsive variants for stored images missing a current manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count what would be queued',
+        )
+
+    def handle(self, *args, **options):
+        from blog.models import BlogPost
+        from gallery.models import GalleryItem
+        from misc.models import Event
+
+        targets = [
+            (GalleryItem, 'original_image', 'image_manifest', 'original_image'),
+            (BlogPost, 'featured_image', 'featured_image_manifest', 'featured_image'),
+            (Event, 'original_image', 'image_manifest', 'event_image'),
+        ]
+        dry_run = options['dry_run']
+        if dry_run:
+            self.stdout.write('🔍 DRY RUN MODE - No jobs will be queued')
+
+        for model, image_field, manifest_field, slot in targets:
+            queued = 0
+            rows = model.objects.exclude(**{image_field: ''}).exclude(**{f'{image_field}__isnull': True})
+            for instance in rows.iterator():
+                name = getattr(instance, image_field).name
+                if manifest_is_current(getattr(instance, manifest_field), name):
+                    continue
+                if not dry_run:
+                    ingest_stored_image(instance, slot, name)
+                queued += 1
+            verb = 'Would queue' if dry_run else 'Queued'
+            self.stdout.write(f'🖼️ {verb} {queued} {model._meta.verbose_name_plural}')
+
+        self.stdout.write(self.style.SUCCESS('✅ Responsive image backfill finished'))
@@ -0,0 +1,29 @@
+"""
+Sitemap rebuild
+Rewrites every sitemap chunk, the sitemap index and the blog RSS feed (see core.sitemaps)
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.sitemaps import SECTIONS, rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Regenerate the pre-gzipped sitemap files and blog RSS feed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many chunks each section needs',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            for section in SECTIONS:
+                self.stdout.write(f'🔍 DRY RUN MODE - {section.name}: {section.chunk_count()} chunk(s)')
+            return
+
+        self.stdout.write('🗺️ Rebuilding sitemaps...')
+        changed = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f'✅ {changed} file(s) changed'))
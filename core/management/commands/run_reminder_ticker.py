@@ -0,0 +1,71 @@
+"""
+Reminder ticker
+Sends booking reminders whose due time has passed (see core.reminders)
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.reminders import DEFAULT_BATCH_SIZE, backfill_reminders, dispatch_due_reminders
+
+
+class Command(BaseCommand):
+    help = 'Claim and send due booking reminders in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Reminders claimed per query (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep ticking instead of running once',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=30,
+            help='Seconds between ticks with --loop (default: 30)',
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='First plan reminders for upcoming confirmed bookings',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count due reminders',
+        )
+
+    def handle(self, *args, **options):
+        from core.models import ScheduledReminder
+
+        if options['dry_run']:
+            due = ScheduledReminder.objects.filter(
+                status=ScheduledReminder.Status.PENDING, due_at__lte=timezone.now()
+            ).count()
+            self.stdout.write(f'🔍 DRY RUN MODE - {due} reminder(s) due')
+            return
+
+        if options['backfill']:
+            planned = backfill_reminders()
+            self.stdout.write(f'📅 Planned reminders for {planned} upcoming booking(s)')
+
+        while True:
+            counts = dispatch_due_reminders(batch_size=options['batch_size'])
+            if any(counts.values()):
+                self.stdout.write(
+                    f"🔔 Sent {counts['sent']}, skipped {counts['skipped']}, "
+                    f"retrying {counts['retried']}, failed {counts['failed']}"
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('✅ Reminder tick finished'))
@@ -0,0 +1,155 @@
+"""
+Startup benchmark
+Measures django.setup() in fresh interpreters and reports import-time side effects
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter. An audit hook records side effects that
+# should never happen while apps are imported: network connections,
+# subprocesses, files opened for writing and started threads.
+CHILD_SCRIPT = r'''
+import json, os, sys, threading, time
+
+events = []
+def audit(event, args):
+    if event == 'socket.connect':
+        events.append(('network', repr(args[1])))
+    elif event == 'subprocess.Popen':
+        events.append(('subprocess', repr(args[1])[:200]))
+    elif event == 'open' and isinstance(args[1], str) and any(flag in args[1] for flag in 'wax+'):
+        events.append(('file_write', str(args[0])))
+sys.addaudithook(audit)
+
+threads_before = {thread.ident for thread in threading.enumerate()}
+started = time.perf_counter()
+import django
+django.setup()
+elapsed = time.perf_counter() - started
+for thread in threading.enumerate():
+    if thread.ident not in threads_before:
+        events.append(('thread', thread.name))
+
+print(json.dumps({'setup_ms': elapsed * 1000, 'side_effects': events, 'modules': len(sys.modules)}))
+'''
+
+
+def _run_child(python, importtime=False):
+    command = [python]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', CHILD_SCRIPT]
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'okpuja_backend.settings'))
+    result = subprocess.run(command, capture_output=True, text=True, cwd=settings.BASE_DIR, env=env)
+    if result.returncode != 0:
+        raise CommandError(f"django.setup() failed in child process:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def _import_times_by_package(importtime_output):
+    """Self time (ms) per top-level package from ``-X importtime`` output"""
+    totals = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, _cumulative, name = [part.strip() for part in line[len('import time:'):].split('|', 2)]
+            package = name.strip().split('.')[0]
+            totals[package] = totals.get(package, 0) + int(self_us) / 1000
+        except ValueError:
+            continue
+    return totals
+
+
+class Command(BaseCommand):
+    help = 'Benchmark django.setup() in fresh interpreters and report import-time side effects'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='Number of fresh interpreter runs (default: 5)',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Number of slowest packages to list (default: 15)',
+        )
+        parser.add_argument(
+            '--max-ms',
+            type=float,
+            help='Fail if the median setup time exceeds this many milliseconds',
+        )
+        parser.add_argument(
+            '--fail-on-side-effects',
+            action='store_true',
+            help='Fail if any app causes side effects at import time',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the results as JSON',
+        )
+
+    def handle(self, *args, **options):
+        python = sys.executable
+        runs = [_run_child(python)[0] for _ in range(max(1, options['runs']))]
+        profile, importtime_output = _run_child(python, importtime=True)
+
+        timings = [run['setup_ms'] for run in runs]
+        local_apps = {config.name.split('.')[0] for config in self._project_apps()}
+        packages = _import_times_by_package(importtime_output)
+        report = {
+            'runs': len(runs),
+            'median_ms': round(statistics.median(timings), 1),
+            'min_ms': round(min(timings), 1),
+            'max_ms': round(max(timings), 1),
+            'modules_loaded': profile['modules'],
+            'side_effects': profile['side_effects'],
+            'slowest_packages': [
+                {'package': name, 'self_ms': round(ms, 1), 'project_app': name in local_apps}
+                for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:options['top']]
+            ],
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._print_report(report)
+
+        if options['max_ms'] is not None and report['median_ms'] > options['max_ms']:
+            raise CommandError(f"Median setup time {report['median_ms']} ms exceeds {options['max_ms']} ms")
+        if options['fail_on_side_effects'] and report['side_effects']:
+            raise CommandError(f"{len(report['side_effects'])} import-time side effect(s) found")
+
+    def _project_apps(self):
+        from django.apps import apps
+        base_dir = str(settings.BASE_DIR)
+        return [config for config in apps.get_app_configs() if str(config.path).startswith(base_dir)]
+
+    def _print_report(self, report):
+        self.stdout.write('⏱️ django.setup() startup benchmark')
+        self.stdout.write(
+            f"   median {report['median_ms']} ms (min {report['min_ms']}, max {report['max_ms']}) "
+            f"over {report['runs']} run(s), {report['modules_loaded']} modules loaded"
+        )
+        self.stdout.write('📦 Slowest packages (self import time):')
+        for row in report['slowest_packages']:
+            marker = ' [app]' if row['project_app'] else ''
+            self.stdout.write(f"   {row['self_ms']:>8} ms  {row['package']}{marker}")
+
+        if report['side_effects']:
+            self.stdout.write(self.style.WARNING(f"⚠️ {len(report['side_effects'])} import-time side effect(s):"))
+            for kind, detail in report['side_effects']:
+                self.stdout.write(f"   {kind}: {detail}")
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ No import-time side effects detected'))
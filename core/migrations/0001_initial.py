@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-19 04:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_type', models.CharField(choices=[('BOOKING', 'Booking'), ('PUJA', 'Puja Booking'), ('ASTROLOGY', 'Astrology Booking')], max_length=20)),
+                ('booking_id', models.PositiveBigIntegerField(help_text='Primary key of the booking row')),
+                ('booking_ref', models.CharField(blank=True, help_text='Public booking reference (book_id / astro_book_id)', max_length=100)),
+                ('kind', models.CharField(choices=[('CREATED', 'Created'), ('STATUS_CHANGED', 'Status Changed'), ('RESCHEDULED', 'Rescheduled'), ('ASSIGNED', 'Assigned'), ('MEET_LINK_ADDED', 'Meet Link Added')], max_length=20)),
+                ('from_value', models.CharField(blank=True, max_length=255)),
+                ('to_value', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='booking_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['booking_type', 'booking_id', 'created_at'], name='core_bookin_booking_e7dfaf_idx'), models.Index(fields=['booking_type', 'kind', 'to_value', 'created_at'], name='core_bookin_booking_170035_idx'), models.Index(fields=['booking_ref'], name='core_bookin_booking_c3d911_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_image_ingest_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_type', models.CharField(choices=[('BOOKING', 'Booking'), ('PUJA', 'Puja Booking'), ('ASTROLOGY', 'Astrology Booking')], max_length=20)),
+                ('booking_id', models.PositiveBigIntegerField()),
+                ('reminder_type', models.CharField(max_length=10)),
+                ('due_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('CLAIMED', 'Claimed'), ('SENT', 'Sent'), ('SKIPPED', 'Skipped'), ('CANCELLED', 'Cancelled'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['due_at'],
+                'indexes': [models.Index(fields=['status', 'due_at'], name='core_schedu_status_df7f7a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('booking_type', 'booking_id', 'reminder_type'), name='unique_booking_reminder')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 05:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_visitor_sketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SitemapFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('path', models.CharField(max_length=255)),
+                ('etag', models.CharField(max_length=64)),
+                ('url_count', models.PositiveIntegerField(default=0)),
+                ('last_modified', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ]
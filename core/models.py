@@ -1,3 +1,233 @@
 from django.db import models
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.db.models import Avg, DurationField, ExpressionWrapper, F, OuterRef, Subquery
+from django.utils import timezone
 
-# Create your models here.
+
+class BookingEventQuerySet(models.QuerySet):
+    def for_booking(self, booking_type, booking_id):
+        """Timeline of a single booking, served by the (type, id, created_at) index"""
+        return self.filter(
+            booking_type=booking_type,
+            booking_id=booking_id
+        ).order_by('created_at', 'id')
+
+    def transition_durations(self, booking_type, from_status, to_status):
+        """
+        Annotate one row per booking with the time spent between the first
+        transition into ``from_status`` and the first transition into ``to_status``.
+        Computed entirely in SQL from the event log.
+        """
+        entered = self.model.objects.filter(
+            booking_type=booking_type,
+            booking_id=OuterRef('booking_id'),
+            kind__in=[BookingEvent.Kind.CREATED, BookingEvent.Kind.STATUS_CHANGED],
+            to_value=from_status
+        ).order_by('created_at').values('created_at')[:1]
+
+        return self.filter(
+            booking_type=booking_type,
+            kind__in=[BookingEvent.Kind.CREATED, BookingEvent.Kind.STATUS_CHANGED],
+            to_value=to_status
+        ).annotate(
+            started_at=Subquery(entered)
+        ).filter(
+            started_at__isnull=False
+        ).annotate(
+            duration=ExpressionWrapper(F('created_at') - F('started_at'), output_field=DurationField())
+        )
+
+    def average_transition_time(self, booking_type, from_status, to_status):
+        """Average duration between two statuses, e.g. CONFIRMED -> COMPLETED"""
+        return self.transition_durations(
+            booking_type, from_status, to_status
+        ).aggregate(average=Avg('duration'))['average']
+
+
+class BookingEvent(models.Model):
+    """
+    Append-only history of booking changes (status, schedule, assignment).
+    Rows are written alongside booking saves and never updated.
+    """
+    class BookingType(models.TextChoices):
+        BOOKING = 'BOOKING', 'Booking'
+        PUJA = 'PUJA', 'Puja Booking'
+        ASTROLOGY = 'ASTROLOGY', 'Astrology Booking'
+
+    class Kind(models.TextChoices):
+        CREATED = 'CREATED', 'Created'
+        STATUS_CHANGED = 'STATUS_CHANGED', 'Status Changed'
+        RESCHEDULED = 'RESCHEDULED', 'Rescheduled'
+        ASSIGNED = 'ASSIGNED', 'Assigned'
+        MEET_LINK_ADDED = 'MEET_LINK_ADDED', 'Meet Link Added'
+
+    booking_type = models.CharField(max_length=20, choices=BookingType.choices)
+    booking_id = models.PositiveBigIntegerField(help_text="Primary key of the booking row")
+    booking_ref = models.CharField(max_length=100, blank=True, help_text="Public booking reference (book_id / astro_book_id)")
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    from_value = models.CharField(max_length=255, blank=True)
+    to_value = models.CharField(max_length=255, blank=True)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='booking_events'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = BookingEventQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['booking_type', 'booking_id', 'created_at']),
+            models.Index(fields=['booking_type', 'kind', 'to_value', 'created_at']),
+            models.Index(fields=['booking_ref']),
+        ]
+
+    def __str__(self):
+        return f"{self.booking_type} {self.booking_ref or self.booking_id}: {self.kind} {self.from_value} -> {self.to_value}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Booking events are append-only and cannot be modified")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Booking events are append-only and cannot be deleted")
+
+
+class ImageIngestJob(models.Model):
+    """One queued image upload for a model's image slot (see core.image_ingest)"""
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        PROCESSING = 'PROCESSING', 'Processing'
+        DONE = 'DONE', 'Done'
+        FAILED = 'FAILED', 'Failed'
+        SUPERSEDED = 'SUPERSEDED', 'Superseded'
+
+    content_type = models.ForeignKey('contenttypes.ContentType', on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    target = GenericForeignKey('content_type', 'object_id')
+    slot = models.CharField(max_length=50)
+    source_path = models.CharField(max_length=500)
+    file_name = models.CharField(max_length=255)
+    keep_source = models.BooleanField(default=False)
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    results = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['content_type', 'object_id', 'slot', 'status']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type.model}:{self.object_id} {self.slot} ({self.status})"
+
+
+class ScheduledReminder(models.Model):
+    """
+    One reminder per booking and reminder type, due at an exact time.
+    Written by core.reminders from the booking event stream and claimed in
+    ``due_at`` order by the reminder ticker.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        CLAIMED = 'CLAIMED', 'Claimed'
+        SENT = 'SENT', 'Sent'
+        SKIPPED = 'SKIPPED', 'Skipped'
+        CANCELLED = 'CANCELLED', 'Cancelled'
+        FAILED = 'FAILED', 'Failed'
+
+    booking_type = models.CharField(max_length=20, choices=BookingEvent.BookingType.choices)
+    booking_id = models.PositiveBigIntegerField()
+    reminder_type = models.CharField(max_length=10)
+    due_at = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['due_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['booking_type', 'booking_id', 'reminder_type'], name='unique_booking_reminder'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'due_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.booking_type} {self.booking_id} {self.reminder_type} @ {self.due_at} ({self.status})"
+
+
+class VisitorSketch(models.Model):
+    """
+    HyperLogLog sketch of the distinct visitors of one object on one day
+    (see core.visitors). Days and objects merge into unique-visitor counts
+    for any range without keeping per-view rows.
+    """
+    content_type = models.ForeignKey('contenttypes.ContentType', on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    target = GenericForeignKey('content_type', 'object_id')
+    day = models.DateField()
+    registers = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['content_type', 'object_id', 'day'], name='unique_visitor_sketch'),
+        ]
+        indexes = [
+            models.Index(fields=['content_type', 'day']),
+        ]
+
+    def __str__(self):
+        return f"Visitors of {self.content_type.model} {self.object_id} on {self.day}"
+
+
+class SitemapFile(models.Model):
+    """
+    A pre-generated, gzipped XML file (sitemap index, sitemap chunk or feed)
+    kept in default storage by core.sitemaps. The ETag and Last-Modified
+    headers are served from this row without opening the file.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    path = models.CharField(max_length=255)
+    etag = models.CharField(max_length=64)
+    url_count = models.PositiveIntegerField(default=0)
+    last_modified = models.DateTimeField()
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class CacheVersion(models.Model):
+    """
+    Version counter of a version-keyed cache (core.cache_versions), kept in
+    the database so a bump is seen by every process whatever the cache backend.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    version = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
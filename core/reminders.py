@@ -0,0 +1,203 @@
+"""
+Booking reminder scheduler.
+
+Every confirmed booking (cart Booking, PujaBooking, AstrologyBooking) gets
+one ScheduledReminder row per reminder type with an exact ``due_at``. Rows
+are kept in sync from the booking event stream: creation, status changes
+and reschedules re-plan them, so ``reschedule()`` needs no extra code.
+
+A ticker (``core.tasks.dispatch_due_reminders``, or
+``manage.py run_reminder_ticker``) claims due rows in ``due_at`` order,
+``batch_size`` at a time, and hands them to the per-type sender. Rows left
+CLAIMED by a ticker that died mid-batch are claimed again after
+``CLAIM_TIMEOUT``, so a reminder is sent at least once.
+"""
+import logging
+from datetime import datetime, timedelta
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .events import booking_events_recorded
+
+logger = logging.getLogger(__name__)
+
+REMINDER_OFFSETS = {
+    '24h': timedelta(hours=24),
+    '2h': timedelta(hours=2),
+    '30m': timedelta(minutes=30),
+}
+REMINDER_LABELS = {
+    '24h': 'Tomorrow',
+    '2h': 'in 2 Hours',
+    '30m': 'in 30 Minutes',
+}
+# A reminder claimed later than this after its due time is skipped
+MAX_LATENESS = {
+    '24h': timedelta(hours=6),
+    '2h': timedelta(minutes=45),
+    '30m': timedelta(minutes=15),
+}
+ACTIVE_STATUSES = ('CONFIRMED',)
+BOOKING_MODELS = {
+    'BOOKING': 'booking.Booking',
+    'PUJA': 'puja.PujaBooking',
+    'ASTROLOGY': 'astrology.AstrologyBooking',
+}
+DEFAULT_BATCH_SIZE = 100
+MAX_ATTEMPTS = 3
+RETRY_DELAY = timedelta(minutes=2)
+# A row still CLAIMED this long after its claim belongs to a crashed ticker
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def session_start(booking):
+    """Aware start datetime from the booking's (date, time) schedule fields"""
+    date_field, time_field = booking.schedule_fields
+    day, at = getattr(booking, date_field), getattr(booking, time_field)
+    if not day or not at:
+        return None
+    return timezone.make_aware(datetime.combine(day, at), timezone.get_current_timezone())
+
+
+def sync_reminders(booking, now=None):
+    """Create, move or cancel the reminder rows of one booking"""
+    from .models import ScheduledReminder
+
+    now = now or timezone.now()
+    rows = ScheduledReminder.objects.filter(booking_type=booking.booking_event_type, booking_id=booking.pk)
+    start = session_start(booking)
+    if booking.status not in ACTIVE_STATUSES or start is None:
+        rows.filter(status=ScheduledReminder.Status.PENDING).update(
+            status=ScheduledReminder.Status.CANCELLED, updated_at=now
+        )
+        return
+
+    existing = {row.reminder_type: row for row in rows}
+    for reminder_type, offset in REMINDER_OFFSETS.items():
+        due_at = start - offset
+        row = existing.get(reminder_type)
+        if row is None:
+            if due_at > now:
+                ScheduledReminder.objects.create(
+                    booking_type=booking.booking_event_type, booking_id=booking.pk,
+                    reminder_type=reminder_type, due_at=due_at
+                )
+        elif row.due_at != due_at or row.status == ScheduledReminder.Status.CANCELLED:
+            # Rescheduled (or re-confirmed): the reminder fires again for the new time
+            row.due_at = due_at
+            row.status = ScheduledReminder.Status.PENDING if due_at > now else ScheduledReminder.Status.SKIPPED
+            row.attempts = 0
+            row.claimed_at = row.sent_at = None
+            row.last_error = ''
+            row.save()
+
+
+def backfill_reminders(now=None):
+    """Plan reminders for every upcoming confirmed booking (e.g. after deploying the scheduler)"""
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    planned = 0
+    for label in BOOKING_MODELS.values():
+        model = apps.get_model(label)
+        date_field = model.schedule_fields[0]
+        bookings = model.objects.filter(status__in=ACTIVE_STATUSES, **{f'{date_field}__gte': today})
+        for booking in bookings.iterator():
+            sync_reminders(booking, now)
+            planned += 1
+    return planned
+
+
+@receiver(booking_events_recorded)
+def sync_reminders_from_events(sender, instance, events, **kwargs):
+    from .models import BookingEvent
+
+    planning_kinds = {BookingEvent.Kind.CREATED, BookingEvent.Kind.STATUS_CHANGED, BookingEvent.Kind.RESCHEDULED}
+    if instance.booking_event_type in BOOKING_MODELS and any(event.kind in planning_kinds for event in events):
+        sync_reminders(instance)
+
+
+def _claimable(now):
+    from .models import ScheduledReminder
+
+    return (
+        Q(status=ScheduledReminder.Status.PENDING, due_at__lte=now) |
+        Q(status=ScheduledReminder.Status.CLAIMED, claimed_at__lte=now - CLAIM_TIMEOUT)
+    )
+
+
+def claim_due_reminders(batch_size=DEFAULT_BATCH_SIZE, now=None):
+    """Atomically move up to ``batch_size`` due (or stale claimed) rows to CLAIMED and return them"""
+    from .models import ScheduledReminder
+
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = ScheduledReminder.objects.filter(_claimable(now)).order_by('due_at')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return []
+        ScheduledReminder.objects.filter(_claimable(now), pk__in=ids).update(
+            status=ScheduledReminder.Status.CLAIMED, claimed_at=now, updated_at=now
+        )
+        return list(ScheduledReminder.objects.filter(pk__in=ids, claimed_at=now).order_by('due_at'))
+
+
+def send_reminder(reminder):
+    """Dispatch one reminder to the notification task of its booking type"""
+    if reminder.booking_type == 'ASTROLOGY':
+        from astrology.tasks import send_astrology_session_reminder
+        send_astrology_session_reminder.delay(reminder.booking_id, reminder.reminder_type)
+    else:
+        from .tasks import send_service_reminder
+        send_service_reminder.delay(reminder.booking_type, reminder.booking_id, reminder.reminder_type)
+
+
+def _booking_for(reminder):
+    model = apps.get_model(BOOKING_MODELS[reminder.booking_type])
+    return model.objects.filter(pk=reminder.booking_id).first()
+
+
+def dispatch_due_reminders(batch_size=DEFAULT_BATCH_SIZE, max_batches=None, now=None):
+    """Claim and send due reminders batch by batch; returns counts per outcome"""
+    from .models import ScheduledReminder
+
+    now = now or timezone.now()
+    counts = {'sent': 0, 'skipped': 0, 'failed': 0, 'retried': 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        claimed = claim_due_reminders(batch_size, now)
+        if not claimed:
+            break
+        batches += 1
+        for reminder in claimed:
+            booking = _booking_for(reminder)
+            too_late = now - reminder.due_at > MAX_LATENESS.get(reminder.reminder_type, timedelta(hours=1))
+            if booking is None or booking.status not in ACTIVE_STATUSES or too_late:
+                reminder.status = ScheduledReminder.Status.SKIPPED
+                counts['skipped'] += 1
+            else:
+                reminder.attempts += 1
+                try:
+                    send_reminder(reminder)
+                    reminder.status = ScheduledReminder.Status.SENT
+                    reminder.sent_at = timezone.now()
+                    counts['sent'] += 1
+                except Exception as e:
+                    logger.error(f"Reminder {reminder.pk} failed: {e}")
+                    reminder.last_error = str(e)
+                    if reminder.attempts < MAX_ATTEMPTS:
+                        reminder.status = ScheduledReminder.Status.PENDING
+                        reminder.due_at = reminder.due_at + RETRY_DELAY * reminder.attempts
+                        counts['retried'] += 1
+                    else:
+                        reminder.status = ScheduledReminder.Status.FAILED
+                        counts['failed'] += 1
+            reminder.save(update_fields=['status', 'attempts', 'sent_at', 'due_at', 'last_error', 'updated_at'])
+        if len(claimed) < batch_size:
+            break
+    return counts
@@ -0,0 +1,28 @@
+from rest_framework import serializers
+from .image_variants import responsive_image_data
+from .models import BookingEvent
+
+
+class BookingEventSerializer(serializers.ModelSerializer):
+    kind_display = serializers.CharField(source='get_kind_display', read_only=True)
+    actor_email = serializers.EmailField(source='actor.email', read_only=True, default=None)
+
+    class Meta:
+        model = BookingEvent
+        fields = [
+            'id', 'booking_type', 'booking_id', 'booking_ref', 'kind', 'kind_display',
+            'from_value', 'to_value', 'actor', 'actor_email', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class ResponsiveImageField(serializers.Field):
+    """Read-only ``srcset`` data built from an image manifest (core.image_variants)"""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs.setdefault('source', 'image_manifest')
+        super().__init__(**kwargs)
+
+    def to_representation(self, manifest):
+        return responsive_image_data(manifest)
@@ -0,0 +1,308 @@
+"""
+Pre-generated sitemaps and the blog RSS feed.
+
+The sitemap is an index (``sitemap.xml``) of chunk files, one per section
+(blog posts, puja services, events, gallery items) and block of
+``CHUNK_SIZE`` primary keys: chunk ``n`` of a section lists the live rows
+with ``n * CHUNK_SIZE <= pk < (n + 1) * CHUNK_SIZE``. A chunk therefore
+never exceeds the 50,000 URL limit of the protocol, and a changed row only
+rewrites the one chunk it falls in.
+
+Every file is written gzipped to default storage and recorded in
+SitemapFile with an ETag (hash of the XML) and Last-Modified time, so
+requests are answered from that row: 304 when the crawler's copy is
+current, otherwise the stored bytes, gzip-encoded as they are. A file
+requested before it was ever generated is rendered on the spot
+(``generate_missing``).
+
+Saves and deletes of the listed models schedule the regeneration of
+their chunk (and the index, and for blog posts the feed) after commit,
+at most once per ``REGENERATE_DELAY`` seconds per file
+(``core.tasks.regenerate_sitemap_chunk``). ``rebuild_all()`` rewrites
+everything (nightly task and ``manage.py rebuild_sitemaps``), which also
+covers queryset updates that send no signals.
+"""
+import gzip
+import hashlib
+import logging
+from xml.sax.saxutils import escape
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.feedgenerator import Rss201rev2Feed
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 50000
+STORAGE_DIR = 'sitemaps'
+INDEX_NAME = 'sitemap'
+FEED_NAME = 'blog-rss'
+FEED_ITEMS = 20
+REGENERATE_DELAY = 60
+
+
+class SitemapSection:
+    """Rows of one model listed in the sitemap, with their page path"""
+
+    def __init__(self, name, model, filters, path, fields, changefreq, priority):
+        self.name = name
+        self.model_label = model
+        self.filters = filters
+        self.path = path
+        self.fields = fields
+        self.changefreq = changefreq
+        self.priority = priority
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def chunk_name(self, chunk):
+        return f'{self.name}-{chunk}'
+
+    def rows(self, chunk):
+        return self.model.objects.filter(
+            **self.filters, pk__gte=chunk * CHUNK_SIZE, pk__lt=(chunk + 1) * CHUNK_SIZE
+        ).order_by('pk').values(*self.fields, 'updated_at')
+
+    def chunk_count(self):
+        top = self.model.objects.filter(**self.filters).aggregate(top=Max('pk'))['top']
+        return 0 if top is None else top // CHUNK_SIZE + 1
+
+
+SECTIONS = (
+    SitemapSection('blog', 'blog.BlogPost', {'status': 'PUBLISHED'}, '/blog/{slug}/', ('slug',), 'weekly', '0.6'),
+    SitemapSection('puja', 'puja.PujaService', {'is_active': True}, '/puja/{pk}/', ('pk',), 'weekly', '0.8'),
+    SitemapSection('events', 'misc.Event', {'status': 'PUBLISHED'}, '/events/{slug}/', ('slug',), 'weekly', '0.7'),
+    SitemapSection('gallery', 'gallery.GalleryItem', {'status': 'PUBLISHED'}, '/gallery/{pk}/', ('pk',), 'monthly', '0.4'),
+)
+SECTIONS_BY_NAME = {section.name: section for section in SECTIONS}
+# Pages that are always listed, in the first chunk of their section
+STATIC_PAGES = {'blog': ('/blog/', 'daily', '0.8')}
+
+
+def site_url(path=''):
+    return settings.FRONTEND_BASE_URL.rstrip('/') + path
+
+
+def file_url(name):
+    """Public URL of a stored file; they are served by the backend (core.views)"""
+    base = settings.BACKEND_URL.rstrip('/')
+    if name == INDEX_NAME:
+        return f'{base}/sitemap.xml'
+    if name == FEED_NAME:
+        return f'{base}/api/blog/feed/'
+    return f'{base}/sitemaps/{name}.xml'
+
+
+# Rendering ---------------------------------------------------------------------
+
+def _url_entry(loc, lastmod=None, changefreq=None, priority=None):
+    parts = [f'<url><loc>{escape(loc)}</loc>']
+    if lastmod:
+        parts.append(f'<lastmod>{lastmod:%Y-%m-%d}</lastmod>')
+    if changefreq:
+        parts.append(f'<changefreq>{changefreq}</changefreq>')
+    if priority:
+        parts.append(f'<priority>{priority}</priority>')
+    parts.append('</url>')
+    return ''.join(parts)
+
+
+def render_chunk(section, chunk):
+    """(XML, number of URLs) of one chunk"""
+    entries = []
+    if chunk == 0 and section.name in STATIC_PAGES:
+        path, changefreq, priority = STATIC_PAGES[section.name]
+        entries.append(_url_entry(site_url(path), changefreq=changefreq, priority=priority))
+    for row in section.rows(chunk).iterator(chunk_size=2000):
+        entries.append(_url_entry(
+            site_url(section.path.format(**row)), row['updated_at'], section.changefreq, section.priority
+        ))
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">' + ''.join(entries) + '</urlset>'
+    )
+    return xml, len(entries)
+
+
+def render_index(files):
+    entries = ''.join(
+        f'<sitemap><loc>{escape(file_url(stored.name))}</loc>'
+        f'<lastmod>{stored.last_modified.isoformat(timespec="seconds")}</lastmod></sitemap>'
+        for stored in files
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">' + entries + '</sitemapindex>'
+    )
+
+
+def render_feed():
+    """(RSS XML, number of items) of the latest published blog posts"""
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    feed = Rss201rev2Feed(
+        title="OkPuja Blog - Hindu Spiritual Services",
+        link=site_url('/blog/'),
+        description="Latest spiritual insights, puja guides, and Hindu traditions from OkPuja",
+        feed_url=file_url(FEED_NAME),
+        language='en',
+    )
+    posts = BlogPost.objects.filter(status='PUBLISHED').order_by('-published_at').only(
+        'title', 'slug', 'excerpt', 'content', 'published_at', 'created_at'
+    )[:FEED_ITEMS]
+    for post in posts:
+        feed.add_item(
+            title=post.title,
+            link=site_url(f'/blog/{post.slug}/'),
+            description=post.excerpt or post.content[:200] + '...',
+            pubdate=post.published_at or post.created_at,
+            unique_id=site_url(f'/blog/{post.slug}/'),
+        )
+    return feed.writeString('utf-8'), feed.num_items()
+
+
+# Storage -----------------------------------------------------------------------
+
+def storage_path(name):
+    return f'{STORAGE_DIR}/{name}.xml.gz'
+
+
+def write_file(name, xml, url_count):
+    """Store ``xml`` gzipped unless unchanged; returns True if the file changed"""
+    SitemapFile = apps.get_model('core', 'SitemapFile')
+    content = xml.encode('utf-8')
+    etag = hashlib.sha256(content).hexdigest()[:32]
+    stored = SitemapFile.objects.filter(name=name).first()
+    if stored is not None and stored.etag == etag and default_storage.exists(stored.path):
+        return False
+
+    path = storage_path(name)
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    # mtime=0 keeps the gzip bytes a pure function of the XML
+    path = default_storage.save(path, ContentFile(gzip.compress(content, mtime=0)))
+    SitemapFile.objects.update_or_create(name=name, defaults={
+        'path': path, 'etag': etag, 'url_count': url_count, 'last_modified': timezone.now(),
+    })
+    return True
+
+
+def delete_file(name):
+    SitemapFile = apps.get_model('core', 'SitemapFile')
+    stored = SitemapFile.objects.filter(name=name).first()
+    if stored is None:
+        return False
+    if default_storage.exists(stored.path):
+        default_storage.delete(stored.path)
+    stored.delete()
+    return True
+
+
+def read_file(stored):
+    with default_storage.open(stored.path, 'rb') as handle:
+        return handle.read()
+
+
+# Regeneration ------------------------------------------------------------------
+
+def regenerate_chunk(section_name, chunk):
+    """Rewrite one chunk (dropping it when empty); returns True if it changed"""
+    section = SECTIONS_BY_NAME[section_name]
+    xml, url_count = render_chunk(section, chunk)
+    if not url_count:
+        return delete_file(section.chunk_name(chunk))
+    return write_file(section.chunk_name(chunk), xml, url_count)
+
+
+def regenerate_index():
+    SitemapFile = apps.get_model('core', 'SitemapFile')
+    chunk_names = [section.chunk_name(n) for section in SECTIONS for n in range(section.chunk_count())]
+    files = SitemapFile.objects.filter(name__in=chunk_names)
+    return write_file(INDEX_NAME, render_index(files), len(files))
+
+
+def regenerate_feed():
+    xml, item_count = render_feed()
+    return write_file(FEED_NAME, xml, item_count)
+
+
+def rebuild_all():
+    """Rewrite every chunk, the index and the feed; returns the number of files that changed"""
+    SitemapFile = apps.get_model('core', 'SitemapFile')
+    changed = 0
+    live = {INDEX_NAME, FEED_NAME}
+    for section in SECTIONS:
+        for chunk in range(section.chunk_count()):
+            changed += regenerate_chunk(section.name, chunk)
+            live.add(section.chunk_name(chunk))
+    for name in SitemapFile.objects.exclude(name__in=live).values_list('name', flat=True):
+        changed += delete_file(name)
+    changed += regenerate_index()
+    changed += regenerate_feed()
+    return changed
+
+
+def generate_missing(name):
+    """
+    Render a file that has no SitemapFile row yet (e.g. the first request
+    after a deploy, before any rebuild ran); returns its row, or None if
+    there is no such file
+    """
+    SitemapFile = apps.get_model('core', 'SitemapFile')
+    if name == INDEX_NAME:
+        # The index only lists stored chunks, so render the missing ones first
+        stored = set(SitemapFile.objects.values_list('name', flat=True))
+        for section in SECTIONS:
+            for chunk in range(section.chunk_count()):
+                if section.chunk_name(chunk) not in stored:
+                    regenerate_chunk(section.name, chunk)
+        regenerate_index()
+    elif name == FEED_NAME:
+        regenerate_feed()
+    else:
+        section_name, _, chunk = name.rpartition('-')
+        section = SECTIONS_BY_NAME.get(section_name)
+        if section is None or not chunk.isdigit() or int(chunk) >= section.chunk_count():
+            return None
+        regenerate_chunk(section_name, int(chunk))
+    return SitemapFile.objects.filter(name=name).first()
+
+
+def schedule_regeneration(section_name, chunk):
+    """Queue a chunk rewrite after commit, once per REGENERATE_DELAY"""
+    from .tasks import regenerate_sitemap_chunk
+
+    def enqueue():
+        # Claimed after commit, so a rolled back save does not hold off the next one
+        if cache.add(f'sitemaps:pending:{section_name}:{chunk}', 1, REGENERATE_DELAY):
+            regenerate_sitemap_chunk.apply_async((section_name, chunk), countdown=REGENERATE_DELAY)
+
+    transaction.on_commit(enqueue)
+
+
+def clear_pending(section_name, chunk):
+    cache.delete(f'sitemaps:pending:{section_name}:{chunk}')
+
+
+def _content_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for section in SECTIONS:
+        if sender is section.model:
+            schedule_regeneration(section.name, instance.pk // CHUNK_SIZE)
+
+
+def connect_signals():
+    for section in SECTIONS:
+        post_save.connect(_content_changed, sender=section.model_label, dispatch_uid=f'sitemap-{section.name}-save')
+        post_delete.connect(
+            _content_changed, sender=section.model_label, dispatch_uid=f'sitemap-{section.name}-delete'
+        )
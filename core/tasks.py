@@ -325,4 +325,74 @@ def send_puja_reschedule_notification(puja_booking_id, old_date, old_time, resch
         logger.info(f"Puja reschedule notification sent for booking #{puja_booking.id}")
         
     except Exception as e:
-        logger.error(f"Failed to send puja reschedule notification: {str(e)}")
\ No newline at end of file
+        logger.error(f"Failed to send puja reschedule notification: {str(e)}")
+
+@shared_task
+def process_image_ingest_job(job_id):
+    """Render and upload the variants of one queued image"""
+    from core.image_ingest import process_job
+
+    job = process_job(job_id)
+    return job.status if job else None
+
+@shared_task
+def send_service_reminder(booking_type, booking_id, reminder_type='24h'):
+    """Send an upcoming-session reminder for a cart or puja booking"""
+    from core.reminders import REMINDER_LABELS
+
+    if booking_type == 'PUJA':
+        from puja.models import PujaBooking
+        booking = PujaBooking.objects.select_related('puja_service').get(id=booking_id)
+        title, reference, email = booking.puja_service.title, f"#{booking.id}", booking.contact_email
+        day, at = booking.booking_date, booking.start_time
+    else:
+        booking = Booking.objects.select_related('user', 'cart').get(id=booking_id)
+        title, reference, email = 'your puja', booking.book_id, booking.user.email
+        day, at = booking.selected_date, booking.selected_time
+
+    send_mail(
+        f"🔔 Reminder: Your Puja {REMINDER_LABELS.get(reminder_type, 'Soon')} - {reference}",
+        f"Reminder: {title} is scheduled for {day} at {at}.",
+        settings.DEFAULT_FROM_EMAIL,
+        [email],
+        fail_silently=False
+    )
+    logger.info(f"Service reminder ({reminder_type}) sent for {booking_type} booking {reference}")
+
+@shared_task
+def dispatch_due_reminders(batch_size=100):
+    """Ticker: send every reminder whose due time has passed"""
+    from core.reminders import dispatch_due_reminders as dispatch
+
+    return dispatch(batch_size=batch_size)
+
+@shared_task
+def prune_view_rows():
+    """Age out raw blog/gallery view rows; unique visitors live on in the sketches"""
+    from core.visitors import prune_view_rows as prune
+
+    deleted = prune()
+    if any(deleted.values()):
+        logger.info(f"Pruned view rows: {deleted}")
+    return deleted
+
+@shared_task
+def regenerate_sitemap_chunk(section_name, chunk):
+    """Rewrite one sitemap chunk after its content changed, then the index (and blog feed)"""
+    from core import sitemaps
+
+    sitemaps.clear_pending(section_name, chunk)
+    if sitemaps.regenerate_chunk(section_name, chunk):
+        sitemaps.regenerate_index()
+    if section_name == 'blog':
+        sitemaps.regenerate_feed()
+
+@shared_task
+def rebuild_sitemaps():
+    """Nightly full rewrite of the sitemaps and feed (catches changes made without signals)"""
+    from core.sitemaps import rebuild_all
+
+    changed = rebuild_all()
+    if changed:
+        logger.info(f"Rebuilt sitemaps: {changed} file(s) changed")
+    return changed
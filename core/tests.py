@@ -1,3 +1,378 @@
-from django.test import TestCase
+import gzip
+import tempfile
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import BytesIO
 
-# Create your tests here.
+from PIL import Image
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from accounts.models import upload_to_imagekit
+from astrology.models import AstrologyBooking, AstrologyService
+from blog.models import BlogPost
+from astrology.serializers import AstrologyServiceSerializer
+from booking.models import Booking, BookingStatus
+from . import sitemaps
+from .hll import HyperLogLog
+from .image_ingest import process_job
+from .models import BookingEvent, ImageIngestJob, ScheduledReminder, SitemapFile
+from .reminders import CLAIM_TIMEOUT, dispatch_due_reminders, session_start
+from .uploads import ImageKitUploader, get_uploader
+from .visitors import add_visitors, prune_view_rows, total_unique_visitors, unique_visitors
+
+User = get_user_model()
+
+
+class BookingEventLogTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='customer@example.com',
+            password='testpass123',
+            username='customer'
+        )
+        self.admin = User.objects.create_user(
+            email='admin@example.com',
+            password='testpass123',
+            username='admin',
+            role=User.Role.ADMIN
+        )
+        self.booking = Booking.objects.create(
+            user=self.user,
+            selected_date=date(2030, 1, 10),
+            selected_time=time(10, 0),
+            status=BookingStatus.PENDING
+        )
+
+    def test_creation_is_logged(self):
+        event = BookingEvent.objects.get(booking_id=self.booking.pk)
+        self.assertEqual(event.kind, BookingEvent.Kind.CREATED)
+        self.assertEqual(event.to_value, BookingStatus.PENDING)
+        self.assertEqual(event.booking_ref, self.booking.book_id)
+
+    def test_changes_are_logged_with_actor(self):
+        booking = Booking.objects.get(pk=self.booking.pk)
+        booking.status = BookingStatus.CONFIRMED
+        booking.event_actor = self.admin
+        booking.save()
+        booking.reschedule(date(2030, 1, 12), time(11, 30), self.admin)
+        booking.assign_to(self.admin, self.admin)
+
+        kinds = list(booking.booking_timeline().values_list('kind', 'from_value', 'to_value'))
+        self.assertEqual(kinds, [
+            (BookingEvent.Kind.CREATED, '', BookingStatus.PENDING),
+            (BookingEvent.Kind.STATUS_CHANGED, BookingStatus.PENDING, BookingStatus.CONFIRMED),
+            (BookingEvent.Kind.RESCHEDULED, '2030-01-10 10:00:00', '2030-01-12 11:30:00'),
+            (BookingEvent.Kind.ASSIGNED, '', str(self.admin.pk)),
+        ])
+        self.assertFalse(booking.booking_timeline().filter(actor__isnull=True).exclude(
+            kind=BookingEvent.Kind.CREATED
+        ).exists())
+
+    def test_unchanged_save_logs_nothing(self):
+        booking = Booking.objects.get(pk=self.booking.pk)
+        booking.save()
+        self.assertEqual(booking.booking_timeline().count(), 1)
+
+    def test_events_are_append_only(self):
+        event = BookingEvent.objects.get(booking_id=self.booking.pk)
+        with self.assertRaises(ValueError):
+            event.save()
+        with self.assertRaises(ValueError):
+            event.delete()
+
+    def test_average_transition_time(self):
+        booking = Booking.objects.get(pk=self.booking.pk)
+        booking.status = BookingStatus.CONFIRMED
+        booking.save()
+        booking.status = BookingStatus.COMPLETED
+        booking.save()
+        BookingEvent.objects.filter(
+            booking_id=booking.pk, to_value=BookingStatus.COMPLETED
+        ).update(created_at=timezone.now() + timedelta(hours=3))
+
+        average = BookingEvent.objects.average_transition_time(
+            BookingEvent.BookingType.BOOKING, BookingStatus.CONFIRMED, BookingStatus.COMPLETED
+        )
+        self.assertAlmostEqual(average.total_seconds() / 3600, 3, places=1)
+
+    def test_timeline_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(f'/api/booking/bookings/{self.booking.pk}/timeline/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['kind'], BookingEvent.Kind.CREATED)
+
+
+@override_settings(
+    IMAGE_UPLOAD_BACKEND='core.uploads.LocalStorageUploader',
+    MEDIA_ROOT=tempfile.mkdtemp(),
+)
+class ImageIngestPipelineTests(TestCase):
+    def setUp(self):
+        self.service = AstrologyService.objects.create(
+            title='Kundali Reading', service_type='HOROSCOPE', description='Birth chart', price=Decimal('501.00')
+        )
+
+    def _upload(self, name='chart.png', size=(640, 480)):
+        buffer = BytesIO()
+        Image.new('RGB', size, 'orange').save(buffer, format='PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def test_upload_is_queued_then_processed_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            job = self.service.save_service_image(self._upload())
+        self.assertEqual(job.status, ImageIngestJob.Status.PENDING)
+        self.assertIsNone(AstrologyService.objects.get(pk=self.service.pk).image_url)
+
+        for callback in callbacks:
+            callback()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageIngestJob.Status.DONE)
+
+        service = AstrologyService.objects.get(pk=self.service.pk)
+        self.assertTrue(service.image_url.endswith('.png'))
+        self.assertIn('/astrology/services/cards/card_', service.image_card_url)
+        with default_storage.open(service.image_thumbnail_url.split(settings.MEDIA_URL, 1)[1]) as thumb:
+            self.assertLessEqual(max(Image.open(thumb).size), 150)
+        self.assertFalse(default_storage.exists(job.source_path))
+
+    def test_newer_upload_supersedes_pending_job(self):
+        with self.captureOnCommitCallbacks():
+            first = self.service.save_service_image(self._upload())
+            second = self.service.save_service_image(self._upload('second.png'))
+        first.refresh_from_db()
+        self.assertEqual(first.status, ImageIngestJob.Status.SUPERSEDED)
+        self.assertIsNone(process_job(first.pk))
+        self.assertEqual(process_job(second.pk).status, ImageIngestJob.Status.DONE)
+
+    def test_invalid_image_is_rejected_in_request(self):
+        upload = SimpleUploadedFile('chart.png', b'not an image', content_type='image/png')
+        with self.assertRaises(serializers.ValidationError):
+            self.service.save_service_image(upload)
+        self.assertFalse(ImageIngestJob.objects.exists())
+
+    def test_responsive_ladder_and_srcset(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.save_service_image(self._upload(size=(1000, 500)))
+
+        service = AstrologyService.objects.get(pk=self.service.pk)
+        manifest = service.image_manifest
+        self.assertEqual((manifest['width'], manifest['height']), (1000, 500))
+        widths = sorted({v['width'] for v in manifest['variants']})
+        self.assertEqual(widths, [320, 640, 960, 1000])
+        self.assertEqual({v['format'] for v in manifest['variants']}, {'avif', 'webp', 'jpeg'})
+
+        data = AstrologyServiceSerializer(service).data['responsive_image']
+        self.assertTrue(data['src'].endswith('-1000w.jpg'))
+        self.assertEqual([source['type'] for source in data['sources']], ['image/avif', 'image/webp'])
+        self.assertIn('-320w.webp 320w', data['sources'][1]['srcset'])
+
+
+class UploaderServiceTests(TestCase):
+    def test_imagekit_client_is_built_lazily(self):
+        with override_settings(IMAGE_UPLOAD_BACKEND='core.uploads.ImageKitUploader'):
+            uploader = get_uploader()
+            self.assertIsInstance(uploader, ImageKitUploader)
+            self.assertIsNone(uploader._client)
+            self.assertIs(get_uploader(), uploader)
+
+    @override_settings(IMAGE_UPLOAD_BACKEND='core.uploads.StubUploader')
+    def test_stub_backend_records_uploads(self):
+        url = upload_to_imagekit(b'data', 'file.jpg', folder='user_profiles')
+        self.assertEqual(url, 'https://uploads.test/user_profiles/file.jpg')
+        self.assertEqual(get_uploader().uploads['user_profiles/file.jpg'], b'data')
+
+
+class ReminderSchedulerTests(TestCase):
+    def setUp(self):
+        service = AstrologyService.objects.create(
+            title='Kundali Reading', service_type='HOROSCOPE', description='Birth chart', price=Decimal('501.00')
+        )
+        self.booking = AstrologyBooking.objects.create(
+            service=service,
+            language='Hindi',
+            preferred_date=date(2030, 1, 10),
+            preferred_time=time(10, 0),
+            birth_place='Varanasi',
+            birth_date=date(1990, 5, 1),
+            birth_time=time(6, 30),
+            gender='MALE',
+            contact_email='seeker@example.com',
+            contact_phone='9999999999'
+        )
+
+    def _reminders(self):
+        return {
+            r.reminder_type: r for r in ScheduledReminder.objects.filter(booking_type='ASTROLOGY', booking_id=self.booking.pk)
+        }
+
+    def test_confirmed_booking_gets_exact_reminders(self):
+        start = session_start(self.booking)
+        reminders = self._reminders()
+        self.assertEqual(set(reminders), {'24h', '2h', '30m'})
+        self.assertEqual(reminders['24h'].due_at, start - timedelta(hours=24))
+        self.assertEqual(reminders['30m'].due_at, start - timedelta(minutes=30))
+
+    def test_reschedule_moves_and_cancel_stops_reminders(self):
+        booking = AstrologyBooking.objects.get(pk=self.booking.pk)
+        booking.reschedule(date(2030, 1, 12), time(18, 0), None)
+        self.assertEqual(self._reminders()['2h'].due_at, session_start(booking) - timedelta(hours=2))
+
+        booking.status = 'CANCELLED'
+        booking.save()
+        self.assertEqual({r.status for r in self._reminders().values()}, {ScheduledReminder.Status.CANCELLED})
+
+    def test_ticker_sends_only_due_reminders(self):
+        now = session_start(self.booking) - timedelta(hours=23)
+        mail.outbox = []
+        counts = dispatch_due_reminders(batch_size=1, now=now)
+
+        reminders = self._reminders()
+        self.assertEqual(counts['sent'], 1)
+        self.assertEqual(reminders['24h'].status, ScheduledReminder.Status.SENT)
+        self.assertEqual(reminders['2h'].status, ScheduledReminder.Status.PENDING)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(dispatch_due_reminders(now=now)['sent'], 0)
+
+    def test_stale_claims_are_claimed_again(self):
+        now = session_start(self.booking) - timedelta(hours=23)
+        # A ticker claimed the 24h reminder and died before sending it
+        ScheduledReminder.objects.filter(booking_type='ASTROLOGY', reminder_type='24h').update(
+            status=ScheduledReminder.Status.CLAIMED, claimed_at=now - timedelta(minutes=1)
+        )
+        self.assertEqual(dispatch_due_reminders(now=now)['sent'], 0)
+
+        counts = dispatch_due_reminders(now=now + CLAIM_TIMEOUT)
+        self.assertEqual(counts['sent'], 1)
+        self.assertEqual(self._reminders()['24h'].status, ScheduledReminder.Status.SENT)
+
+
+class FieldTrackerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='writer@example.com', password='testpass123', username='writer')
+        self.post = BlogPost.objects.create(user=self.user, title='Navratri Guide', content='Nine nights')
+
+    def test_publishing_stamps_published_at_without_rereading(self):
+        post = BlogPost.objects.get(pk=self.post.pk)
+        self.assertFalse(post.has_changed('status'))
+        post.status = 'PUBLISHED'
+        self.assertTrue(post.has_changed('status'))
+        with self.assertNumQueries(1):
+            post.save()
+        self.assertIsNotNone(post.published_at)
+        self.assertEqual(post.saved_changes, {'status': 'DRAFT'})
+        self.assertFalse(post.has_changed('status'))
+
+        post.is_featured = True
+        with self.assertNumQueries(1):
+            post.save(update_fields=['is_featured'])
+        self.assertEqual(post.saved_changes, {})
+
+    def test_booking_update_reports_previous_values(self):
+        booking = Booking.objects.create(
+            user=self.user, selected_date=date(2030, 1, 10), selected_time=time(10, 0), status=BookingStatus.PENDING
+        )
+        booking = Booking.objects.get(pk=booking.pk)
+        booking.selected_time = '11:30'
+        booking.save()
+        self.assertEqual(booking.saved_changes, {'selected_time': time(10, 0)})
+        self.assertEqual(booking.previous('selected_time'), time(11, 30))
+
+
+class UniqueVisitorSketchTests(TestCase):
+    def test_hyperloglog_estimate_and_merge(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        first.update(f'ip:{n}' for n in range(6000))
+        second.update(f'ip:{n}' for n in range(4000, 10000))
+        self.assertAlmostEqual(first.count(), 6000, delta=6000 * 0.07)
+        union = HyperLogLog.from_bytes(first.to_bytes()).merge(second)
+        self.assertAlmostEqual(union.count(), 10000, delta=10000 * 0.07)
+        self.assertEqual(len(union.to_bytes()), 2048)
+
+    def test_daily_sketches_merge_across_days_and_prune_raw_rows(self):
+        from blog.models import BlogView
+
+        user = User.objects.create_user(email='reader@example.com', password='testpass123', username='reader')
+        post = BlogPost.objects.create(user=user, title='Ekadashi Vrat', content='Fasting')
+        other = BlogPost.objects.create(user=user, title='Pradosh Vrat', content='Fasting')
+        monday, tuesday = date(2030, 1, 7), date(2030, 1, 8)
+        add_visitors(BlogPost, post.pk, monday, ['ip:1', 'ip:2', 'u:7'])
+        add_visitors(BlogPost, post.pk, tuesday, ['ip:2', 'u:7', 'ip:3'])
+        with self.assertNumQueries(3):
+            # Returning visitor: the sketch is read but not rewritten (plus the savepoint pair)
+            add_visitors(BlogPost, post.pk, tuesday, ['ip:3'])
+        add_visitors(BlogPost, other.pk, tuesday, ['ip:1'])
+
+        self.assertEqual(unique_visitors(BlogPost, start=monday, end=tuesday), {post.pk: 4, other.pk: 1})
+        self.assertEqual(unique_visitors(BlogPost, [post.pk], start=tuesday), {post.pk: 3})
+        self.assertEqual(total_unique_visitors(BlogPost), 4)
+
+        old = BlogView.objects.create(post=post, ip_address='10.0.0.1')
+        BlogView.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=120))
+        BlogView.objects.create(post=post, ip_address='10.0.0.2')
+        self.assertEqual(prune_view_rows(days=90)['blog.BlogView'], 1)
+        self.assertEqual(BlogView.objects.count(), 1)
+
+
+@override_settings(
+    MEDIA_ROOT=tempfile.mkdtemp(),
+    BACKEND_URL='https://api.example.com',
+    FRONTEND_BASE_URL='https://www.example.com',
+)
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='writer@example.com', password='testpass123', username='writer')
+        self.post = BlogPost.objects.create(user=self.user, title='Ganesh Chaturthi', content='Modak', status='PUBLISHED')
+        BlogPost.objects.create(user=self.user, title='Draft Notes', content='WIP')
+
+    def _body(self, response):
+        body = b''.join(response)
+        return gzip.decompress(body) if response.get('Content-Encoding') == 'gzip' else body
+
+    def test_index_chunks_and_feed_are_served_with_validators(self):
+        sitemaps.rebuild_all()
+        client = APIClient()
+        response = client.get('/sitemap.xml', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'https://api.example.com/sitemaps/blog-0.xml', self._body(response))
+
+        chunk = self._body(client.get('/sitemaps/blog-0.xml'))
+        self.assertIn(b'https://www.example.com/blog/ganesh-chaturthi/', chunk)
+        self.assertNotIn(b'draft-notes', chunk)
+        self.assertIn(b'Ganesh Chaturthi', self._body(client.get('/api/blog/feed/')))
+
+        etag = client.get('/sitemaps/blog-0.xml')['ETag']
+        with self.assertNumQueries(1):
+            revalidated = client.get('/sitemaps/blog-0.xml', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_files_never_generated_are_rendered_on_first_request(self):
+        client = APIClient()
+        index = client.get('/sitemap.xml')
+        self.assertEqual(index.status_code, 200)
+        self.assertIn(b'https://api.example.com/sitemaps/blog-0.xml', self._body(index))
+        self.assertIn(b'ganesh-chaturthi', self._body(client.get('/sitemaps/blog-0.xml')))
+        self.assertIn(b'Ganesh Chaturthi', self._body(client.get('/api/blog/feed/')))
+        self.assertEqual(client.get('/sitemaps/blog-7.xml').status_code, 404)
+
+    def test_content_change_rewrites_only_its_chunk(self):
+        sitemaps.rebuild_all()
+        before = {f.name: f.etag for f in SitemapFile.objects.all()}
+        with self.captureOnCommitCallbacks(execute=True):
+            BlogPost.objects.create(user=self.user, title='Janmashtami', content='Dahi handi', status='PUBLISHED')
+        after = {f.name: f.etag for f in SitemapFile.objects.all()}
+        changed = {name for name in after if after[name] != before.get(name)}
+        # The index only changes when a chunk's lastmod moves to a new second
+        self.assertTrue({'blog-0', 'blog-rss'} <= changed <= {'blog-0', 'blog-rss', 'sitemap'})
+        self.assertEqual(SitemapFile.objects.get(name='blog-0').url_count, 3)
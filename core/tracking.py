@@ -0,0 +1,88 @@
+"""
+Field change tracking for models.
+
+``FieldTrackerMixin`` snapshots the tracked fields when an instance is
+loaded and after every save, so "did X change?" is answered from memory
+instead of re-reading the row before saving::
+
+    class BlogPost(FieldTrackerMixin, models.Model):
+        tracked_fields = ('status',)
+
+    post.has_changed('status')      # current value differs from the loaded one
+    post.previous('status')         # value as loaded / last saved
+    post.saved_changes              # {field: old value} changed by the last save()
+
+Inside pre_save/post_save receivers ``has_changed``/``previous`` still
+describe the save in progress; the snapshot moves forward once save()
+returns.
+"""
+
+
+class FieldTrackerMixin:
+    tracked_fields = ()
+    saved_changes = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def tracked_field_names(self):
+        return list(self.tracked_fields)
+
+    def _snapshot_tracked_fields(self, names=None):
+        snapshot = getattr(self, '_tracked_snapshot', None) or {}
+        for name in names if names is not None else self.tracked_field_names():
+            # Deferred fields stay out of the snapshot (and are never reported as changed)
+            if name in self.__dict__:
+                snapshot[name] = self.tracked_value(name)
+        self._tracked_snapshot = snapshot
+
+    def tracked_value(self, name):
+        # Normalise assigned values (e.g. '2025-01-01' strings) so they compare with loaded ones
+        value = getattr(self, name, None)
+        try:
+            return self._meta.get_field(name).to_python(value)
+        except Exception:
+            return value
+
+    def has_snapshot(self):
+        return getattr(self, '_tracked_snapshot', None) is not None
+
+    def previous(self, name):
+        """Value of a tracked field as it was loaded or last saved"""
+        return (getattr(self, '_tracked_snapshot', None) or {}).get(name)
+
+    def has_changed(self, name):
+        snapshot = getattr(self, '_tracked_snapshot', None)
+        if snapshot is None or name not in snapshot:
+            return self._state.adding
+        return snapshot[name] != self.tracked_value(name)
+
+    def changed_fields(self):
+        """{field: previous value} of tracked fields that differ from the snapshot"""
+        snapshot = getattr(self, '_tracked_snapshot', None) or {}
+        return {
+            name: snapshot[name]
+            for name in self.tracked_field_names()
+            if name in snapshot and snapshot[name] != self.tracked_value(name)
+        }
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        saved_names = None
+        if update_fields is not None:
+            concrete = {f.name: f.attname for f in self._meta.concrete_fields}
+            saved_names = {concrete.get(name, name) for name in update_fields} | set(update_fields)
+        changes = self.changed_fields() if self.has_snapshot() else None
+        if changes is not None and saved_names is not None:
+            changes = {name: value for name, value in changes.items() if name in saved_names}
+
+        super().save(*args, **kwargs)
+
+        self.saved_changes = changes
+        names = self.tracked_field_names()
+        if saved_names is not None and self.has_snapshot():
+            names = [name for name in names if name in saved_names]
+        self._snapshot_tracked_fields(names)
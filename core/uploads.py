@@ -0,0 +1,158 @@
+"""
+Shared file uploader service.
+
+One uploader instance per process, built on first use from
+``IMAGE_UPLOAD_BACKEND`` (a dotted class path). Backends:
+
+* ``ImageKitUploader``: ImageKit.io; the SDK is imported and the client
+  constructed only when the first upload happens
+* ``LocalStorageUploader``: Django's default_storage (local development)
+* ``StubUploader``: keeps uploads in memory (tests)
+
+Nothing here touches the network or the ImageKit SDK at import time, so
+``django.setup()``, management commands and test runs do not pay for it.
+"""
+import logging
+import os
+import threading
+from io import BytesIO
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'core.uploads.ImageKitUploader'
+
+
+class UploadError(Exception):
+    pass
+
+
+class BaseUploader:
+    def upload(self, file, file_name, folder=None, is_private=False):
+        """Store ``file`` (bytes, file object or (name, file) tuple) and return its public URL"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _read(file):
+        if isinstance(file, bytes):
+            return file
+        if isinstance(file, tuple):
+            file = file[1]
+        if hasattr(file, 'seek'):
+            file.seek(0)
+        content = file.read()
+        if hasattr(file, 'seek'):
+            file.seek(0)
+        return content
+
+
+class ImageKitUploader(BaseUploader):
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from imagekitio import ImageKit
+
+                    self._client = ImageKit(
+                        private_key=settings.IMAGEKIT_PRIVATE_KEY,
+                        public_key=settings.IMAGEKIT_PUBLIC_KEY,
+                        url_endpoint=settings.IMAGEKIT_URL_ENDPOINT
+                    )
+        return self._client
+
+    def upload(self, file, file_name, folder=None, is_private=False):
+        from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
+
+        try:
+            options = UploadFileRequestOptions(
+                use_unique_file_name=False,
+                folder=folder,
+                is_private_file=is_private,
+                overwrite_file=True,
+                overwrite_ai_tags=True,
+                overwrite_tags=True,
+                overwrite_custom_metadata=True
+            )
+            response = self.client.upload_file(
+                file=(file_name, BytesIO(self._read(file))),
+                file_name=file_name,
+                options=options
+            )
+
+            metadata = getattr(response, 'response_metadata', None)
+            if getattr(metadata, 'http_status_code', None) != 200:
+                raise UploadError(f"ImageKit upload failed: {getattr(metadata, 'raw', 'No metadata')}")
+            if getattr(response, 'url', None) and str(response.url).startswith('http'):
+                return response.url
+            raw = getattr(metadata, 'raw', None) or {}
+            if raw.get('url'):
+                return raw['url']
+            raise UploadError(f"ImageKit upload succeeded but no URL returned: {raw}")
+
+        except Exception as e:
+            logger.error(f"ImageKit upload error: {e}")
+            raise UploadError(f"ImageKit upload error: {e}")
+
+
+class LocalStorageUploader(BaseUploader):
+    def upload(self, file, file_name, folder=None, is_private=False):
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+
+        name = default_storage.save(os.path.join(folder or '', file_name), ContentFile(self._read(file)))
+        base_url = getattr(settings, 'IMAGE_LOCAL_BASE_URL', 'http://localhost:8000')
+        return f"{base_url.rstrip('/')}{default_storage.url(name)}"
+
+
+class StubUploader(BaseUploader):
+    """Records uploads in memory and returns predictable URLs"""
+    base_url = 'https://uploads.test'
+
+    def __init__(self):
+        self.uploads = {}
+        self._lock = threading.Lock()
+
+    def upload(self, file, file_name, folder=None, is_private=False):
+        path = '/'.join(filter(None, [folder, file_name]))
+        with self._lock:
+            self.uploads[path] = self._read(file)
+        return f"{self.base_url}/{path}"
+
+
+_uploader = None
+_uploader_lock = threading.Lock()
+
+
+def get_uploader():
+    """The process-wide uploader, constructed on first use"""
+    global _uploader
+    if _uploader is None:
+        with _uploader_lock:
+            if _uploader is None:
+                backend = getattr(settings, 'IMAGE_UPLOAD_BACKEND', DEFAULT_BACKEND)
+                _uploader = import_string(backend)()
+    return _uploader
+
+
+def reset_uploader():
+    global _uploader
+    _uploader = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting in ('IMAGE_UPLOAD_BACKEND', 'MEDIA_ROOT'):
+        reset_uploader()
+
+
+def upload_file(file, file_name, folder=None, is_private=False):
+    return get_uploader().upload(file, file_name, folder=folder, is_private=is_private)
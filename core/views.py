@@ -1,4 +1,50 @@
+import gzip
+
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .models import SitemapFile
+from . import sitemaps
+
+# Crawlers may reuse a stored file this long before revalidating with its ETag
+STORED_FILE_MAX_AGE = 60 * 60
 
 def info_view(request):
-    return render(request, 'info/index.html')
\ No newline at end of file
+    return render(request, 'info/index.html')
+
+def stored_file_response(request, name, content_type):
+    """Serve a file pre-generated by core.sitemaps, answering revalidation from its row"""
+    stored = SitemapFile.objects.filter(name=name).first() or sitemaps.generate_missing(name)
+    if stored is None:
+        raise Http404('No such file')
+
+    etag = f'"{stored.etag}"'
+    last_modified = int(stored.last_modified.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        body = sitemaps.read_file(stored)
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = HttpResponse(body, content_type=content_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(body), content_type=content_type)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = f'public, max-age={STORED_FILE_MAX_AGE}'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+@require_safe
+def sitemap_index_view(request):
+    return stored_file_response(request, sitemaps.INDEX_NAME, 'application/xml')
+
+@require_safe
+def sitemap_chunk_view(request, name):
+    return stored_file_response(request, name, 'application/xml')
+
+@require_safe
+def blog_feed_view(request):
+    return stored_file_response(request, sitemaps.FEED_NAME, 'application/rss+xml; charset=utf-8')
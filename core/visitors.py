@@ -0,0 +1,94 @@
+"""
+Unique-visitor counting with HyperLogLog sketches.
+
+Each (object, day) pair keeps one VisitorSketch row of ~2 KB, however
+many views it gets. A visitor is the user id when logged in, otherwise
+the client IP. Unique visitors over any date range or set of objects is
+the count of the merged sketches, read with one query.
+
+Because uniques come from the sketches, the raw view rows (BlogView,
+GalleryView) only need to cover recent history; prune_view_rows() ages
+them out after ``VIEW_ROW_RETENTION_DAYS``.
+"""
+import logging
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+from .hll import HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 90
+VIEW_ROW_MODELS = ('blog.BlogView', 'gallery.GalleryView')
+
+
+def visitor_key(user_id=None, ip_address=None):
+    if user_id:
+        return f"u:{user_id}"
+    return f"ip:{ip_address}" if ip_address else None
+
+
+def add_visitors(model, object_id, day, visitors):
+    """Merge visitor keys into the sketch of ``object_id`` on ``day``"""
+    from .models import VisitorSketch
+
+    visitors = [visitor for visitor in visitors if visitor]
+    if not visitors:
+        return
+    content_type = ContentType.objects.get_for_model(model)
+    with transaction.atomic():
+        row, created = VisitorSketch.objects.select_for_update().get_or_create(
+            content_type=content_type, object_id=object_id, day=day, defaults={'registers': b''}
+        )
+        sketch = HyperLogLog.from_bytes(row.registers)
+        # Returning visitors usually leave the sketch untouched: no write
+        if sketch.update(visitors) or created:
+            row.registers = sketch.to_bytes()
+            row.save(update_fields=['registers', 'updated_at'])
+
+
+def _sketches(model, object_ids=None, start=None, end=None):
+    from .models import VisitorSketch
+
+    rows = VisitorSketch.objects.filter(content_type=ContentType.objects.get_for_model(model))
+    if object_ids is not None:
+        rows = rows.filter(object_id__in=list(object_ids))
+    if start is not None:
+        rows = rows.filter(day__gte=start)
+    if end is not None:
+        rows = rows.filter(day__lte=end)
+    return rows.values_list('object_id', 'registers')
+
+
+def unique_visitors(model, object_ids=None, start=None, end=None):
+    """{object_id: estimated unique visitors} over the days in [start, end]"""
+    merged = {}
+    for object_id, registers in _sketches(model, object_ids, start, end):
+        sketch = HyperLogLog.from_bytes(registers)
+        if object_id in merged:
+            merged[object_id].merge(sketch)
+        else:
+            merged[object_id] = sketch
+    return {object_id: sketch.count() for object_id, sketch in merged.items()}
+
+
+def total_unique_visitors(model, object_ids=None, start=None, end=None):
+    """Estimated unique visitors across all matching objects and days"""
+    return HyperLogLog.merged(
+        HyperLogLog.from_bytes(registers) for _, registers in _sketches(model, object_ids, start, end)
+    ).count()
+
+
+def prune_view_rows(days=None, now=None):
+    """Delete raw view rows older than the retention period; returns {model label: deleted}"""
+    days = days if days is not None else getattr(settings, 'VIEW_ROW_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    deleted = {}
+    for label in VIEW_ROW_MODELS:
+        deleted[label], _ = apps.get_model(label).objects.filter(created_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,122 @@
+"""
+Cache-backed write-behind buffer.
+
+Request handlers append small tuples to a named buffer; a periodic job
+drains it and writes everything in bulk. Items land in time buckets of
+``bucket_seconds``: each bucket has a counter and one cache entry per
+item, so appends from any number of workers never overwrite each other.
+Only closed buckets (older than the current one) are drained by default,
+so nothing still being written to is cut off.
+
+The buffer lives in the Django cache, so it only works when every web and
+Celery process shares that cache (Redis, see REDIS_URL in settings).
+``buffering_enabled()`` is False on a per-process cache (LocMem/Dummy)
+unless ``WRITE_BUFFER_ENABLED`` says otherwise; callers then write
+straight to the database instead of appending.
+
+Drains take ``lock()`` so two flushers never read the same buckets, and
+discard them only once their rows are committed.
+"""
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Undrained buckets are kept this long; a flusher outage longer than this loses items
+ITEM_TTL = 60 * 60 * 24
+# A crashed flusher holds the drain lock at most this long
+LOCK_TIMEOUT = 60 * 5
+PER_PROCESS_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def shared_cache_configured():
+    """Whether the default cache is seen by every process"""
+    return settings.CACHES['default']['BACKEND'] not in PER_PROCESS_BACKENDS
+
+
+def buffering_enabled():
+    enabled = getattr(settings, 'WRITE_BUFFER_ENABLED', None)
+    return shared_cache_configured() if enabled is None else enabled
+
+
+class CacheBuffer:
+    def __init__(self, name, bucket_seconds):
+        self.name = name
+        # A number or a callable (e.g. reading a setting at call time)
+        self._bucket_seconds = bucket_seconds
+        self.drained_key = f"{name}:flushed_through"
+        self.lock_key = f"{name}:lock"
+
+    @property
+    def bucket_seconds(self):
+        value = self._bucket_seconds
+        return value() if callable(value) else value
+
+    def bucket_at(self, now=None):
+        return int((now if now is not None else time.time()) // self.bucket_seconds)
+
+    def bucket_start(self, bucket):
+        """Epoch seconds at which ``bucket`` starts"""
+        return bucket * self.bucket_seconds
+
+    def _count_key(self, bucket):
+        return f"{self.name}:{bucket}:n"
+
+    def _item_key(self, bucket, seq):
+        return f"{self.name}:{bucket}:{seq}"
+
+    def _next_seq(self, bucket):
+        key = self._count_key(bucket)
+        cache.add(key, 0, ITEM_TTL)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(key, 1, ITEM_TTL)
+            return 1
+
+    def append(self, item, now=None):
+        bucket = self.bucket_at(now)
+        cache.set(self._item_key(bucket, self._next_seq(bucket)), item, ITEM_TTL)
+
+    def buckets(self, now=None, include_current=False):
+        """Buckets not drained yet, oldest first"""
+        latest = self.bucket_at(now) - (0 if include_current else 1)
+        drained = cache.get(self.drained_key)
+        oldest = latest - ITEM_TTL // self.bucket_seconds
+        first = oldest if drained is None else max(drained + 1, oldest)
+        return range(first, latest + 1)
+
+    def read(self, bucket):
+        count = cache.get(self._count_key(bucket)) or 0
+        if not count:
+            return []
+        keys = [self._item_key(bucket, seq) for seq in range(1, count + 1)]
+        items = cache.get_many(keys)
+        return [items[key] for key in keys if key in items]
+
+    def pending(self, now=None, include_current=True):
+        return sum(len(self.read(bucket)) for bucket in self.buckets(now, include_current))
+
+    @contextmanager
+    def lock(self):
+        """Yields True if this caller holds the drain lock, False if another drain is running"""
+        acquired = cache.add(self.lock_key, 1, LOCK_TIMEOUT)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                cache.delete(self.lock_key)
+
+    def discard(self, buckets):
+        """Drop drained buckets and remember how far the buffer was drained"""
+        if not buckets:
+            return
+        for bucket in buckets:
+            count = cache.get(self._count_key(bucket)) or 0
+            cache.delete_many([self._count_key(bucket)] + [self._item_key(bucket, seq) for seq in range(1, count + 1)])
+        cache.set(self.drained_key, buckets[-1], None)
@@ -7,6 +7,9 @@ from imagekit.processors import ResizeToFill, ResizeToFit, SmartResize
 import uuid
 import os
 
+from core.image_ingest import ingest_stored_image
+from core.image_variants import ResponsiveImage, manifest_is_current
+
 def gallery_image_upload_path(instance, filename):
     ext = filename.split('.')[-1]
     filename = f"{uuid.uuid4()}.{ext}"
@@ -124,6 +127,14 @@ class GalleryItem(models.Model):
         format='JPEG',
         options={'quality': 90, 'progressive': True}
     )
+
+    # Responsive AVIF/WebP/JPEG ladder built by core.image_ingest; the
+    # ImageSpecFields above remain the fallback until it exists
+    image_manifest = models.JSONField(default=dict, blank=True, editable=False)
+
+    image_ingest_variants = {
+        'original_image': (ResponsiveImage('image_manifest', 'gallery'),),
+    }
     
     popularity = models.PositiveIntegerField(
         _('popularity'),
@@ -170,6 +181,13 @@ class GalleryItem(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if self.original_image and (update_fields is None or 'original_image' in update_fields):
+            if not manifest_is_current(self.image_manifest, self.original_image.name):
+                ingest_stored_image(self, 'original_image', self.original_image.name)
+
     def increment_popularity(self):
         self.popularity += 1
         self.save(update_fields=['popularity'])
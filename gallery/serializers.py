@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import GalleryCategory, GalleryItem, GalleryView
 from accounts.serializers import UserSerializer
+from core.serializers import ResponsiveImageField
 
 class GalleryCategorySerializer(serializers.ModelSerializer):
     item_count = serializers.SerializerMethodField()
@@ -21,11 +22,12 @@ class GalleryItemListSerializer(serializers.ModelSerializer):
     category = GalleryCategorySerializer(read_only=True)
     thumbnail_url = serializers.SerializerMethodField()
     medium_url = serializers.SerializerMethodField()
+    responsive_image = ResponsiveImageField()
     
     class Meta:
         model = GalleryItem
         fields = [
-            'id', 'title', 'category', 'thumbnail_url', 'medium_url',
+            'id', 'title', 'category', 'thumbnail_url', 'medium_url', 'responsive_image',
             'popularity', 'is_featured', 'status', 'created_at'
         ]
         read_only_fields = fields
@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from .models import GalleryCategory, GalleryItem, GalleryView
 from .serializers import (
     GalleryCategorySerializer,
@@ -11,6 +12,7 @@ from .serializers import (
     GalleryViewSerializer
 )
 from core.permissions import IsAdminOrReadOnly, IsOwnerOrReadOnly
+from core.visitors import add_visitors, visitor_key
 
 class GalleryCategoryListView(generics.ListAPIView):
     queryset = GalleryCategory.objects.filter(status='PUBLISHED')
@@ -43,12 +45,15 @@ class GalleryItemDetailView(generics.RetrieveAPIView):
         instance = self.get_object()
         
         # Record view
+        user = request.user if request.user.is_authenticated else None
+        ip_address = self.get_client_ip(request)
         GalleryView.objects.create(
             item=instance,
-            user=request.user if request.user.is_authenticated else None,
-            ip_address=self.get_client_ip(request),
+            user=user,
+            ip_address=ip_address,
             user_agent=request.META.get('HTTP_USER_AGENT', '')
         )
+        add_visitors(GalleryItem, instance.pk, timezone.localdate(), [visitor_key(user and user.pk, ip_address)])
         
         # Increment popularity
         instance.increment_popularity()
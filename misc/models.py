@@ -4,66 +4,14 @@ from django.utils.text import slugify
 from django.utils import timezone
 from django.urls import reverse
 from django.conf import settings
-from imagekitio import ImageKit
-from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
 import uuid
 import os
 import logging
 
-logger = logging.getLogger(__name__)
-
-# Initialize ImageKit client
-imagekit = ImageKit(
-    private_key=settings.IMAGEKIT_PRIVATE_KEY,
-    public_key=settings.IMAGEKIT_PUBLIC_KEY,
-    url_endpoint=settings.IMAGEKIT_URL_ENDPOINT
-)
-
-def upload_to_imagekit(file, file_name, folder="events"):
-    """Upload file to ImageKit.io and return URL"""
-    try:
-        from io import BytesIO
-        
-        options = UploadFileRequestOptions(
-            use_unique_file_name=True,
-            folder=folder,
-            is_private_file=False,
-            overwrite_file=False,
-            overwrite_ai_tags=True,
-            overwrite_tags=True,
-            overwrite_custom_metadata=True
-        )
-
-        # Handle file upload
-        if hasattr(file, 'read'):
-            file_content = file.read()
-            file.seek(0)  # Reset file pointer
-            file_data = (file_name, BytesIO(file_content))
-        else:
-            file_data = file
-
-        response = imagekit.upload_file(
-            file=file_data,
-            file_name=file_name,
-            options=options
-        )
+from core.image_ingest import ImageVariant, ingest_stored_image
+from core.image_variants import ResponsiveImage, manifest_is_current
 
-        # Check for valid response and URL
-        if (hasattr(response, 'response_metadata') and 
-            getattr(response.response_metadata, 'http_status_code', None) == 200):
-            if hasattr(response, 'url') and response.url:
-                return response.url
-            elif (hasattr(response.response_metadata, 'raw') and 
-                  response.response_metadata.raw.get('url')):
-                return response.response_metadata.raw['url']
-            else:
-                raise Exception("ImageKit upload succeeded but no URL returned")
-        else:
-            raise Exception(f"ImageKit upload failed: {getattr(response.response_metadata, 'raw', 'No metadata')}")
-
-    except Exception as e:
-        logger.error(f"ImageKit upload error: {e}")
-        raise Exception(f"ImageKit upload error: {e}")
+logger = logging.getLogger(__name__)
 
 def event_image_upload_path(instance, filename):
     ext = filename.split('.')[-1]
@@ -117,6 +65,17 @@ class Event(models.Model):
         null=True
     )
     
+    image_manifest = models.JSONField(default=dict, blank=True, editable=False)
+
+    image_ingest_variants = {
+        'event_image': (
+            ResponsiveImage('image_manifest', 'events'),
+            ImageVariant('imagekit_original_url', None, 'events/originals'),
+            ImageVariant('imagekit_thumbnail_url', (400, 300), 'events/thumbnails', prefix='thumb_'),
+            ImageVariant('imagekit_banner_url', (1200, 600), 'events/banners', prefix='banner_', quality=90),
+        ),
+    }
+
     event_date = models.DateField(
         _('event date')
     )
@@ -179,60 +138,17 @@ class Event(models.Model):
         if not self.slug:
             self.slug = slugify(self.title)
         
-        # Upload to ImageKit if image is uploaded and URLs are not set
-        if self.original_image and not self.imagekit_original_url:
-            try:
-                from PIL import Image
-                from io import BytesIO
-                
-                logger.info(f"Starting ImageKit upload for event: {self.title}")
-                
-                # Upload original image to ImageKit
-                original_name = f"event-{self.slug or 'temp'}-original.jpg"
-                self.imagekit_original_url = upload_to_imagekit(
-                    self.original_image,
-                    original_name,
-                    folder="events/originals"
-                )
-                
-                # Create and upload thumbnail (400x300)
-                img = Image.open(self.original_image)
-                img.thumbnail((400, 300), Image.Resampling.LANCZOS)
-                
-                thumbnail_buffer = BytesIO()
-                img.save(thumbnail_buffer, format='JPEG', quality=85)
-                thumbnail_buffer.seek(0)
-                
-                thumbnail_name = f"event-{self.slug or 'temp'}-thumbnail.jpg"
-                self.imagekit_thumbnail_url = upload_to_imagekit(
-                    (thumbnail_name, thumbnail_buffer),
-                    thumbnail_name,
-                    folder="events/thumbnails"
-                )
-                
-                # Create and upload banner (1200x600)
-                img = Image.open(self.original_image)
-                img.thumbnail((1200, 600), Image.Resampling.LANCZOS)
-                
-                banner_buffer = BytesIO()
-                img.save(banner_buffer, format='JPEG', quality=90)
-                banner_buffer.seek(0)
-                
-                banner_name = f"event-{self.slug or 'temp'}-banner.jpg"
-                self.imagekit_banner_url = upload_to_imagekit(
-                    (banner_name, banner_buffer),
-                    banner_name,
-                    folder="events/banners"
-                )
-                
-                logger.info(f"Successfully uploaded images to ImageKit for event: {self.title}")
-                
-            except Exception as e:
-                logger.error(f"Failed to upload images to ImageKit for event {self.title}: {e}")
-                # Continue saving even if ImageKit upload fails - fallback to local storage
-                logger.info(f"Event {self.title} will use local image storage as fallback")
-        
         super().save(*args, **kwargs)
+
+        # Original, thumbnail, banner and the responsive ladder are uploaded by
+        # the image ingestion pipeline after commit; until then the local image
+        # is the fallback
+        if self.original_image and (
+            not self.imagekit_original_url
+            or not manifest_is_current(self.image_manifest, self.original_image.name)
+        ):
+            ext = os.path.splitext(self.original_image.name)[1].lower() or '.jpg'
+            ingest_stored_image(self, 'event_image', self.original_image.name, f"event-{self.slug}{ext}")
         
     def get_absolute_url(self):
         return reverse('misc:event_detail', kwargs={'slug': self.slug})
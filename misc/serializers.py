@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core.serializers import ResponsiveImageField
 from .models import Event, JobOpening, ContactUs
 
 class EventSerializer(serializers.ModelSerializer):
@@ -7,12 +8,13 @@ class EventSerializer(serializers.ModelSerializer):
     banner_url = serializers.SerializerMethodField()
     original_image_url = serializers.SerializerMethodField()
     days_until = serializers.SerializerMethodField()
+    responsive_image = ResponsiveImageField()
     
     class Meta:
         model = Event
         fields = [
             'id', 'title', 'slug', 'description',
-            'thumbnail_url', 'banner_url', 'original_image_url',
+            'thumbnail_url', 'banner_url', 'original_image_url', 'responsive_image',
             'imagekit_original_url', 'imagekit_thumbnail_url', 'imagekit_banner_url',
             'event_date', 'start_time', 'end_time', 'location',
             'registration_link', 'status', 'is_featured',
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -268,6 +269,26 @@ DB_BACKUP_STORAGE_TYPE = os.getenv('DB_BACKUP_STORAGE_TYPE', 'LOCAL')  # LOCAL,
 DB_BACKUP_PATH = os.getenv('DB_BACKUP_PATH', 'backups/')
 DB_BACKUP_RETENTION_DAYS = int(os.getenv('DB_BACKUP_RETENTION_DAYS', 7))
 
+# Cache
+# The write-behind buffers (core.write_buffer) and the cache version counters
+# (puja catalog, booking calendars, blog comments/trending) must be shared by
+# every web and Celery process: set REDIS_URL in production. Without it each
+# process has its own LocMem cache and blog views are written directly.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Celery Configuration
 # For development, use in-memory broker (no Redis required)
 CELERY_TASK_ALWAYS_EAGER = True  # Execute tasks immediately in development
@@ -278,5 +299,81 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    # Exact-time booking reminders (core.reminders)
+    'dispatch-due-reminders': {
+        'task': 'core.tasks.dispatch_due_reminders',
+        'schedule': 60.0,
+    },
+    # Astrology slots held by abandoned payments (astrology.slots)
+    'release-expired-slot-holds': {
+        'task': 'astrology.tasks.release_expired_slot_holds',
+        'schedule': 120.0,
+    },
+    # Stale pending payments, idle and old converted carts (cart.janitor)
+    'run-cart-janitor': {
+        'task': 'cart.tasks.run_cart_janitor',
+        'schedule': 60.0 * 15,
+    },
+    # Buffered blog post views (blog.view_buffer)
+    'flush-blog-views': {
+        'task': 'blog.tasks.flush_blog_views',
+        'schedule': 60.0,
+    },
+    # Buffered blog search log (blog.search)
+    'flush-blog-search-log': {
+        'task': 'blog.tasks.flush_search_log',
+        'schedule': 120.0,
+    },
+    # Full TF-IDF related-posts recompute (blog.related)
+    'rebuild-related-posts': {
+        'task': 'blog.tasks.rebuild_related_posts',
+        'schedule': 60.0 * 60 * 24,
+    },
+    # Daily BlogAnalytics/BlogPostDailyStats rollups (blog.rollups)
+    'rollup-blog-analytics': {
+        'task': 'blog.tasks.rollup_blog_analytics',
+        'schedule': 60.0 * 60,
+    },
+    # Nightly, once yesterday's last view bucket has been flushed (CELERY_TIMEZONE)
+    'rollup-blog-analytics-nightly': {
+        'task': 'blog.tasks.rollup_blog_analytics_nightly',
+        'schedule': crontab(hour=0, minute=30),
+    },
+    # Raw BlogView/GalleryView rows past retention (core.visitors)
+    'prune-view-rows': {
+        'task': 'core.tasks.prune_view_rows',
+        'schedule': 60.0 * 60 * 24,
+    },
+    'rebuild-sitemaps': {
+        'task': 'core.tasks.rebuild_sitemaps',
+        'schedule': 60.0 * 60 * 24,
+    },
+}
+
+# Blog views are buffered in the cache and flushed in buckets of this many seconds.
+# The buffer lives in the cache, so multi-process deployments need a shared cache (Redis).
+BLOG_VIEW_BUCKET_SECONDS = int(os.getenv('BLOG_VIEW_BUCKET_SECONDS', 30))
+# Raw view rows are kept this long; unique visitors come from core.visitors sketches
+VIEW_ROW_RETENTION_DAYS = int(os.getenv('VIEW_ROW_RETENTION_DAYS', 90))
+# Blog searches are logged to BlogSearchQuery in batches of this many seconds
+BLOG_SEARCH_LOG_BUCKET_SECONDS = int(os.getenv('BLOG_SEARCH_LOG_BUCKET_SECONDS', 60))
+# Engagement loses half its weight in the trending score after this many hours (blog.trending)
+BLOG_TRENDING_HALF_LIFE_HOURS = float(os.getenv('BLOG_TRENDING_HALF_LIFE_HOURS', 48))
+
+# Astrology slot engine (astrology.slots)
+ASTROLOGY_WORKING_HOURS = (os.getenv('ASTROLOGY_OPENS_AT', '10:00'), os.getenv('ASTROLOGY_CLOSES_AT', '19:00'))
+ASTROLOGY_SLOT_INTERVAL_MINUTES = int(os.getenv('ASTROLOGY_SLOT_INTERVAL_MINUTES', 30))
+ASTROLOGY_CONCURRENT_SESSIONS = int(os.getenv('ASTROLOGY_CONCURRENT_SESSIONS', 1))
+ASTROLOGY_SLOT_HOLD_MINUTES = int(os.getenv('ASTROLOGY_SLOT_HOLD_MINUTES', 10))
+
+# Uploads (core.uploads): ImageKitUploader, LocalStorageUploader or StubUploader
+IMAGE_UPLOAD_BACKEND = os.getenv('IMAGE_UPLOAD_BACKEND', 'core.uploads.ImageKitUploader')
+# Image ingestion pipeline (core.image_ingest)
+IMAGE_INGEST_UPLOAD_WORKERS = int(os.getenv('IMAGE_INGEST_UPLOAD_WORKERS', 4))
+IMAGE_LOCAL_BASE_URL = os.getenv('IMAGE_LOCAL_BASE_URL', 'http://localhost:8000')
+# Responsive variants (core.image_variants): width ladder and modern formats; JPEG is always added
+IMAGE_VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+IMAGE_VARIANT_FORMATS = tuple(os.getenv('IMAGE_VARIANT_FORMATS', 'avif,webp').split(','))
 DB_BACKUP_MAX_FILES = int(os.getenv('DB_BACKUP_MAX_FILES', 10))
 DB_BACKUP_AUTO_ENABLED = os.getenv('DB_BACKUP_AUTO_ENABLED', 'True') == 'True'
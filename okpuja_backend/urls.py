@@ -5,7 +5,7 @@ from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from django.conf import settings
 from django.conf.urls.static import static
-from core.views import info_view
+from core.views import info_view, sitemap_chunk_view, sitemap_index_view
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -25,6 +25,10 @@ urlpatterns = [
     path('', info_view, name='info'),
     # Admin
     path('admin/', admin.site.urls),
+
+    # Sitemaps (pre-generated by core.sitemaps)
+    path('sitemap.xml', sitemap_index_view, name='sitemap-index'),
+    path('sitemaps/<slug:name>.xml', sitemap_chunk_view, name='sitemap-chunk'),
     
     # API Documentation
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
@@ -3,7 +3,7 @@ Clean Admin interface for payments app
 """
 
 from django.contrib import admin
-from .models import PaymentOrder, PaymentRefund, PaymentWebhook
+from .models import PaymentOrder, PaymentRefund, PaymentWebhook, PendingCheckout
 
 
 @admin.register(PaymentOrder)
@@ -114,3 +114,13 @@ class PaymentWebhookAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
+
+
+@admin.register(PendingCheckout)
+class PendingCheckoutAdmin(admin.ModelAdmin):
+    """Pending Checkout Admin"""
+    
+    list_display = ['payment_order', 'checkout_type', 'user', 'preferred_date', 'preferred_time', 'created_at']
+    list_filter = ['checkout_type', 'created_at']
+    search_fields = ['payment_order__merchant_order_id', 'user__email', 'contact_email']
+    raw_id_fields = ['payment_order', 'user', 'astrology_service', 'slot_hold']
@@ -136,9 +136,8 @@ class CartPaymentView(APIView):
                         }
                     }, status=status.HTTP_200_OK)
             
-            # Calculate amount from cart
-            amount_in_rupees = cart.total_price
-            amount_in_paisa = int(amount_in_rupees * 100)
+            # Amount comes from the cart's stored price quote (already in paisa)
+            amount_in_paisa = cart.get_price_quote()['final_paisa']
             
             # Create payment order with PROFESSIONAL redirect handler URL for safe payment verification
             payment_data = {
@@ -81,10 +81,17 @@ class Command(BaseCommand):
                     f'(Remaining: {remaining_minutes}min {remaining_seconds % 60}sec)'
                 )
         
+        # Free astrology slots held by expired or abandoned payments
+        released_holds = 0
+        if not dry_run:
+            from astrology.slots import release_expired_holds
+            released_holds = release_expired_holds()
+        
         # Summary
         self.stdout.write('\n📈 CLEANUP SUMMARY:')
         self.stdout.write(f'   Checked: {checked_count} orders')
         self.stdout.write(f'   Expired: {expired_count} orders')
+        self.stdout.write(f'   Released slot holds: {released_holds}')
         
         if dry_run:
             self.stdout.write(
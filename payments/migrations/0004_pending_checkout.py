@@ -0,0 +1,94 @@
+# Generated by Django 5.2 on 2026-10-19 04:48
+
+import django.db.models.deletion
+from django.conf import settings
+from datetime import datetime
+
+from django.db import migrations, models
+
+PAYLOAD_KEYS = (
+    'booking_type', 'service_id', 'service_title', 'service_price', 'user_id', 'language',
+    'preferred_date', 'preferred_time', 'birth_place', 'birth_date', 'birth_time', 'gender',
+    'questions', 'contact_email', 'contact_phone', 'frontend_redirect_url', 'slot_hold_id',
+)
+
+
+def move_astrology_payloads(apps, schema_editor):
+    """Copy astrology booking forms out of PaymentOrder.metadata into PendingCheckout rows"""
+    PaymentOrder = apps.get_model('payments', 'PaymentOrder')
+    PendingCheckout = apps.get_model('payments', 'PendingCheckout')
+    AstrologyService = apps.get_model('astrology', 'AstrologyService')
+
+    AstrologySlotHold = apps.get_model('astrology', 'AstrologySlotHold')
+
+    service_ids = set(AstrologyService.objects.values_list('pk', flat=True))
+    hold_ids = set(AstrologySlotHold.objects.values_list('pk', flat=True))
+    for order in PaymentOrder.objects.filter(metadata__booking_type='astrology').iterator():
+        data = order.metadata
+        try:
+            checkout = PendingCheckout(
+                payment_order_id=order.merchant_order_id,
+                checkout_type='ASTROLOGY',
+                user_id=order.user_id,
+                frontend_redirect_url=data.get('frontend_redirect_url', ''),
+                astrology_service_id=data['service_id'] if data.get('service_id') in service_ids else None,
+                slot_hold_id=data['slot_hold_id'] if data.get('slot_hold_id') in hold_ids else None,
+                language=data.get('language', ''),
+                preferred_date=datetime.fromisoformat(data['preferred_date']).date(),
+                preferred_time=datetime.strptime(data['preferred_time'], '%H:%M:%S').time(),
+                birth_place=data.get('birth_place', ''),
+                birth_date=datetime.fromisoformat(data['birth_date']).date(),
+                birth_time=datetime.strptime(data['birth_time'], '%H:%M:%S').time(),
+                gender=data.get('gender', ''),
+                questions=data.get('questions') or '',
+                contact_email=data.get('contact_email', ''),
+                contact_phone=data.get('contact_phone', ''),
+            )
+        except (KeyError, TypeError, ValueError):
+            # Unparseable payloads stay in metadata untouched
+            continue
+        checkout.save()
+        PaymentOrder.objects.filter(pk=order.pk).update(
+            metadata={key: value for key, value in data.items() if key not in PAYLOAD_KEYS}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('astrology', '0010_slot_engine'),
+        ('payments', '0003_add_address_to_payment_order'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingCheckout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checkout_type', models.CharField(choices=[('ASTROLOGY', 'Astrology Booking')], max_length=20)),
+                ('frontend_redirect_url', models.URLField(blank=True)),
+                ('language', models.CharField(blank=True, max_length=50)),
+                ('preferred_date', models.DateField(blank=True, null=True)),
+                ('preferred_time', models.TimeField(blank=True, null=True)),
+                ('birth_place', models.CharField(blank=True, max_length=255)),
+                ('birth_date', models.DateField(blank=True, null=True)),
+                ('birth_time', models.TimeField(blank=True, null=True)),
+                ('gender', models.CharField(blank=True, max_length=10)),
+                ('questions', models.TextField(blank=True)),
+                ('contact_email', models.EmailField(blank=True, max_length=254)),
+                ('contact_phone', models.CharField(blank=True, max_length=15)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('astrology_service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='astrology.astrologyservice')),
+                ('payment_order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='pending_checkout', to='payments.paymentorder', to_field='merchant_order_id')),
+                ('slot_hold', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='astrology.astrologyslothold')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_checkouts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'payments_pending_checkout',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['checkout_type', 'created_at'], name='payments_pe_checkou_54f61c_idx')],
+            },
+        ),
+        migrations.RunPython(move_astrology_payloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-19 05:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0005_cart_janitor_indexes'),
+        ('payments', '0004_pending_checkout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymentorder',
+            name='cart',
+            field=models.ForeignObject(editable=False, from_fields=['cart_id'], null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='payment_orders', serialize=False, to='cart.cart', to_fields=['cart_id']),
+        ),
+    ]
@@ -38,6 +38,11 @@ class PaymentOrder(models.Model):
     
     # Cart Integration (optional)
     cart_id = models.CharField(max_length=100, null=True, blank=True, db_index=True, help_text="Associated cart ID")
+    # Join on cart_id for cart queries (no column or constraint of its own)
+    cart = models.ForeignObject(
+        'cart.Cart', on_delete=models.DO_NOTHING, from_fields=['cart_id'], to_fields=['cart_id'],
+        related_name='payment_orders', null=True, editable=False, serialize=False
+    )
     
     # Address Integration (for booking creation)
     address_id = models.PositiveIntegerField(null=True, blank=True, help_text="Selected address ID for delivery/service")
@@ -106,6 +111,80 @@ class PaymentOrder(models.Model):
         if phonepe_response:
             self.phonepe_response = phonepe_response
         self.save()
+    
+    def get_pending_checkout(self):
+        """The typed checkout payload of this order, or None for cart/plain payments"""
+        try:
+            return self.pending_checkout
+        except PendingCheckout.DoesNotExist:
+            return None
+    
+    @property
+    def checkout_type(self):
+        checkout = self.get_pending_checkout()
+        return checkout.checkout_type if checkout else None
+
+
+class PendingCheckout(models.Model):
+    """
+    Booking form submitted with a payment, kept until the payment succeeds
+    and the booking is created from it. Replaces the payload that used to
+    live in PaymentOrder.metadata.
+    """
+    
+    class CheckoutType(models.TextChoices):
+        ASTROLOGY = 'ASTROLOGY', 'Astrology Booking'
+    
+    payment_order = models.OneToOneField(
+        PaymentOrder,
+        to_field='merchant_order_id',
+        on_delete=models.CASCADE,
+        related_name='pending_checkout'
+    )
+    checkout_type = models.CharField(max_length=20, choices=CheckoutType.choices)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='pending_checkouts')
+    frontend_redirect_url = models.URLField(blank=True)
+    
+    # Astrology booking
+    astrology_service = models.ForeignKey(
+        'astrology.AstrologyService', on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    slot_hold = models.ForeignKey(
+        'astrology.AstrologySlotHold', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    language = models.CharField(max_length=50, blank=True)
+    preferred_date = models.DateField(null=True, blank=True)
+    preferred_time = models.TimeField(null=True, blank=True)
+    birth_place = models.CharField(max_length=255, blank=True)
+    birth_date = models.DateField(null=True, blank=True)
+    birth_time = models.TimeField(null=True, blank=True)
+    gender = models.CharField(max_length=10, blank=True)
+    questions = models.TextField(blank=True)
+    contact_email = models.EmailField(blank=True)
+    contact_phone = models.CharField(max_length=15, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    ASTROLOGY_BOOKING_FIELDS = (
+        'user', 'language', 'preferred_date', 'preferred_time', 'birth_place',
+        'birth_date', 'birth_time', 'gender', 'questions', 'contact_email', 'contact_phone'
+    )
+    
+    class Meta:
+        db_table = 'payments_pending_checkout'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['checkout_type', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_checkout_type_display()} checkout {self.payment_order_id}"
+    
+    def astrology_booking_fields(self):
+        """AstrologyBooking field values copied from this checkout"""
+        fields = {name: getattr(self, name) for name in self.ASTROLOGY_BOOKING_FIELDS}
+        fields['service'] = self.astrology_service
+        return fields
 
 
 class PaymentRefund(models.Model):
@@ -65,12 +65,12 @@ class PaymentRedirectHandler(View):
                     try:
                         from datetime import datetime, timedelta
                         from astrology.models import AstrologyBooking
-                        from .models import PaymentOrder  # Import PaymentOrder from current app
+                        from .models import PaymentOrder, PendingCheckout  # Import from current app
                         
                         # Look for recent successful astrology payments (last 10 minutes)
                         recent_time = datetime.now() - timedelta(minutes=10)
                         recent_astrology_payments = PaymentOrder.objects.filter(
-                            metadata__booking_type='astrology',
+                            pending_checkout__checkout_type=PendingCheckout.CheckoutType.ASTROLOGY,
                             status='SUCCESS',
                             updated_at__gte=recent_time
                         ).order_by('-updated_at')[:5]
@@ -82,7 +82,7 @@ class PaymentRedirectHandler(View):
                             astrology_booking = AstrologyBooking.objects.filter(payment_id=str(payment.id)).first()
                             if astrology_booking:
                                 logger.info(f"Using recent astrology payment: {payment.merchant_order_id} -> {astrology_booking.astro_book_id}")
-                                frontend_base = payment.metadata.get('frontend_redirect_url', 'https://www.okpuja.com').rstrip('/')
+                                frontend_base = (payment.pending_checkout.frontend_redirect_url or 'https://www.okpuja.com').rstrip('/')
                                 redirect_url = f"{frontend_base}/astro-booking-success?astro_book_id={astrology_booking.astro_book_id}&fallback=true"
                                 return redirect(redirect_url)
                         
@@ -115,8 +115,8 @@ class PaymentRedirectHandler(View):
                     frontend_base = None
                     
                     # Check if this is an astrology booking
-                    logger.info(f"🔍 Checking payment metadata for order {merchant_order_id}: {payment_order.metadata}")
-                    if payment_order.metadata.get('booking_type') == 'astrology':
+                    checkout = payment_order.get_pending_checkout()
+                    if checkout and checkout.checkout_type == checkout.CheckoutType.ASTROLOGY:
                         logger.info(f"✅ Detected astrology booking for order: {merchant_order_id}")
                         try:
                             from astrology.models import AstrologyBooking
@@ -140,8 +140,8 @@ class PaymentRedirectHandler(View):
                         except Exception as e:
                             logger.warning(f"❌ Could not get/create astrology booking for payment {payment_order.id}: {e}")
                         
-                        # Get the original frontend URL from metadata for astrology bookings
-                        frontend_base = payment_order.metadata.get('frontend_redirect_url', 'https://www.okpuja.com')
+                        # Get the original frontend URL from the checkout for astrology bookings
+                        frontend_base = checkout.frontend_redirect_url or 'https://www.okpuja.com'
                         if frontend_base.endswith('/'):
                             frontend_base = frontend_base.rstrip('/')
                         logger.info(f"🌐 Using frontend base URL: {frontend_base}")
@@ -191,9 +191,10 @@ class PaymentRedirectHandler(View):
                     
                 elif status in ['FAILED', 'CANCELLED']:
                     # Check if this is an astrology booking
-                    if payment_order.metadata.get('booking_type') == 'astrology':
-                        # Extract frontend_base from metadata for astrology bookings
-                        frontend_base = payment_order.metadata.get('frontend_redirect_url', 'https://www.okpuja.com').rstrip('/')
+                    checkout = payment_order.get_pending_checkout()
+                    if checkout and checkout.checkout_type == checkout.CheckoutType.ASTROLOGY:
+                        # Extract frontend_base from the checkout for astrology bookings
+                        frontend_base = (checkout.frontend_redirect_url or 'https://www.okpuja.com').rstrip('/')
                         
                         # Try to get astro_book_id if booking exists
                         astro_book_id = None
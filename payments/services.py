@@ -9,8 +9,8 @@ import json
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.conf import settings
-from django.db import models
-from .models import PaymentOrder, PaymentRefund
+from django.db import models, transaction
+from .models import PaymentOrder, PaymentRefund, PendingCheckout
 from .phonepe_client import PhonePePaymentClient
 
 logger = logging.getLogger(__name__)
@@ -582,7 +582,7 @@ class WebhookService:
                         logger.error("Failed to create booking from cart")
                 
                 # Handle astrology booking creation
-                elif payment_order.metadata.get('booking_type') == 'astrology':
+                elif payment_order.checkout_type == PendingCheckout.CheckoutType.ASTROLOGY:
                     booking = self._create_astrology_booking(payment_order)
                     if booking:
                         logger.info(f"Astrology booking created via webhook: {booking.astro_book_id}")
@@ -687,11 +687,8 @@ class WebhookService:
             
             logger.info(f"Booking created from cart {cart.cart_id}: {booking.book_id}")
             
-            # Auto-cleanup old converted carts to keep database clean
-            try:
-                self._cleanup_old_carts(payment_order.user)
-            except Exception as e:
-                logger.warning(f"Failed to cleanup old carts: {e}")
+            # Old converted carts are pruned by the background cart janitor
+            # (cart.tasks.run_cart_janitor), not on the payment path
             
             # Send booking confirmation email (trigger Celery task)
             try:
@@ -707,129 +704,46 @@ class WebhookService:
             logger.error(f"Failed to create booking from cart {payment_order.cart_id}: {e}")
             return None
     
-    def _cleanup_old_carts(self, user):
-        """Clean up old converted carts, keeping only the latest 3"""
-        from cart.models import Cart
-        from booking.models import Booking
-        from django.db import connection, transaction
-        
-        # Find all converted carts for this user
-        converted_carts = Cart.objects.filter(
-            user=user, 
-            status=Cart.StatusChoices.CONVERTED
-        ).order_by('-created_at')
-        
-        # Keep only the latest 3, mark older ones for cleanup
-        carts_to_keep = converted_carts[:3]
-        carts_to_cleanup = converted_carts[3:]
-        
-        for cart in carts_to_cleanup:
-            try:
-                with transaction.atomic():
-                    # Before deleting cart, set booking cart reference to NULL
-                    bookings = Booking.objects.filter(cart=cart)
-                    for booking in bookings:
-                        booking.cart = None
-                        booking.save()
-                    
-                    # Handle payment order references
-                    from .models import PaymentOrder
-                    payments = PaymentOrder.objects.filter(cart_id=cart.cart_id)
-                    for payment in payments:
-                        payment.cart_id = None
-                        payment.save()
-                    
-                    # Use raw SQL to safely delete cart with foreign key constraint handling
-                    cursor = connection.cursor()
-                    try:
-                        # Temporarily disable foreign key constraints for this delete
-                        cursor.execute("PRAGMA foreign_keys = OFF")
-                        cart.delete()
-                        cursor.execute("PRAGMA foreign_keys = ON")
-                        logger.info(f"Cleaned up old cart: {cart.cart_id}")
-                    except Exception as sql_error:
-                        # Re-enable foreign keys even if delete failed
-                        cursor.execute("PRAGMA foreign_keys = ON")
-                        raise sql_error
-                
-            except Exception as e:
-                logger.warning(f"Failed to cleanup cart {cart.cart_id}: {e}")
-        
-        if carts_to_cleanup:
-            logger.info(f"Cart cleanup complete: removed {len(carts_to_cleanup)} old carts")
-
     def _create_astrology_booking(self, payment_order):
-        """Create astrology booking after successful payment from stored metadata"""
+        """Create astrology booking after successful payment from its pending checkout"""
         try:
             # Import here to avoid circular imports
-            from astrology.models import AstrologyBooking, AstrologyService
-            from django.contrib.auth import get_user_model
-            from datetime import datetime
-            
-            User = get_user_model()
-            
-            # Get booking data from payment metadata
-            metadata = payment_order.metadata
-            if not metadata or metadata.get('booking_type') != 'astrology':
-                logger.error("No astrology booking data found in payment metadata")
-                return None
-            
-            # Validate required fields
-            required_fields = [
-                'service_id', 'user_id', 'language', 'preferred_date', 'preferred_time',
-                'birth_place', 'birth_date', 'birth_time', 'gender', 'contact_email', 'contact_phone'
-            ]
-            
-            for field in required_fields:
-                if field not in metadata:
-                    logger.error(f"Missing required field in payment metadata: {field}")
-                    return None
+            from astrology.models import AstrologyBooking
             
-            # Get service and user
-            try:
-                service = AstrologyService.objects.get(id=metadata['service_id'])
-                user = User.objects.get(id=metadata['user_id'])
-            except (AstrologyService.DoesNotExist, User.DoesNotExist) as e:
-                logger.error(f"Service or user not found: {e}")
+            checkout = payment_order.get_pending_checkout()
+            if checkout is None or checkout.checkout_type != PendingCheckout.CheckoutType.ASTROLOGY:
+                logger.error("No astrology checkout found for payment order")
                 return None
             
-            # Parse dates and times
-            try:
-                preferred_date = datetime.fromisoformat(metadata['preferred_date']).date()
-                preferred_time = datetime.strptime(metadata['preferred_time'], '%H:%M:%S').time()
-                birth_date = datetime.fromisoformat(metadata['birth_date']).date()
-                birth_time = datetime.strptime(metadata['birth_time'], '%H:%M:%S').time()
-            except (ValueError, KeyError) as e:
-                logger.error(f"Error parsing dates/times from metadata: {e}")
-                return None
-            
-            # Create the booking
-            booking_data = {
-                'user': user,
-                'service': service,
-                'language': metadata['language'],
-                'preferred_date': preferred_date,
-                'preferred_time': preferred_time,
-                'birth_place': metadata['birth_place'],
-                'birth_date': birth_date,
-                'birth_time': birth_time,
-                'gender': metadata['gender'],
-                'questions': metadata.get('questions', ''),
-                'contact_email': metadata['contact_email'],
-                'contact_phone': metadata['contact_phone'],
-                'payment_id': str(payment_order.id),
-                'status': 'CONFIRMED',  # Already confirmed since payment is successful
-                'metadata': {
-                    'payment_confirmed': True,
-                    'payment_order_id': str(payment_order.id),
-                    'merchant_order_id': payment_order.merchant_order_id,
-                    'payment_amount': payment_order.amount,
-                    'payment_completed_at': payment_order.completed_at.isoformat() if payment_order.completed_at else None,
-                    'phonepe_transaction_id': payment_order.phonepe_transaction_id
-                }
-            }
-            
-            booking = AstrologyBooking.objects.create(**booking_data)
+            from astrology.slots import claim_paid_hold, confirm_hold
+            with transaction.atomic():
+                # The payment may arrive after the hold expired: the slot is checked
+                # again under the day lock before the booking takes it
+                has_slot = claim_paid_hold(checkout.slot_hold_id) if checkout.slot_hold_id else True
+                # Typed columns: the booking is a direct copy, nothing to re-parse
+                booking = AstrologyBooking.objects.create(
+                    **checkout.astrology_booking_fields(),
+                    payment_id=str(payment_order.id),
+                    # Already confirmed since payment is successful, unless the slot was lost
+                    status='CONFIRMED' if has_slot else 'NEEDS_RESCHEDULE',
+                    metadata={
+                        'payment_confirmed': True,
+                        'payment_order_id': str(payment_order.id),
+                        'merchant_order_id': payment_order.merchant_order_id,
+                        'payment_amount': payment_order.amount,
+                        'payment_completed_at': payment_order.completed_at.isoformat() if payment_order.completed_at else None,
+                        'phonepe_transaction_id': payment_order.phonepe_transaction_id,
+                        'slot_conflict': not has_slot
+                    }
+                )
+                if checkout.slot_hold_id and has_slot:
+                    # The booking now occupies the slot that was held during payment
+                    confirm_hold(checkout.slot_hold_id, booking)
+            
+            if not has_slot:
+                logger.error(f"Astrology booking {booking.astro_book_id} lost its slot after payment {payment_order.merchant_order_id}")
+                booking.send_slot_conflict_notification()
+                return booking
             
             logger.info(f"Astrology booking created successfully: {booking.astro_book_id} after payment {payment_order.merchant_order_id}")
             
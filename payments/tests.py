@@ -1,3 +1,87 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core import mail
 from django.test import TestCase
 
-# Create your tests here.
+from astrology.models import AstrologyService, AstrologySlotHold
+from astrology.slots import free_slots, hold_slot, release_expired_holds
+from .models import PaymentOrder, PendingCheckout
+from .services import WebhookService
+
+User = get_user_model()
+
+
+class PendingCheckoutTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='seeker@example.com', password='testpass123', username='seeker')
+        self.service = AstrologyService.objects.create(
+            title='Kundali Reading', service_type='HOROSCOPE', description='Birth chart', price=Decimal('501.00')
+        )
+        self.order = PaymentOrder.objects.create(
+            merchant_order_id='OKPUJA_TEST0001', user=self.user, amount=50100,
+            redirect_url='https://api.okpuja.com/api/payments/redirect/', status='SUCCESS'
+        )
+        self.hold = hold_slot(self.service, date(2030, 3, 15), time(11, 0), user=self.user)
+        PendingCheckout.objects.create(
+            payment_order=self.order,
+            checkout_type=PendingCheckout.CheckoutType.ASTROLOGY,
+            user=self.user,
+            frontend_redirect_url='https://www.okpuja.com',
+            astrology_service=self.service,
+            slot_hold=self.hold,
+            language='Hindi',
+            preferred_date=date(2030, 3, 15),
+            preferred_time=time(11, 0),
+            birth_place='Varanasi',
+            birth_date=date(1990, 5, 1),
+            birth_time=time(6, 30),
+            gender='MALE',
+            contact_email='seeker@example.com',
+            contact_phone='9999999999'
+        )
+
+    def test_booking_is_copied_from_checkout(self):
+        order = PaymentOrder.objects.get(merchant_order_id='OKPUJA_TEST0001')
+        self.assertEqual(order.checkout_type, PendingCheckout.CheckoutType.ASTROLOGY)
+        self.assertNotIn('birth_place', order.metadata)
+
+        booking = WebhookService()._create_astrology_booking(order)
+        self.assertEqual(booking.service, self.service)
+        self.assertEqual(booking.user, self.user)
+        self.assertEqual(booking.preferred_time, time(11, 0))
+        self.assertEqual(booking.birth_date, date(1990, 5, 1))
+        self.assertEqual(booking.payment_id, str(order.id))
+        self.hold.refresh_from_db()
+        self.assertEqual(self.hold.status, AstrologySlotHold.Status.CONFIRMED)
+
+    def test_late_payment_does_not_double_book_a_retaken_slot(self):
+        day = date(2030, 3, 15)
+        # The hold expires, the sweeper frees it and another customer takes the slot
+        release_expired_holds(now=self.hold.expires_at + timedelta(seconds=1))
+        other = User.objects.create_user(email='other@example.com', password='testpass123', username='other')
+        hold_slot(self.service, day, time(11, 0), user=other)
+        mail.outbox = []
+
+        booking = WebhookService()._create_astrology_booking(self.order)
+        self.assertEqual(booking.status, 'NEEDS_RESCHEDULE')
+        self.assertTrue(booking.metadata['slot_conflict'])
+        self.hold.refresh_from_db()
+        self.assertEqual(self.hold.status, AstrologySlotHold.Status.RELEASED)
+        self.assertEqual([m.subject for m in mail.outbox], [f'Astrology Booking Needs Reschedule - {booking.astro_book_id}'])
+
+        # A released hold whose slot is still free is booked as usual
+        AstrologySlotHold.objects.filter(user=other).update(status=AstrologySlotHold.Status.RELEASED)
+        booking.delete()
+        booking = WebhookService()._create_astrology_booking(self.order)
+        self.assertEqual(booking.status, 'CONFIRMED')
+        self.assertNotIn(time(11, 0), [start for start, _ in free_slots(self.service, day)])
+
+    def test_orders_without_checkout_are_not_astrology(self):
+        order = PaymentOrder.objects.create(
+            merchant_order_id='CART_1_ABCDEF', user=self.user, amount=100,
+            redirect_url='https://api.okpuja.com/api/payments/redirect/'
+        )
+        self.assertIsNone(order.checkout_type)
+        self.assertIsNone(WebhookService()._create_astrology_booking(order))
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.safestring import mark_safe
-from .models import PujaCategory, PujaService, Package, PujaBooking
+from .models import PujaCategory, PujaService, Package, PujaBooking, PujaSearchSynonym
 
 class PackageInline(admin.TabularInline):
     model = Package
@@ -85,4 +85,10 @@ class PujaBookingAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(PujaSearchSynonym)
+class PujaSearchSynonymAdmin(admin.ModelAdmin):
+    list_display = ('terms', 'normalized_terms', 'updated_at')
+    search_fields = ('terms',)
+    readonly_fields = ('normalized_terms', 'created_at', 'updated_at')
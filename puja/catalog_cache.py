@@ -0,0 +1,64 @@
+"""
+Versioned read-through cache for the public puja catalog.
+
+Every list response is stored under the current catalog version and the
+request's filter parameters. Any save/delete of a PujaCategory, PujaService
+or Package bumps the version (see puja/signals.py), which orphans all
+cached entries at once instead of deleting keys one by one. The version is
+kept in the database (core.cache_versions), so every worker sees the bump.
+"""
+import hashlib
+import json
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.cache_versions import bump_version, get_version
+
+CATALOG_VERSION_KEY = 'puja_catalog_version'
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 6
+CATALOG_BROWSER_MAX_AGE = 60
+
+
+def get_catalog_version():
+    return get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    return bump_version(CATALOG_VERSION_KEY)
+
+
+def catalog_cache_key(scope, query_params):
+    params = urlencode(sorted((key, value) for key in query_params for value in query_params.getlist(key)))
+    digest = hashlib.md5(params.encode('utf-8')).hexdigest()
+    return f"puja_catalog:{get_catalog_version()}:{scope}:{digest}"
+
+
+class CatalogCacheMixin:
+    """
+    ListAPIView mixin serving responses from the catalog cache with ETag/304.
+    Views set ``catalog_cache_scope`` to a unique name.
+    """
+    catalog_cache_scope = None
+
+    def list(self, request, *args, **kwargs):
+        cache_key = catalog_cache_key(self.catalog_cache_scope or type(self).__name__, request.query_params)
+        cached = cache.get(cache_key)
+        if cached is None:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            payload = json.dumps(response.data, sort_keys=True, default=str)
+            cached = ('"%s"' % hashlib.md5(payload.encode('utf-8')).hexdigest(), response.data)
+            cache.set(cache_key, cached, CATALOG_CACHE_TIMEOUT)
+
+        etag, data = cached
+        if etag in [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={CATALOG_BROWSER_MAX_AGE}'
+        return response
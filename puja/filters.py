@@ -1,18 +1,42 @@
 import django_filters
+
+from core.filters import RankedSearchFilter as BaseRankedSearchFilter
+
 from .models import PujaService, Package
+from . import search
 
 class PujaServiceFilter(django_filters.FilterSet):
     min_duration = django_filters.NumberFilter(field_name="duration_minutes", lookup_expr='gte')
     max_duration = django_filters.NumberFilter(field_name="duration_minutes", lookup_expr='lte')
+    # Price filters read the stored package summary: a service matches when the
+    # price range of its active packages (min_price..max_price) overlaps the
+    # requested range, even if no single package lies inside it
+    min_price = django_filters.NumberFilter(field_name="max_price", lookup_expr='gte')
+    max_price = django_filters.NumberFilter(field_name="min_price", lookup_expr='lte')
+    language = django_filters.ChoiceFilter(
+        field_name="languages", lookup_expr='contains', choices=Package.Language.choices
+    )
+    has_packages = django_filters.BooleanFilter(field_name="package_count", method='filter_has_packages')
 
     class Meta:
         model = PujaService
         fields = ['category', 'type', 'is_active']
 
+    def filter_has_packages(self, queryset, name, value):
+        return queryset.filter(package_count__gt=0) if value else queryset.filter(package_count=0)
+
 class PackageFilter(django_filters.FilterSet):
     min_price = django_filters.NumberFilter(field_name="price", lookup_expr='gte')
     max_price = django_filters.NumberFilter(field_name="price", lookup_expr='lte')
 
     class Meta:
         model = Package
-        fields = ['puja_service', 'language', 'package_type', 'is_active']
\ No newline at end of file
+        fields = ['puja_service', 'language', 'package_type', 'is_active']
+
+class RankedSearchFilter(BaseRankedSearchFilter):
+    """``?search=`` backed by the puja full-text index (puja.search)"""
+
+    def ranked_ids(self, request, query, queryset):
+        if queryset.model is Package:
+            return search.ranked_package_ids(query)
+        return search.ranked_service_ids(query)
@@ -0,0 +1,35 @@
+"""
+Rebuild the per-service package summary columns
+Recomputes min/max price, package count and languages on PujaService
+"""
+
+from django.core.management.base import BaseCommand
+
+from puja.models import PujaService
+
+
+class Command(BaseCommand):
+    help = 'Recompute min_price, max_price, package_count and languages for puja services'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--service',
+            type=int,
+            action='append',
+            dest='service_ids',
+            help='Only rebuild this service id (repeatable)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows per bulk update (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('📦 Rebuilding puja package summaries...')
+        updated = PujaService.refresh_package_summaries(
+            service_ids=options['service_ids'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ Updated {updated} service(s)'))
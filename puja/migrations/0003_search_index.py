@@ -0,0 +1,189 @@
+# Generated by Django 5.2 on 2026-10-19 04:23
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of puja.search as of this migration, so later changes to the
+# application code cannot change what it does
+FTS_TABLE = 'puja_search_fts'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_FOLDS = (
+    ('aa', 'a'), ('ee', 'i'), ('oo', 'u'), ('w', 'v'),
+)
+
+SYNONYMS = [
+    'griha, grih, graha, gruha, गृह',
+    'pravesh, pravesha, parvesh, प्रवेश',
+    'puja, pooja, pujan, poojan, पूजा',
+    'havan, hawan, homa, homam, हवन',
+    'shanti, shanthi, shantee, शांति',
+    'vivah, vivaha, shaadi, shadi, marriage, wedding, विवाह',
+    'satyanarayan, satyanarayana, satyanaryan, सत्यनारायण',
+    'katha, kath, कथा',
+    'rudrabhishek, rudrabhishekam, rudra abhishek, रुद्राभिषेक',
+    'navgraha, navagraha, navgrah, नवग्रह',
+    'mundan, mundan sanskar, chudakarana, मुंडन',
+]
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title_norm, body_norm,
+        content='puja_pujasearchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON puja_pujasearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title_norm, body_norm) VALUES (new.id, new.title_norm, new.body_norm);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON puja_pujasearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title_norm, body_norm)
+        VALUES ('delete', old.id, old.title_norm, old.body_norm);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON puja_pujasearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title_norm, body_norm)
+        VALUES ('delete', old.id, old.title_norm, old.body_norm);
+        INSERT INTO {FTS_TABLE}(rowid, title_norm, body_norm) VALUES (new.id, new.title_norm, new.body_norm);
+    END""",
+]
+SQLITE_REVERSE = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_FORWARD = [
+    """ALTER TABLE puja_pujasearchdocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title_norm, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(body_norm, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX puja_search_vector_gin ON puja_pujasearchdocument USING GIN (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS puja_search_vector_gin",
+    "ALTER TABLE puja_pujasearchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_fts_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_fts_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_REVERSE)
+
+
+def normalize_token(token):
+    token = ''.join(
+        ch for ch in unicodedata.normalize('NFKD', token.lower())
+        if not unicodedata.combining(ch) or not ch.isascii()
+    )
+    if not token.isascii():
+        return unicodedata.normalize('NFC', token)
+    for source, target in _FOLDS:
+        token = token.replace(source, target)
+    if len(token) > 3 and token.endswith('a'):
+        token = token[:-1]
+    return token
+
+
+def normalize_text(*parts):
+    return ' '.join(normalize_token(token) for part in parts for token in _TOKEN_RE.findall(part or ''))
+
+
+def _service_document(service):
+    return {
+        'title_norm': normalize_text(service.title),
+        'body_norm': normalize_text(
+            service.description, service.category.name if service.category_id else '', service.get_type_display()
+        ),
+    }
+
+
+def _package_document(package):
+    service = package.puja_service
+    return {
+        'title_norm': normalize_text(service.title, package.get_package_type_display()),
+        'body_norm': normalize_text(
+            package.description, package.location, package.get_language_display(), package.language,
+            service.category.name if service.category_id else ''
+        ),
+    }
+
+
+def seed_synonyms_and_index(apps, schema_editor):
+    PujaSearchSynonym = apps.get_model('puja', 'PujaSearchSynonym')
+    PujaSearchDocument = apps.get_model('puja', 'PujaSearchDocument')
+    PujaSearchSynonym.objects.bulk_create([
+        PujaSearchSynonym(terms=terms, normalized_terms=' '.join(dict.fromkeys(normalize_text(terms).split())))
+        for terms in SYNONYMS
+    ])
+    documents = [
+        PujaSearchDocument(doc_key=f'service:{service.pk}', service=service, **_service_document(service))
+        for service in apps.get_model('puja', 'PujaService').objects.select_related('category')
+    ]
+    documents += [
+        PujaSearchDocument(
+            doc_key=f'package:{package.pk}', service_id=package.puja_service_id, package=package,
+            **_package_document(package)
+        )
+        for package in apps.get_model('puja', 'Package').objects.select_related('puja_service__category')
+    ]
+    PujaSearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('puja', '0002_alter_pujaservice_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PujaSearchSynonym',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('terms', models.CharField(help_text='Comma separated spellings that should match each other', max_length=500)),
+                ('normalized_terms', models.TextField(blank=True, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Puja Search Synonym',
+                'verbose_name_plural': 'Puja Search Synonyms',
+                'ordering': ['terms'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PujaSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doc_key', models.CharField(max_length=40, unique=True)),
+                ('title_norm', models.TextField(blank=True)),
+                ('body_norm', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('package', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='puja.package')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='puja.pujaservice')),
+            ],
+            options={
+                'verbose_name': 'Puja Search Document',
+                'verbose_name_plural': 'Puja Search Documents',
+            },
+        ),
+        migrations.RunPython(create_fts_index, drop_fts_index),
+        migrations.RunPython(seed_synonyms_and_index, migrations.RunPython.noop),
+    ]
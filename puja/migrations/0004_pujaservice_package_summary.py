@@ -0,0 +1,59 @@
+# Generated by Django 5.2 on 2026-10-19 04:26
+
+from django.db import migrations, models
+
+
+def fill_package_summaries(apps, schema_editor):
+    PujaService = apps.get_model('puja', 'PujaService')
+    Package = apps.get_model('puja', 'Package')
+    services = []
+    for service in PujaService.objects.all():
+        packages = Package.objects.filter(puja_service_id=service.pk, is_active=True)
+        summary = packages.aggregate(
+            min_price=models.Min('price'), max_price=models.Max('price'), package_count=models.Count('id')
+        )
+        service.min_price = summary['min_price']
+        service.max_price = summary['max_price']
+        service.package_count = summary['package_count']
+        service.languages = ','.join(sorted(set(packages.values_list('language', flat=True))))
+        services.append(service)
+    PujaService.objects.bulk_update(services, ['min_price', 'max_price', 'package_count', 'languages'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('puja', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pujaservice',
+            name='languages',
+            field=models.CharField(blank=True, editable=False, help_text='Comma separated languages of active packages', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='pujaservice',
+            name='max_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='pujaservice',
+            name='min_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='pujaservice',
+            name='package_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='pujaservice',
+            index=models.Index(fields=['is_active', 'min_price'], name='puja_pujase_is_acti_c4e3e9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pujaservice',
+            index=models.Index(fields=['is_active', 'max_price'], name='puja_pujase_is_acti_faeaa1_idx'),
+        ),
+        migrations.RunPython(fill_package_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('puja', '0004_pujaservice_package_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pujaservice',
+            name='image_manifest',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -3,6 +3,10 @@ from django.conf import settings
 from imagekit.models import ImageSpecField
 from imagekit.processors import ResizeToFill, SmartResize
 from accounts.models import ImageKitField
+from core.events import BookingEventMixin
+from core.tracking import FieldTrackerMixin
+from core.image_ingest import ImageVariant
+from core.image_variants import ResponsiveImage
 from django.utils.translation import gettext_lazy as _
 
 User = settings.AUTH_USER_MODEL
@@ -48,6 +52,27 @@ class PujaService(models.Model):
         help_text="Approximate duration in minutes"
     )
     is_active = models.BooleanField(default=True)
+
+    image_manifest = models.JSONField(default=dict, blank=True, editable=False)
+
+    image_ingest_variants = {
+        'image': (
+            ImageVariant('image', None, 'puja/services'),
+            ResponsiveImage('image_manifest', 'puja/services'),
+        ),
+    }
+
+    # Summary of active packages, maintained by puja.signals and
+    # rebuild_puja_package_summary; never edited directly
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    package_count = models.PositiveIntegerField(default=0, editable=False)
+    languages = models.CharField(
+        max_length=100,
+        blank=True,
+        editable=False,
+        help_text="Comma separated languages of active packages"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -58,12 +83,63 @@ class PujaService(models.Model):
         indexes = [
             models.Index(fields=['title', 'is_active']),
             models.Index(fields=['category', 'is_active']),
+            models.Index(fields=['is_active', 'min_price']),
+            models.Index(fields=['is_active', 'max_price']),
         ]
 
     def __str__(self):
         return f"{self.title} ({self.get_type_display()})"
 
-class Package(models.Model):
+    @property
+    def language_list(self):
+        return self.languages.split(',') if self.languages else []
+
+    @classmethod
+    def refresh_package_summaries(cls, service_ids=None, batch_size=500):
+        """
+        Recompute min/max price, package count and languages from active
+        packages. ``service_ids=None`` rebuilds every service. Uses UPDATEs
+        only, so updated_at and the save() signals are left alone.
+        """
+        packages = Package.objects.filter(is_active=True).order_by()
+        services = cls.objects.order_by('pk')
+        if service_ids is not None:
+            service_ids = [pk for pk in service_ids if pk]
+            packages = packages.filter(puja_service_id__in=service_ids)
+            services = services.filter(pk__in=service_ids)
+
+        summaries = {
+            row['puja_service_id']: row
+            for row in packages.values('puja_service_id').annotate(
+                min_price=models.Min('price'),
+                max_price=models.Max('price'),
+                package_count=models.Count('id'),
+            )
+        }
+        languages = {}
+        for service_id, language in packages.values_list('puja_service_id', 'language').distinct():
+            languages.setdefault(service_id, []).append(language)
+
+        changed = []
+        for service in services.only('pk', 'min_price', 'max_price', 'package_count', 'languages'):
+            summary = summaries.get(service.pk, {})
+            values = {
+                'min_price': summary.get('min_price'),
+                'max_price': summary.get('max_price'),
+                'package_count': summary.get('package_count', 0),
+                'languages': ','.join(sorted(languages.get(service.pk, []))),
+            }
+            if any(getattr(service, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(service, field, value)
+                changed.append(service)
+
+        cls.objects.bulk_update(
+            changed, ['min_price', 'max_price', 'package_count', 'languages'], batch_size=batch_size
+        )
+        return len(changed)
+
+class Package(FieldTrackerMixin, models.Model):
     class Language(models.TextChoices):
         HINDI = 'HINDI', 'Hindi'
         ENGLISH = 'ENGLISH', 'English'
@@ -116,10 +192,14 @@ class Package(models.Model):
         ordering = ['puja_service', 'price']
         unique_together = ['puja_service', 'language', 'package_type']
 
+    # Lets the summary signal refresh the old service when a package moves
+    tracked_fields = ('puja_service_id',)
+
     def __str__(self):
         return f"{self.puja_service.title} - {self.get_language_display()} {self.get_package_type_display()}"
 
-class PujaBooking(models.Model):
+
+class PujaBooking(BookingEventMixin, models.Model):
     class BookingStatus(models.TextChoices):
         PENDING = 'PENDING', 'Pending'
         CONFIRMED = 'CONFIRMED', 'Confirmed'
@@ -171,6 +251,13 @@ class PujaBooking(models.Model):
             models.Index(fields=['puja_service', 'status']),
         ]
 
+    booking_event_type = 'PUJA'
+    schedule_fields = ('booking_date', 'start_time')
+    calendar_fields = (
+        'user_id', 'status', 'booking_date', 'start_time', 'end_time', 'address', 'special_instructions',
+        'puja_service_id'
+    )
+
     def __str__(self):
         return f"{self.puja_service.title} - {self.booking_date} ({self.get_status_display()})"
     
@@ -190,6 +277,7 @@ class PujaBooking(models.Model):
         
         self.booking_date = new_date
         self.start_time = new_time
+        self.event_actor = rescheduled_by
         self.save()
         
         # Send reschedule notification
@@ -207,4 +295,54 @@ class PujaBooking(models.Model):
             'old_time': old_time,
             'new_date': new_date,
             'new_time': new_time
-        }
\ No newline at end of file
+        }
+
+class PujaSearchDocument(models.Model):
+    """Normalised search text for one service or package (see puja.search)"""
+    doc_key = models.CharField(max_length=40, unique=True)
+    service = models.ForeignKey(
+        PujaService,
+        on_delete=models.CASCADE,
+        related_name='search_documents'
+    )
+    package = models.ForeignKey(
+        Package,
+        on_delete=models.CASCADE,
+        related_name='search_documents',
+        null=True,
+        blank=True
+    )
+    title_norm = models.TextField(blank=True)
+    body_norm = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Puja Search Document"
+        verbose_name_plural = "Puja Search Documents"
+
+    def __str__(self):
+        return self.doc_key
+
+
+class PujaSearchSynonym(models.Model):
+    """A group of interchangeable search terms, e.g. "griha, grih, गृह" """
+    terms = models.CharField(
+        max_length=500,
+        help_text="Comma separated spellings that should match each other"
+    )
+    normalized_terms = models.TextField(blank=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Puja Search Synonym"
+        verbose_name_plural = "Puja Search Synonyms"
+        ordering = ['terms']
+
+    def __str__(self):
+        return self.terms
+
+    def save(self, *args, **kwargs):
+        from .search import normalize_text
+        self.normalized_terms = ' '.join(dict.fromkeys(normalize_text(self.terms).split()))
+        super().save(*args, **kwargs)
@@ -0,0 +1,254 @@
+"""
+Full-text search over puja services and packages.
+
+Each service and package has a PujaSearchDocument row holding normalised
+text. The index is backend specific:
+
+* SQLite: an FTS5 external-content table (``puja_search_fts``) kept in sync
+  with the documents by triggers, ranked with bm25().
+* PostgreSQL: a generated tsvector column with a GIN index, ranked with
+  ts_rank_cd().
+
+Any other database falls back to ``icontains`` matching.
+
+Text is folded for Hindi transliteration before indexing and querying
+(pooja/puja, griha/grih, aa/a...). Query terms are expanded through the
+PujaSearchSynonym table, and every term is prefix matched.
+"""
+import re
+import unicodedata
+
+from django.db import connection
+
+FTS_TABLE = 'puja_search_fts'
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 2.0
+MAX_RESULTS = 200
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_FOLDS = (
+    ('aa', 'a'), ('ee', 'i'), ('oo', 'u'), ('w', 'v'),
+)
+
+
+def normalize_token(token):
+    """Fold common transliteration variants of a single lowercase token"""
+    token = ''.join(
+        ch for ch in unicodedata.normalize('NFKD', token.lower())
+        if not unicodedata.combining(ch) or not ch.isascii()
+    )
+    if not token.isascii():
+        # Devanagari and other scripts are indexed as written
+        return unicodedata.normalize('NFC', token)
+    for source, target in _FOLDS:
+        token = token.replace(source, target)
+    # Schwa deletion: "griha"/"grih", "puja"/"puj", "pravesha"/"pravesh"
+    if len(token) > 3 and token.endswith('a'):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [normalize_token(token) for token in _TOKEN_RE.findall(text or '')]
+
+
+def normalize_text(*parts):
+    return ' '.join(token for part in parts for token in tokenize(part))
+
+
+def _synonym_map(tokens):
+    from .models import PujaSearchSynonym
+
+    expansions = {token: {token} for token in tokens}
+    rows = PujaSearchSynonym.objects.filter(normalized_terms__regex=_any_token_regex(tokens)).values_list(
+        'normalized_terms', flat=True
+    ) if tokens else []
+    for terms in rows:
+        group = set(terms.split())
+        for token in tokens:
+            if token in group:
+                expansions[token] |= group
+    return expansions
+
+
+def _any_token_regex(tokens):
+    return r'(^| )(' + '|'.join(re.escape(token) for token in tokens) + r')( |$)'
+
+
+def expand_query(query):
+    """Return a list of OR-groups (one per query token) of normalised terms"""
+    tokens = list(dict.fromkeys(tokenize(query)))
+    expansions = _synonym_map(tokens)
+    return [sorted(expansions[token]) for token in tokens]
+
+
+def _fts5_match(groups):
+    return ' AND '.join(
+        '(' + ' OR '.join(f'"{term}"*' for term in group) + ')'
+        for group in groups
+    )
+
+
+def _tsquery(groups):
+    return ' & '.join(
+        '(' + ' | '.join(f"{term}:*" for term in group) + ')'
+        for group in groups
+    )
+
+
+def fts_available():
+    return connection.vendor in ('sqlite', 'postgresql') and _index_exists()
+
+
+def _index_exists():
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            return cursor.fetchone() is not None
+        cursor.execute(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = 'puja_pujasearchdocument' "
+            "AND column_name = 'search_vector'"
+        )
+        return cursor.fetchone() is not None
+
+
+def search_documents(query, limit=MAX_RESULTS):
+    """
+    Return [(service_id, package_id, rank)] best match first. ``rank`` is
+    lower-is-better for every backend.
+    """
+    groups = [group for group in expand_query(query) if group]
+    if not groups:
+        return []
+
+    if fts_available():
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    f"SELECT d.service_id, d.package_id, bm25({FTS_TABLE}, %s, %s) AS rank "
+                    f"FROM {FTS_TABLE} JOIN puja_pujasearchdocument d ON d.id = {FTS_TABLE}.rowid "
+                    f"WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s",
+                    [TITLE_WEIGHT, BODY_WEIGHT, _fts5_match(groups), limit]
+                )
+            else:
+                cursor.execute(
+                    "SELECT service_id, package_id, -ts_rank_cd(search_vector, q) AS rank "
+                    "FROM puja_pujasearchdocument, to_tsquery('simple', %s) q "
+                    "WHERE search_vector @@ q ORDER BY rank LIMIT %s",
+                    [_tsquery(groups), limit]
+                )
+            return cursor.fetchall()
+
+    # Fallback: substring match on the normalised columns, title matches first
+    from django.db.models import Q
+    from .models import PujaSearchDocument
+
+    condition = Q()
+    for group in groups:
+        any_term = Q()
+        for term in group:
+            any_term |= Q(title_norm__icontains=term) | Q(body_norm__icontains=term)
+        condition &= any_term
+    rows = PujaSearchDocument.objects.filter(condition).values_list('service_id', 'package_id', 'title_norm')[:limit]
+    title_terms = {term for group in groups for term in group}
+    return sorted(
+        ((service_id, package_id, 0 if any(term in title for term in title_terms) else 1)
+         for service_id, package_id, title in rows),
+        key=lambda row: row[2]
+    )
+
+
+def ranked_service_ids(query):
+    """Service ids ordered by their best matching document"""
+    seen = {}
+    for service_id, _package_id, rank in search_documents(query):
+        if service_id not in seen:
+            seen[service_id] = rank
+    return list(seen)
+
+
+def ranked_package_ids(query):
+    """Package ids ordered by rank; a service-level hit also matches its packages"""
+    from .models import Package
+
+    hits = search_documents(query)
+    service_ids = {service_id for service_id, package_id, _rank in hits if not package_id}
+    # The packages of every service-level hit, in one query
+    packages_by_service = {}
+    if service_ids:
+        rows = Package.objects.filter(puja_service_id__in=service_ids).order_by('price').values_list(
+            'puja_service_id', 'id'
+        )
+        for service_id, package_id in rows:
+            packages_by_service.setdefault(service_id, []).append(package_id)
+
+    order = []
+    for service_id, package_id, _rank in hits:
+        order.extend([package_id] if package_id else packages_by_service.get(service_id, []))
+    return list(dict.fromkeys(order))
+
+
+# Index maintenance ---------------------------------------------------------
+
+def _service_document(service):
+    return {
+        'title_norm': normalize_text(service.title),
+        'body_norm': normalize_text(
+            service.description, service.category.name if service.category_id else '', service.get_type_display()
+        ),
+    }
+
+
+def _package_document(package):
+    service = package.puja_service
+    return {
+        'title_norm': normalize_text(service.title, package.get_package_type_display()),
+        'body_norm': normalize_text(
+            package.description, package.location, package.get_language_display(), package.language,
+            service.category.name if service.category_id else ''
+        ),
+    }
+
+
+def _models(apps=None):
+    if apps is None:
+        from django.apps import apps
+    return apps.get_model('puja', 'PujaSearchDocument'), apps.get_model('puja', 'PujaService')
+
+
+def index_service(service, with_packages=True, apps=None):
+    PujaSearchDocument, _ = _models(apps)
+    PujaSearchDocument.objects.update_or_create(
+        doc_key=f'service:{service.pk}',
+        defaults={'service': service, 'package': None, **_service_document(service)}
+    )
+    if with_packages:
+        for package in service.packages.select_related('puja_service__category'):
+            index_package(package, apps)
+
+
+def index_package(package, apps=None):
+    PujaSearchDocument, _ = _models(apps)
+    PujaSearchDocument.objects.update_or_create(
+        doc_key=f'package:{package.pk}',
+        defaults={'service_id': package.puja_service_id, 'package': package, **_package_document(package)}
+    )
+
+
+def remove_package(package_id):
+    from .models import PujaSearchDocument
+    PujaSearchDocument.objects.filter(doc_key=f'package:{package_id}').delete()
+
+
+def rebuild_index(apps=None):
+    """Re-create every search document; returns the number indexed.
+
+    ``apps`` lets data migrations pass their historical app registry.
+    """
+    PujaSearchDocument, PujaService = _models(apps)
+    PujaSearchDocument.objects.all().delete()
+    count = 0
+    for service in PujaService.objects.select_related('category'):
+        index_service(service, apps=apps)
+        count += 1 + service.packages.count()
+    return count
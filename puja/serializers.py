@@ -1,4 +1,8 @@
+import uuid
+
 from rest_framework import serializers
+from core.image_ingest import ingest_image, read_upload
+from core.serializers import ResponsiveImageField
 from puja.models import PujaCategory, PujaService, Package, PujaBooking
 
 #just pushed to check git history
@@ -8,8 +12,6 @@ class PujaCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
 
-from accounts.models import upload_to_imagekit
-
 class PujaServiceSerializer(serializers.ModelSerializer):
     category = serializers.PrimaryKeyRelatedField(
         queryset=PujaCategory.objects.all(), write_only=True
@@ -17,111 +19,47 @@ class PujaServiceSerializer(serializers.ModelSerializer):
     category_detail = PujaCategorySerializer(source='category', read_only=True)
     image = serializers.FileField(write_only=True, required=False)
     image_url = serializers.CharField(source='image', read_only=True)
+    responsive_image = ResponsiveImageField()
+    languages = serializers.ListField(source='language_list', child=serializers.CharField(), read_only=True)
 
     class Meta:
         model = PujaService
         fields = [
-            'id', 'title', 'image', 'image_url',
+            'id', 'title', 'image', 'image_url', 'responsive_image',
             'description', 'category', 'category_detail', 'type', 'duration_minutes',
+            'min_price', 'max_price', 'package_count', 'languages',
             'is_active', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at']
+        read_only_fields = ['min_price', 'max_price', 'package_count', 'created_at', 'updated_at']
 
-    def create(self, validated_data):
+    def _read_image(self):
         request = self.context.get('request')
         image_file = request.FILES.get('image') if request else None
-        if image_file:
-            try:
-                # Read file content into bytes (similar to accounts app)
-                if hasattr(image_file, 'read'):
-                    image_file.seek(0)
-                    file_bytes = image_file.read()
-                else:
-                    with open(image_file, 'rb') as f:
-                        file_bytes = f.read()
-                
-                # Validate image using bytes
-                from PIL import Image
-                from io import BytesIO
-                import os
-                import uuid
-                
-                try:
-                    Image.open(BytesIO(file_bytes)).verify()
-                except Exception as e:
-                    raise serializers.ValidationError({'image': f'Invalid image file: {str(e)}'})
-                
-                # Generate unique filename
-                original_filename = getattr(image_file, 'name', 'service.jpg')
-                ext = os.path.splitext(original_filename)[1].lower()
-                if ext not in ['.jpg', '.jpeg', '.png', '.gif']:
-                    raise serializers.ValidationError({'image': 'Unsupported image format. Please upload JPG, JPEG, PNG, or GIF.'})
-                
-                filename = f"service_{uuid.uuid4()}{ext}"
-                
-                # Upload using bytes (same as accounts app)
-                image_url = upload_to_imagekit(file_bytes, filename, folder="puja/services")
-                
-                if not image_url or not isinstance(image_url, str) or not image_url.startswith('http'):
-                    raise serializers.ValidationError({'image': 'Image upload to ImageKit failed. Please try again.'})
-                
-                validated_data['image'] = image_url
-                
-            except serializers.ValidationError:
-                raise
-            except Exception as e:
-                raise serializers.ValidationError({'image': f'Error processing image: {str(e)}'})
-        else:
-            validated_data.pop('image', None)
-        return super().create(validated_data)
+        if not image_file:
+            return None
+        try:
+            return read_upload(image_file)
+        except serializers.ValidationError as e:
+            raise serializers.ValidationError({'image': e.detail})
+
+    def _queue_image(self, instance, upload):
+        if upload:
+            file_bytes, ext = upload
+            ingest_image(instance, 'image', file_bytes, f"service_{uuid.uuid4()}{ext}")
+
+    def create(self, validated_data):
+        validated_data.pop('image', None)
+        upload = self._read_image()
+        instance = super().create(validated_data)
+        self._queue_image(instance, upload)
+        return instance
 
     def update(self, instance, validated_data):
-        request = self.context.get('request')
-        image_file = request.FILES.get('image') if request else None
-        if image_file:
-            try:
-                # Read file content into bytes (similar to accounts app)
-                if hasattr(image_file, 'read'):
-                    image_file.seek(0)
-                    file_bytes = image_file.read()
-                else:
-                    with open(image_file, 'rb') as f:
-                        file_bytes = f.read()
-                
-                # Validate image using bytes
-                from PIL import Image
-                from io import BytesIO
-                import os
-                import uuid
-                
-                try:
-                    Image.open(BytesIO(file_bytes)).verify()
-                except Exception as e:
-                    raise serializers.ValidationError({'image': f'Invalid image file: {str(e)}'})
-                
-                # Generate unique filename
-                original_filename = getattr(image_file, 'name', 'service.jpg')
-                ext = os.path.splitext(original_filename)[1].lower()
-                if ext not in ['.jpg', '.jpeg', '.png', '.gif']:
-                    raise serializers.ValidationError({'image': 'Unsupported image format. Please upload JPG, JPEG, PNG, or GIF.'})
-                
-                filename = f"service_{uuid.uuid4()}{ext}"
-                
-                # Upload using bytes (same as accounts app)
-                image_url = upload_to_imagekit(file_bytes, filename, folder="puja/services")
-                
-                if not image_url or not isinstance(image_url, str) or not image_url.startswith('http'):
-                    raise serializers.ValidationError({'image': 'Image upload to ImageKit failed. Please try again.'})
-                
-                validated_data['image'] = image_url
-                
-            except serializers.ValidationError:
-                raise
-            except Exception as e:
-                raise serializers.ValidationError({'image': f'Error processing image: {str(e)}'})
-        else:
-            validated_data.pop('image', None)
-        return super().update(instance, validated_data)
+        validated_data.pop('image', None)
+        upload = self._read_image()
+        instance = super().update(instance, validated_data)
+        self._queue_image(instance, upload)
+        return instance
 
 class PackageSerializer(serializers.ModelSerializer):
     puja_service = serializers.PrimaryKeyRelatedField(queryset=PujaService.objects.all(), write_only=True)
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import PujaCategory, PujaService, Package
+from .catalog_cache import bump_catalog_version
+from . import search
+
+
+@receiver([post_save, post_delete], sender=PujaCategory)
+@receiver([post_save, post_delete], sender=PujaService)
+@receiver([post_save, post_delete], sender=Package)
+def invalidate_catalog_cache(sender, **kwargs):
+    """Any catalog change starts a new catalog version"""
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=PujaService)
+def index_puja_service(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_service(instance)
+
+
+@receiver(post_save, sender=Package)
+def index_puja_package(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_package(instance)
+
+
+@receiver(post_delete, sender=Package)
+def unindex_puja_package(sender, instance, **kwargs):
+    search.remove_package(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Package)
+def refresh_service_package_summary(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # The old service too, when a package moves
+    service_ids = {instance.puja_service_id, instance.previous('puja_service_id')}
+    PujaService.refresh_package_summaries(service_ids)
+
+
+@receiver(post_save, sender=PujaCategory)
+def reindex_category_services(sender, instance, created, raw=False, **kwargs):
+    # Category names are part of every document of its services
+    if created or raw:
+        return
+    for service in instance.services.select_related('category'):
+        search.index_service(service)
@@ -1,3 +1,176 @@
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .catalog_cache import get_catalog_version
+from .models import PujaCategory, PujaService, Package
+
+
+class PujaCatalogCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.category = PujaCategory.objects.create(name='Graha Shanti')
+        self.service = PujaService.objects.create(
+            title='Navgraha Puja',
+            description='Peace offering to the nine planets',
+            category=self.category,
+            duration_minutes=90
+        )
+
+    def test_service_list_is_cached_with_etag(self):
+        first = self.client.get('/api/puja/services/')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(first.data), 1)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/puja/services/')
+        self.assertEqual(cached.data, first.data)
+
+        not_modified = self.client.get('/api/puja/services/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_catalog_change_bumps_version(self):
+        first = self.client.get('/api/puja/services/')
+        PujaService.objects.create(
+            title='Griha Pravesh',
+            description='House warming ceremony',
+            category=self.category,
+            duration_minutes=120
+        )
+        response = self.client.get('/api/puja/services/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+    def test_version_is_shared_through_the_database(self):
+        before = get_catalog_version()
+        self.service.title = 'Navgraha Shanti Puja'
+        self.service.save()
+        # Another worker starts with its own, empty cache
+        cache.clear()
+        self.assertEqual(get_catalog_version(), before + 1)
+
+    def test_filters_are_cached_separately(self):
+        Package.objects.create(
+            puja_service=self.service,
+            location='Delhi',
+            language=Package.Language.HINDI,
+            package_type=Package.PackageType.BASIC,
+            price=Decimal('1000.00'),
+            description='Basic package'
+        )
+        self.assertEqual(len(self.client.get('/api/puja/packages/').data), 1)
+        self.assertEqual(len(self.client.get('/api/puja/packages/', {'min_price': 5000}).data), 0)
+
+
+class PujaSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = PujaCategory.objects.create(name='Vastu')
+        self.griha = PujaService.objects.create(
+            title='Griha Pravesh Puja',
+            description='House warming ceremony with havan',
+            category=category,
+            duration_minutes=120
+        )
+        self.katha = PujaService.objects.create(
+            title='Satyanarayan Katha',
+            description='Monthly katha for a peaceful griha',
+            category=category,
+            duration_minutes=90
+        )
+        self.package = Package.objects.create(
+            puja_service=self.katha, location='Delhi', price=Decimal('2100.00'),
+            description='Includes prasad'
+        )
+
+    def test_transliteration_and_synonyms(self):
+        for query in ['grih parvesh', 'gruha pooja', 'गृह', 'griha prav']:
+            response = self.client.get('/api/puja/services/', {'search': query})
+            self.assertEqual([row['id'] for row in response.data][:1], [self.griha.pk], query)
+
+    def test_title_matches_rank_first(self):
+        response = self.client.get('/api/puja/services/', {'search': 'griha'})
+        self.assertEqual([row['id'] for row in response.data], [self.griha.pk, self.katha.pk])
+
+    def test_index_follows_catalog_changes(self):
+        response = self.client.get('/api/puja/packages/', {'search': 'satyanarayana'})
+        self.assertEqual([row['id'] for row in response.data], [self.package.pk])
+
+        self.package.delete()
+        self.katha.title = 'Rudrabhishek'
+        self.katha.save()
+        self.assertFalse(self.client.get('/api/puja/packages/', {'search': 'satyanarayan'}).data)
+        services = self.client.get('/api/puja/services/', {'search': 'rudrabhishekam'}).data
+        self.assertEqual([row['id'] for row in services], [self.katha.pk])
+
+    def test_service_hits_match_their_packages_in_one_query(self):
+        from puja.search import ranked_package_ids
+
+        premium = Package.objects.create(
+            puja_service=self.griha, location='Delhi', price=Decimal('5100.00'), description='Premium',
+            package_type=Package.PackageType.PREMIUM
+        )
+        basic = Package.objects.create(
+            puja_service=self.griha, location='Delhi', price=Decimal('1100.00'), description='Basic',
+            package_type=Package.PackageType.BASIC
+        )
+        with self.assertNumQueries(4):
+            ids = ranked_package_ids('griha')
+        self.assertCountEqual(ids[:2], [basic.pk, premium.pk])
+        self.assertEqual(ids[2:], [self.package.pk])
+
+
+class PujaPackageSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = PujaCategory.objects.create(name='Shanti')
+        self.service = PujaService.objects.create(
+            title='Navgraha Shanti', description='Planet peace', category=category, duration_minutes=60
+        )
+        self.other = PujaService.objects.create(
+            title='Rudrabhishek', description='Shiva abhishek', category=category, duration_minutes=60
+        )
+        self.basic = Package.objects.create(
+            puja_service=self.service, location='Delhi', price=Decimal('1100.00'),
+            description='Basic', package_type=Package.PackageType.BASIC
+        )
+        Package.objects.create(
+            puja_service=self.service, location='Delhi', price=Decimal('5100.00'), description='Premium',
+            package_type=Package.PackageType.PREMIUM, language=Package.Language.SANSKRIT
+        )
+
+    def test_summary_follows_package_changes(self):
+        self.service.refresh_from_db()
+        self.assertEqual((self.service.min_price, self.service.max_price), (Decimal('1100.00'), Decimal('5100.00')))
+        self.assertEqual(self.service.package_count, 2)
+        self.assertEqual(self.service.language_list, ['HINDI', 'SANSKRIT'])
+
+        basic = Package.objects.get(pk=self.basic.pk)
+        basic.puja_service = self.other
+        basic.save()
+        self.service.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.service.min_price, self.service.package_count), (Decimal('5100.00'), 1))
+        self.assertEqual((self.other.min_price, self.other.package_count), (Decimal('1100.00'), 1))
+
+        basic.delete()
+        self.other.refresh_from_db()
+        self.assertEqual((self.other.min_price, self.other.package_count, self.other.languages), (None, 0, ''))
+
+    def test_service_price_filters(self):
+        response = self.client.get('/api/puja/services/', {'max_price': 2000})
+        self.assertEqual([row['id'] for row in response.data], [self.service.pk])
+        self.assertEqual(response.data[0]['min_price'], '1100.00')
+        self.assertFalse(self.client.get('/api/puja/services/', {'min_price': 6000}).data)
+        # Packages at 1100 and 5100: the ranges overlap
+        response = self.client.get('/api/puja/services/', {'min_price': 2000, 'max_price': 3000})
+        self.assertEqual([row['id'] for row in response.data], [self.service.pk])
 
-# Create your tests here.
+        PujaService.objects.update(min_price=None, max_price=None, package_count=0, languages='')
+        self.assertEqual(PujaService.refresh_package_summaries(), 1)
+        self.assertEqual(PujaService.objects.get(pk=self.service.pk).package_count, 2)
@@ -9,9 +9,11 @@ from .serializers import (
     PackageSerializer, PujaBookingSerializer,
     CreatePujaBookingSerializer, PujaBookingRescheduleSerializer
 )
-from .filters import PujaServiceFilter, PackageFilter
+from .filters import PujaServiceFilter, PackageFilter, RankedSearchFilter
+from .catalog_cache import CatalogCacheMixin
 
-class PujaCategoryListView(generics.ListAPIView):
+class PujaCategoryListView(CatalogCacheMixin, generics.ListAPIView):
+    catalog_cache_scope = 'categories'
     queryset = PujaCategory.objects.all()
     serializer_class = PujaCategorySerializer
     permission_classes = [permissions.AllowAny]
@@ -23,24 +25,25 @@ class PujaCategoryCreateView(generics.CreateAPIView):
     serializer_class = PujaCategorySerializer
     permission_classes = [IsAdminUser]
 
-class PujaServiceListView(generics.ListAPIView):
+class PujaServiceListView(CatalogCacheMixin, generics.ListAPIView):
+    catalog_cache_scope = 'services'
     serializer_class = PujaServiceSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter]
     filterset_class = PujaServiceFilter
-    search_fields = ['title', 'description']
 
     def get_queryset(self):
-        return PujaService.objects.filter(is_active=True)
+        return PujaService.objects.filter(is_active=True).select_related('category')
 
-class PackageListView(generics.ListAPIView):
+class PackageListView(CatalogCacheMixin, generics.ListAPIView):
+    catalog_cache_scope = 'packages'
     serializer_class = PackageSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter]
     filterset_class = PackageFilter
 
     def get_queryset(self):
-        return Package.objects.filter(is_active=True)
+        return Package.objects.filter(is_active=True).select_related('puja_service__category')
 
 class PujaBookingListView(generics.ListAPIView):
     serializer_class = PujaBookingSerializer